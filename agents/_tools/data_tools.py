@@ -29,7 +29,6 @@ from __future__ import annotations
 import json
 import logging
 
-import pandas as pd
 from langchain_core.tools import tool
 
 from agents._cache import cache_key, clear_cache, write_payloads
@@ -38,9 +37,11 @@ from financialtools.analysis import (
     filter_year,
     normalise_time,
 )
+from financialtools.cache import default_statement_cache
 from financialtools.exceptions import DownloadError, EvaluationError
 from financialtools.processor import Downloader, FundamentalMetricsEvaluator
-from financialtools.utils import dataframe_to_json, resolve_sector
+from financialtools.payloads import encode_payloads
+from financialtools.utils import resolve_sector
 
 _logger = logging.getLogger(__name__)
 
@@ -60,7 +61,8 @@ def _download_and_evaluate(
 
     Stages
     ------
-    1. Download merged financials via Downloader.from_ticker().
+    1. Download merged financials via Downloader.from_ticker() — raw yfinance
+       payloads are served from the shared StatementCache while fresh.
     1b. Enrich with company name and sector from yfinance info.
     2. Evaluate with FundamentalTraderAssistant (24 scored + 14 unscored metrics).
     3. Normalise timestamps and filter to the requested year.
@@ -77,6 +79,8 @@ def _download_and_evaluate(
                     ticker/year before writing new data.  Clears both
                     ``payloads.json`` and any stale ``{topic}.json`` files from
                     prior runs so consumers always see fresh artefacts.
+                    Also drops the ticker's cached yfinance payloads so the
+                    download itself is fresh.
                     Default False — cache is overwritten in place (payloads.json
                     replaced; old topic results remain until topics are re-run).
 
@@ -109,9 +113,12 @@ def _download_and_evaluate(
         _logger.info("[_download_and_evaluate] force_refresh=True — clearing cache key=%s",
                      key_to_clear)
         clear_cache(key_to_clear)
+        statements = default_statement_cache()
+        if statements is not None:
+            statements.invalidate(ticker)
 
     # ── Stage 1: Download ────────────────────────────────────────────────────
-    d = Downloader.from_ticker(ticker)
+    d = Downloader.from_ticker(ticker, cache=True)
     merged = d.get_merged_data()
 
     if merged.empty:
@@ -139,15 +146,16 @@ def _download_and_evaluate(
     fta = FundamentalMetricsEvaluator(data=merged, weights=weights)
     evaluate_out = fta.evaluate()
 
-    # ── Stage 3: Normalise + filter ──────────────────────────────────────────
-    def _prep(df: pd.DataFrame) -> str:
-        return dataframe_to_json(filter_year(normalise_time(df), year))
-
-    metrics_json          = _prep(evaluate_out["metrics"])
-    extended_metrics_json = _prep(evaluate_out["extended_metrics"])
-    eval_metrics_json     = _prep(evaluate_out["eval_metrics"])
-    composite_scores_json = _prep(evaluate_out["composite_scores"])
-    red_flags_json        = _prep(evaluate_out["red_flags"])
+    # ── Stage 3: Normalise + filter + compact encoding ───────────────────────
+    payloads = encode_payloads({
+        key: filter_year(normalise_time(evaluate_out[key]), year)
+        for key in ("metrics", "extended_metrics", "eval_metrics", "composite_scores", "red_flags")
+    })
+    metrics_json          = payloads["metrics"]
+    extended_metrics_json = payloads["extended_metrics"]
+    eval_metrics_json     = payloads["eval_metrics"]
+    composite_scores_json = payloads["composite_scores"]
+    red_flags_json        = payloads["red_flags"]
 
     # ── Stage 4: Write disk cache (observability side-effect) ────────────────
     key = cache_key(ticker, year)
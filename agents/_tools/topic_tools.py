@@ -5,7 +5,8 @@ Public API
 ----------
 _analyse_topic(payloads, topic, model) → str
     Core LLM implementation.  Accepts a payloads dict (keys: ticker, metrics,
-    extended_metrics, composite_scores, eval_metrics, red_flags) and runs the
+    extended_metrics, composite_scores, eval_metrics, red_flags), projects it
+    to the topic's blocks and columns (financialtools.projections) and runs the
     full chain: build → invoke with retry → write topic result to cache.
     Never raises — returns {"error": "..."} on failure.
     Called directly by topic subgraph nodes (data from state, no disk reads).
@@ -43,10 +44,10 @@ import os
 
 from dotenv import load_dotenv
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
 
 from agents._cache import read_payloads, write_topic_result
-from financialtools.analysis import build_topic_chain, invoke_chain
+from financialtools.analysis import build_topic_chain, default_chain_factory, invoke_chain
+from financialtools.projections import project_payloads
 
 load_dotenv()
 
@@ -73,6 +74,7 @@ def _analyse_topic(payloads: dict, topic: str, model: str = _DEFAULT_MODEL) -> s
                    ticker, metrics, extended_metrics, composite_scores,
                    eval_metrics, red_flags
                Optional key: cache_key (used for logging and cache write).
+               Only the blocks registered for the topic are required.
     topic    : One of the seven topic keys
                ("liquidity", "solvency", "profitability", "efficiency",
                 "cash_flow", "growth", "red_flags").
@@ -93,16 +95,11 @@ def _analyse_topic(payloads: dict, topic: str, model: str = _DEFAULT_MODEL) -> s
 
     _logger.info("[%s] Starting analysis for topic '%s'", log_key, topic)
     try:
-        llm = ChatOpenAI(model=model, temperature=0)
+        llm = default_chain_factory().llm(model)
         prompt, parser = build_topic_chain(topic, llm)
 
-        inputs = {
-            "metrics":          payloads["metrics"],
-            "extended_metrics": payloads["extended_metrics"],
-            "composite_scores": payloads["composite_scores"],
-            "eval_metrics":     payloads["eval_metrics"],
-            "red_flags":        payloads["red_flags"],
-        }
+        # Only the blocks and metric columns this topic reads (projections.py).
+        inputs = project_payloads(payloads, topic)
 
         assessment = invoke_chain(prompt, parser, llm, inputs, topic, ticker)
 
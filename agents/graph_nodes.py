@@ -31,12 +31,12 @@ import logging
 
 from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from langgraph.graph import END, START, StateGraph
 
 from agents._tools.data_tools import _download_and_evaluate
 from agents._tools.topic_tools import _DEFAULT_MODEL, _analyse_topic
 from agents.graph_state import AnalysisState
+from financialtools.analysis import default_chain_factory
 
 load_dotenv()
 
@@ -110,6 +110,9 @@ def create_topic_subgraph(topic: str):
 
     The subgraph reads the five payload JSON strings from state (written by
     prepare_data_node) and calls _analyse_topic directly — no disk reads.
+    _analyse_topic projects them to the topic's registered blocks and metric
+    columns (financialtools.projections), so each topic's prompt carries only
+    what its system prompt uses.
 
     Parameters
     ----------
@@ -272,6 +275,12 @@ Growth:                {growth}
 Red Flags:             {red_flags}
 """
 
+# Built once at import; the LLM client comes from default_chain_factory().
+_REPORT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", _REPORT_SYSTEM),
+    ("human",  _REPORT_HUMAN),
+])
+
 
 def compile_report_node(state: AnalysisState) -> dict:
     """
@@ -289,12 +298,7 @@ def compile_report_node(state: AnalysisState) -> dict:
         val = state.get(key)
         return json.dumps(val, indent=2) if val else "unavailable"
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", _REPORT_SYSTEM),
-        ("human",  _REPORT_HUMAN),
-    ])
-
-    llm = ChatOpenAI(model=model, temperature=0)
+    llm = default_chain_factory().llm(model)
 
     inputs = {
         "company_name":          company,
@@ -311,7 +315,7 @@ def compile_report_node(state: AnalysisState) -> dict:
     }
 
     _logger.info("[compile_report_node] generating final report for %s", ticker)
-    response = (prompt | llm).invoke(inputs)
+    response = (_REPORT_PROMPT | llm).invoke(inputs)
     report   = response.content if hasattr(response, "content") else str(response)
 
     _logger.info("[compile_report_node] report generated (%d chars)", len(report))
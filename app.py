@@ -13,7 +13,6 @@ import logging
 import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
 load_dotenv()
 
@@ -22,6 +21,7 @@ from financialtools.analysis import (
     _build_topic_chain,
     _invoke_chain,
     build_weights,
+    default_chain_factory,
     filter_year,
     normalise_time,
 )
@@ -31,7 +31,8 @@ _DISPLAY_TOPICS = [t for t in _TOPIC_MAP if t != "regime"]
 from financialtools.config import sec_sector_metric_weights
 from financialtools.exceptions import EvaluationError
 from financialtools.processor import Downloader, FundamentalMetricsEvaluator
-from financialtools.utils import dataframe_to_json
+from financialtools.payloads import encode_payloads
+from financialtools.projections import project_payloads
 
 logging.basicConfig(level=logging.INFO)
 
@@ -110,7 +111,7 @@ def _stage_download_evaluate(ticker: str, sector: str) -> dict:
     Returns the evaluate() result dict.
     Raises EvaluationError if download is empty or evaluation fails.
     """
-    d = Downloader.from_ticker(ticker)
+    d = Downloader.from_ticker(ticker, cache=True)
     merged = d.get_merged_data()
     if merged.empty:
         raise EvaluationError(
@@ -124,18 +125,14 @@ def _stage_download_evaluate(ticker: str, sector: str) -> dict:
 
 def _build_payloads(evaluate_out: dict, year: int | None) -> dict:
     """
-    Normalise time columns and serialise the five DataFrames to JSON strings.
+    Normalise time columns and encode the five DataFrames as compact JSON
+    strings (financialtools.payloads).
 
     Returns a dict with keys: metrics, extended_metrics, composite_scores,
     eval_metrics, red_flags — ready to pass to any chain.
     """
     keys = ["metrics", "extended_metrics", "eval_metrics", "composite_scores", "red_flags"]
-    payloads = {}
-    for k in keys:
-        df = normalise_time(evaluate_out[k])
-        df = filter_year(df, year)
-        payloads[k] = dataframe_to_json(df)
-    return payloads
+    return encode_payloads({k: filter_year(normalise_time(evaluate_out[k]), year) for k in keys})
 
 
 # ---------------------------------------------------------------------------
@@ -383,8 +380,8 @@ if run_btn and ticker:
         payloads = _build_payloads(evaluate_out, year)
         results["evaluate_output"] = evaluate_out
 
-        # Stage 2: initialise LLM once, shared across all chains
-        llm = ChatOpenAI(model=model, temperature=0)
+        # Stage 2: shared LLM client (pooled across reruns of the app)
+        llm = default_chain_factory().llm(model)
 
         progress = st.progress(1 / total_steps, text="Evaluation complete.")
 
@@ -395,7 +392,9 @@ if run_btn and ticker:
             progress.progress(i / total_steps, text=f"{label} chain …")
 
             prompt, parser = _build_topic_chain(topic, llm)
-            results[topic] = _invoke_chain(prompt, parser, llm, payloads, topic, ticker)
+            results[topic] = _invoke_chain(
+                prompt, parser, llm, project_payloads(payloads, topic), topic, ticker
+            )
 
         # Stage 4: regime chain (separate UI step — rendered in its own tab)
         st.write("Running **Overall Regime** chain …")
@@ -0,0 +1,300 @@
+"""
+bench_evaluate.py — evaluate() hot-path benchmark on synthetic universes
+========================================================================
+
+Usage
+-----
+    python benchmarks/bench_evaluate.py                          # 1, 100, 1000, 10000 tickers
+    python benchmarks/bench_evaluate.py --sizes 1 100 --repeat 5
+    python benchmarks/bench_evaluate.py --json after.json --compare before.json
+
+What it measures
+----------------
+A synthetic merged-fundamentals frame (every column ``compute_metrics`` and
+``compute_extended_metrics`` read, plus market data and ``sector``) is built
+per universe size, with 4–10 annual periods per ticker and realistic gaps:
+
+  - ~5 % of cells NaN at random
+  - banks (financial-services) structurally lack gross_profit, ebitda,
+    current_assets/liabilities, inventory and cost_of_revenue
+  - ~10 % of tickers report only a partial latest period (cash flow missing)
+  - ~5 % of tickers have a sparse oldest period (balance sheet only)
+  - a few negative-equity, negative-FCF and zero-revenue rows
+
+Each ``evaluate()`` stage is then timed on its own, in pipeline order, so a
+change to one stage shows up in that stage's row:
+
+  compute_metrics, compute_valuation_metrics, raw_red_flags,
+  composite_scores, cross_sectional_scores, metrics_red_flags,
+  compute_extended_metrics, and the end-to-end evaluate().
+
+cross_sectional_scores is the peer-relative score source
+(``scoring="percentile"``: sector / fiscal-year ranks of every metric); it is
+not part of the default absolute-scoring evaluate().
+
+composite_scores and metrics_red_flags work on the wide metrics frame; the
+former melt, score_metric and weights_merge stages no longer exist in
+evaluate() (JSON from older runs still lists them — ``--compare`` skips
+stages missing on either side).
+
+Size 1 runs FundamentalMetricsEvaluator; larger sizes run
+UniverseMetricsEvaluator (one columnar pass over the universe). Times are
+the best of ``--repeat`` runs. Peak memory is measured in a separate
+tracemalloc pass (tracing slows execution, so it never overlaps timing) and
+is the peak allocated above the stage's starting point.
+
+Output is machine-readable JSON (``--json``): a ``meta`` block (commit,
+versions, parameters) and one record per (size, stage). ``--compare`` prints
+per-stage time ratios against an earlier JSON file. No network access.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import FundamentalMetricsEvaluator
+from financialtools.universe import UniverseMetricsEvaluator
+from financialtools.utils import build_weights
+
+_SECTORS = (
+    "technology", "healthcare", "industrials", "financial-services",
+    "energy", "consumer-cyclical", "real-estate", "utilities",
+)
+
+# Balance-sheet / income / cash-flow columns as ratios of revenue: (mean, sd).
+_RATIOS = {
+    "gross_profit":                        (0.45, 0.15),
+    "operating_income":                    (0.15, 0.10),
+    "net_income_common_stockholders":      (0.10, 0.08),
+    "ebitda":                              (0.25, 0.10),
+    "ebit":                                (0.18, 0.08),
+    "interest_expense_non_operating":      (0.01, 0.005),
+    "total_assets":                        (2.00, 0.60),
+    "total_debt":                          (0.50, 0.30),
+    "common_stock_equity":                 (0.90, 0.40),
+    "current_assets":                      (0.80, 0.25),
+    "current_liabilities":                 (0.45, 0.15),
+    "inventory":                           (0.12, 0.06),
+    "accounts_receivable":                 (0.15, 0.05),
+    "accounts_payable":                    (0.09, 0.03),
+    "cash_and_cash_equivalents":           (0.20, 0.10),
+    "working_capital":                     (0.35, 0.20),
+    "net_debt":                            (0.30, 0.30),
+    "invested_capital":                    (1.40, 0.40),
+    "free_cash_flow":                      (0.08, 0.08),
+    "operating_cash_flow":                 (0.14, 0.07),
+    "capital_expenditure":                 (-0.06, 0.03),
+    "depreciation_amortization_depletion": (0.05, 0.02),
+    "cost_of_revenue":                     (0.55, 0.15),
+}
+_BANK_ABSENT = (
+    "gross_profit", "ebitda", "current_assets", "current_liabilities",
+    "inventory", "cost_of_revenue",
+)
+_CASHFLOW = ("free_cash_flow", "operating_cash_flow", "capital_expenditure",
+             "depreciation_amortization_depletion")
+
+
+def make_universe(n_tickers: int, min_periods: int = 4, max_periods: int = 10,
+                  nan_rate: float = 0.05, seed: int = 0) -> pd.DataFrame:
+    """Synthetic combined merged-fundamentals frame (see module docstring)."""
+    rng = np.random.default_rng(seed)
+    periods = rng.integers(min_periods, max_periods + 1, size=n_tickers)
+    n_rows = int(periods.sum())
+    tickers = np.array([f"T{i:05d}" for i in range(n_tickers)])
+    sectors = rng.choice(_SECTORS, size=n_tickers)
+
+    row_ticker = np.repeat(np.arange(n_tickers), periods)
+    # Period index within the ticker: 0 = oldest.
+    pos = np.arange(n_rows) - np.repeat(np.cumsum(periods) - periods, periods)
+    last_year = 2024
+    years = last_year - (np.repeat(periods, periods) - 1 - pos)
+
+    base = rng.lognormal(mean=20, sigma=1.5, size=n_tickers)
+    growth = rng.normal(0.06, 0.08, size=n_tickers)
+    revenue = base[row_ticker] * (1 + growth[row_ticker]) ** pos
+    revenue *= rng.normal(1.0, 0.03, size=n_rows)
+
+    data = {
+        "ticker": tickers[row_ticker],
+        "time": pd.to_datetime([f"{y}-12-31" for y in years]),
+        "sector": sectors[row_ticker],
+        "total_revenue": revenue,
+    }
+    for col, (mean, sd) in _RATIOS.items():
+        data[col] = revenue * rng.normal(mean, sd, size=n_rows)
+    data["tax_rate_for_calcs"] = np.clip(rng.normal(0.21, 0.05, size=n_rows), 0, 0.5)
+    shares = rng.lognormal(mean=18, sigma=1.0, size=n_tickers)[row_ticker]
+    data["ordinary_shares_number"] = shares * (1 + rng.normal(0.0, 0.01, size=n_rows))
+    data["diluted_eps"] = data["net_income_common_stockholders"] / shares
+    price = rng.lognormal(mean=3.5, sigma=0.8, size=n_tickers)[row_ticker]
+    data["currentprice"] = price
+    data["sharesoutstanding"] = shares
+    data["marketcap"] = price * shares
+    df = pd.DataFrame(data)
+
+    value_cols = [c for c in df.columns if c not in ("ticker", "time", "sector")]
+    values = df[value_cols].to_numpy(copy=True)
+    values[rng.random(values.shape) < nan_rate] = np.nan
+    df[value_cols] = values
+
+    is_bank = df["sector"].to_numpy() == "financial-services"
+    df.loc[is_bank, list(_BANK_ABSENT)] = np.nan
+
+    latest = pos == np.repeat(periods, periods) - 1
+    partial = np.isin(row_ticker, np.flatnonzero(rng.random(n_tickers) < 0.10)) & latest
+    df.loc[partial, list(_CASHFLOW)] = np.nan
+
+    sparse = np.isin(row_ticker, np.flatnonzero(rng.random(n_tickers) < 0.05)) & (pos == 0)
+    df.loc[sparse, [c for c in value_cols if c not in ("total_assets", "total_debt",
+                                                       "common_stock_equity")]] = np.nan
+
+    odd = rng.random(n_rows)
+    df.loc[odd < 0.02, "common_stock_equity"] *= -1
+    df.loc[(odd >= 0.02) & (odd < 0.07), "free_cash_flow"] *= -1
+    df.loc[(odd >= 0.07) & (odd < 0.08), "total_revenue"] = 0.0
+    return df
+
+
+def _make_evaluator(df: pd.DataFrame):
+    if df["ticker"].nunique() == 1:
+        return FundamentalMetricsEvaluator(df, build_weights(df["sector"].iloc[0]))
+    return UniverseMetricsEvaluator(df)
+
+
+# ── Stages, in evaluate() order. Each takes (evaluator, state) and stores its output. ──
+
+STAGES = (
+    ("compute_metrics",           lambda ev, st: st.__setitem__("metrics", ev.compute_metrics())),
+    ("compute_valuation_metrics", lambda ev, st: ev.compute_valuation_metrics()),
+    ("raw_red_flags",             lambda ev, st: ev.raw_red_flags()),
+    ("composite_scores",          lambda ev, st: ev._composite_scores_wide(st["metrics"])),
+    ("cross_sectional_scores",    lambda ev, st: ev._score_cross_sectional(st["metrics"], "percentile")),
+    ("metrics_red_flags",         lambda ev, st: ev._metrics_red_flags_wide(st["metrics"])),
+    ("compute_extended_metrics",  lambda ev, st: ev.compute_extended_metrics()),
+)
+
+
+def _run_stages(df: pd.DataFrame, trace: bool) -> dict:
+    """Run every stage once; return {stage: seconds} or {stage: peak_bytes} when tracing."""
+    out = {}
+    ev, st = _make_evaluator(df), {}
+    for name, fn in STAGES:
+        if trace:
+            tracemalloc.reset_peak()
+            start_mem = tracemalloc.get_traced_memory()[0]
+            fn(ev, st)
+            out[name] = tracemalloc.get_traced_memory()[1] - start_mem
+        else:
+            start = time.perf_counter()
+            fn(ev, st)
+            out[name] = time.perf_counter() - start
+
+    ev = _make_evaluator(df)
+    if trace:
+        tracemalloc.reset_peak()
+        start_mem = tracemalloc.get_traced_memory()[0]
+        ev.evaluate()
+        out["evaluate"] = tracemalloc.get_traced_memory()[1] - start_mem
+    else:
+        start = time.perf_counter()
+        ev.evaluate()
+        out["evaluate"] = time.perf_counter() - start
+    return out
+
+
+def run(n_tickers: int, repeat: int, memory: bool, seed: int = 0) -> list[dict]:
+    df = make_universe(n_tickers, seed=seed)
+    times = [_run_stages(df, trace=False) for _ in range(repeat)]
+    peaks = None
+    if memory:
+        tracemalloc.start()
+        try:
+            peaks = _run_stages(df, trace=True)
+        finally:
+            tracemalloc.stop()
+
+    evaluator = type(_make_evaluator(df)).__name__
+    return [
+        {
+            "tickers": n_tickers,
+            "rows": len(df),
+            "evaluator": evaluator,
+            "stage": stage,
+            "seconds": round(min(t[stage] for t in times), 6),
+            "peak_bytes": peaks[stage] if peaks else None,
+        }
+        for stage in [name for name, _ in STAGES] + ["evaluate"]
+    ]
+
+
+def _meta(args) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+    }
+
+
+def _print(results: list[dict]) -> None:
+    print(f"{'tickers':>7} {'rows':>7} {'stage':<26} {'seconds':>10} {'peak MiB':>9}")
+    for r in results:
+        mem = f"{r['peak_bytes'] / 2**20:>9.2f}" if r["peak_bytes"] is not None else f"{'-':>9}"
+        print(f"{r['tickers']:>7} {r['rows']:>7} {r['stage']:<26} {r['seconds']:>10.4f} {mem}")
+
+
+def _print_compare(results: list[dict], path: str) -> None:
+    with open(path) as f:
+        old = {(r["tickers"], r["stage"]): r for r in json.load(f)["results"]}
+    print(f"\nvs {path}")
+    print(f"{'tickers':>7} {'stage':<26} {'before':>10} {'after':>10} {'ratio':>7}")
+    for r in results:
+        prev = old.get((r["tickers"], r["stage"]))
+        if prev is None or not prev["seconds"]:
+            continue
+        print(f"{r['tickers']:>7} {r['stage']:<26} {prev['seconds']:>10.4f} "
+              f"{r['seconds']:>10.4f} {r['seconds'] / prev['seconds']:>7.2f}")
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="evaluate() stage benchmark on synthetic universes.")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000, 10000],
+                   help="universe sizes (tickers)")
+    p.add_argument("--repeat", type=int, default=3, help="timing runs per size (best is kept)")
+    p.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--json", metavar="PATH", default=None, help="write results as JSON")
+    p.add_argument("--compare", metavar="PATH", default=None,
+                   help="earlier --json output to print time ratios against")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    logging.disable(logging.WARNING)     # synthetic gaps trigger expected column warnings
+    results = []
+    for n in args.sizes:
+        results.extend(run(n, args.repeat, memory=not args.no_memory, seed=args.seed))
+    _print(results)
+    if args.compare:
+        _print_compare(results, args.compare)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"meta": _meta(args), "results": results}, f, indent=2)
@@ -0,0 +1,130 @@
+"""
+bench_rate_limiter.py — lock-contention benchmark for the threaded rate limiters
+================================================================================
+
+Usage
+-----
+    python benchmarks/bench_rate_limiter.py                    # 64 threads, default sizes
+    python benchmarks/bench_rate_limiter.py --threads 128 --calls 200
+    python benchmarks/bench_rate_limiter.py --json results.json
+
+What it measures
+----------------
+N threads call ``acquire()`` concurrently on one shared limiter whose limits
+are high enough never to throttle, so the timing isolates the per-call
+bookkeeping and lock hold time. The day window is pre-filled with
+``--prefill`` timestamps to reproduce a busy day (the list-based limiter
+rescanned all of them on every call).
+
+Limiters compared
+-----------------
+  list     — the previous list-comprehension implementation (reference copy below)
+  deque    — RateLimiter (per-window deques + condition variable)
+  bucket   — TokenBucketLimiter
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from financialtools.utils import RateLimiter, TokenBucketLimiter
+
+
+class _ListRateLimiter:
+    """Reference copy of the previous list-based RateLimiter, for comparison only."""
+
+    def __init__(self, per_minute=60, per_hour=360, per_day=8000):
+        self.per_minute, self.per_hour, self.per_day = per_minute, per_hour, per_day
+        self.calls: list[float] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.time()
+                self.calls = [t for t in self.calls if now - t < 86400]
+                calls_last_minute = [t for t in self.calls if now - t < 60]
+                calls_last_hour = [t for t in self.calls if now - t < 3600]
+                wait = 0.0
+                if len(calls_last_minute) >= self.per_minute and calls_last_minute:
+                    wait = max(wait, 60 - (now - calls_last_minute[0]))
+                if len(calls_last_hour) >= self.per_hour and calls_last_hour:
+                    wait = max(wait, 3600 - (now - calls_last_hour[0]))
+                if len(self.calls) >= self.per_day and self.calls:
+                    wait = max(wait, 86400 - (now - self.calls[0]))
+                if wait <= 0.0:
+                    self.calls.append(time.time())
+                    return
+            time.sleep(max(0.0, wait))
+
+
+def _make(kind: str, total: int, prefill: int):
+    limit = total + prefill + 1
+    if kind == "list":
+        limiter = _ListRateLimiter(per_minute=limit, per_hour=limit, per_day=limit)
+        # Spread the prefill over the past ~23 h so it stays in the day window only.
+        now = time.time()
+        limiter.calls = [now - 3600 - i for i in range(prefill, 0, -1)]
+    elif kind == "deque":
+        limiter = RateLimiter(per_minute=limit, per_hour=limit, per_day=limit)
+        now = time.time()
+        limiter._windows.calls[2].extend(now - 3600 - i for i in range(prefill, 0, -1))
+    elif kind == "bucket":
+        limiter = TokenBucketLimiter(per_minute=limit * 60, burst=limit)
+    else:
+        raise ValueError(kind)
+    return limiter
+
+
+def run_one(kind: str, threads: int, calls: int, prefill: int) -> dict:
+    limiter = _make(kind, threads * calls, prefill)
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(calls):
+            limiter.acquire()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    total = threads * calls
+    return {
+        "limiter": kind,
+        "threads": threads,
+        "calls": total,
+        "prefill": prefill,
+        "seconds": round(elapsed, 4),
+        "acquires_per_sec": round(total / elapsed, 1),
+        "us_per_acquire": round(elapsed / total * 1e6, 2),
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Rate limiter contention benchmark.")
+    p.add_argument("--threads", type=int, default=64)
+    p.add_argument("--calls", type=int, default=100, help="acquire() calls per thread")
+    p.add_argument("--prefill", type=int, default=7999, help="timestamps pre-loaded into the day window")
+    p.add_argument("--limiters", nargs="+", default=["list", "deque", "bucket"])
+    p.add_argument("--json", metavar="PATH", default=None, help="also write results as JSON")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    results = [run_one(k, args.threads, args.calls, args.prefill) for k in args.limiters]
+    print(f"{'limiter':<8} {'threads':>7} {'calls':>7} {'seconds':>9} {'acq/s':>11} {'us/acq':>8}")
+    for r in results:
+        print(
+            f"{r['limiter']:<8} {r['threads']:>7} {r['calls']:>7} {r['seconds']:>9.3f} "
+            f"{r['acquires_per_sec']:>11.0f} {r['us_per_acquire']:>8.2f}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,126 @@
+"""
+bench_reshape.py — Downloader statement reshape + merge benchmark
+=================================================================
+
+Usage
+-----
+    python benchmarks/bench_reshape.py                       # 200 tickers, default sizes
+    python benchmarks/bench_reshape.py --tickers 1000 --items 80
+    python benchmarks/bench_reshape.py --json results.json
+
+What it measures
+----------------
+For each synthetic ticker, three wide yfinance-style statements (line items
+as the index, one column per period, ~10 % NaN cells) are turned into the
+merged ``get_merged_data()`` frame. Two paths are timed:
+
+  previous — melt → pivot_table per statement, then two chained ``merge``
+             calls (reference copy below)
+  current  — ``Downloader.from_raw`` (transpose reshape, ``_join_on_time``)
+
+Period labels are strings: the previous path cannot melt Timestamp labels
+on pandas 3. Before timing, every ticker's output is compared with
+``pd.testing.assert_frame_equal`` — the benchmark aborts on any difference.
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from financialtools.downloader import Downloader
+
+
+def _reference_reshape(df: pd.DataFrame) -> pd.DataFrame:
+    """Reference copy of the previous melt → pivot_table reshape, for comparison only."""
+    if df.empty:
+        return df
+    pivot_vars = ["index", "ticker", "docs"]
+    value_vars = [c for c in df.columns if c not in pivot_vars]
+    df = df.melt(id_vars=pivot_vars, value_vars=value_vars, var_name="time", value_name="value")
+    df = df.pivot_table(index=["ticker", "docs", "time"], columns="index", values="value").reset_index()
+    df.columns = [col.replace(' ', '_').lower() for col in df.columns]
+    return df
+
+
+def _reference_merged(ticker, balance_sheet, income_stmt, cashflow) -> pd.DataFrame:
+    bs = _reference_reshape(balance_sheet.reset_index().assign(ticker=ticker, docs="balance_sheet"))
+    inc = _reference_reshape(income_stmt.reset_index().assign(ticker=ticker, docs="income_stmt"))
+    cf = _reference_reshape(cashflow.reset_index().assign(ticker=ticker, docs="cashflow"))
+    merged = bs
+    for df in (cf, inc):
+        merged = merged.merge(df, how="left", on=["ticker", "time"])
+    return merged
+
+
+def _current_merged(ticker, balance_sheet, income_stmt, cashflow) -> pd.DataFrame:
+    # Empty info → get_merged_data() skips the market-data broadcast, like the reference.
+    return Downloader.from_raw(ticker, balance_sheet, income_stmt, cashflow, {}).get_merged_data()
+
+
+def _make_statements(n_tickers: int, n_items: int, n_periods: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    periods = [f"{2024 - i}-12-31" for i in range(n_periods)]
+    shared = [f"Net Income From Continuing Operations {i}" for i in range(3)]
+    out = []
+    for t in range(n_tickers):
+        statements = []
+        for kind in ("Balance", "Income", "Cash"):
+            items = [f"{kind} Line Item {i}" for i in range(n_items)] + shared
+            values = rng.normal(1e9, 2e8, size=(len(items), n_periods))
+            values[rng.random(values.shape) < 0.1] = np.nan
+            statements.append(pd.DataFrame(values, index=items, columns=periods))
+        out.append((f"T{t:05d}", *statements))
+    return out
+
+
+def _time(fn, universe) -> float:
+    start = time.perf_counter()
+    for args in universe:
+        fn(*args)
+    return time.perf_counter() - start
+
+
+def run(n_tickers: int, n_items: int, n_periods: int) -> list[dict]:
+    universe = _make_statements(n_tickers, n_items, n_periods)
+    for args in universe:
+        pd.testing.assert_frame_equal(_current_merged(*args), _reference_merged(*args))
+
+    results = []
+    for name, fn in (("previous", _reference_merged), ("current", _current_merged)):
+        elapsed = _time(fn, universe)
+        results.append({
+            "path": name,
+            "tickers": n_tickers,
+            "items": n_items,
+            "periods": n_periods,
+            "seconds": round(elapsed, 4),
+            "ms_per_ticker": round(elapsed / n_tickers * 1e3, 3),
+        })
+    return results
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Statement reshape + merge benchmark.")
+    p.add_argument("--tickers", type=int, default=200)
+    p.add_argument("--items", type=int, default=60, help="line items per statement")
+    p.add_argument("--periods", type=int, default=4)
+    p.add_argument("--json", metavar="PATH", default=None, help="also write results as JSON")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    results = run(args.tickers, args.items, args.periods)
+    print("outputs identical for every ticker")
+    print(f"{'path':<9} {'tickers':>7} {'items':>6} {'periods':>7} {'seconds':>9} {'ms/ticker':>10}")
+    for r in results:
+        print(
+            f"{r['path']:<9} {r['tickers']:>7} {r['items']:>6} {r['periods']:>7} "
+            f"{r['seconds']:>9.3f} {r['ms_per_ticker']:>10.3f}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
@@ -7,33 +7,83 @@
 # Surface:
 #   - Core pipeline classes  : Downloader, FundamentalMetricsEvaluator,
 #                              DownloaderWrapper, FundamentalEvaluator
+#   - Universe evaluation    : UniverseMetricsEvaluator, split_by_ticker, SCORING_MODES
+#   - Fundamentals storage   : FundamentalsStore
+#   - Incremental evaluation : evaluate_incremental, IncrementalState
+#   - Async download         : AsyncDownloader, AsyncRateLimiter, download_concurrent
+#   - Payload caching        : DiskCache, StatementCache, default_statement_cache,
+#                              ResponseCache, default_response_cache
+#   - Sector weights         : WeightsRegistry, SectorWeights, default_weights_registry
+#   - Red-flag rules         : RedFlagRule (register via FundamentalMetricsEvaluator.register_red_flag_rule)
+#   - Metric formulas        : MetricFormula (register via FundamentalMetricsEvaluator.register_metric)
 #   - Analysis entry point   : run_topic_analysis
 #   - Public helpers         : build_weights, list_sectors, filter_year, normalise_time
-#   - Chain helpers          : build_topic_chain, invoke_chain
+#   - Chain helpers          : build_topic_chain, invoke_chain, run_topic_chains,
+#                              ChainFactory, default_chain_factory
+#   - LLM payloads           : encode_payload, encode_payloads, payload_token_counts,
+#                              count_tokens, PAYLOAD_LAYOUTS
+#   - Topic projections      : TopicProjection, register_topic_projection, topic_projection,
+#                              project_payloads
 #   - Result merging         : merge_results, export_financial_results, read_financial_results,
 #                              empty_result (empty_evaluate_result is a backward-compat alias)
-#   - Threading utility      : RateLimiter
+#   - Export formats         : ResultFormat, register_format, available_formats
+#   - Compact results        : CompactResult
+#   - Sector benchmarks      : SectorBenchmarks, compute_benchmarks
+#   - Threading utility      : RateLimiter, TokenBucketLimiter, SQLiteRateLimiter
 #   - Exceptions             : DownloadError, EvaluationError, SectorNotFoundError
 #   - Deprecated             : FundamentalTraderAssistant (use FundamentalMetricsEvaluator)
 
 from financialtools.analysis import (
+    ChainFactory,
     build_topic_chain,
+    default_chain_factory,
     build_weights,
     filter_year,
     invoke_chain,
     list_sectors,
     normalise_time,
     run_topic_analysis,
+    run_topic_chains,
 )
+from financialtools.async_downloader import AsyncDownloader, AsyncRateLimiter, download_concurrent
+from financialtools.benchmarks import SectorBenchmarks, compute_benchmarks
+from financialtools.cache import (
+    DiskCache,
+    ResponseCache,
+    StatementCache,
+    default_response_cache,
+    default_statement_cache,
+)
+from financialtools.crosssection import SCORING_MODES
 from financialtools.exceptions import DownloadError, EvaluationError, SectorNotFoundError
 from financialtools.processor import (
     Downloader,
     FundamentalMetricsEvaluator,
     FundamentalTraderAssistant,  # deprecated alias — use FundamentalMetricsEvaluator
 )
-from financialtools.evaluator import empty_result
+from financialtools.evaluator import RedFlagRule, empty_result
+from financialtools.exporters import ResultFormat, available_formats, register_format
+from financialtools.formulas import MetricFormula
+from financialtools.incremental import IncrementalState, evaluate_incremental
+from financialtools.payloads import (
+    PAYLOAD_LAYOUTS,
+    count_tokens,
+    encode_payload,
+    encode_payloads,
+    payload_token_counts,
+)
+from financialtools.projections import (
+    TopicProjection,
+    project_payloads,
+    register_topic_projection,
+    topic_projection,
+)
+from financialtools.results import CompactResult
+from financialtools.store import FundamentalsStore
+from financialtools.universe import UniverseMetricsEvaluator, split_by_ticker
 empty_evaluate_result = empty_result  # backward-compat alias — prefer empty_result
-from financialtools.utils import RateLimiter, resolve_sector
+from financialtools.utils import RateLimiter, SQLiteRateLimiter, TokenBucketLimiter, resolve_sector
+from financialtools.weights import SectorWeights, WeightsRegistry, default_weights_registry
 from financialtools.wrappers import (
     DownloaderWrapper,
     FundamentalEvaluator,
@@ -44,13 +94,26 @@ from financialtools.wrappers import (
 
 __all__ = [
     # analysis helpers
+    "ChainFactory",
     "build_topic_chain",
+    "default_chain_factory",
     "build_weights",
     "filter_year",
     "invoke_chain",
     "list_sectors",
     "normalise_time",
     "run_topic_analysis",
+    "run_topic_chains",
+    # LLM payloads
+    "encode_payload",
+    "encode_payloads",
+    "payload_token_counts",
+    "count_tokens",
+    "PAYLOAD_LAYOUTS",
+    "TopicProjection",
+    "register_topic_projection",
+    "topic_projection",
+    "project_payloads",
     # exceptions
     "DownloadError",
     "EvaluationError",
@@ -61,14 +124,41 @@ __all__ = [
     "FundamentalTraderAssistant",  # deprecated alias
     "DownloaderWrapper",
     "FundamentalEvaluator",
+    "UniverseMetricsEvaluator",
+    "split_by_ticker",
+    "SCORING_MODES",
+    "FundamentalsStore",
+    "evaluate_incremental",
+    "IncrementalState",
+    "AsyncDownloader",
+    "download_concurrent",
+    "DiskCache",
+    "StatementCache",
+    "default_statement_cache",
+    "ResponseCache",
+    "default_response_cache",
+    "RedFlagRule",
+    "MetricFormula",
+    "WeightsRegistry",
+    "SectorWeights",
+    "default_weights_registry",
     # result helpers
     "merge_results",
     "export_financial_results",
     "read_financial_results",
+    "ResultFormat",
+    "register_format",
+    "available_formats",
+    "CompactResult",
+    "SectorBenchmarks",
+    "compute_benchmarks",
     "empty_result",
     "empty_evaluate_result",  # backward-compat alias for empty_result
     # threading utility
     "RateLimiter",
+    "TokenBucketLimiter",
+    "SQLiteRateLimiter",
+    "AsyncRateLimiter",
     # data utilities
     "resolve_sector",
 ]
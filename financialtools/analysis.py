@@ -6,7 +6,9 @@ overall StockRegimeAssessment in one call.
 
 Public API
 ----------
-run_topic_analysis(ticker, sector, year, model)  →  TopicAnalysisResult
+run_topic_analysis(ticker, sector, year, model, max_concurrency, cache, payload_layout)  →  TopicAnalysisResult
+run_topic_chains(llm, inputs, ticker, topics, max_concurrency, cache)     →  {topic: assessment}
+default_chain_factory()                                                  →  ChainFactory
 
 Usage
 -----
@@ -25,16 +27,33 @@ Design invariants
   to "Default" with a warning.
 - Time column is normalised to integer years before JSON serialisation so
   the LLM receives "2022" / "2023", not "2022-12-31 00:00:00".
-- All seven topic chains use the same five JSON payloads: metrics,
-  extended_metrics, composite_scores, eval_metrics, red_flags.
+- Payloads are encoded by payloads.encode_payloads: column names once per
+  table, floats rounded to 4 significant digits, constant columns (ticker,
+  sector, all-null metrics) stated once. Token counts before/after are logged.
+- The five JSON payloads (metrics, extended_metrics, composite_scores,
+  eval_metrics, red_flags) are encoded once; each topic chain then receives
+  only the blocks and metric columns registered for it in projections.py
+  (e.g. liquidity: four scored ratios + working-capital diagnostics).
+  quantitative_overview and regime receive all five in full.
 - The overall regime chain additionally receives market_comparison as an
   empty string — it is available in StockRegimeAssessment but not fed by
   this pipeline (no benchmark files required).
 - Each chain uses a one-shot output-fixing retry: if PydanticOutputParser
   fails, a follow-up LLM call asks it to correct the malformed JSON and
   tries to parse again. If the retry also fails, the topic result is None.
+- The nine chains run concurrently on a thread pool (max_concurrency caps
+  how many are in flight), so latency per ticker is roughly the slowest chain
+  rather than the sum. Each topic keeps its own fix retry.
+- Parsed assessments are cached on disk (cache.ResponseCache) under a hash of
+  model, topic, system prompt + output schema and the five payloads. A repeat
+  request is answered without an LLM call; changing the prompt, the schema,
+  the model or any payload is a miss. Failed topics (None) are not cached.
+- LLM clients and chain parts come from default_chain_factory(): one
+  ChatOpenAI per (model, temperature) over a shared httpx connection pool,
+  and one (prompt, parser) pair per topic with the schema instructions
+  rendered once per output model — nothing is rebuilt per ticker.
 - run_topic_analysis() never raises on LLM failures — each topic returns
-  None on error and the error is logged.
+  None on error (including network errors) and the error is logged.
 
 Debugging
 ---------
@@ -43,13 +62,17 @@ Debugging
 - LLM parse failure → _invoke_chain retries once; if it still fails
   the topic result is None and a WARNING is logged
 - Sector not found → falls back to "Default" weights; logged as WARNING
+- Stale LLM answer → run with cache=None, or FINANCIALTOOLS_NO_CACHE=1
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
 import pandas as pd
@@ -61,6 +84,7 @@ from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
+from financialtools.cache import ResponseCache, default_response_cache
 from financialtools.exceptions import EvaluationError
 from financialtools.processor import Downloader, FundamentalMetricsEvaluator
 from financialtools.pydantic_models import (
@@ -86,7 +110,8 @@ from financialtools.prompts import (
     system_prompt_red_flags,
     system_prompt_solvency,
 )
-from financialtools.utils import dataframe_to_json
+from financialtools.payloads import encode_payloads
+from financialtools.projections import human_template, project_payloads
 
 _logger = logging.getLogger(__name__)
 
@@ -106,9 +131,9 @@ _TOPIC_MAP: dict[str, tuple[str, type]] = {
     "regime":                 (system_prompt_StockRegimeAssessment_extended, StockRegimeAssessment),
 }
 
-# Human message template shared by all topic chains and the regime chain.
-# The five JSON blocks are the same for every topic — the system prompt
-# controls which fields the LLM focuses on.
+# Human message template with all five JSON blocks — the default of
+# _build_chain_parts. Topic chains use projections.human_template(topic),
+# which keeps only the blocks registered for the topic.
 _TOPIC_HUMAN_TEMPLATE = (
     "Metrics:\n{metrics}\n"
     "Extended Metrics:\n{extended_metrics}\n"
@@ -251,7 +276,23 @@ _FIX_PROMPT = ChatPromptTemplate.from_messages([
 ])
 
 
-def _build_chain_parts(system_prompt_str: str, model_cls: type, llm: ChatOpenAI):
+@lru_cache(maxsize=None)
+def _schema_instructions(model_cls: type) -> str:
+    return PydanticOutputParser(pydantic_object=model_cls).get_format_instructions()
+
+
+def _format_instructions(parser) -> str:
+    """parser.get_format_instructions(), generated once per Pydantic model."""
+    model_cls = getattr(parser, "pydantic_object", None)
+    return _schema_instructions(model_cls) if model_cls is not None else parser.get_format_instructions()
+
+
+def _build_chain_parts(
+    system_prompt_str: str,
+    model_cls: type,
+    llm: ChatOpenAI,
+    human_template_str: str = _TOPIC_HUMAN_TEMPLATE,
+):
     """
     Build prompt + parser for a topic or regime chain.
 
@@ -263,11 +304,11 @@ def _build_chain_parts(system_prompt_str: str, model_cls: type, llm: ChatOpenAI)
     """
     parser = PydanticOutputParser(pydantic_object=model_cls)
     system_filled = system_prompt_str.format(
-        format_instructions=parser.get_format_instructions()
+        format_instructions=_format_instructions(parser)
     )
     prompt = ChatPromptTemplate.from_messages([
         ("system", system_filled),
-        ("human", _TOPIC_HUMAN_TEMPLATE),
+        ("human", human_template_str),
     ])
     return prompt, parser
 
@@ -279,19 +320,141 @@ def build_topic_chain(topic: str, llm: ChatOpenAI):
     Returns (prompt, parser) — not a pre-built Runnable — so that
     invoke_chain can handle the fix retry without an extra closure.
 
+    The human message carries only the payload blocks registered for the
+    topic in projections.py, so the chain expects project_payloads(inputs, topic).
+
+    Served from default_chain_factory(): the pair is built once per topic
+    and shared by every later call (the prompt and parser do not depend on
+    the LLM).
+
     Parameters
     ----------
     topic : one of the keys in _TOPIC_MAP
-    llm   : shared ChatOpenAI instance
+    llm   : shared ChatOpenAI instance (kept for the call signature)
     """
-    system_prompt_str, model_cls = _TOPIC_MAP[topic]
-    return _build_chain_parts(system_prompt_str, model_cls, llm)
+    return default_chain_factory().parts(topic)
+
 
+class ChainFactory:
+    """
+    Process-wide source of topic chain parts and LLM clients.
+
+    parts(topic)      — (prompt, parser) for a topic, built on first use and
+                        reused. Keyed by the topic's system prompt, output
+                        model and human template, so a changed _TOPIC_MAP
+                        entry or projection builds a fresh pair.
+    llm(model, temperature=0) — one ChatOpenAI per (model, temperature). All
+                        of them share one httpx connection pool, so batch
+                        loops reuse open HTTPS connections instead of setting
+                        up a client per ticker.
+
+    Thread-safe. clear() forgets every cached object; clients already handed
+    out keep working on the old pool, and later llm() calls start a new one.
+    close() also closes the pool — for shutdown only, since clients handed
+    out before it can no longer make requests.
+
+    Usage
+    -----
+    factory = default_chain_factory()
+    llm = factory.llm("gpt-4.1-nano")
+    prompt, parser = factory.parts("liquidity")
+    """
 
-def invoke_chain(prompt, parser, llm, inputs: dict, topic: str, ticker: str):
+    def __init__(self, max_connections: int = 32):
+        self.max_connections = max_connections
+        self._parts: dict[tuple, tuple] = {}
+        self._llms: dict[tuple, ChatOpenAI] = {}
+        self._http_client = None
+        self._lock = threading.Lock()
+
+    def parts(self, topic: str):
+        """(prompt, parser) for ``topic``; KeyError if it is not in _TOPIC_MAP."""
+        system_prompt_str, model_cls = _TOPIC_MAP[topic]
+        key = (topic, system_prompt_str, model_cls, human_template(topic))
+        with self._lock:
+            parts = self._parts.get(key)
+            if parts is None:
+                parts = self._parts[key] = _build_chain_parts(
+                    system_prompt_str, model_cls, None, key[3]
+                )
+            return parts
+
+    def llm(self, model: str, temperature: float = 0) -> ChatOpenAI:
+        """Shared ChatOpenAI for ``(model, temperature)``."""
+        key = (model, temperature)
+        with self._lock:
+            llm = self._llms.get(key)
+            if llm is None:
+                if self._http_client is None:
+                    import httpx
+                    limits = httpx.Limits(max_connections=self.max_connections,
+                                          max_keepalive_connections=self.max_connections)
+                    self._http_client = httpx.Client(limits=limits)
+                llm = self._llms[key] = ChatOpenAI(
+                    model=model, temperature=temperature, http_client=self._http_client
+                )
+            return llm
+
+    def clear(self) -> None:
+        """Drop cached parts and clients; the old pool stays open for clients in use."""
+        with self._lock:
+            self._parts.clear()
+            self._llms.clear()
+            self._http_client = None
+
+    def close(self) -> None:
+        """clear() and close the connection pool (shutdown only)."""
+        with self._lock:
+            client, self._http_client = self._http_client, None
+            self._parts.clear()
+            self._llms.clear()
+        if client is not None:
+            client.close()
+
+
+_default_factory: ChainFactory | None = None
+_default_factory_lock = threading.Lock()
+
+
+def default_chain_factory() -> ChainFactory:
+    """Return the process-wide ChainFactory (created on first use)."""
+    global _default_factory
+    with _default_factory_lock:
+        if _default_factory is None:
+            _default_factory = ChainFactory()
+        return _default_factory
+
+
+def _resolve_response_cache(cache) -> Optional[ResponseCache]:
+    # True → the shared default (None under FINANCIALTOOLS_NO_CACHE); None / False → off.
+    return default_response_cache() if cache is True else (cache or None)
+
+
+def response_cache_key(prompt, parser, llm, inputs: dict, topic: str) -> str:
+    """
+    Content address of one topic request for ResponseCache.
+
+    Covers the model (name and temperature), the topic, the full prompt
+    template, the parser's output schema and the payloads, so a change to any
+    of them is a cache miss.
+    """
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+    temperature = getattr(llm, "temperature", None)
+    system_prompt = prompt.pretty_repr() + "\n" + _format_instructions(parser)
+    return ResponseCache.key(f"{model}@{temperature}", topic, system_prompt, inputs)
+
+
+def invoke_chain(prompt, parser, llm, inputs: dict, topic: str, ticker: str, cache=True):
     """
     Invoke a chain with one-shot output-fixing retry.
 
+    Responses are cached by default: with ``cache`` (True, the default, for
+    default_response_cache(), or a ResponseCache) a previously parsed
+    assessment for the same request is returned without calling the LLM, and
+    a fresh successful result is stored. None results are never cached, so a
+    failed topic is retried on the next run. ``cache=None`` / ``False`` or
+    FINANCIALTOOLS_NO_CACHE=1 always call the LLM.
+
     Call budget
     -----------
     - Happy path  : 1 LLM call  (primary)
@@ -308,6 +471,22 @@ def invoke_chain(prompt, parser, llm, inputs: dict, topic: str, ticker: str):
     not a second fresh invocation.  Re-calling the LLM before fixing would
     discard the broken output and waste a third call.
     """
+    cache = _resolve_response_cache(cache)
+    if cache is None:
+        return _invoke_uncached(prompt, parser, llm, inputs, topic, ticker)
+
+    key = response_cache_key(prompt, parser, llm, inputs, topic)
+    cached = cache.get_assessment(key, topic, parser.pydantic_object)
+    if cached is not None:
+        _logger.info("[%s] '%s' served from the response cache", ticker, topic)
+        return cached
+    result = _invoke_uncached(prompt, parser, llm, inputs, topic, ticker)
+    if result is not None:
+        cache.put_assessment(key, topic, result)
+    return result
+
+
+def _invoke_uncached(prompt, parser, llm, inputs: dict, topic: str, ticker: str):
     raw_chain = prompt | llm
     raw = raw_chain.invoke(inputs)          # call 1 — always made
     try:
@@ -321,7 +500,7 @@ def invoke_chain(prompt, parser, llm, inputs: dict, topic: str, ticker: str):
         try:
             fix_chain = _FIX_PROMPT | llm
             fixed_raw = fix_chain.invoke({  # call 2 — fix only, no re-invoke
-                "format_instructions": parser.get_format_instructions(),
+                "format_instructions": _format_instructions(parser),
                 "broken": broken_content,
             })
             return parser.invoke(fixed_raw)
@@ -333,6 +512,70 @@ def invoke_chain(prompt, parser, llm, inputs: dict, topic: str, ticker: str):
             return None
 
 
+def _run_topic(topic: str, llm, inputs: dict, ticker: str, cache=True):
+    """Build and invoke one topic chain on its projected payloads; any failure → None."""
+    _logger.info("[%s] Running '%s' chain …", ticker, topic)
+    try:
+        prompt, parser = build_topic_chain(topic, llm)
+        topic_inputs = project_payloads(inputs, topic)
+        return invoke_chain(prompt, parser, llm, topic_inputs, topic, ticker, cache=cache)
+    except Exception as exc:
+        _logger.error("[%s] '%s' chain failed: %s", ticker, topic, exc, exc_info=True)
+        return None
+
+
+def run_topic_chains(
+    llm,
+    inputs: dict,
+    ticker: str,
+    topics: Optional[list[str]] = None,
+    max_concurrency: Optional[int] = None,
+    cache=True,
+) -> dict:
+    """
+    Run topic chains concurrently on a bounded thread pool.
+
+    Each topic receives only its registered payload blocks and metric
+    columns (projections.project_payloads) and runs through invoke_chain, so
+    its one-shot fix retry happens inside that topic's own task. A topic whose chain fails — parse
+    failure after the retry, or any exception from the LLM call — maps to
+    None; the other topics are unaffected.
+
+    Parameters
+    ----------
+    llm             : shared ChatOpenAI instance (thread-safe)
+    inputs          : the five JSON payloads of _TOPIC_HUMAN_TEMPLATE (projected
+                      per topic before the call)
+    ticker          : used in log messages
+    topics          : subset of _TOPIC_MAP keys (default: all, in map order)
+    max_concurrency : cap on chains in flight (default: all topics at once;
+                      1 runs them one after another in the calling thread)
+    cache           : ResponseCache, True (default: default_response_cache())
+                      or None / False (no caching); see invoke_chain
+
+    Returns
+    -------
+    dict
+        {topic: assessment or None}, in the order of ``topics``.
+    """
+    topics = list(_TOPIC_MAP) if topics is None else list(topics)
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+    workers = min(max_concurrency or len(topics), len(topics))
+    cache = _resolve_response_cache(cache)
+    if workers <= 1:
+        results = {topic: _run_topic(topic, llm, inputs, ticker, cache) for topic in topics}
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="topic-chain") as pool:
+            futures = {topic: pool.submit(_run_topic, topic, llm, inputs, ticker, cache)
+                       for topic in topics}
+            results = {topic: future.result() for topic, future in futures.items()}
+    if cache is not None:
+        _logger.info("[%s] response cache hit rate: %.0f%% (this process)",
+                     ticker, 100 * (cache.hit_rate() or 0.0))
+    return results
+
+
 # Backward-compat aliases — will be removed in a future release.
 _build_topic_chain = build_topic_chain
 _invoke_chain = invoke_chain
@@ -347,6 +590,9 @@ def run_topic_analysis(
     sector: str,
     year: Optional[int] = None,
     model: str = "gpt-4.1-nano",
+    max_concurrency: Optional[int] = None,
+    cache=True,
+    payload_layout: str = "table",
 ) -> TopicAnalysisResult:
     """
     Run the full fundamental analysis pipeline for a single ticker.
@@ -365,6 +611,15 @@ def run_topic_analysis(
     year    : Optional year filter. When provided, only rows for that year
               are sent to the LLM. None sends all available years.
     model   : OpenAI model name (default: "gpt-4.1-nano").
+    max_concurrency : Maximum number of topic chains in flight at once.
+              None (default) runs all nine concurrently; 1 runs them
+              sequentially. Lower it if the API key has a tight rate limit.
+    cache   : ResponseCache for parsed assessments. True (default) uses
+              default_response_cache(); None / False always call the LLM.
+    payload_layout : Layout of the five JSON payloads, one of
+              payloads.PAYLOAD_LAYOUTS ("table" default, "columns",
+              "records"). All layouts round floats to 4 significant digits
+              and hoist constant columns such as ticker and sector.
 
     Returns
     -------
@@ -398,7 +653,7 @@ def run_topic_analysis(
     # Stage 1: Download
     # ------------------------------------------------------------------
     _logger.info("[%s] Downloading financial data …", ticker)
-    d = Downloader.from_ticker(ticker)
+    d = Downloader.from_ticker(ticker, cache=True)
     merged = d.get_merged_data()
 
     if merged.empty:
@@ -421,43 +676,24 @@ def run_topic_analysis(
     # ------------------------------------------------------------------
     # Stage 3: Prepare JSON payloads
     # ------------------------------------------------------------------
-    metrics_df          = evaluate_out["metrics"]
-    extended_metrics_df = evaluate_out["extended_metrics"]
-    eval_metrics_df     = evaluate_out["eval_metrics"]
-    composite_scores_df = evaluate_out["composite_scores"]
-    red_flags_df        = evaluate_out["red_flags"]
-
-    # Normalise time → integer year, then filter if year is specified
-    metrics_df          = filter_year(normalise_time(metrics_df),          year)
-    extended_metrics_df = filter_year(normalise_time(extended_metrics_df), year)
-    eval_metrics_df     = filter_year(normalise_time(eval_metrics_df),     year)
-    composite_scores_df = filter_year(normalise_time(composite_scores_df), year)
-    red_flags_df        = filter_year(normalise_time(red_flags_df),        year)
-
-    metrics_json          = dataframe_to_json(metrics_df)
-    extended_metrics_json = dataframe_to_json(extended_metrics_df)
-    eval_metrics_json     = dataframe_to_json(eval_metrics_df)
-    composite_scores_json = dataframe_to_json(composite_scores_df)
-    red_flags_json        = dataframe_to_json(red_flags_df)
-
-    topic_inputs = {
-        "metrics":          metrics_json,
-        "extended_metrics": extended_metrics_json,
-        "composite_scores": composite_scores_json,
-        "eval_metrics":     eval_metrics_json,
-        "red_flags":        red_flags_json,
+    # Normalise time → integer year, filter if year is specified, then
+    # encode compactly (payloads.py) — one table per frame, rounded floats.
+    frames = {
+        key: filter_year(normalise_time(evaluate_out[key]), year)
+        for key in ("metrics", "extended_metrics", "composite_scores", "eval_metrics", "red_flags")
     }
+    topic_inputs = encode_payloads(frames, model=model, layout=payload_layout)
 
     # ------------------------------------------------------------------
     # Stage 4: LLM chains
     # ------------------------------------------------------------------
-    _logger.info("[%s] Initialising LLM (%s, temperature=0) …", ticker, model)
-    llm = ChatOpenAI(model=model, temperature=0)
+    _logger.info("[%s] Using shared LLM client (%s, temperature=0) …", ticker, model)
+    llm = default_chain_factory().llm(model)
 
-    for topic in _TOPIC_MAP:
-        _logger.info("[%s] Running '%s' chain …", ticker, topic)
-        prompt, parser = build_topic_chain(topic, llm)
-        assessment = invoke_chain(prompt, parser, llm, topic_inputs, topic, ticker)
+    assessments = run_topic_chains(
+        llm, topic_inputs, ticker, max_concurrency=max_concurrency, cache=cache
+    )
+    for topic, assessment in assessments.items():
         setattr(result, topic, assessment)
 
     _logger.info("[%s] Analysis complete.", ticker)
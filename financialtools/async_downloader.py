@@ -0,0 +1,285 @@
+"""async_downloader.py — asyncio download engine for Downloader.
+
+``Downloader.from_ticker`` makes four blocking yfinance calls in sequence
+(balance_sheet, income_stmt, cashflow, info). AsyncDownloader issues the four
+fetches of a ticker concurrently and downloads many tickers at once, bounded by:
+  - ``max_concurrency``  — tickers in flight at the same time
+  - ``host_limits``      — in-flight requests per remote host
+  - ``limiter``          — shared AsyncRateLimiter (one slot per ticker, the same
+                           unit ``Downloader.stream_download`` uses)
+
+A failure of one ticker never affects the others: it is logged and reported
+as a ``DownloadError`` in the ``failures`` dict.
+
+The fetch layer is pluggable. A fetcher is any object with
+  - ``host(kind) -> str``
+  - ``async fetch(ticker, kind)`` returning the raw yfinance payload for
+    ``kind`` in ``FETCH_KINDS`` (a wide DataFrame, or a dict for "info").
+``YFinanceFetcher`` is the default; ``StaticFetcher`` serves pre-built payloads
+for tests and benchmarks; ``CachingFetcher`` wraps either with a StatementCache.
+
+Depends on: downloader, exceptions, utils (_SlidingWindows), yfinance (YFinanceFetcher only).
+"""
+import asyncio
+import logging as _logging
+import time
+
+from financialtools.downloader import FETCH_KINDS, Downloader  # noqa: F401  (FETCH_KINDS re-exported)
+from financialtools.exceptions import DownloadError
+from financialtools.utils import _SlidingWindows
+
+_logger = _logging.getLogger(__name__)
+
+DEFAULT_HOST_LIMIT = 8
+
+
+class AsyncRateLimiter:
+    """asyncio sliding-window rate limiter with the RateLimiter windows.
+
+    Enforces per_minute / per_hour / per_day simultaneously. ``await acquire()``
+    suspends the calling task (never the event loop) until every window has a
+    free slot, then records the call.
+
+    Usage
+    -----
+    limiter = AsyncRateLimiter(per_minute=30)
+    await limiter.acquire()
+    """
+
+    def __init__(self, per_minute: int = 60, per_hour: int = 360, per_day: int = 8000):
+        self.per_minute = per_minute
+        self.per_hour = per_hour
+        self.per_day = per_day
+        self._windows = _SlidingWindows(((60, per_minute), (3600, per_hour), (86400, per_day)))
+        self._lock: asyncio.Lock | None = None
+        self._loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # asyncio primitives belong to one event loop; recreate per loop so the
+        # limiter can be reused across asyncio.run() calls.
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def acquire(self) -> None:
+        """Wait until a call is permissible under all three windows."""
+        # Holding the lock while sleeping keeps waiters FIFO; unlike the threaded
+        # RateLimiter this does not block anything else — only tasks queued on
+        # the limiter wait.
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                wait = self._windows.wait_time(now)
+                if wait <= 0.0:
+                    self._windows.record(now)
+                    return
+                await asyncio.sleep(wait)
+
+
+class YFinanceFetcher:
+    """Default fetcher: each yfinance property read runs in a worker thread."""
+
+    HOST = "query2.finance.yahoo.com"
+
+    def host(self, kind: str) -> str:
+        return self.HOST
+
+    async def fetch(self, ticker: str, kind: str):
+        import yfinance as yf
+
+        # A Ticker per fetch — yfinance's lazy per-Ticker caches are not
+        # designed for concurrent access from several threads.
+        return await asyncio.to_thread(lambda: getattr(yf.Ticker(ticker), kind))
+
+
+class StaticFetcher:
+    """Fetcher serving pre-built payloads — a local stand-in for yfinance.
+
+    Parameters
+    ----------
+    payloads : dict
+        ``{ticker: {kind: payload}}`` for every kind in FETCH_KINDS. A payload
+        that is an Exception instance is raised instead of returned.
+    latency : float
+        Seconds each fetch sleeps, to model network round-trips in benchmarks.
+    host_name : str
+        Host reported for every kind.
+    """
+
+    def __init__(self, payloads: dict, latency: float = 0.0, host_name: str = "stub"):
+        self.payloads = payloads
+        self.latency = latency
+        self.host_name = host_name
+
+    def host(self, kind: str) -> str:
+        return self.host_name
+
+    async def fetch(self, ticker: str, kind: str):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        try:
+            payload = self.payloads[ticker][kind]
+        except KeyError:
+            raise KeyError(f"no stub payload for {ticker!r} / {kind!r}") from None
+        if isinstance(payload, Exception):
+            raise payload
+        return payload
+
+
+class CachingFetcher:
+    """Fetcher wrapper that serves fresh payloads from a StatementCache.
+
+    Misses are forwarded to the wrapped fetcher and stored; empty payloads
+    are not cached (same rule as ``Downloader.from_ticker``).
+
+    Usage
+    -----
+    fetcher = CachingFetcher(YFinanceFetcher(), default_statement_cache())
+    AsyncDownloader(fetcher=fetcher)
+    """
+
+    def __init__(self, fetcher, cache):
+        self.fetcher = fetcher
+        self.cache = cache
+
+    def host(self, kind: str) -> str:
+        return self.fetcher.host(kind)
+
+    async def fetch(self, ticker: str, kind: str):
+        payload = self.cache.get_payload(ticker, kind)
+        if payload is None:
+            payload = await self.fetcher.fetch(ticker, kind)
+            if payload is not None and len(payload):
+                self.cache.put_payload(ticker, kind, payload)
+        return payload
+
+
+class AsyncDownloader:
+    """Concurrent multi-ticker download engine producing ``Downloader`` instances.
+
+    Parameters
+    ----------
+    fetcher : object, optional
+        Fetch layer (see module docstring). Defaults to ``YFinanceFetcher()``.
+    limiter : AsyncRateLimiter, optional
+        Shared rate limiter; one ``acquire()`` per ticker. None disables it.
+        A blocking limiter (e.g. ``SQLiteRateLimiter`` shared with other
+        processes) is also accepted; its acquire() runs in a worker thread.
+    max_concurrency : int
+        Maximum number of tickers downloading at the same time.
+    host_limits : dict, optional
+        ``{host: max_in_flight_requests}``; hosts not listed use ``default_host_limit``.
+    default_host_limit : int
+        In-flight request cap for hosts absent from ``host_limits``.
+
+    Usage
+    -----
+    engine = AsyncDownloader(limiter=AsyncRateLimiter(per_minute=30), max_concurrency=8)
+    downloaders, failures = asyncio.run(engine.download_many(["AAPL", "MSFT"]))
+    """
+
+    def __init__(
+        self,
+        fetcher=None,
+        limiter: AsyncRateLimiter | None = None,
+        max_concurrency: int = 8,
+        host_limits: dict | None = None,
+        default_host_limit: int = DEFAULT_HOST_LIMIT,
+    ):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        self.fetcher = fetcher if fetcher is not None else YFinanceFetcher()
+        self.limiter = limiter
+        self.max_concurrency = max_concurrency
+        self.host_limits = dict(host_limits or {})
+        self.default_host_limit = default_host_limit
+
+    def _semaphores(self):
+        """Fresh per-run semaphores (asyncio primitives are bound to one loop)."""
+        return asyncio.Semaphore(self.max_concurrency), {}
+
+    async def _fetch(self, ticker: str, kind: str, host_sems: dict):
+        host = self.fetcher.host(kind)
+        sem = host_sems.get(host)
+        if sem is None:
+            sem = host_sems[host] = asyncio.Semaphore(
+                self.host_limits.get(host, self.default_host_limit)
+            )
+        async with sem:
+            return await self.fetcher.fetch(ticker, kind)
+
+    async def _download(self, ticker: str, ticker_sem, host_sems: dict) -> Downloader:
+        async with ticker_sem:
+            if self.limiter is not None:
+                if asyncio.iscoroutinefunction(self.limiter.acquire):
+                    await self.limiter.acquire()
+                else:
+                    # Blocking limiters (RateLimiter, SQLiteRateLimiter) wait in a thread.
+                    await asyncio.to_thread(self.limiter.acquire)
+            payloads = await asyncio.gather(
+                *(self._fetch(ticker, kind, host_sems) for kind in FETCH_KINDS),
+                return_exceptions=True,
+            )
+        try:
+            for kind, payload in zip(FETCH_KINDS, payloads):
+                if isinstance(payload, BaseException):
+                    raise DownloadError(f"[{ticker}] {kind} fetch failed: {payload}") from payload
+            return Downloader.from_raw(ticker, *payloads)
+        except DownloadError as e:
+            _logger.error("%s", e)
+            raise
+        except Exception as e:
+            _logger.error(f"[{ticker}] reshape failed: {e}", exc_info=True)
+            raise DownloadError(f"[{ticker}] download failed: {e}") from e
+
+    async def download_one(self, ticker: str) -> Downloader:
+        """Download one ticker with its four fetches in parallel.
+
+        Raises
+        ------
+        DownloadError
+            If any fetch or the reshape fails.
+        """
+        return await self._download(ticker, *self._semaphores())
+
+    async def iter_download(self, tickers: list[str]):
+        """Async generator yielding ``(ticker, Downloader | DownloadError)`` as each finishes."""
+        ticker_sem, host_sems = self._semaphores()
+
+        async def _guarded(t):
+            try:
+                return t, await self._download(t, ticker_sem, host_sems)
+            except DownloadError as e:
+                return t, e
+
+        for fut in asyncio.as_completed([_guarded(t) for t in tickers]):
+            yield await fut
+
+    async def download_many(self, tickers: list[str]) -> tuple[dict, dict]:
+        """Download every ticker; one ticker's failure never affects the others.
+
+        Returns
+        -------
+        (downloaders, failures)
+            ``{ticker: Downloader}`` for successes and ``{ticker: DownloadError}``
+            for failures, both in input order.
+        """
+        outcomes = {}
+        async for ticker, outcome in self.iter_download(tickers):
+            outcomes[ticker] = outcome
+        downloaders = {t: outcomes[t] for t in tickers if isinstance(outcomes.get(t), Downloader)}
+        failures = {t: outcomes[t] for t in tickers if isinstance(outcomes.get(t), DownloadError)}
+        _logger.info(
+            "[async] downloaded %d ticker(s), %d failed", len(downloaders), len(failures)
+        )
+        return downloaders, failures
+
+
+def download_concurrent(tickers: list[str], **kwargs) -> tuple[dict, dict]:
+    """Blocking entry point: ``AsyncDownloader(**kwargs).download_many(tickers)``.
+
+    Must not be called from inside a running event loop (e.g. Jupyter) — await
+    ``AsyncDownloader.download_many`` there instead.
+    """
+    return asyncio.run(AsyncDownloader(**kwargs).download_many(tickers))
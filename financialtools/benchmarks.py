@@ -0,0 +1,170 @@
+"""benchmarks.py — per-sector peer benchmarks of evaluated metrics.
+
+Provides:
+  compute_benchmarks() — peer statistics of every metric column of a wide
+                         ``metrics`` / ``eval_metrics`` frame, per (sector, time):
+                         mean (``market_value``), median, quantiles and peer count.
+                         One grouped pass over the wide frame, no melt.
+  SectorBenchmarks     — those tables persisted as one Parquet file per
+                         (key, sector), so re-running one sector rewrites only
+                         that sector's files; Excel export is optional.
+
+Benchmarks are computed straight from the evaluation results held in memory
+(``evaluate()`` dicts, ``CompactResult`` or a ``UniverseMetricsEvaluator``
+result) — nothing is read back from the exported Excel files.
+
+Output schema (one row per sector × metric × time):
+  sector, metrics, time, market_value, median, q25, q75, count
+
+``market_value`` keeps its historical meaning (NaN-skipping mean); the quantile
+columns follow ``quantiles`` (``q10`` for 0.1, …). ``count`` is the number of
+tickers with a value.
+
+Depends on: exporters (write_frames), numpy, pandas, pyarrow (deferred — only
+required when benchmarks are persisted).
+"""
+import logging as _logging
+import os
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from financialtools.exporters import write_frames
+
+_logger = _logging.getLogger(__name__)
+
+BENCHMARK_KEYS = ("metrics", "eval_metrics")
+DEFAULT_QUANTILES = (0.25, 0.75)
+
+_ID_COLS = frozenset({"ticker", "time", "sector"})
+_LEAD_COLS = ["sector", "metrics", "time"]
+
+
+def _quantile_name(q: float) -> str:
+    return f"q{round(q * 100):02d}"
+
+
+def _empty_benchmarks(quantiles) -> pd.DataFrame:
+    stats = ["market_value", "median"] + [_quantile_name(q) for q in quantiles] + ["count"]
+    return pd.DataFrame(columns=_LEAD_COLS + stats)
+
+
+def compute_benchmarks(wide: pd.DataFrame, quantiles=DEFAULT_QUANTILES) -> pd.DataFrame:
+    """Per-(sector, time) peer statistics of every metric column of ``wide``.
+
+    ``wide`` is a merged ``metrics`` or ``eval_metrics`` frame (``ticker``,
+    ``time``, ``sector`` plus one column per metric). Statistics skip NaN
+    values; a group with no values gets NaN statistics and ``count`` 0.
+    Rows are ordered by sector, then metric, then time (first appearance).
+    """
+    if wide is None or wide.empty or "sector" not in wide.columns:
+        return _empty_benchmarks(quantiles)
+    metric_cols = [c for c in wide.columns if c not in _ID_COLS]
+    if not metric_cols:
+        return _empty_benchmarks(quantiles)
+
+    values = wide[metric_cols].astype("float64")
+    grouped = values.groupby([wide["sector"], wide["time"]], sort=False, dropna=False)
+    stats = {"market_value": grouped.mean(), "median": grouped.median()}
+    for q in quantiles:
+        stats[_quantile_name(q)] = grouped.quantile(q)
+    stats["count"] = grouped.count()
+
+    # Every statistic is a (groups × metrics) frame in the same group order;
+    # ravelling column-major lays the rows out metric by metric.
+    index = stats["market_value"].index
+    n_metrics = len(metric_cols)
+    sectors = np.tile(index.get_level_values(0).to_numpy(dtype=object), n_metrics)
+    long = pd.DataFrame({
+        "sector": sectors,
+        "metrics": np.repeat(np.asarray(metric_cols, dtype=object), len(index)),
+        "time": np.tile(index.get_level_values(1).to_numpy(dtype=object), n_metrics),
+        **{name: frame[metric_cols].to_numpy().ravel(order="F") for name, frame in stats.items()},
+    })
+    order = np.argsort(pd.factorize(sectors)[0], kind="stable")
+    return long.take(order).reset_index(drop=True)
+
+
+class SectorBenchmarks:
+    """Sector benchmark tables kept as Parquet, updated one sector at a time.
+
+    Parameters
+    ----------
+    root : str
+        Directory holding ``<key>/sector=<sector>.parquet`` files (created on
+        first write).
+    quantiles : tuple of float
+        Quantiles reported next to the mean and median.
+
+    Usage
+    -----
+    bench = SectorBenchmarks("financial_data/benchmarks")
+    bench.update(CompactResult.concat(results))   # replaces the sectors present
+    peers = bench.read("metrics", sectors=["technology"])
+    bench.to_excel("financial_data")              # metrics_by_sectors.xlsx, …
+    """
+
+    def __init__(self, root: str = "financial_data/benchmarks", quantiles=DEFAULT_QUANTILES):
+        self.root = root
+        self.quantiles = tuple(quantiles)
+
+    def _path(self, key: str, sector) -> str:
+        return os.path.join(self.root, key, f"sector={quote(str(sector), safe='')}.parquet")
+
+    def sectors(self, key: str = "metrics") -> list[str]:
+        """Sectors with stored benchmarks for ``key``."""
+        directory = os.path.join(self.root, key)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            unquote(name[len("sector="):-len(".parquet")])
+            for name in os.listdir(directory)
+            if name.startswith("sector=") and name.endswith(".parquet")
+        )
+
+    def update(self, result) -> dict:
+        """Recompute the benchmarks of every sector present in ``result``.
+
+        ``result`` is anything with ``evaluate()`` keys — a merged dict of
+        frames, a ``CompactResult`` or a ``UniverseMetricsEvaluator`` result —
+        covering every ticker of the sectors it contains. Those sectors' files
+        are replaced; other sectors keep their stored benchmarks.
+
+        Returns
+        -------
+        dict
+            ``{key: [sectors written]}``.
+        """
+        written = {}
+        for key in BENCHMARK_KEYS:
+            wide = result.get(key)
+            table = compute_benchmarks(wide, self.quantiles)
+            written[key] = []
+            for sector, part in table.groupby("sector", sort=False):
+                self._write(self._path(key, sector), part)
+                written[key].append(sector)
+            if written[key]:
+                _logger.info("[benchmarks] %s: updated %d sector(s)", key, len(written[key]))
+        return written
+
+    def _write(self, path: str, part: pd.DataFrame) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        part.reset_index(drop=True).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    def read(self, key: str = "metrics", sectors: list[str] | None = None) -> pd.DataFrame:
+        """Stored benchmarks for ``key`` (optionally only ``sectors``), sorted by sector."""
+        wanted = self.sectors(key) if sectors is None else sorted(sectors)
+        paths = [self._path(key, s) for s in wanted if os.path.isfile(self._path(key, s))]
+        if not paths:
+            return _empty_benchmarks(self.quantiles)
+        return pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True)
+
+    def to_excel(self, output_dir: str, sheet_name: str = "sheet1") -> list[str]:
+        """Write ``<key>_by_sectors.xlsx`` for every key with stored benchmarks."""
+        tables = {f"{key}_by_sectors": self.read(key) for key in BENCHMARK_KEYS}
+        tables = {name: table for name, table in tables.items() if not table.empty}
+        written = write_frames(tables, output_dir, formats=("xlsx",), sheet_name=sheet_name)
+        return [path for paths in written.values() for path in paths]
@@ -0,0 +1,314 @@
+"""cache.py — persistent on-disk caches backed by SQLite.
+
+Provides:
+  DiskCache       — generic key/value cache: pickled values, per-entry kind,
+                    TTL checked on read, size-bounded LRU eviction, hit/miss
+                    counters per kind. Safe to share between threads and
+                    processes (one SQLite file, short transactions).
+  StatementCache  — raw yfinance payloads keyed by (ticker, kind) with a
+                    separate TTL per kind: statements change at most
+                    quarterly, ``info`` (prices, market cap) goes stale fast.
+  default_statement_cache() — the process-wide StatementCache shared by
+                    run_analysis.py (via run_topic_analysis), app.py and the
+                    agent prepare_data_node (via _download_and_evaluate).
+  ResponseCache   — parsed LLM assessments keyed by a content hash of
+                    (model, topic, system prompt, payloads): identical requests
+                    are answered from disk. Used by analysis.invoke_chain.
+  default_response_cache() — the process-wide ResponseCache.
+
+Location: ``$FINANCIALTOOLS_CACHE_DIR`` (default ``~/.cache/financialtools``).
+Set ``FINANCIALTOOLS_NO_CACHE=1`` to bypass the default cache entirely.
+
+Depends on: utils (_cache_dir), sqlite3, pickle.
+"""
+import hashlib
+import json
+import logging as _logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from financialtools.utils import _cache_dir
+
+_logger = _logging.getLogger(__name__)
+
+_DAY = 86400.0
+
+# Per-kind TTLs (seconds) for raw yfinance payloads.
+STATEMENT_TTLS = {
+    "balance_sheet": 7 * _DAY,
+    "income_stmt":   7 * _DAY,
+    "cashflow":      7 * _DAY,
+    "info":          3600.0,
+}
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# LLM responses: the prompt hash already changes whenever a prompt or output
+# schema changes, so the TTL only bounds how long an old answer is reused.
+RESPONSE_TTL = 30 * _DAY
+RESPONSE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class DiskCache:
+    """SQLite-backed persistent cache with TTL and size-bounded LRU eviction.
+
+    Parameters
+    ----------
+    path : str
+        SQLite file (parent directories are created).
+    max_bytes : int
+        Upper bound on the summed size of stored values. After each ``put``
+        the least-recently-read entries are evicted until the total fits.
+
+    Usage
+    -----
+    cache = DiskCache("/tmp/cache.sqlite", max_bytes=64 * 2**20)
+    cache.put("k", {"a": 1}, kind="demo")
+    cache.get("k", kind="demo", ttl=3600)   # → {"a": 1}, or None when missing/expired
+    cache.stats()                           # → {"demo": {"hits": 1, "misses": 0}}
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        self._stats: dict[str, dict[str, int]] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, kind TEXT NOT NULL, value BLOB NOT NULL,"
+            " size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def __getstate__(self):
+        # sqlite3 connections and locks cannot be pickled — recreate lazily.
+        state = self.__dict__.copy()
+        del state["_local"], state["_counter_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, kind: str, outcome: str) -> None:
+        with self._counter_lock:
+            self._stats.setdefault(kind, {"hits": 0, "misses": 0})[outcome] += 1
+
+    def get(self, key: str, kind: str = "default", ttl: float | None = None, validate=None):
+        """Return the cached value, or None when missing or older than ``ttl`` seconds.
+
+        ``validate(value)``, when given, converts the stored value before it is
+        returned; an entry it rejects (raises) is dropped and counted as a miss.
+        """
+        conn = self._connect()
+        row = conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None or (ttl is not None and now - row[1] > ttl):
+            if row is not None:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._count(kind, "misses")
+            return None
+        try:
+            value = pickle.loads(row[0])
+            if validate is not None:
+                value = validate(value)
+        except Exception as e:
+            _logger.warning("[cache] dropping unreadable entry %s: %s", key, e)
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._count(kind, "misses")
+            return None
+        conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        self._count(kind, "hits")
+        return value
+
+    def put(self, key: str, value, kind: str = "default") -> None:
+        """Store ``value`` under ``key`` and evict LRU entries beyond ``max_bytes``."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            _logger.warning("[cache] %s (%d bytes) exceeds max_bytes — not cached", key, len(blob))
+            return
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, value, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, blob, len(blob), now, now),
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        _logger.debug("[cache] evicted %d entr%s from %s", evicted, "y" if evicted == 1 else "ies", self.path)
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove every entry (counters are kept)."""
+        self._connect().execute("DELETE FROM entries")
+
+    def size_bytes(self) -> int:
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Hit/miss counters of this process, per kind: ``{kind: {"hits": n, "misses": n}}``."""
+        with self._counter_lock:
+            return {k: dict(v) for k, v in self._stats.items()}
+
+    def hit_rate(self, kind: str | None = None) -> float | None:
+        """Share of lookups served from the cache (one kind, or all); None before any lookup."""
+        stats = self.stats()
+        counts = list(stats.values()) if kind is None else [stats.get(kind, {"hits": 0, "misses": 0})]
+        lookups = sum(c["hits"] + c["misses"] for c in counts)
+        return sum(c["hits"] for c in counts) / lookups if lookups else None
+
+
+class StatementCache(DiskCache):
+    """Cache of raw yfinance payloads keyed by (ticker, kind).
+
+    Parameters
+    ----------
+    path : str, optional
+        SQLite file; defaults to ``<cache dir>/statements.sqlite``.
+    ttls : dict, optional
+        Per-kind TTL overrides in seconds, merged over ``STATEMENT_TTLS``.
+    max_bytes : int
+        LRU size bound (see DiskCache).
+
+    Usage
+    -----
+    cache = StatementCache()
+    Downloader.from_ticker("AAPL", cache=cache)
+    cache.stats()   # → {"balance_sheet": {"hits": 1, "misses": 0}, ...}
+    """
+
+    def __init__(self, path: str | None = None, ttls: dict | None = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(path or os.path.join(_cache_dir(), "statements.sqlite"), max_bytes)
+        self.ttls = {**STATEMENT_TTLS, **(ttls or {})}
+
+    @staticmethod
+    def _key(ticker: str, kind: str) -> str:
+        return f"{ticker.upper()}::{kind}"
+
+    def get_payload(self, ticker: str, kind: str):
+        """Return the cached payload for (ticker, kind), or None when missing/expired."""
+        return self.get(self._key(ticker, kind), kind=kind, ttl=self.ttls.get(kind))
+
+    def put_payload(self, ticker: str, kind: str, payload) -> None:
+        self.put(self._key(ticker, kind), payload, kind=kind)
+
+    def invalidate(self, ticker: str) -> None:
+        """Drop every cached payload of ``ticker``."""
+        for kind in self.ttls:
+            self.delete(self._key(ticker, kind))
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(DiskCache):
+    """Cache of parsed LLM assessments keyed by what was sent to the model.
+
+    The key hashes the model name (and temperature), the topic, the system
+    prompt together with the output schema, and the JSON payloads — so any
+    change to the prompt, the schema or the data is a miss. Values are stored
+    as ``model_dump()`` dicts and validated back into the Pydantic class on a
+    hit; an entry that no longer validates is dropped and counted as a miss.
+    Hit/miss counters are per topic.
+
+    Parameters
+    ----------
+    path : str, optional
+        SQLite file; defaults to ``<cache dir>/llm_responses.sqlite``.
+    ttl : float
+        Seconds an entry is served (default 30 days).
+    max_bytes : int
+        LRU size bound (see DiskCache).
+
+    Usage
+    -----
+    cache = ResponseCache()
+    invoke_chain(prompt, parser, llm, inputs, topic, ticker, cache=cache)
+    cache.stats()       # → {"liquidity": {"hits": 1, "misses": 0}, ...}
+    cache.hit_rate()    # → 1.0
+    """
+
+    def __init__(self, path: str | None = None, ttl: float = RESPONSE_TTL,
+                 max_bytes: int = RESPONSE_MAX_BYTES):
+        super().__init__(path or os.path.join(_cache_dir(), "llm_responses.sqlite"), max_bytes)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(model: str, topic: str, system_prompt: str, payload: dict) -> str:
+        """Content address of one request: ``model::topic::<prompt hash>::<payload hash>``."""
+        payload_text = json.dumps(payload, sort_keys=True, default=str)
+        return f"{model}::{topic}::{_digest(system_prompt)[:16]}::{_digest(payload_text)}"
+
+    def get_assessment(self, key: str, topic: str, model_cls: type):
+        """Return the cached assessment as a ``model_cls`` instance, or None."""
+        return self.get(key, kind=topic, ttl=self.ttl, validate=model_cls.model_validate)
+
+    def put_assessment(self, key: str, topic: str, assessment) -> None:
+        self.put(key, assessment.model_dump(mode="json"), kind=topic)
+
+
+_default_cache: StatementCache | None = None
+_default_response_cache: ResponseCache | None = None
+_default_lock = threading.Lock()
+
+
+def _cache_disabled() -> bool:
+    return os.environ.get("FINANCIALTOOLS_NO_CACHE", "").lower() in ("1", "true", "yes")
+
+
+def default_statement_cache() -> StatementCache | None:
+    """Return the process-wide StatementCache (None when FINANCIALTOOLS_NO_CACHE is set)."""
+    global _default_cache
+    if _cache_disabled():
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = StatementCache()
+        return _default_cache
+
+
+def default_response_cache() -> ResponseCache | None:
+    """Return the process-wide ResponseCache (None when FINANCIALTOOLS_NO_CACHE is set)."""
+    global _default_response_cache
+    if _cache_disabled():
+        return None
+    with _default_lock:
+        if _default_response_cache is None:
+            _default_response_cache = ResponseCache()
+        return _default_response_cache
@@ -0,0 +1,118 @@
+"""crosssection.py — peer-relative (cross-sectional) metric statistics and scores.
+
+Provides:
+  SCORING_MODES            — ``"absolute"`` (fixed ``_SCORE_THRESHOLDS``, the default),
+                             ``"percentile"`` and ``"zscore"`` (peer-relative).
+  peer_groups()            — one integer code per row: its (sector, fiscal year)
+                             peer group, -1 when either key is missing.
+  cross_sectional_stats()  — percentile rank and z-score of every cell of a
+                             (rows × metrics) matrix within its row's peer group;
+                             every metric column in one grouped pass.
+  percentile_scores(), zscore_scores() — map those statistics onto the 1–5 scale
+                             of the absolute thresholds, so composites stay comparable.
+
+Percentiles are mid-ranks, ``(rank - 0.5) / n`` with ties averaged: a group of
+one sits at 0.5 (score 3) and the scale is symmetric. Z-scores use the sample
+standard deviation and are NaN for groups with fewer than two values or no
+dispersion. NaN metric values are left out of their group's statistics and, like
+NaN statistics, score a neutral 3.
+
+Depends on: numpy, pandas.
+"""
+import numpy as np
+import pandas as pd
+
+SCORING_MODES = ("absolute", "percentile", "zscore")
+
+
+def _scoring_mode(mode: str) -> str:
+    if mode not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode {mode!r} — expected one of {list(SCORING_MODES)}")
+    return mode
+
+
+def _peer_year(time) -> np.ndarray:
+    """Fiscal year of each row as float (timestamps, dates or years); NaN when missing or unparseable."""
+    time = pd.Series(time)
+    if pd.api.types.is_numeric_dtype(time):
+        return time.to_numpy(dtype="float64", na_value=np.nan)
+    years = pd.to_datetime(time, errors="coerce").dt.year
+    return years.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def peer_groups(sectors, time) -> np.ndarray:
+    """Peer-group code of each row: rows share a code when sector and fiscal year match."""
+    keys = pd.DataFrame({
+        "sector": np.asarray(sectors, dtype=object),
+        "year": _peer_year(time),
+    })
+    codes = keys.groupby(["sector", "year"], sort=False).ngroup()
+    return codes.fillna(-1).to_numpy(dtype=np.int64)
+
+
+def _block_ranks(block: np.ndarray) -> np.ndarray:
+    """1-based rank of each value within its column of ``block``, ties averaged; NaN → NaN.
+
+    One column-wise sort; each run of equal values gets the mean of its first
+    and last sorted position.
+    """
+    m, k = block.shape
+    order = np.argsort(block, axis=0)           # NaNs sort last
+    ordered = np.take_along_axis(block, order, axis=0)
+    position = np.broadcast_to(np.arange(m)[:, None], (m, k))
+    run_start = np.ones((m, k), dtype=bool)
+    run_start[1:] = ordered[1:] != ordered[:-1]
+    run_end = np.ones((m, k), dtype=bool)
+    run_end[:-1] = run_start[1:]
+    first = np.maximum.accumulate(np.where(run_start, position, 0), axis=0)
+    last = np.minimum.accumulate(np.where(run_end, position, m - 1)[::-1], axis=0)[::-1]
+    ranks = np.empty((m, k))
+    np.put_along_axis(ranks, order, (first + last) / 2.0 + 1.0, axis=0)
+    ranks[np.isnan(block)] = np.nan
+    return ranks
+
+
+def cross_sectional_stats(values: np.ndarray, groups: np.ndarray) -> tuple:
+    """Return ``(percentile, zscore)``, both shaped like ``values``.
+
+    ``values`` is a (rows × metrics) float array; ``groups`` the rows' peer-group
+    codes from ``peer_groups`` (-1 = no group → NaN statistics).
+
+    Rows are ordered by group once; each group is then one contiguous
+    (peers × metrics) block whose ranks, counts, means and standard deviations
+    are computed for all metric columns together. Sorting within groups is
+    cheaper than sorting every column of the whole universe.
+    """
+    n, k = values.shape
+    percentile = np.full((n, k), np.nan)
+    zscore = np.full((n, k), np.nan)
+    perm = np.argsort(groups, kind="stable")
+    ordered_groups = groups[perm]
+    bounds = np.flatnonzero(np.r_[True, ordered_groups[1:] != ordered_groups[:-1], True])
+    ordered = values[perm]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            if start == stop or ordered_groups[start] < 0:
+                continue
+            rows = perm[start:stop]
+            block = ordered[start:stop]
+            valid = ~np.isnan(block)
+            count = valid.sum(axis=0)
+            percentile[rows] = (_block_ranks(block) - 0.5) / count
+            mean = np.where(valid, block, 0.0).sum(axis=0) / count
+            deviation = np.where(valid, block - mean, 0.0)
+            std = np.sqrt((deviation ** 2).sum(axis=0) / (count - 1))
+            zscore[rows] = np.where(std > 0, (block - mean) / std, np.nan)
+    return percentile, zscore
+
+
+def percentile_scores(percentile: np.ndarray, inverse: np.ndarray) -> np.ndarray:
+    """``1 + 4 × percentile`` (``1 - percentile`` for lower-is-better columns); NaN → 3."""
+    p = np.where(inverse, 1.0 - percentile, percentile)
+    return np.where(np.isnan(p), 3.0, 1.0 + 4.0 * p)
+
+
+def zscore_scores(zscore: np.ndarray, inverse: np.ndarray) -> np.ndarray:
+    """``3 + z`` clipped to [1, 5] (``3 - z`` for lower-is-better columns); NaN → 3."""
+    z = np.where(inverse, -zscore, zscore)
+    return np.where(np.isnan(z), 3.0, np.clip(3.0 + z, 1.0, 5.0))
@@ -3,20 +3,33 @@
 Provides Downloader: fetches, reshapes, and merges balance sheet,
 income statement, cash flow, and info data for a single ticker.
 
-Depends on: exceptions, utils (RateLimiter), pandas, yfinance.
+Depends on: exceptions, utils (RateLimiter, resolve_sector), pandas, yfinance.
 No compute/scoring logic — see evaluator.py for that layer.
 """
 import os
 import logging as _logging
-from typing import List
+from functools import lru_cache
+from typing import TYPE_CHECKING, List
 
 import pandas as pd
 
 from financialtools.exceptions import DownloadError
-from financialtools.utils import RateLimiter  # noqa: F401  (re-export for callers)
+from financialtools.utils import RateLimiter, resolve_sector  # noqa: F401  (RateLimiter re-exported for callers)
+
+if TYPE_CHECKING:
+    from financialtools.store import FundamentalsStore
 
 _logger = _logging.getLogger(__name__)
 
+# yf.Ticker attributes fetched per ticker, in from_raw() argument order.
+FETCH_KINDS = ("balance_sheet", "income_stmt", "cashflow", "info")
+
+
+@lru_cache(maxsize=4096)
+def _normalise_column(name: str) -> str:
+    """yfinance line item → column name ("Total Revenue" → "total_revenue"); memoised."""
+    return name.replace(' ', '_').lower()
+
 
 class Downloader:
     def __init__(self, ticker, _from_factory: bool = False):
@@ -38,9 +51,17 @@ class Downloader:
         self._info = None
 
     @classmethod
-    def from_ticker(cls, ticker):
+    def from_ticker(cls, ticker, cache=None):
         """Download and reshape all financial data for one ticker.
 
+        Parameters
+        ----------
+        cache : StatementCache | True | None
+            Persistent payload cache (see ``cache.py``). ``True`` selects the
+            process-wide ``default_statement_cache()``; ``None`` always hits
+            yfinance. Payloads still fresh under their per-kind TTL are read
+            from disk; only missing or expired ones are fetched (and stored).
+
         Returns
         -------
         Downloader
@@ -63,54 +84,100 @@ class Downloader:
         """
         import yfinance as yf
 
+        if cache is True:
+            from financialtools.cache import default_statement_cache
+            cache = default_statement_cache()
+
         try:
             t = yf.Ticker(ticker)
-            d = cls(ticker, _from_factory=True)
-
-            # raw data
-            d._balance_sheet = cls.__reshape_fin_data(
-                t.balance_sheet.reset_index().assign(ticker=ticker, docs="balance_sheet")
-            )
-            d._income_stmt = cls.__reshape_fin_data(
-                t.income_stmt.reset_index().assign(ticker=ticker, docs="income_stmt")
-            )
-            d._cashflow = cls.__reshape_fin_data(
-                t.cashflow.reset_index().assign(ticker=ticker, docs="cashflow")
-            )
-
-            df_info = pd.DataFrame(list(t.info.items()), columns=["key", "value"])
-            df_info.insert(0, "ticker", ticker)
-            df_info = df_info.pivot(index=["ticker"], columns='key', values='value').reset_index()
-            d._info = df_info
-
-            return d
+            if cache is None:
+                return cls.from_raw(ticker, t.balance_sheet, t.income_stmt, t.cashflow, t.info)
+            payloads = []
+            for kind in FETCH_KINDS:
+                payload = cache.get_payload(ticker, kind)
+                if payload is None:
+                    payload = getattr(t, kind)
+                    # Never pin an empty response (throttled / delisted) for a full TTL.
+                    if payload is not None and len(payload):
+                        cache.put_payload(ticker, kind, payload)
+                payloads.append(payload)
+            return cls.from_raw(ticker, *payloads)
 
         except Exception as e:
             _logger.error(f"[{ticker}] from_ticker failed: {e}", exc_info=True)
             raise DownloadError(f"[{ticker}] download failed: {e}") from e
 
+    @classmethod
+    def from_raw(cls, ticker, balance_sheet, income_stmt, cashflow, info):
+        """Build a Downloader from raw yfinance payloads — no network access.
+
+        Parameters
+        ----------
+        balance_sheet, income_stmt, cashflow : pd.DataFrame
+            Wide statements as returned by ``yf.Ticker(...).balance_sheet`` etc.
+            (line items as the index, one column per period).
+        info : dict
+            ``yf.Ticker(...).info``.
+
+        Used by ``from_ticker`` and by the async engine in ``async_downloader.py``,
+        which fetches the four payloads concurrently. Exceptions from reshaping
+        propagate — callers wrap them in ``DownloadError``.
+        """
+        d = cls(ticker, _from_factory=True)
+
+        # raw data
+        d._balance_sheet = cls.__reshape_fin_data(balance_sheet, ticker, "balance_sheet")
+        d._income_stmt = cls.__reshape_fin_data(income_stmt, ticker, "income_stmt")
+        d._cashflow = cls.__reshape_fin_data(cashflow, ticker, "cashflow")
+
+        df_info = pd.DataFrame(list(info.items()), columns=["key", "value"])
+        df_info.insert(0, "ticker", ticker)
+        df_info = df_info.pivot(index=["ticker"], columns='key', values='value').reset_index()
+        d._info = df_info
+
+        return d
+
     @staticmethod
-    def __reshape_fin_data(df: pd.DataFrame) -> pd.DataFrame:
+    def __reshape_fin_data(statement: pd.DataFrame, ticker: str, docs: str) -> pd.DataFrame:
         """
-        Reshape financial data DataFrame to have 'ticker', 'time', and metric columns.
+        Reshape a wide yfinance statement to have 'ticker', 'docs', 'time', and metric columns.
 
         Args:
-            df: Financial data DataFrame from yfinance (e.g., balance sheet).
+            statement: Wide statement from yfinance (line items as index, one column per period).
+            ticker: Ticker symbol written to the 'ticker' column.
+            docs: Statement kind written to the 'docs' column (e.g. "balance_sheet").
 
         Returns:
-            pd.DataFrame with columns 'ticker', 'time', and financial metrics, or empty on failure.
+            pd.DataFrame with one row per period (ascending), metric columns sorted by
+            line item and renamed through ``_normalise_column``; all-NaN periods and
+            line items are dropped. Empty on failure.
+
+        A transpose replaces the former melt → pivot_table round trip: (period, line
+        item) is already unique in a yfinance statement, so pivot_table's groupby-mean
+        only cost time (and melt rejects Timestamp period labels on pandas 3). Output
+        is identical, including pivot_table's sorting and NaN dropping — see
+        tests/test_downloader.py and benchmarks/bench_reshape.py.
         """
-        if df.empty:
-            return df
+        if statement.empty:
+            return statement.reset_index().assign(ticker=ticker, docs=docs)
         try:
-            pivot_vars = ["index", "ticker", "docs"]
-            value_vars = [c for c in df.columns if c not in pivot_vars]
-            df = df.melt(id_vars=pivot_vars, value_vars=value_vars,
-                         var_name="time", value_name="value")
-            df = df.pivot_table(index=["ticker", "docs", "time"],
-                                columns="index", values="value").reset_index()
-            df.columns = [col.replace(' ', '_').lower() for col in df.columns]
-            return df
+            values = statement.T
+            values = values.loc[values.index.notna(), values.columns.notna()]
+            # pivot_table averaged duplicate (period, line item) pairs — keep that.
+            if not values.columns.is_unique:
+                values = values.T.groupby(level=0).mean().T
+            if not values.index.is_unique:
+                values = values.groupby(level=0).mean()
+
+            arr = values.to_numpy()
+            missing = pd.isna(arr)
+            periods = values.index[~missing.all(axis=1)].sort_values()
+            items = values.columns[~missing.all(axis=0)].sort_values()
+            arr = arr[values.index.get_indexer(periods)][:, values.columns.get_indexer(items)]
+
+            keys = pd.DataFrame({"ticker": ticker, "docs": docs, "time": periods.to_numpy()})
+            body = pd.DataFrame(arr, columns=[_normalise_column(c) for c in items])
+            return pd.concat([keys, body], axis=1)
         except Exception as e:
             _logger.error("Error reshaping financial data: %s", e, exc_info=True)
             return pd.DataFrame()
@@ -150,7 +217,7 @@ class Downloader:
 
             merged = dfs[0]
             for df in dfs[1:]:
-                merged = merged.merge(df, how="left", on=["ticker", "time"])
+                merged = self._join_on_time(merged, df)
 
             if merged.empty:
                 return pd.DataFrame()
@@ -168,6 +235,24 @@ class Downloader:
             _logger.error(f"[{self.ticker}] get_merged_data failed: {e}", exc_info=True)
             return pd.DataFrame()
 
+    @staticmethod
+    def _join_on_time(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+        """Left-join one statement onto another by period.
+
+        Equivalent to ``left.merge(right, how="left", on=["ticker", "time"])`` —
+        same row order, column order and ``_x``/``_y`` suffixes (``docs_x``,
+        ``docs_y``, ``docs`` after the two joins in get_merged_data) — but aligns
+        on the period index directly: both frames hold one ticker and reshaped
+        statements have one row per period.
+        """
+        right = right.drop(columns="ticker").set_index("time").reindex(left["time"].to_numpy())
+        overlap = left.columns.intersection(right.columns)
+        if len(overlap):
+            left = left.rename(columns={c: f"{c}_x" for c in overlap})
+            right = right.rename(columns={c: f"{c}_y" for c in overlap})
+        right.index = left.index
+        return pd.concat([left, right], axis=1)
+
     @classmethod
     def combine_merged_data(cls, downloaders: List['Downloader']) -> pd.DataFrame:
         """Combine merged financial data from multiple Downloader instances."""
@@ -222,37 +307,70 @@ class Downloader:
         tickers: list[str],
         limiter: "RateLimiter",
         out_dir: str = "financial_data",
+        store: "FundamentalsStore | None" = None,
+        store_batch_size: int = 50,
     ):
         """Stream tickers one by one, saving each to Parquet as soon as ready.
 
         Yields each successfully downloaded ``Downloader`` instance.
 
+        When ``store`` (a ``FundamentalsStore``) is given, merged data is upserted
+        into the partitioned store — keyed by the sector resolved from the
+        ticker's info — instead of being written as ``{ticker}_merged_data.parquet``.
+        Merged frames are buffered and upserted together every ``store_batch_size``
+        tickers and when the stream ends (or is closed early), since each upsert
+        rewrites its partitions in full; a yielded ticker may therefore not be in
+        the store yet. If an upsert fails, each buffered ticker's Parquet file is
+        written as a fallback. Info data is still written per ticker to ``out_dir``.
+
         Note: ``out_dir`` is relative to the caller's working directory, not the
         package root. Pass an absolute path (e.g. ``str(Path.cwd() / "data")``) if
         you need deterministic output placement from notebooks or scripts.
         """
         os.makedirs(out_dir, exist_ok=True)
+        pending: list[tuple[str, pd.DataFrame, str]] = []
 
-        for t in tickers:
-            limiter.acquire()
+        def _write(t: str, name: str, df: pd.DataFrame | None) -> None:
             try:
-                d = cls.from_ticker(t)
-
-                tables = {
-                    "merged_data": d.get_merged_data(),
-                    "info": d.get_info_data()
-                }
-
-                for name, df in tables.items():
-                    try:
-                        if df is not None and not df.empty:
-                            path = os.path.join(out_dir, f"{t}_{name}.parquet")
-                            df.to_parquet(path)
-                    except Exception as e:
-                        _logger.error(f"[{t}] Parquet write failed for '{name}': {e}")
-
-                _logger.info("[%s] Saved data to %s", t, out_dir)
-                yield d
+                if df is not None and not df.empty:
+                    df.to_parquet(os.path.join(out_dir, f"{t}_{name}.parquet"))
+            except Exception as e:
+                _logger.error(f"[{t}] Parquet write failed for '{name}': {e}")
 
+        def _flush() -> None:
+            if not pending:
+                return
+            try:
+                store.upsert(pd.concat(
+                    [df.assign(sector=sector) for _, df, sector in pending],
+                    ignore_index=True,
+                ))
+                _logger.info("Upserted %d ticker(s) into the store", len(pending))
             except Exception as e:
-                _logger.error(f"[{t}] Download failed: {e}", exc_info=True)
+                _logger.error(f"Store upsert failed for {len(pending)} ticker(s): {e} — writing merged data to Parquet instead")
+                for t, df, _ in pending:
+                    _write(t, "merged_data", df)
+            pending.clear()
+
+        try:
+            for t in tickers:
+                limiter.acquire()
+                try:
+                    d = cls.from_ticker(t)
+
+                    merged, info = d.get_merged_data(), d.get_info_data()
+                    if store is not None and merged is not None and not merged.empty:
+                        pending.append((t, merged, resolve_sector(info)))
+                    else:
+                        _write(t, "merged_data", merged)
+                    _write(t, "info", info)
+
+                    _logger.info("[%s] Saved data to %s", t, out_dir)
+                    if len(pending) >= store_batch_size:
+                        _flush()
+                    yield d
+
+                except Exception as e:
+                    _logger.error(f"[{t}] Download failed: {e}", exc_info=True)
+        finally:
+            _flush()
@@ -3,15 +3,24 @@
 Provides FundamentalMetricsEvaluator: computes financial ratios, scores them
 against sector weights, detects red flags, and returns a structured result dict.
 
-Depends on: exceptions, pandas, numpy only.
+Depends on: exceptions, formulas, crosssection, pandas, numpy only.
 No yfinance calls — see downloader.py for data acquisition.
 """
 import logging as _logging
+from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
 
+from financialtools.crosssection import (
+    _scoring_mode,
+    cross_sectional_stats,
+    peer_groups,
+    percentile_scores,
+    zscore_scores,
+)
 from financialtools.exceptions import EvaluationError
+from financialtools.formulas import MetricFormula, MetricPlan, _ratio, compile_plan
 
 _logger = _logging.getLogger(__name__)
 
@@ -50,30 +59,114 @@ def empty_result() -> dict:
     return _empty_result()
 
 
-# Columns that compute_metrics() accesses with hard bracket notation.
-# Any column absent from the input DataFrame is filled with np.nan so formulas
-# produce NaN scores instead of raising KeyError.
-# Two categories:
-#   - Sector-conditional: banks / insurance structurally omit these
+# ── Metric formulas ────────────────────────────────────────────────────────────
+# Every metric is declared once here; compute_metrics() / compute_extended_metrics()
+# run the compiled plan (formulas.MetricPlan), and SCORED_METRICS, the score
+# thresholds, the inverse flags and the required-column tuples below are all
+# derived from these tables. Extend with register_metric().
+#
+# ``required`` columns are NaN-filled when absent with a single WARNING listing
+# ALL of them — an actionable diff instead of an opaque EvaluationError. Two
+# categories:
+#   - Sector-conditional: banks / insurance structurally omit gross_profit,
+#     operating_income, ebitda, current_assets, current_liabilities
 #   - Core: should always be present; guard against yfinance schema changes
-# _fill_missing_cols() logs a single WARNING listing ALL absent columns before
-# filling them, giving an actionable diff instead of an opaque EvaluationError.
-_REQUIRED_METRIC_COLS: tuple = (
-    # Sector-conditional (banks structurally omit these)
-    "gross_profit",
-    "operating_income",
-    "ebitda",
-    "current_assets",
-    "current_liabilities",
-    # Core — should always be present; guard against yfinance schema changes
-    "total_revenue",
-    "net_income_common_stockholders",
-    "total_assets",
-    "common_stock_equity",
-    "free_cash_flow",
-    "total_debt",
-    "operating_cash_flow",
+# Every other referenced column is optional (NaN without a warning).
+_F = MetricFormula
+_NI = "net_income_common_stockholders"
+
+_METRIC_FORMULAS: tuple = (
+    # ── Profitability Margins ─────────────────────────────────────────────────
+    _F("GrossMargin", "gross_profit", "total_revenue",
+       required=("gross_profit", "total_revenue"), thresholds=(0.2, 0.3, 0.4, 0.5)),
+    _F("OperatingMargin", "operating_income", "total_revenue",
+       required=("operating_income", "total_revenue"), thresholds=(0.05, 0.1, 0.15, 0.2)),
+    _F("NetProfitMargin", _NI, "total_revenue",
+       required=(_NI, "total_revenue"), thresholds=(0.03, 0.07, 0.12, 0.2)),
+    _F("EBITDAMargin", "ebitda", "total_revenue",
+       required=("ebitda", "total_revenue"), thresholds=(0.1, 0.2, 0.3, 0.4)),
+    # ── Returns ───────────────────────────────────────────────────────────────
+    _F("ROA", _NI, "total_assets",
+       required=(_NI, "total_assets"), thresholds=(0.02, 0.05, 0.08, 0.12)),
+    _F("ROE", _NI, "common_stock_equity",
+       required=(_NI, "common_stock_equity"), thresholds=(0.05, 0.1, 0.15, 0.2)),
+    # ── Cash Flow Metrics ─────────────────────────────────────────────────────
+    _F("FCFToRevenue", "free_cash_flow", "total_revenue",
+       required=("free_cash_flow", "total_revenue"), thresholds=(0.02, 0.05, 0.1, 0.2)),
+    _F("FCFYield", "free_cash_flow", "marketcap",
+       required=("free_cash_flow",), thresholds=(0.02, 0.04, 0.06, 0.1)),
+    _F("FCFtoDebt", "free_cash_flow", "total_debt",
+       required=("free_cash_flow", "total_debt"), thresholds=(0.05, 0.1, 0.2, 0.3)),
+    # ── Leverage & Liquidity ──────────────────────────────────────────────────
+    # inverse: lower is better; negative values (negative equity) → score 1 via
+    # the guard in _score_codes
+    _F("DebtToEquity", "total_debt", "common_stock_equity",
+       required=("total_debt", "common_stock_equity"), thresholds=(0.5, 1.0, 1.5, 2.0),
+       inverse=True),
+    _F("CurrentRatio", "current_assets", "current_liabilities",
+       required=("current_assets", "current_liabilities"), thresholds=(1.0, 1.2, 1.5, 2.0)),
+    # ── Liquidity (extended) ──────────────────────────────────────────────────
+    _F("QuickRatio", "current_assets - inventory", "current_liabilities",
+       required=("current_assets", "current_liabilities"), thresholds=(0.5, 0.8, 1.0, 1.5)),
+    _F("CashRatio", "cash_and_cash_equivalents", "current_liabilities",
+       required=("current_liabilities",), thresholds=(0.1, 0.2, 0.5, 1.0)),
+    _F("WorkingCapitalRatio", "working_capital", "current_assets",
+       required=("current_assets",), thresholds=(0.05, 0.1, 0.2, 0.3)),
+    # ── Solvency (extended) ───────────────────────────────────────────────────
+    _F("DebtRatio", "total_debt", "total_assets",
+       required=("total_debt", "total_assets"), thresholds=(0.2, 0.4, 0.6, 0.8), inverse=True),
+    _F("EquityRatio", "common_stock_equity", "total_assets",
+       required=("common_stock_equity", "total_assets"), thresholds=(0.2, 0.4, 0.6, 0.8)),
+    _F("NetDebtToEBITDA", "net_debt", "ebitda",
+       required=("ebitda",), thresholds=(1.0, 2.0, 3.0, 5.0), inverse=True),
+    _F("InterestCoverage", "ebit", "interest_expense_non_operating",
+       thresholds=(1.5, 3.0, 5.0, 10.0)),
+    # ── Returns: ROIC (extended) ──────────────────────────────────────────────
+    _F("ROIC", "ebit * (1 - tax_rate_for_calcs)", "invested_capital",
+       thresholds=(0.05, 0.1, 0.15, 0.2)),
+    # ── Efficiency (extended) ─────────────────────────────────────────────────
+    _F("AssetTurnover", "total_revenue", "total_assets",
+       required=("total_revenue", "total_assets"), thresholds=(0.3, 0.6, 1.0, 1.5)),
+    # ── Cash Flow (extended) ──────────────────────────────────────────────────
+    _F("OCFRatio", "operating_cash_flow", "current_liabilities",
+       required=("operating_cash_flow", "current_liabilities"), thresholds=(0.1, 0.2, 0.4, 0.6)),
+    _F("FCFMargin", "free_cash_flow", "total_revenue",
+       required=("free_cash_flow", "total_revenue"), thresholds=(0.02, 0.05, 0.1, 0.2)),
+    _F("CashConversion", "operating_cash_flow", _NI,
+       required=("operating_cash_flow", _NI), thresholds=(0.5, 0.8, 1.0, 1.2)),
+    _F("CapexRatio", "capital_expenditure", "operating_cash_flow",
+       required=("operating_cash_flow",), thresholds=(0.1, 0.2, 0.4, 0.6), inverse=True),
+)
+
+# Unscored: time-differential (growth) or derived chains (e.g. CCC) that lack
+# universal thresholds appropriate for 1–5 scoring.
+_EXTENDED_FORMULAS: tuple = (
+    # ── Efficiency chain (working-capital turnover) ───────────────────────────
+    _F("ReceivablesTurnover", "total_revenue", "accounts_receivable", required=("total_revenue",)),
+    _F("DSO", "accounts_receivable * 365", "total_revenue", required=("total_revenue",)),
+    _F("InventoryTurnover", "cost_of_revenue", "inventory"),
+    _F("DIO", "inventory * 365", "cost_of_revenue"),
+    _F("PayablesTurnover", "cost_of_revenue", "accounts_payable"),
+    _F("DPO", "accounts_payable * 365", "cost_of_revenue"),
+    _F("CCC", "DSO + DIO - DPO"),     # NaN in any leg propagates
+    # ── Growth rates ──────────────────────────────────────────────────────────
+    _F("RevenueGrowth", "total_revenue", growth=True, required=("total_revenue",)),
+    _F("NetIncomeGrowth", _NI, growth=True, required=(_NI,)),
+    _F("FCFGrowth", "free_cash_flow", growth=True, required=("free_cash_flow",)),
+    # ── Red-flag ratios ───────────────────────────────────────────────────────
+    _F("Accruals", f"{_NI} - operating_cash_flow", "total_assets",
+       required=(_NI, "operating_cash_flow", "total_assets")),
+    _F("DebtGrowth", "total_debt", growth=True, required=("total_debt",)),
+    _F("Dilution", "ordinary_shares_number", growth=True),
+    _F("CapexToDepreciation", "abs(capital_expenditure)", "depreciation_amortization_depletion"),
 )
+del _F, _NI
+
+SCORED_METRICS: list = [f.name for f in _METRIC_FORMULAS]
+
+# Input columns of each formula-driven step, derived from the tables above.
+_REQUIRED_METRIC_COLS: tuple = compile_plan(_METRIC_FORMULAS).required
+_REQUIRED_EXTENDED_COLS: tuple = compile_plan(_EXTENDED_FORMULAS).required
 
 # Columns required by compute_valuation_metrics().
 _REQUIRED_VALUATION_COLS: tuple = (
@@ -81,43 +174,112 @@ _REQUIRED_VALUATION_COLS: tuple = (
     "free_cash_flow",
     "diluted_eps",
 )
+# Read when present, NaN without a warning when absent.
+_OPTIONAL_VALUATION_COLS: tuple = ("sharesoutstanding", "currentprice", "marketcap")
 
-# Columns required by compute_extended_metrics() with hard bracket access.
-_REQUIRED_EXTENDED_COLS: tuple = (
-    "total_revenue",
-    "net_income_common_stockholders",
-    "free_cash_flow",
-    "total_debt",
+# Output columns of compute_valuation_metrics(), in order.
+_VALUATION_METRICS: tuple = (
+    "bvps", "fcf_per_share", "eps", "P/E", "P/B", "P/FCF", "EarningsYield", "FCFYield",
 )
 
-SCORED_METRICS: list = [
-    # Original 11
-    "GrossMargin",
-    "OperatingMargin",
-    "NetProfitMargin",
-    "EBITDAMargin",
-    "ROA",
-    "ROE",
-    "FCFToRevenue",
-    "FCFYield",
-    "FCFtoDebt",
-    "DebtToEquity",
-    "CurrentRatio",
-    # Extended 13 (added by compute_metrics() expansion)
-    "QuickRatio",
-    "CashRatio",
-    "WorkingCapitalRatio",
-    "DebtRatio",
-    "EquityRatio",
-    "NetDebtToEBITDA",
-    "InterestCoverage",
-    "ROIC",
-    "AssetTurnover",
-    "OCFRatio",
-    "FCFMargin",
-    "CashConversion",
-    "CapexRatio",
-]
+
+# ── Ratio kernels ──────────────────────────────────────────────────────────────
+def _float_values(s: pd.Series) -> np.ndarray:
+    """``s`` as a float64 array — a view for float columns, NaN for unparseable cells."""
+    try:
+        return s.to_numpy(dtype=np.float64, na_value=np.nan)
+    except (TypeError, ValueError):
+        return pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+# ── Red-flag rules ─────────────────────────────────────────────────────────────
+# Comparison operators a RedFlagRule may use. NaN operands never raise a flag.
+_RULE_OPS: dict = {
+    "<":  np.less,
+    "<=": np.less_equal,
+    ">":  np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+@dataclass(frozen=True)
+class RedFlagRule:
+    """One declarative red-flag rule: flag rows where ``metric <op> threshold``.
+
+    Attributes
+    ----------
+    metric : str
+        Metric rules: a scored metric name (``"ROE"``) matched against the
+        long-format ``metrics`` column. Raw rules: a column of the merged
+        input frame (``"free_cash_flow"``).
+    op : str
+        One of ``<``, ``<=``, ``>``, ``>=``, ``==``, ``!=``.
+    threshold : float | str
+        A number, or — raw rules only — the name of another input column,
+        compared after multiplying it by ``scale``.
+    label : str
+        Text written to the ``red_flag`` column.
+    scale : float
+        Multiplier applied to a column threshold (``ebitda > 2 * operating_cash_flow``).
+    name : str, optional
+        Raw rules: value written to the ``metrics`` column (defaults to ``metric``).
+    """
+
+    metric: str
+    op: str
+    threshold: float | str
+    label: str
+    scale: float = 1.0
+    name: str | None = None
+
+    def __post_init__(self):
+        if self.op not in _RULE_OPS:
+            raise ValueError(f"unknown operator {self.op!r} — expected one of {sorted(_RULE_OPS)}")
+
+
+# Threshold flags on scored metrics (long format). The first matching rule wins
+# for a row, so order matters when several rules target the same metric.
+_METRIC_RED_FLAG_RULES: tuple = (
+    RedFlagRule("GrossMargin",     "<", 0,    "Negative Gross Margin"),
+    RedFlagRule("OperatingMargin", "<", 0,    "Negative Operating Margin"),
+    RedFlagRule("NetProfitMargin", "<", 0,    "Negative Net Margin"),
+    RedFlagRule("ROA",             "<", 0,    "Negative ROA"),
+    RedFlagRule("ROE",             "<", 0,    "Negative ROE"),
+    RedFlagRule("DebtToEquity",    ">", 2,    "High Debt-to-Equity (>2)"),
+    RedFlagRule("FCFtoDebt",       "<", 0.05, "Insufficient Free Cash Flow to cover debt"),
+)
+
+# Cash-flow quality flags on raw input columns. Every rule is reported
+# independently (one output row per rule and matching input row).
+_RAW_RED_FLAG_RULES: tuple = (
+    RedFlagRule("free_cash_flow",      "<", 0, "Negative Free Cash Flow", name="rrf_fcf"),
+    RedFlagRule("operating_cash_flow", "<", 0, "Negative Operating Cash Flow", name="rrf_ocf"),
+    RedFlagRule("ebitda", ">", "operating_cash_flow",
+                "Earnings quality concern (EBITDA >> OCF)", scale=2.0, name="ebitdaVSocf"),
+)
+
+
+def _rule_mask(d: pd.DataFrame, rule: RedFlagRule, column: str | None = None) -> np.ndarray:
+    """Boolean mask of the rows of ``d`` where ``rule`` fires (NaN operands → False).
+
+    ``column`` overrides the compared column (``"value"`` for long-format metric
+    rows); by default ``rule.metric`` names it. Absent columns never fire.
+    """
+    col = column or rule.metric
+    if col not in d.columns:
+        return np.zeros(len(d), dtype=bool)
+    left = d[col].to_numpy(dtype=float, na_value=np.nan)
+    if isinstance(rule.threshold, str):
+        if rule.threshold not in d.columns:
+            return np.zeros(len(d), dtype=bool)
+        right = d[rule.threshold].to_numpy(dtype=float, na_value=np.nan) * rule.scale
+    else:
+        right = rule.threshold
+    valid = ~np.isnan(left) & ~np.isnan(right)
+    with np.errstate(invalid="ignore"):
+        return valid & _RULE_OPS[rule.op](left, right)
 
 
 class FundamentalMetricsEvaluator:
@@ -128,9 +290,27 @@ class FundamentalMetricsEvaluator:
 
     Construct via ``FundamentalEvaluator`` (the high-level wrapper in
     ``wrappers.py``) rather than directly, unless you need lower-level control.
+
+    ``scoring`` must be ``"absolute"`` (``_SCORE_THRESHOLDS``). The
+    peer-relative modes ``"percentile"`` / ``"zscore"`` rank each value against
+    the other tickers of its sector and fiscal year (see ``crosssection.py``);
+    a single ticker has none, so they are only accepted by
+    ``UniverseMetricsEvaluator``.
+
+    Raises
+    ------
+    ValueError
+        For an unknown or peer-relative ``scoring`` mode.
     """
 
-    def __init__(self, data: pd.DataFrame, weights: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, weights: pd.DataFrame, scoring: str = "absolute"):
+        self.scoring = _scoring_mode(scoring)
+        if self.scoring != "absolute":
+            raise ValueError(
+                f"scoring={scoring!r} ranks each ticker against its sector peers, and a "
+                "single-ticker evaluator has none (every score would be 3.0) — "
+                "use UniverseMetricsEvaluator"
+            )
         self.d = data
         self.metrics = pd.DataFrame()
         self.eval_metrics = pd.DataFrame()
@@ -173,11 +353,27 @@ class FundamentalMetricsEvaluator:
             )
         self.sector = sectors[0]
 
+    def _sector_column(self, d: pd.DataFrame):
+        """Return the sector value(s) to assign to the rows of ``d``.
+
+        Single-ticker evaluation has exactly one sector, so a scalar is returned.
+        Multi-ticker subclasses override this to map each row's ticker to its sector.
+        """
+        return self.sector
+
+    def _sort_for_growth(self, d: pd.DataFrame) -> pd.DataFrame:
+        """Order rows chronologically so pct_change() compares consecutive periods."""
+        return d.sort_values("time").reset_index(drop=True)
+
+    def _pct_change(self, s: pd.Series, d: pd.DataFrame) -> pd.Series:
+        """Period-over-period growth of ``s`` (rows of ``d`` already time-sorted)."""
+        return s.pct_change()
+
     def safe_div(self, num, den) -> np.ndarray:
         try:
-            num = pd.Series(num) if not isinstance(num, pd.Series) else num
-            den = pd.Series(den) if not isinstance(den, pd.Series) else den
-            return np.where((den != 0) & (den.notna()) & (num.notna()), num / den, np.nan)
+            num = np.asarray(num, dtype=np.float64)
+            den = np.asarray(den, dtype=np.float64)
+            return _ratio(np.empty(np.broadcast(num, den).shape), num, den)
         except Exception as e:
             _logger.error(f"[{self.ticker}] safe_div failed: {e}", exc_info=True)
             return np.full(len(num), np.nan)
@@ -205,22 +401,38 @@ class FundamentalMetricsEvaluator:
             )
         return None
 
-    def _fill_missing_cols(self, d: pd.DataFrame, required: tuple) -> pd.DataFrame:
-        """Fill absent required columns — attempt derivation before NaN fallback.
+    def _input_arrays(self, required: tuple, optional: tuple = (), order=None) -> dict:
+        """Read the input columns a compute step needs as float64 arrays — once.
+
+        Only these columns are touched; ``self.d`` is neither copied nor mutated
+        (numeric columns come back as views). ``order`` optionally reorders the
+        rows (a position array, e.g. the growth sort).
 
+        Absent required columns — attempt derivation before NaN fallback.
         For total_debt: tries to compute it from component columns so tickers
         that omit the yfinance aggregate (e.g. TCEHY) still produce valid metrics.
-        Other absent columns are filled with NaN and collected into one WARNING.
+        Other absent required columns are NaN and collected into one WARNING;
+        absent optional columns are NaN silently.
         """
-        missing = [c for c in required if c not in d.columns]
-        if not missing:
-            return d
+        d = self.d
+        n = len(d)
+        arrays = {}
+        missing = []
+        for col in (*required, *optional):
+            if col in arrays:
+                continue
+            if col in d.columns:
+                arrays[col] = _float_values(d[col])
+            elif col in required:
+                missing.append(col)
+            else:
+                arrays[col] = np.full(n, np.nan)
 
         # ── total_debt derivation ──────────────────────────────────────────────
         if "total_debt" in missing:
             derived = self._derive_total_debt(d)
             if derived is not None:
-                d["total_debt"] = derived
+                arrays["total_debt"] = _float_values(derived)
                 missing.remove("total_debt")
                 _logger.debug(
                     "[%s] total_debt derived from component columns (no aggregate provided)",
@@ -236,200 +448,166 @@ class FundamentalMetricsEvaluator:
                 self.ticker, len(missing), missing,
             )
             for col in missing:
-                d[col] = np.nan
-        return d
+                arrays[col] = np.full(n, np.nan)
+
+        if order is not None:
+            arrays = {col: values[order] for col, values in arrays.items()}
+        return arrays
+
+    def _result_frame(self, ids: pd.DataFrame, names: tuple, block: np.ndarray) -> pd.DataFrame:
+        """Wrap the (rows × metrics) output ``block`` as ``ticker, time, <names...>, sector``.
+
+        The block becomes the frame's float data as is (no copy — it is
+        column-major, pandas' own layout); only the id columns are added.
+        """
+        out = pd.DataFrame(block, index=ids.index, columns=list(names), copy=False)
+        out.insert(0, "ticker", ids["ticker"].array)
+        out.insert(1, "time", ids["time"].array)
+        out["sector"] = self._sector_column(out)
+        return out
 
     def compute_valuation_metrics(self):
         try:
-            d = self.d.copy()
-            d = self._fill_missing_cols(d, _REQUIRED_VALUATION_COLS)
+            cols = self.d.columns
+            x = self._input_arrays(_REQUIRED_VALUATION_COLS, _OPTIONAL_VALUATION_COLS)
 
-            if "sharesoutstanding" in d.columns:
-                shares = d["sharesoutstanding"]
-            else:
+            if "sharesoutstanding" not in cols:
                 _logger.warning(
                     f"[{self.ticker}] 'sharesoutstanding' not in data — "
                     "bvps and fcf_per_share will be NaN. "
                     "Merge sharesoutstanding from Downloader.get_info_data() before calling evaluate()."
                 )
-                shares = pd.Series(np.nan, index=d.index)
-
-            _price  = d.get("currentprice", pd.Series(np.nan, index=d.index))
-            _mktcap = d.get("marketcap",    pd.Series(np.nan, index=d.index))
-            if "currentprice" not in d.columns:
+            if "currentprice" not in cols:
                 _logger.warning(
                     f"[{self.ticker}] 'currentprice' not in data — "
                     "P/E, P/B, P/FCF, EarningsYield will be NaN. "
                     "Merge currentprice from Downloader.get_info_data() before calling evaluate()."
                 )
-            if "marketcap" not in d.columns:
+            if "marketcap" not in cols:
                 _logger.warning(
                     f"[{self.ticker}] 'marketcap' not in data — "
                     "FCFYield will be NaN. "
                     "Merge marketcap from Downloader.get_info_data() before calling evaluate()."
                 )
 
-            d['bvps'] = self.safe_div(d["common_stock_equity"], shares)
-            d['fcf_per_share'] = self.safe_div(d["free_cash_flow"], shares)
-            d['eps'] = d['diluted_eps']
+            # One preallocated (rows × metrics) block; column-major so every
+            # metric is a contiguous view the kernels write into.
+            block = np.empty((len(self.d), len(_VALUATION_METRICS)), order="F")
+            m = dict(zip(_VALUATION_METRICS, block.T))
+            shares, price = x["sharesoutstanding"], x["currentprice"]
 
-            d["P/E"] = self.safe_div(_price, d["eps"])
-            d["P/B"] = self.safe_div(_price, d["bvps"])
-            d["P/FCF"] = self.safe_div(_price, d["fcf_per_share"])
-            d["EarningsYield"] = self.safe_div(d["eps"], _price)
-            d["FCFYield"] = self.safe_div(d["free_cash_flow"], _mktcap)
+            _ratio(m["bvps"], x["common_stock_equity"], shares)
+            _ratio(m["fcf_per_share"], x["free_cash_flow"], shares)
+            m["eps"][:] = x["diluted_eps"]
 
-            metric_cols = ["bvps", "fcf_per_share", "eps", "P/E",
-                           "P/B", "P/FCF", "EarningsYield", "FCFYield"]
+            _ratio(m["P/E"], price, m["eps"])
+            _ratio(m["P/B"], price, m["bvps"])
+            _ratio(m["P/FCF"], price, m["fcf_per_share"])
+            _ratio(m["EarningsYield"], m["eps"], price)
+            _ratio(m["FCFYield"], x["free_cash_flow"], x["marketcap"])
 
-            d = d[["ticker", "time"] + metric_cols]
-            d['sector'] = self.sector
-            self.eval_metrics = d
-            return d
+            self.eval_metrics = self._result_frame(self.d, _VALUATION_METRICS, block)
+            return self.eval_metrics
         except Exception as e:
             _logger.error(f"[{self.ticker}] compute_valuation_metrics failed: {e}", exc_info=True)
             return pd.DataFrame()
 
     def compute_metrics(self):
         try:
-            d = self.d.copy()
-
-            # Fill any absent required columns with NaN before formula evaluation.
-            # _fill_missing_cols() emits a single WARNING listing all missing columns,
-            # so a yfinance schema change produces an actionable message rather than
+            # One pass of the compiled formula plan: only the input columns the
+            # formulas read are loaded — as float64 arrays, once — and shared
+            # subexpressions are evaluated once. Absent required columns are NaN;
+            # _input_arrays() emits a single WARNING listing all of them, so a
+            # yfinance schema change produces an actionable message rather than
             # an opaque KeyError swallowed by the except below.
-            d = self._fill_missing_cols(d, _REQUIRED_METRIC_COLS)
-
-            # ── Profitability Margins ─────────────────────────────────────────
-            d["GrossMargin"] = self.safe_div(d["gross_profit"], d["total_revenue"])
-            d["OperatingMargin"] = self.safe_div(d["operating_income"], d["total_revenue"])
-            d["NetProfitMargin"] = self.safe_div(d["net_income_common_stockholders"], d["total_revenue"])
-            d["EBITDAMargin"] = self.safe_div(d["ebitda"], d["total_revenue"])
-
-            # ── Returns ───────────────────────────────────────────────────────
-            d["ROA"] = self.safe_div(d["net_income_common_stockholders"], d["total_assets"])
-            d["ROE"] = self.safe_div(d["net_income_common_stockholders"], d["common_stock_equity"])
-
-            # ── Cash Flow Metrics ─────────────────────────────────────────────
-            d["FCFToRevenue"] = self.safe_div(d["free_cash_flow"], d["total_revenue"])
-            d["FCFYield"] = self.safe_div(
-                d["free_cash_flow"],
-                d.get("marketcap", pd.Series(np.nan, index=d.index)),
-            )
-            d["FCFtoDebt"] = self.safe_div(d["free_cash_flow"], d["total_debt"])
+            plan = self._metric_plan()
+            x = self._input_arrays(plan.required, plan.optional)
+            block = plan.evaluate(x, len(self.d))
+            self.metrics = self._result_frame(self.d, plan.names, block)
+            return self.metrics
+        except Exception as e:
+            _logger.error(f"[{self.ticker}] compute_metrics failed: {e}", exc_info=True)
+            return pd.DataFrame()
 
-            # ── Leverage & Liquidity ──────────────────────────────────────────
-            d["DebtToEquity"] = self.safe_div(d["total_debt"], d["common_stock_equity"])
-            d["CurrentRatio"] = self.safe_div(d["current_assets"], d["current_liabilities"])
+    # Metric formula tables — extend with register_metric().
+    _METRIC_FORMULAS: tuple = _METRIC_FORMULAS
+    _EXTENDED_FORMULAS: tuple = _EXTENDED_FORMULAS
 
-            # ── Liquidity (extended) ──────────────────────────────────────────
-            d["QuickRatio"] = self.safe_div(
-                d["current_assets"] - d.get("inventory", pd.Series(np.nan, index=d.index)),
-                d["current_liabilities"],
-            )
-            d["CashRatio"] = self.safe_div(
-                d.get("cash_and_cash_equivalents", pd.Series(np.nan, index=d.index)),
-                d["current_liabilities"],
-            )
-            d["WorkingCapitalRatio"] = self.safe_div(
-                d.get("working_capital", pd.Series(np.nan, index=d.index)),
-                d["current_assets"],
-            )
+    # Scoring thresholds — class constant derived from _METRIC_FORMULAS, not
+    # rebuilt per call. Four boundary values per metric map to scores 1–5.
+    _SCORE_THRESHOLDS: dict = {f.name: list(f.thresholds) for f in _METRIC_FORMULAS}
 
-            # ── Solvency (extended) ───────────────────────────────────────────
-            d["DebtRatio"] = self.safe_div(d["total_debt"], d["total_assets"])
-            d["EquityRatio"] = self.safe_div(d["common_stock_equity"], d["total_assets"])
-            d["NetDebtToEBITDA"] = self.safe_div(
-                d.get("net_debt", pd.Series(np.nan, index=d.index)),
-                d["ebitda"],
-            )
-            d["InterestCoverage"] = self.safe_div(
-                d.get("ebit", pd.Series(np.nan, index=d.index)),
-                d.get("interest_expense_non_operating", pd.Series(np.nan, index=d.index)),
-            )
+    # Metrics where a lower value is better — score is inverted via 6 - score.
+    _INVERSE_METRICS: frozenset = frozenset(f.name for f in _METRIC_FORMULAS if f.inverse)
 
-            # ── Returns: ROIC (extended) ──────────────────────────────────────
-            _tax  = d.get("tax_rate_for_calcs", pd.Series(np.nan, index=d.index))
-            _ic   = d.get("invested_capital",   pd.Series(np.nan, index=d.index))
-            _ebit = d.get("ebit",               pd.Series(np.nan, index=d.index))
-            d["ROIC"] = self.safe_div(_ebit * (1 - _tax), _ic)
-
-            # ── Efficiency (extended) ─────────────────────────────────────────
-            d["AssetTurnover"] = self.safe_div(d["total_revenue"], d["total_assets"])
-
-            # ── Cash Flow (extended) ──────────────────────────────────────────
-            d["OCFRatio"] = self.safe_div(d["operating_cash_flow"], d["current_liabilities"])
-            d["FCFMargin"] = self.safe_div(d["free_cash_flow"], d["total_revenue"])
-            d["CashConversion"] = self.safe_div(
-                d["operating_cash_flow"],
-                d["net_income_common_stockholders"],
-            )
-            d["CapexRatio"] = self.safe_div(
-                d.get("capital_expenditure", pd.Series(np.nan, index=d.index)),
-                d["operating_cash_flow"],
-            )
+    # Red-flag rule tables — extend with register_red_flag_rule().
+    _METRIC_RED_FLAG_RULES: tuple = _METRIC_RED_FLAG_RULES
+    _RAW_RED_FLAG_RULES: tuple = _RAW_RED_FLAG_RULES
 
-            metric_cols = [
-                # Original 11
-                "GrossMargin", "OperatingMargin", "NetProfitMargin", "EBITDAMargin",
-                "ROA", "ROE", "FCFToRevenue", "FCFYield", "FCFtoDebt",
-                "DebtToEquity", "CurrentRatio",
-                # Extended 13
-                "QuickRatio", "CashRatio", "WorkingCapitalRatio",
-                "DebtRatio", "EquityRatio", "NetDebtToEBITDA", "InterestCoverage",
-                "ROIC",
-                "AssetTurnover",
-                "OCFRatio", "FCFMargin", "CashConversion", "CapexRatio",
-            ]
-
-            d = d[["ticker", "time"] + metric_cols]
-            d['sector'] = self.sector
-            self.metrics = d
-            return d
-        except Exception as e:
-            _logger.error(f"[{self.ticker}] compute_metrics failed: {e}", exc_info=True)
-            return pd.DataFrame()
+    @classmethod
+    def _threshold_table(cls) -> tuple:
+        """Return ``(metric_index, threshold_matrix, inverse_flags)`` for this class.
 
-    # Scoring thresholds — class constant, not rebuilt per call.
-    # Four boundary values per metric map to scores 1–5 via np.digitize.
-    _SCORE_THRESHOLDS: dict = {
-        # Original 11
-        "GrossMargin":         [0.2, 0.3, 0.4, 0.5],
-        "OperatingMargin":     [0.05, 0.1, 0.15, 0.2],
-        "NetProfitMargin":     [0.03, 0.07, 0.12, 0.2],
-        "EBITDAMargin":        [0.1, 0.2, 0.3, 0.4],
-        "ROA":                 [0.02, 0.05, 0.08, 0.12],
-        "ROE":                 [0.05, 0.1, 0.15, 0.2],
-        "FCFToRevenue":        [0.02, 0.05, 0.1, 0.2],
-        "FCFYield":            [0.02, 0.04, 0.06, 0.1],
-        # inverse: lower is better; negative values (negative equity) → score 1 via guard in score_row
-        "DebtToEquity":        [0.5, 1.0, 1.5, 2.0],
-        "CurrentRatio":        [1.0, 1.2, 1.5, 2.0],
-        "FCFtoDebt":           [0.05, 0.1, 0.2, 0.3],
-        # Liquidity (extended)
-        "QuickRatio":          [0.5, 0.8, 1.0, 1.5],
-        "CashRatio":           [0.1, 0.2, 0.5, 1.0],
-        "WorkingCapitalRatio": [0.05, 0.1, 0.2, 0.3],
-        # Solvency (extended)
-        "DebtRatio":           [0.2, 0.4, 0.6, 0.8],   # inverse: lower is better
-        "EquityRatio":         [0.2, 0.4, 0.6, 0.8],
-        "NetDebtToEBITDA":     [1.0, 2.0, 3.0, 5.0],   # inverse: lower is better
-        "InterestCoverage":    [1.5, 3.0, 5.0, 10.0],
-        # Returns (extended)
-        "ROIC":                [0.05, 0.1, 0.15, 0.2],
-        # Efficiency (extended)
-        "AssetTurnover":       [0.3, 0.6, 1.0, 1.5],
-        # Cash Flow (extended)
-        "OCFRatio":            [0.1, 0.2, 0.4, 0.6],
-        "FCFMargin":           [0.02, 0.05, 0.1, 0.2],
-        "CashConversion":      [0.5, 0.8, 1.0, 1.2],
-        "CapexRatio":          [0.1, 0.2, 0.4, 0.6],   # inverse: lower is better
-    }
+        ``threshold_matrix[i]`` holds the four ascending boundaries of
+        ``metric_index[i]``; ``inverse_flags[i]`` marks lower-is-better metrics.
+        Compiled once per class and rebuilt only if ``_SCORE_THRESHOLDS`` or
+        ``_INVERSE_METRICS`` is reassigned (e.g. by a subclass).
+        """
+        cached = cls.__dict__.get("_compiled_thresholds")
+        if (
+            cached is None
+            or cached[0] is not cls._SCORE_THRESHOLDS
+            or cached[1] is not cls._INVERSE_METRICS
+        ):
+            names = pd.Index(list(cls._SCORE_THRESHOLDS))
+            matrix = np.array([cls._SCORE_THRESHOLDS[m] for m in names], dtype=np.float64)
+            inverse = np.array([m in cls._INVERSE_METRICS for m in names], dtype=bool)
+            cached = (cls._SCORE_THRESHOLDS, cls._INVERSE_METRICS, (names, matrix, inverse))
+            cls._compiled_thresholds = cached
+        return cached[2]
+
+    @classmethod
+    def _metric_plan(cls, extended: bool = False) -> MetricPlan:
+        """Compiled plan of this class's ``_METRIC_FORMULAS`` (or ``_EXTENDED_FORMULAS``).
+
+        Cached per class and rebuilt only when the table is reassigned
+        (``register_metric`` or a subclass override), like ``_threshold_table``.
+        """
+        attr = "_EXTENDED_FORMULAS" if extended else "_METRIC_FORMULAS"
+        formulas = getattr(cls, attr)
+        cache_attr = "_compiled" + attr
+        cached = cls.__dict__.get(cache_attr)
+        if cached is None or cached[0] is not formulas:
+            cached = (formulas, compile_plan(tuple(formulas)))
+            setattr(cls, cache_attr, cached)
+        return cached[1]
 
-    # Metrics where a lower value is better — score is inverted via 6 - score.
-    _INVERSE_METRICS: frozenset = frozenset(
-        {"DebtToEquity", "DebtRatio", "NetDebtToEBITDA", "CapexRatio"}
-    )
+    @staticmethod
+    def _score_codes(values: np.ndarray, codes: np.ndarray, table: tuple) -> np.ndarray:
+        """Score ``values`` whose metric is ``codes`` (index into ``table``; -1 = unknown).
+
+        Works on arrays of any shape and replaces the per-metric ``np.digitize``
+        loop: ``1 + count(thresholds <= value)`` equals
+        ``np.digitize(value, thresholds) + 1`` for ascending thresholds.
+        Unknown metrics and NaN values score 3.
+        """
+        names, matrix, inverse = table
+        known = (codes >= 0) & ~np.isnan(values)
+        safe = np.where(codes >= 0, codes, 0)
+        raw = np.ones(values.shape, dtype=np.int64)
+        # One pass per threshold column (4), not per metric (24): gather each
+        # row's boundary with np.take and count the boundaries it reaches.
+        with np.errstate(invalid="ignore"):
+            for bound in matrix.T:
+                raw += values >= np.take(bound, safe)
+        raw = np.where(np.take(inverse, safe), 6 - raw, raw)
+        scores = np.where(known, raw, 3)
+        # P1-1 guard: negative book equity → negative D/E ratio → maximum risk.
+        # Applied after the inversion so it cannot be overridden.
+        if "DebtToEquity" in names:
+            dte = names.get_loc("DebtToEquity")
+            scores[known & (codes == dte) & (values < 0)] = 1
+        return scores
 
     def _score_metric(self, df):
         """
@@ -437,40 +615,98 @@ class FundamentalMetricsEvaluator:
 
         Returns a new DataFrame — does not mutate the input.
 
-        Vectorized implementation: one np.digitize call per metric name rather than
-        one Python function call per row.  This eliminates the row-by-row apply()
-        overhead and removes the closure over self, making the method independently
-        testable and picklable for ProcessPoolExecutor use.
+        Single pass: the metrics column is factorized to codes of the precompiled
+        threshold table once, then every row is scored in one vectorized
+        comparison (see ``_score_codes``) — no per-metric mask over the frame.
 
         Scoring rules
         -------------
         - NaN value or unknown metric name → neutral score 3
         - DebtToEquity < 0 (negative book equity) → maximum risk score 1 (P1-1 guard)
-        - Known metric → np.digitize against 4 thresholds → raw score 1–5
+        - Known metric → digitize against 4 thresholds → raw score 1–5
           inverse metrics (_INVERSE_METRICS) → 6 - raw_score
         """
         df = df.copy()
-        # Default: score 3 (neutral) for NaN values and metrics not in _SCORE_THRESHOLDS.
-        scores = pd.Series(3, index=df.index, dtype=np.int64)
+        table = self._threshold_table()
+        # Factorize once, then look up only the distinct names (NaN code -1 → -1).
+        row_codes, uniques = pd.factorize(df['metrics'])
+        codes = np.append(table[0].get_indexer(uniques), -1)[row_codes]
+        values = df['value'].to_numpy(dtype=np.float64, na_value=np.nan)
+        df['score'] = pd.Series(self._score_codes(values, codes, table), index=df.index)
+        return df
 
-        non_null = df['value'].notna()
+    def _score_wide(self, metrics: pd.DataFrame) -> pd.DataFrame:
+        """Score the wide ``metrics`` frame directly — no melt to long format.
 
-        for metric_name, thresholds in self._SCORE_THRESHOLDS.items():
-            mask = non_null & (df['metrics'] == metric_name)
-            if not mask.any():
-                continue
-            raw = (np.digitize(df.loc[mask, 'value'].to_numpy(), thresholds) + 1).astype(np.int64)
-            if metric_name in self._INVERSE_METRICS:
-                raw = 6 - raw
-            scores.loc[mask] = raw
+        Returns the id columns (ticker, time, and sector when present) followed
+        by one int64 score column per metric column, with the same scores
+        ``_score_metric`` assigns to the melted rows.
+        """
+        id_cols = [c for c in ("ticker", "time", "sector") if c in metrics.columns]
+        metric_cols = [c for c in metrics.columns if c not in id_cols]
+        table = self._threshold_table()
+        codes = table[0].get_indexer(metric_cols).astype(np.intp)
+        values = metrics[metric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        scores = self._score_codes(values, np.broadcast_to(codes, values.shape), table)
+        return pd.concat(
+            [metrics[id_cols], pd.DataFrame(scores, index=metrics.index, columns=metric_cols)],
+            axis=1,
+        )
 
-        # P1-1 guard: negative book equity → negative D/E ratio → maximum risk.
-        # Must run after the threshold loop so the inversion (above) cannot override it.
-        neg_dte = non_null & (df['metrics'] == 'DebtToEquity') & (df['value'] < 0)
-        scores.loc[neg_dte] = 1
+    def _score_cross_sectional(self, metrics: pd.DataFrame, mode: str) -> pd.DataFrame:
+        """Peer-relative counterpart of ``_score_wide`` (same layout, float scores).
 
-        df['score'] = scores
-        return df
+        Every metric column is ranked within its row's (sector, fiscal year)
+        group in one grouped pass and mapped to 1–5 by ``mode``
+        (``"percentile"`` or ``"zscore"``); ``_INVERSE_METRICS`` are flipped and
+        the negative-equity DebtToEquity guard still scores 1.
+        """
+        id_cols = [c for c in ("ticker", "time", "sector") if c in metrics.columns]
+        metric_cols = [c for c in metrics.columns if c not in id_cols]
+        values = metrics[metric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        percentile, zscore = cross_sectional_stats(
+            values, peer_groups(metrics["sector"], metrics["time"])
+        )
+        inverse = np.isin(metric_cols, list(self._INVERSE_METRICS))
+        if mode == "percentile":
+            scores = percentile_scores(percentile, inverse)
+        else:
+            scores = zscore_scores(zscore, inverse)
+        if "DebtToEquity" in metric_cols:
+            j = metric_cols.index("DebtToEquity")
+            with np.errstate(invalid="ignore"):
+                scores[values[:, j] < 0, j] = 1.0
+        return pd.concat(
+            [metrics[id_cols], pd.DataFrame(scores, index=metrics.index, columns=metric_cols)],
+            axis=1,
+        )
+
+    def _scores_wide(self, metrics: pd.DataFrame) -> pd.DataFrame:
+        """Wide score frame from the source chosen by ``self.scoring``."""
+        if self.scoring == "absolute":
+            return self._score_wide(metrics)
+        return self._score_cross_sectional(metrics, self.scoring)
+
+    def compute_cross_sectional(self, stat: str = "percentile") -> pd.DataFrame:
+        """Peer-relative statistic of every scored metric, shaped like ``metrics``.
+
+        ``stat="percentile"`` gives each value's mid-rank percentile (0–1) among
+        the rows with the same sector and fiscal year; ``stat="zscore"`` its
+        z-score within that group. NaN where the value is missing (or, for
+        z-scores, the group has fewer than two values).
+        """
+        if stat not in ("percentile", "zscore"):
+            raise ValueError(f"Unknown stat {stat!r} — expected 'percentile' or 'zscore'")
+        if self.metrics is None or self.metrics.empty:
+            self.compute_metrics()
+        m = self.metrics
+        id_cols = [c for c in ("ticker", "time", "sector") if c in m.columns]
+        metric_cols = [c for c in m.columns if c not in id_cols]
+        values = m[metric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        percentile, zscore = cross_sectional_stats(values, peer_groups(m["sector"], m["time"]))
+        out = m.copy(deep=False)
+        out[metric_cols] = percentile if stat == "percentile" else zscore
+        return out
 
     def compute_scores(self):
         try:
@@ -485,8 +721,13 @@ class FundamentalMetricsEvaluator:
                 var_name="metrics",
                 value_name="value"
             )
-            scored = self._score_metric(df)
-            scored['sector'] = self.sector
+            if self.scoring == "absolute":
+                scored = self._score_metric(df)
+            else:
+                # Same melt order, so the peer-relative scores line up row for row.
+                scored = df.assign(score=self._scores_wide(self.metrics)[scored_cols]
+                                   .to_numpy().ravel(order="F"))
+            scored['sector'] = self._sector_column(scored)
             self.metric_scores = scored
             return scored
         except Exception as e:
@@ -494,27 +735,28 @@ class FundamentalMetricsEvaluator:
             return pd.DataFrame()
 
     def raw_red_flags(self):
-        try:
-            _cols = ["ticker", "time", "free_cash_flow", "operating_cash_flow", "ebitda"]
-            d = self.d.reindex(columns=_cols).copy()
-
-            d["rrf_fcf"] = np.where(d["free_cash_flow"] < 0, "Negative Free Cash Flow", None)
-            d["rrf_ocf"] = np.where(d["operating_cash_flow"] < 0, "Negative Operating Cash Flow", None)
-            d["ebitdaVSocf"] = np.where(
-                (d["ebitda"].notna()) & (d["operating_cash_flow"].notna()) &
-                (d["ebitda"] > 2 * d["operating_cash_flow"]),
-                "Earnings quality concern (EBITDA >> OCF)",
-                None
-            )
+        """Evaluate ``_RAW_RED_FLAG_RULES`` against the merged input columns.
 
-            d = d.melt(
-                id_vars=["ticker", "time"],
-                value_vars=["rrf_fcf", "rrf_ocf", "ebitdaVSocf"],
-                var_name="metrics",
-                value_name="red_flag"
-            )
-
-            return d[d["red_flag"].notna()]
+        Returns a long DataFrame (ticker, time, metrics, red_flag) with one row per
+        rule and matching input row, grouped by rule in registration order. A rule
+        whose column is absent from the input never fires.
+        """
+        try:
+            rules = self._RAW_RED_FLAG_RULES
+            n = len(self.d)
+            keys = self.d.reindex(columns=["ticker", "time"])
+            parts = []
+            for i, rule in enumerate(rules):
+                mask = _rule_mask(self.d, rule)
+                hit = np.flatnonzero(mask)
+                part = keys.iloc[hit].copy()
+                part.index = pd.RangeIndex(n)[hit] + i * n
+                part["metrics"] = rule.name or rule.metric
+                part["red_flag"] = rule.label
+                parts.append(part)
+            if not parts:
+                return pd.DataFrame(columns=["ticker", "time", "metrics", "red_flag"])
+            return pd.concat(parts)
         except Exception as e:
             _logger.error(f"[{self.ticker}] raw_red_flags failed: {e}", exc_info=True)
             return pd.DataFrame()
@@ -527,64 +769,31 @@ class FundamentalMetricsEvaluator:
         are either time-differential (pct_change) or derived chains (e.g., CCC)
         that lack universal thresholds appropriate for 1–5 scoring.
 
-        Groups returned
+        Groups returned (``_EXTENDED_FORMULAS``, plus any ``register_metric(...,
+        extended=True)`` additions)
         ---------------
         Efficiency chain  : ReceivablesTurnover, DSO, InventoryTurnover, DIO,
                             PayablesTurnover, DPO, CCC
         Growth            : RevenueGrowth, NetIncomeGrowth, FCFGrowth
         Red-flag ratios   : Accruals, DebtGrowth, Dilution, CapexToDepreciation
 
-        Invariant: self.d is sorted by time on a copy before pct_change() to
-        guarantee chronological ordering. self.d is never mutated.
+        Invariant: rows are put in chronological order (``_sort_for_growth`` on
+        the ticker/time keys) before pct_change(). self.d is never mutated or copied.
         """
         try:
-            d = self.d.copy().sort_values("time").reset_index(drop=True)
-            d = self._fill_missing_cols(d, _REQUIRED_EXTENDED_COLS)
-
-            _recv   = d.get("accounts_receivable",               pd.Series(np.nan, index=d.index))
-            _inv    = d.get("inventory",                          pd.Series(np.nan, index=d.index))
-            _pay    = d.get("accounts_payable",                   pd.Series(np.nan, index=d.index))
-            _cogs   = d.get("cost_of_revenue",                    pd.Series(np.nan, index=d.index))
-            _capex  = d.get("capital_expenditure",                pd.Series(np.nan, index=d.index))
-            _da     = d.get("depreciation_amortization_depletion", pd.Series(np.nan, index=d.index))
-            _shares = d.get("ordinary_shares_number",             pd.Series(np.nan, index=d.index))
-
-            # ── Efficiency chain (working-capital turnover) ───────────────────
-            d["ReceivablesTurnover"] = self.safe_div(d["total_revenue"], _recv)
-            d["DSO"]                 = self.safe_div(_recv * 365, d["total_revenue"])
-            d["InventoryTurnover"]   = self.safe_div(_cogs, _inv)
-            d["DIO"]                 = self.safe_div(_inv * 365, _cogs)
-            d["PayablesTurnover"]    = self.safe_div(_cogs, _pay)
-            d["DPO"]                 = self.safe_div(_pay * 365, _cogs)
-            d["CCC"] = np.where(
-                pd.isna(d["DSO"]) | pd.isna(d["DIO"]) | pd.isna(d["DPO"]),
-                np.nan,
-                d["DSO"] + d["DIO"] - d["DPO"],
-            )
+            # Sort only the (ticker, time) keys and carry each row's position,
+            # so the value columns are gathered once in growth order.
+            keys = self.d[["ticker", "time"]].assign(_row=np.arange(len(self.d)))
+            keys = self._sort_for_growth(keys)
+            order = keys.pop("_row").to_numpy()
+            plan = self._metric_plan(extended=True)
+            x = self._input_arrays(plan.required, plan.optional, order=order)
 
-            # ── Growth rates ──────────────────────────────────────────────────
-            d["RevenueGrowth"]   = d["total_revenue"].pct_change()
-            d["NetIncomeGrowth"] = d["net_income_common_stockholders"].pct_change()
-            d["FCFGrowth"]       = d["free_cash_flow"].pct_change()
+            def growth(values):
+                return self._pct_change(pd.Series(values, copy=False), keys).to_numpy()
 
-            # ── Red-flag ratios ───────────────────────────────────────────────
-            d["Accruals"] = self.safe_div(
-                d["net_income_common_stockholders"] - d["operating_cash_flow"],
-                d["total_assets"],
-            )
-            d["DebtGrowth"] = d["total_debt"].pct_change()
-            d["Dilution"]   = _shares.pct_change()
-            d["CapexToDepreciation"] = self.safe_div(_capex.abs(), _da)
-
-            result_cols = [
-                "ReceivablesTurnover", "DSO", "InventoryTurnover", "DIO",
-                "PayablesTurnover", "DPO", "CCC",
-                "RevenueGrowth", "NetIncomeGrowth", "FCFGrowth",
-                "Accruals", "DebtGrowth", "Dilution", "CapexToDepreciation",
-            ]
-            out = d[["ticker", "time"] + result_cols].copy()
-            out["sector"] = self.sector
-            return out
+            block = plan.evaluate(x, len(keys), growth=growth)
+            return self._result_frame(keys, plan.names, block)
 
         except Exception as e:
             _logger.error(
@@ -595,35 +804,93 @@ class FundamentalMetricsEvaluator:
     def _metrics_red_flags(self, df):
         """Add red flag names to a long-format DataFrame with 'metrics' and 'value' columns.
 
-        Returns a new DataFrame — does not mutate the input.
+        Returns a new DataFrame — does not mutate the input — holding only the
+        flagged rows.
+
+        Vectorized over ``_METRIC_RED_FLAG_RULES``: one boolean mask per rule
+        instead of one Python call per row. A row takes the label of the first
+        rule that matches it; NaN values are never flagged.
         """
-        df = df.copy()
+        metrics = df["metrics"].to_numpy()
+        labels = np.full(len(df), None, dtype=object)
+        unset = np.ones(len(df), dtype=bool)
+        by_metric: dict = {}
+        for rule in self._METRIC_RED_FLAG_RULES:
+            if rule.metric not in by_metric:
+                by_metric[rule.metric] = metrics == rule.metric
+            mask = unset & by_metric[rule.metric] & _rule_mask(df, rule, column="value")
+            labels[mask] = rule.label
+            unset &= ~mask
+
+        flagged = ~unset
+        out = df.loc[flagged].reset_index(drop=True)
+        out["red_flag"] = labels[flagged].tolist() if flagged.any() else pd.Series(dtype=object)
+        return out
+
+    @classmethod
+    def register_red_flag_rule(cls, rule: RedFlagRule, raw: bool = False) -> None:
+        """Append ``rule`` to this class's metric rules (or raw rules when ``raw=True``).
+
+        Registration is per class: registering on a subclass leaves the parent's
+        table untouched, while registering on FundamentalMetricsEvaluator also
+        reaches subclasses that have not registered rules of their own.
+
+        Rules are class state of the current process — register them at import
+        time of your module so ProcessPoolExecutor workers see them as well.
 
-        def single_metric_flag(row):
-            metric, value = row["metrics"], row["value"]
-            if pd.isna(value):
-                return None
-
-            if metric == "GrossMargin" and value < 0:
-                return "Negative Gross Margin"
-            if metric == "OperatingMargin" and value < 0:
-                return "Negative Operating Margin"
-            if metric == "NetProfitMargin" and value < 0:
-                return "Negative Net Margin"
-            if metric == "ROA" and value < 0:
-                return "Negative ROA"
-            if metric == "ROE" and value < 0:
-                return "Negative ROE"
-            if metric == "DebtToEquity" and value > 2:
-                return "High Debt-to-Equity (>2)"
-            if metric == "FCFtoDebt" and value < 0.05:
-                return "Insufficient Free Cash Flow to cover debt"
-            return None
-
-        df["red_flag"] = df.apply(single_metric_flag, axis=1)
-        df = df[df["red_flag"].notna()].reset_index(drop=True)
+        Raises
+        ------
+        ValueError
+            A metric rule with a column-name threshold (only raw rules compare
+            two columns).
+        """
+        attr = "_RAW_RED_FLAG_RULES" if raw else "_METRIC_RED_FLAG_RULES"
+        if not raw and isinstance(rule.threshold, str):
+            raise ValueError(
+                f"metric rule {rule.metric!r} has a column threshold {rule.threshold!r} — "
+                "column comparisons are only supported for raw rules (raw=True)"
+            )
+        setattr(cls, attr, tuple(getattr(cls, attr)) + (rule,))
 
-        return df
+    @classmethod
+    def register_metric(cls, formula: MetricFormula, extended: bool = False) -> None:
+        """Append ``formula`` to this class's scored metrics (or the unscored
+        ``compute_extended_metrics`` table when ``extended=True``).
+
+        A scored metric joins ``compute_metrics()``, its thresholds and inverse
+        flag join ``_SCORE_THRESHOLDS`` / ``_INVERSE_METRICS``, and it enters the
+        composite with the sector weight given to it (e.g.
+        ``build_weights(sector, overrides={name: weight})``); without a weight it
+        is excluded from the composite and logged. Registration is per class,
+        like ``register_red_flag_rule``, and is class state of the current process.
+
+        Raises
+        ------
+        ValueError
+            Name already defined on this class; a scored metric without
+            thresholds, or an extended metric with them.
+        """
+        taken = {f.name for f in (*cls._METRIC_FORMULAS, *cls._EXTENDED_FORMULAS)}
+        if formula.name in taken:
+            raise ValueError(f"metric {formula.name!r} is already defined")
+        if extended:
+            if formula.thresholds is not None:
+                raise ValueError(
+                    f"extended metric {formula.name!r} has thresholds — extended metrics "
+                    "are unscored; register it with extended=False to score it"
+                )
+            attr = "_EXTENDED_FORMULAS"
+        else:
+            if formula.thresholds is None:
+                raise ValueError(f"scored metric {formula.name!r} needs thresholds")
+            attr = "_METRIC_FORMULAS"
+        formulas = tuple(getattr(cls, attr)) + (formula,)
+        compile_plan(formulas)      # validate (expressions, duplicates) before mutating
+        setattr(cls, attr, formulas)
+        if not extended:
+            cls._SCORE_THRESHOLDS = {**cls._SCORE_THRESHOLDS, formula.name: list(formula.thresholds)}
+            if formula.inverse:
+                cls._INVERSE_METRICS = cls._INVERSE_METRICS | {formula.name}
 
     @staticmethod
     def _compute_composite_scores(df: pd.DataFrame) -> pd.DataFrame:
@@ -648,6 +915,96 @@ class FundamentalMetricsEvaluator:
         composite["composite_score"] = composite["total_weighted_score"] / composite["total_weight"]
         return composite[["sector", "ticker", "time", "composite_score"]]
 
+    def _sector_weight_matrix(self, sectors: pd.Series, metric_cols: list) -> np.ndarray:
+        """Row-aligned weights: ``out[i, j]`` is the weight of ``metric_cols[j]`` in
+        the sector of row ``i`` (NaN when the sector has no weight for it).
+
+        Duplicate (sector, metrics) weight rows are summed — what the long path's
+        merge did implicitly by duplicating the scored rows.
+        """
+        table = (
+            self.weights.groupby(["sector", "metrics"])["weights"].sum(min_count=1)
+            .unstack("metrics")
+            .reindex(columns=metric_cols)
+        )
+        return table.reindex(sectors.to_numpy()).to_numpy(dtype=np.float64)
+
+    def _composite_scores_wide(self, m: pd.DataFrame) -> pd.DataFrame:
+        """Composite scores straight from the wide ``metrics`` frame.
+
+        Same output as melt → ``_score_metric`` → merge(weights) →
+        ``_compute_composite_scores``, without the long intermediate or the merge:
+        the wide score matrix (``_score_wide``) is multiplied row-wise with each
+        row's sector weight vector. Metrics without a weight for a row's sector
+        are excluded from that row's composite, and logged unless the weights
+        registry already reported the gap (``weights.attrs["missing_metrics"]``).
+        Scores come from ``self.scoring`` — absolute thresholds or peer-relative.
+        """
+        scored = self._scores_wide(m)
+        id_cols = ["ticker", "time", "sector"]
+        metric_cols = [c for c in scored.columns if c not in id_cols]
+        weights = self._sector_weight_matrix(m["sector"], metric_cols)
+
+        has_weight = ~np.isnan(weights)
+        # Gaps a WeightsRegistry already reported when it built the frame are not
+        # repeated here — only (sector, metric) gaps it did not know about.
+        reported = self.weights.attrs.get("missing_metrics", {})
+        sectors = m["sector"].to_numpy()
+        missing_weights = [
+            c for j, c in enumerate(metric_cols)
+            if not has_weight[:, j].all()
+            and any(c not in reported.get(s, ()) for s in pd.unique(sectors[~has_weight[:, j]]))
+        ]
+        if missing_weights:
+            _logger.warning(
+                f"[{self.ticker}] Metrics missing weights after merge: {missing_weights}. "
+                "These metrics will be excluded from the composite score."
+            )
+
+        weights = np.where(has_weight, weights, 0.0)
+        scores = scored[metric_cols].to_numpy(dtype=np.float64)
+        totals = m[id_cols].copy()
+        totals["total_weighted_score"] = np.einsum("ij,ij->i", scores, weights)
+        totals["total_weight"] = weights.sum(axis=1)
+        # groupby (not a plain sort) keeps the long path's semantics exactly:
+        # sorted keys, NaN keys dropped, duplicate (ticker, time) rows pooled.
+        composite = totals.groupby(id_cols, as_index=False).agg(
+            total_weighted_score=("total_weighted_score", "sum"),
+            total_weight=("total_weight", "sum"),
+        )
+        composite["composite_score"] = composite["total_weighted_score"] / composite["total_weight"]
+        return composite[["sector", "ticker", "time", "composite_score"]]
+
+    def _metrics_red_flags_wide(self, m: pd.DataFrame) -> pd.DataFrame:
+        """Metric red flags straight from the wide ``metrics`` frame.
+
+        Returns (ticker, time, metrics, red_flag) with the same rows, labels and
+        order as ``_metrics_red_flags`` on the melted frame (metric-major, then
+        row order) — each rule is a mask on its metric's column, so only the
+        flagged cells are ever materialized in long form.
+        """
+        id_cols = ("ticker", "time", "sector")
+        metric_cols = [c for c in m.columns if c not in id_cols]
+        position = {c: j for j, c in enumerate(metric_cols)}
+        labels = np.full((len(m), len(metric_cols)), None, dtype=object)
+        unset = np.ones(labels.shape, dtype=bool)
+        for rule in self._METRIC_RED_FLAG_RULES:
+            j = position.get(rule.metric)
+            if j is None:
+                continue
+            mask = unset[:, j] & _rule_mask(m, rule)
+            labels[mask, j] = rule.label
+            unset[mask, j] = False
+
+        cols, rows = np.nonzero(~unset.T)
+        out = pd.DataFrame({
+            "ticker": m["ticker"].iloc[rows].reset_index(drop=True),
+            "time": m["time"].iloc[rows].reset_index(drop=True),
+            "metrics": pd.Series(pd.Index(metric_cols).take(cols)),
+        })
+        out["red_flag"] = labels[rows, cols].tolist() if len(rows) else pd.Series(dtype=object)
+        return out
+
     def evaluate(self):
         """
         Evaluate financial metrics, compute scores, detect red flags, and return a summary.
@@ -679,27 +1036,10 @@ class FundamentalMetricsEvaluator:
             ev = self.compute_valuation_metrics()
             d = self.raw_red_flags()
 
-            _id_vars = {"ticker", "time", "sector"}
-            scored_cols = [c for c in m.columns if c not in _id_vars]
-            m_long = m.melt(
-                id_vars=["ticker", "time"],
-                value_vars=scored_cols,
-                var_name="metrics",
-                value_name="value"
-            )
-
-            s = self._score_metric(m_long)
-            s = s.merge(self.weights, how="left", on="metrics")
-            missing_weights = s[s["weights"].isna()]["metrics"].unique().tolist()
-            if missing_weights:
-                _logger.warning(
-                    f"[{self.ticker}] Metrics missing weights after merge: {missing_weights}. "
-                    "These metrics will be excluded from the composite score."
-                )
-
-            self.scores = self._compute_composite_scores(s)
-            rf = self._metrics_red_flags(m_long)
-            self.red_flags = rf[["ticker", "time", "metrics", "red_flag"]]
+            # Wide path: composites and red flags come straight from the wide
+            # metrics frame — no long (ticker × time × metric) intermediate.
+            self.scores = self._composite_scores_wide(m)
+            self.red_flags = self._metrics_red_flags_wide(m)
             ext = self.compute_extended_metrics()
 
             return {
@@ -0,0 +1,237 @@
+"""exporters.py — pluggable writers and readers for exported result frames.
+
+Provides:
+  ResultFormat       — one export format: file extension, writer, reader, the
+                       modules it needs and its read-speed rank.
+  register_format()  — add or replace a format (``"xlsx"``, ``"parquet"``,
+                       ``"arrow"`` and ``"csv"`` are built in).
+  available_formats() — registered formats whose dependencies are installed,
+                       fastest reader first.
+  write_frames()     — write ``{key: DataFrame}`` as ``<output_dir>/<key>.<ext>``
+                       for every requested format, all (key, format) writes in
+                       parallel threads; exports of the key in other formats
+                       are removed so they cannot be read back stale.
+  read_frame()       — read ``<input_dir>/<key>.<ext>`` in the fastest format
+                       present (or the one requested).
+
+Excel worksheets hold at most ``EXCEL_MAX_ROWS`` rows (header included); larger
+frames continue on ``<sheet_name>_2``, ``<sheet_name>_3`` … and the xlsx reader
+joins them back in order. Files are written to a temporary name and moved into
+place, so a reader never sees a half-written export.
+
+Identifier columns (``ticker``, ``time``, ``sector`` …) are read back as strings
+from every format (read_frame casts whatever the reader returns), so a frame
+reads the same whichever format it came from.
+
+Depends on: pandas; pyarrow (parquet, arrow) and openpyxl (xlsx) are imported
+by pandas only when their format is used.
+"""
+import importlib.util
+import logging as _logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+import pandas as pd
+
+_logger = _logging.getLogger(__name__)
+
+EXCEL_MAX_ROWS = 1_048_576
+# Identifier columns, read back as text. Excel and CSV parse them as text directly
+# (they would otherwise turn "2023" into a number); read_frame casts the rest.
+_TEXT_DTYPES = {c: "str" for c in ("ticker", "time", "sector", "metrics", "red_flag", "company_name")}
+
+
+@dataclass(frozen=True)
+class ResultFormat:
+    """An export format: ``write(df, path, sheet_name)`` / ``read(path, sheet_name)``."""
+
+    name: str
+    extension: str
+    write: Callable
+    read: Callable
+    requires: tuple = ()
+    rank: int = 50           # lower reads faster; read_frame prefers the lowest
+
+    @property
+    def available(self) -> bool:
+        return all(importlib.util.find_spec(module) is not None for module in self.requires)
+
+
+# ── built-in formats ─────────────────────────────────────────────────────────
+
+def _sheet_names(sheet_name: str, n: int) -> list[str]:
+    return [sheet_name] + [f"{sheet_name}_{i}" for i in range(2, n + 1)]
+
+
+def _write_xlsx(df: pd.DataFrame, path: str, sheet_name: str) -> None:
+    limit = EXCEL_MAX_ROWS - 1                    # one row per sheet for the header
+    starts = range(0, max(len(df), 1), limit)
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for name, start in zip(_sheet_names(sheet_name, len(starts)), starts):
+            df.iloc[start:start + limit].to_excel(writer, sheet_name=name, index=False)
+    if len(starts) > 1:
+        _logger.info("%s: %d rows split over %d sheets", path, len(df), len(starts))
+
+
+def _read_xlsx(path: str, sheet_name: str) -> pd.DataFrame:
+    with pd.ExcelFile(path, engine="openpyxl") as book:
+        parts = [book.parse(sheet_name, dtype=_TEXT_DTYPES)]
+        for name in _sheet_names(sheet_name, len(book.sheet_names))[1:]:
+            if name not in book.sheet_names:
+                break
+            parts.append(book.parse(name, dtype=_TEXT_DTYPES))
+    return parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+
+
+def _read_csv(path: str, sheet_name: str) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=_TEXT_DTYPES)
+
+
+def _write_parquet(df: pd.DataFrame, path: str, sheet_name: str) -> None:
+    df.to_parquet(path, index=False)
+
+
+def _write_arrow(df: pd.DataFrame, path: str, sheet_name: str) -> None:
+    df.reset_index(drop=True).to_feather(path)
+
+
+_FORMATS: dict[str, ResultFormat] = {}
+
+
+def register_format(fmt: ResultFormat) -> None:
+    """Add ``fmt`` to the registry (replacing a format of the same name)."""
+    _FORMATS[fmt.name] = fmt
+
+
+for _fmt in (
+    ResultFormat("arrow", ".arrow", _write_arrow,
+                 lambda path, sheet_name: pd.read_feather(path), ("pyarrow",), rank=0),
+    ResultFormat("parquet", ".parquet", _write_parquet,
+                 lambda path, sheet_name: pd.read_parquet(path), ("pyarrow",), rank=1),
+    ResultFormat("csv", ".csv", lambda df, path, sheet_name: df.to_csv(path, index=False),
+                 _read_csv, rank=2),
+    ResultFormat("xlsx", ".xlsx", _write_xlsx, _read_xlsx, ("openpyxl",), rank=3),
+):
+    register_format(_fmt)
+
+
+def available_formats() -> list[str]:
+    """Names of the usable formats, fastest reader first."""
+    usable = [f for f in _FORMATS.values() if f.available]
+    return [f.name for f in sorted(usable, key=lambda f: f.rank)]
+
+
+def _format(name: str) -> ResultFormat:
+    try:
+        return _FORMATS[name]
+    except KeyError:
+        raise ValueError(f"Unknown export format {name!r} — expected one of {sorted(_FORMATS)}") from None
+
+
+# ── write / read ─────────────────────────────────────────────────────────────
+
+def _identifiers_as_text(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the identifier columns of ``df`` to strings, keeping nulls (in place)."""
+    for name in _TEXT_DTYPES:
+        if name not in df.columns or pd.api.types.is_string_dtype(df[name].dtype):
+            continue
+        col = df[name]
+        if pd.api.types.is_float_dtype(col.dtype) and (col.dropna() % 1 == 0).all():
+            col = col.astype("Int64")             # 2023.0 → "2023"
+        df[name] = col.astype("str").where(col.notna())
+    return df
+
+
+def _remove_stale(output_dir: str, key: str, written: list) -> None:
+    # Every export of ``key`` not written just now — other formats, and requested
+    # formats whose write failed — is older than what was written.
+    for fmt in _FORMATS.values():
+        path = os.path.join(output_dir, f"{key}{fmt.extension}")
+        if path not in written and os.path.isfile(path):
+            os.remove(path)
+            _logger.info("Removed stale export %s", path)
+
+
+def _write_one(fmt: ResultFormat, df: pd.DataFrame, path: str, sheet_name: str) -> str:
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.tmp{ext}"                      # keep the extension for the writer
+    try:
+        fmt.write(df, tmp, sheet_name)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    _logger.info("Data exported to %s", path)
+    return path
+
+
+def write_frames(
+    frames: dict,
+    output_dir: str,
+    formats=("xlsx",),
+    sheet_name: str = "sheet1",
+    max_workers: int | None = None,
+) -> dict:
+    """Write every frame in every format; return ``{key: [paths written]}``.
+
+    The (key, format) writes run in a thread pool (``max_workers`` threads,
+    default one per write up to the CPU count). A failed write is logged and
+    left out of the returned paths; the other writes are unaffected.
+
+    Once a key has been written, its other exports are deleted — files in
+    registered formats outside ``formats`` and the previous file of any
+    format whose write failed: read_frame prefers the fastest format present,
+    and an older Parquet file must not shadow a newer Excel one.
+
+    Raises
+    ------
+    ValueError
+        If a format is not registered.
+    """
+    fmts = [_format(name) for name in formats]
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [
+        (key, fmt, df, os.path.join(output_dir, f"{key}{fmt.extension}"))
+        for key, df in frames.items()
+        for fmt in fmts
+    ]
+    written = {key: [] for key in frames}
+    if not tasks:
+        return written
+    workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            (key, fmt, pool.submit(_write_one, fmt, df, path, sheet_name))
+            for key, fmt, df, path in tasks
+        ]
+        for key, fmt, future in futures:
+            try:
+                written[key].append(future.result())
+            except Exception as e:
+                _logger.error("Failed to export %r as %s: %s", key, fmt.name, e, exc_info=True)
+    for key, paths in written.items():
+        if paths:
+            _remove_stale(output_dir, key, paths)
+    return written
+
+
+def read_frame(input_dir: str, key: str, sheet_name: str = "sheet1", fmt: str | None = None) -> pd.DataFrame:
+    """Read ``<input_dir>/<key>`` in format ``fmt``, or the fastest one present.
+
+    Identifier columns come back as strings whichever format is read.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no export of ``key`` exists (in ``fmt``, when given).
+    """
+    candidates = [_format(fmt)] if fmt is not None else [_FORMATS[n] for n in available_formats()]
+    for candidate in candidates:
+        path = os.path.join(input_dir, f"{key}{candidate.extension}")
+        if os.path.isfile(path):
+            return _identifiers_as_text(candidate.read(path, sheet_name))
+    raise FileNotFoundError(f"No export of {key!r} in {input_dir} "
+                            f"(looked for {[c.extension for c in candidates]})")
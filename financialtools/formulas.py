@@ -0,0 +1,242 @@
+"""formulas.py — declarative metric formulas compiled into one evaluation plan.
+
+Provides:
+  MetricFormula  — one metric, declared once: numerator and optional denominator
+                   expressions over input columns (or earlier metrics), the columns
+                   whose absence deserves a warning, and — for scored metrics —
+                   the four score thresholds and the lower-is-better flag.
+  MetricPlan     — a tuple of formulas compiled into a flat program: every input
+                   column is loaded once, every distinct subexpression (``ebit``,
+                   ``total_revenue``, ``current_assets - inventory`` ...) is
+                   evaluated once, and each metric is one vectorized kernel writing
+                   into its column of a preallocated (rows × metrics) block.
+  compile_plan() — cached MetricPlan for a formula tuple.
+
+Expressions are plain arithmetic: column names, numbers, ``+ - * /``, unary
+minus and ``abs(...)``. A name that matches a metric declared earlier in the
+same table refers to that metric's output (``CCC = DSO + DIO - DPO``). Division
+— the numerator/denominator pair or ``/`` inside an expression — is NaN where
+the denominator is zero or either side is NaN; other NaNs propagate.
+
+Depends on: numpy only.
+"""
+import ast
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+
+# ── Kernels ────────────────────────────────────────────────────────────────────
+def _ratio(out: np.ndarray, num, den) -> np.ndarray:
+    """Write ``num / den`` into ``out``; NaN where ``den`` is 0 or either side is NaN.
+
+    No temporaries beyond the ``den != 0`` mask: the division runs in place
+    and NaN operands propagate through it.
+    """
+    out.fill(np.nan)
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        np.divide(num, den, out=out, where=np.asarray(den) != 0)
+    return out
+
+
+def _binary(op: str, out: np.ndarray, a, b) -> np.ndarray:
+    if op == "/":
+        return _ratio(out, a, b)
+    ufunc = {"+": np.add, "-": np.subtract, "*": np.multiply}[op]
+    with np.errstate(invalid="ignore", over="ignore"):
+        return ufunc(a, b, out=out)
+
+
+# ── Expressions ────────────────────────────────────────────────────────────────
+# Parsed expressions are nested tuples, hashable so identical subtrees dedupe:
+#   ("name", str) | ("const", float) | ("neg", node) | ("abs", node)
+#   | ("op", "+"|"-"|"*"|"/", node, node)
+_BINOPS = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}
+
+
+def _parse(expr: str) -> tuple:
+    try:
+        tree = ast.parse(expr, mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"invalid metric expression {expr!r}: {e.msg}") from None
+
+    def walk(node):
+        if isinstance(node, ast.Name):
+            return ("name", node.id)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            return ("const", float(node.value))
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            return ("op", _BINOPS[type(node.op)], walk(node.left), walk(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return ("neg", walk(node.operand))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+            return walk(node.operand)
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id == "abs" and len(node.args) == 1 and not node.keywords):
+            return ("abs", walk(node.args[0]))
+        raise ValueError(
+            f"unsupported syntax in metric expression {expr!r}: {ast.dump(node)[:60]} — "
+            "use column names, numbers, + - * /, unary minus and abs()"
+        )
+
+    return walk(tree)
+
+
+def _names(node: tuple) -> list:
+    if node[0] == "name":
+        return [node[1]]
+    if node[0] in ("neg", "abs"):
+        return _names(node[1])
+    if node[0] == "op":
+        return _names(node[2]) + _names(node[3])
+    return []
+
+
+@dataclass(frozen=True)
+class MetricFormula:
+    """One metric: ``numerator / denominator`` (or just ``numerator``).
+
+    ``growth=True`` makes the metric the period-over-period change of the
+    numerator expression (the evaluator's ``_pct_change`` hook) — no denominator.
+    ``required`` lists the input columns whose absence is reported (they are
+    NaN-filled with one WARNING per compute step); other referenced columns are
+    optional and silently NaN when absent. ``thresholds`` (four ascending
+    boundaries → scores 1–5) and ``inverse`` (lower is better) apply to scored
+    metrics only.
+    """
+
+    name: str
+    numerator: str
+    denominator: str | None = None
+    required: tuple = ()
+    thresholds: tuple | None = None
+    inverse: bool = False
+    growth: bool = False
+
+    def __post_init__(self):
+        object.__setattr__(self, "required", tuple(self.required))
+        _parse(self.numerator)
+        if self.denominator is not None:
+            if self.growth:
+                raise ValueError(f"{self.name}: a growth metric has no denominator")
+            _parse(self.denominator)
+        if self.thresholds is not None:
+            bounds = tuple(float(t) for t in self.thresholds)
+            if len(bounds) != 4 or list(bounds) != sorted(bounds):
+                raise ValueError(
+                    f"{self.name}: thresholds must be four ascending values, got {self.thresholds!r}"
+                )
+            object.__setattr__(self, "thresholds", bounds)
+        elif self.inverse:
+            raise ValueError(f"{self.name}: inverse=True needs thresholds")
+
+    def columns(self, metrics=()) -> list:
+        """Input columns the formula reads (names of ``metrics`` excluded), in order."""
+        exprs = [self.numerator] + ([self.denominator] if self.denominator else [])
+        names = [n for e in exprs for n in _names(_parse(e))]
+        return list(dict.fromkeys(n for n in names if n not in metrics))
+
+
+class MetricPlan:
+    """Flat evaluation program for a tuple of formulas.
+
+    Built by ``compile_plan``. ``required`` / ``optional`` are the input columns
+    to load (each once); ``evaluate(columns, n)`` returns the (n × metrics)
+    column-major output block in ``names`` order.
+    """
+
+    def __init__(self, formulas: tuple):
+        names = [f.name for f in formulas]
+        if len(set(names)) != len(names):
+            dup = sorted({n for n in names if names.count(n) > 1})
+            raise ValueError(f"duplicate metric names: {dup}")
+        self.formulas = formulas
+        self.names = tuple(names)
+
+        required, optional, defined = {}, {}, set()
+        self._program = []         # (kind, key, args) in execution order
+        self._slots = {}           # node → scratch index (compound nodes only)
+        for f in formulas:
+            for col in f.columns(metrics=defined):
+                (required if col in f.required else optional)[col] = None
+            num = self._emit(_parse(f.numerator), defined)
+            if f.growth:
+                self._program.append(("growth", f.name, (num,)))
+            elif f.denominator is not None:
+                den = self._emit(_parse(f.denominator), defined)
+                self._program.append(("ratio", f.name, (num, den)))
+            else:
+                self._program.append(("copy", f.name, (num,)))
+            defined.add(f.name)
+        self.required = tuple(required)
+        self.optional = tuple(c for c in optional if c not in required)
+
+    def _emit(self, node: tuple, defined: set) -> tuple:
+        """Schedule ``node`` (and its operands) once; return its operand reference."""
+        kind = node[0]
+        if kind == "const":
+            return ("const", node[1])
+        if kind == "name":
+            return ("metric" if node[1] in defined else "column", node[1])
+        # Metric references resolve by position, so the same text after a metric
+        # of that name is declared is a different node.
+        key = (node, frozenset(n for n in _names(node) if n in defined))
+        if key not in self._slots:
+            args = tuple(self._emit(child, defined) for child in node[1:]
+                         if isinstance(child, tuple))
+            self._slots[key] = len(self._slots)
+            op = node[1] if kind == "op" else kind
+            self._program.append(("node", self._slots[key], (op, *args)))
+        return ("slot", self._slots[key])
+
+    @property
+    def n_subexpressions(self) -> int:
+        """Distinct compound subexpressions evaluated per call (after dedupe)."""
+        return len(self._slots)
+
+    def evaluate(self, columns: dict, n: int, growth=None) -> np.ndarray:
+        """Run the program on ``columns`` (``{name: float64 array of length n}``).
+
+        ``growth(values) -> array`` computes period-over-period change for
+        growth metrics (required when the plan has any).
+        """
+        block = np.empty((n, len(self.names)), order="F")
+        out = dict(zip(self.names, block.T))
+        scratch = [None] * len(self._slots)
+
+        def value(ref):
+            kind, key = ref
+            if kind == "const":
+                return key
+            if kind == "column":
+                return columns[key]
+            if kind == "metric":
+                return out[key]
+            return scratch[key]
+
+        for kind, key, args in self._program:
+            if kind == "node":
+                op, *operands = args
+                target = np.empty(n)
+                if op == "neg":
+                    np.negative(value(operands[0]), out=target)
+                elif op == "abs":
+                    np.abs(value(operands[0]), out=target)
+                else:
+                    _binary(op, target, value(operands[0]), value(operands[1]))
+                scratch[key] = target
+            elif kind == "ratio":
+                _ratio(out[key], value(args[0]), value(args[1]))
+            elif kind == "growth":
+                out[key][:] = growth(np.broadcast_to(value(args[0]), (n,)))
+            else:
+                out[key][:] = value(args[0])
+        return block
+
+
+@lru_cache(maxsize=64)
+def compile_plan(formulas: tuple) -> MetricPlan:
+    """Compile ``formulas`` once; later calls with the same tuple reuse the plan."""
+    return MetricPlan(formulas)
@@ -0,0 +1,260 @@
+"""incremental.py — incremental re-evaluation of a multi-ticker universe.
+
+Each (ticker, time) row of merged fundamentals gets a content fingerprint.
+``evaluate_incremental()`` compares the fingerprints with those stored
+alongside the previous results and recomputes only the rows that are new,
+changed, or whose growth inputs changed — then splices the fresh rows into
+the previous results.
+
+Which rows are recomputed
+-------------------------
+Scored metrics, valuation metrics, red flags and composite scores depend only
+on their own row, so a row is recomputed when:
+  - it is new or its fingerprint changed, or
+  - the weights of its sector changed.
+The growth figures in ``extended_metrics`` (pct_change) also depend on the
+previous period of the same ticker, so a row is additionally recomputed when:
+  - its predecessor was recomputed, or
+  - its predecessor is a different period than last time (insertions/removals).
+The evaluator is run on the recomputed rows plus their predecessors (the
+boundary state for pct_change); predecessor outputs are discarded.
+
+Rows of a ticker present in ``data`` that no longer appear in it are dropped
+from the results. Tickers absent from ``data`` keep their previous results.
+
+Depends on: evaluator, universe, pandas, numpy, pyarrow (save/load only).
+"""
+import hashlib
+import logging as _logging
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import _EMPTY_RESULT_KEYS, _empty_result
+from financialtools.universe import UniverseMetricsEvaluator
+
+_logger = _logging.getLogger(__name__)
+
+_KEY_COLS = ["ticker", "time"]
+_FINGERPRINTS_FILE = "_fingerprints.parquet"
+_WEIGHTS_FILE = "_weights.parquet"
+# Odd 64-bit multiplier used to mix a column's name hash into its value hashes.
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def row_fingerprints(data: pd.DataFrame) -> pd.DataFrame:
+    """Return one content fingerprint per (ticker, time) row of ``data``.
+
+    The fingerprint covers every non-key column whose value is not null, mixed
+    with the column name, and is independent of column order. Null cells do not
+    contribute, so widening a frame with all-NaN columns (e.g. after
+    ``combine_merged_data``) leaves existing fingerprints unchanged. Numeric
+    values are hashed as float64 so int/float round-trips compare equal.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns ``ticker``, ``time``, ``fingerprint`` (uint64), in ``data`` order.
+    """
+    acc = np.zeros(len(data), dtype=np.uint64)
+    for col in sorted(c for c in data.columns if c not in _KEY_COLS):
+        s = data[col]
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            s = s.astype("float64")
+        values = pd.util.hash_pandas_object(s, index=False).to_numpy()
+        name = pd.util.hash_array(np.array([str(col)], dtype=object))[0]
+        acc += np.where(s.notna().to_numpy(), (values ^ name) * _MIX, np.uint64(0))
+    out = data[_KEY_COLS].reset_index(drop=True)
+    out["fingerprint"] = acc
+    return out
+
+
+def _weights_fingerprints(weights: pd.DataFrame) -> dict:
+    """Return ``{sector: digest}`` of each sector's (metrics, weights) table."""
+    w = weights[["sector", "metrics", "weights"]].sort_values(["sector", "metrics"])
+    out = {}
+    for sector, part in w.groupby("sector", sort=False):
+        hashed = pd.util.hash_pandas_object(part[["metrics", "weights"]], index=False)
+        out[sector] = hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()
+    return out
+
+
+def _key_index(df: pd.DataFrame) -> pd.MultiIndex:
+    return pd.MultiIndex.from_frame(df[_KEY_COLS])
+
+
+def _select(df: pd.DataFrame, keys: pd.MultiIndex, keep: bool) -> pd.DataFrame:
+    """Rows of ``df`` whose (ticker, time) is in ``keys`` (keep=True) or not (keep=False)."""
+    if not isinstance(df, pd.DataFrame) or df.empty or not set(_KEY_COLS) <= set(df.columns):
+        return pd.DataFrame() if keep else df
+    mask = _key_index(df).isin(keys)
+    return df[mask if keep else ~mask]
+
+
+@dataclass
+class IncrementalState:
+    """Evaluation results plus the fingerprints they were computed from.
+
+    Fields
+    ------
+    results              : universe ``evaluate()`` dict (all tickers)
+    fingerprints         : ticker, time, fingerprint — see ``row_fingerprints``
+    weights_fingerprints : {sector: digest} of the weights used
+    recomputed           : rows recomputed by the call that produced this state
+                           (not persisted)
+    """
+
+    results: dict
+    fingerprints: pd.DataFrame
+    weights_fingerprints: dict
+    recomputed: int = 0
+
+    def save(self, directory: str) -> None:
+        """Write results and fingerprints as Parquet files under ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        for key in _EMPTY_RESULT_KEYS:
+            df = self.results.get(key, pd.DataFrame())
+            df.reset_index(drop=True).to_parquet(os.path.join(directory, f"{key}.parquet"), index=False)
+        self.fingerprints.to_parquet(os.path.join(directory, _FINGERPRINTS_FILE), index=False)
+        pd.DataFrame(
+            {"sector": list(self.weights_fingerprints), "fingerprint": list(self.weights_fingerprints.values())}
+        ).to_parquet(os.path.join(directory, _WEIGHTS_FILE), index=False)
+
+    @classmethod
+    def load(cls, directory: str) -> "IncrementalState | None":
+        """Read a state written by ``save()``; None when ``directory`` holds no state."""
+        if not os.path.isfile(os.path.join(directory, _FINGERPRINTS_FILE)):
+            return None
+        results = _empty_result()
+        for key in _EMPTY_RESULT_KEYS:
+            path = os.path.join(directory, f"{key}.parquet")
+            if os.path.isfile(path):
+                results[key] = pd.read_parquet(path)
+        weights = pd.read_parquet(os.path.join(directory, _WEIGHTS_FILE))
+        return cls(
+            results=results,
+            fingerprints=pd.read_parquet(os.path.join(directory, _FINGERPRINTS_FILE)),
+            weights_fingerprints=dict(zip(weights["sector"], weights["fingerprint"])),
+        )
+
+
+def evaluate_incremental(
+    data: pd.DataFrame,
+    previous: IncrementalState | None = None,
+    weights: pd.DataFrame | None = None,
+    sector: str | None = None,
+    sector_col: str = "sector",
+) -> IncrementalState:
+    """Evaluate ``data``, recomputing only rows that differ from ``previous``.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Combined merged fundamentals (same input as ``UniverseMetricsEvaluator``).
+    previous : IncrementalState, optional
+        State returned by an earlier call (or ``IncrementalState.load``).
+        When None, the whole universe is evaluated.
+    weights, sector, sector_col
+        Passed to ``UniverseMetricsEvaluator``.
+
+    Returns
+    -------
+    IncrementalState
+        Spliced results, identical to a full ``UniverseMetricsEvaluator``
+        evaluation of the current universe up to row order (sorted by
+        ticker, time).
+
+    Raises
+    ------
+    EvaluationError
+        Propagated from ``UniverseMetricsEvaluator``.
+    """
+    ev = UniverseMetricsEvaluator(data, weights=weights, sector=sector, sector_col=sector_col)
+    frame = ev.d.copy()
+    frame[sector_col] = ev._sector_column(frame).to_numpy()
+    fp = row_fingerprints(frame)
+    wfp = _weights_fingerprints(ev.weights)
+
+    if previous is None:
+        return _evaluate_all(ev, fp, wfp)
+    if previous.fingerprints["time"].dtype != fp["time"].dtype:
+        _logger.warning(
+            "[incremental] 'time' dtype changed (%s → %s) — re-evaluating everything",
+            previous.fingerprints["time"].dtype, fp["time"].dtype,
+        )
+        return _evaluate_all(ev, fp, wfp)
+
+    prev_fp = previous.fingerprints
+    # Tickers absent from ``data`` keep their previous fingerprints and results.
+    carried = prev_fp[~prev_fp["ticker"].isin(fp["ticker"].unique())]
+    fp_out = pd.concat([carried, fp], ignore_index=True)
+    wfp_out = {**previous.weights_fingerprints, **wfp}
+
+    # ── rows that are new or changed ─────────────────────────────────────────
+    unchanged = pd.MultiIndex.from_frame(fp).isin(pd.MultiIndex.from_frame(prev_fp))
+    row_sector = frame[sector_col].to_numpy()
+    stale_weights = {s for s, h in wfp.items() if previous.weights_fingerprints.get(s) != h}
+    changed = ~unchanged | np.isin(row_sector, list(stale_weights))
+
+    # ── rows whose growth inputs changed ─────────────────────────────────────
+    k = fp[_KEY_COLS].copy()
+    k["_changed"] = changed
+    k = k.sort_values(_KEY_COLS, kind="stable")
+    g = k.groupby("ticker", sort=False)
+    k["_prev_time"] = g["time"].shift(1)
+    old = prev_fp[_KEY_COLS].sort_values(_KEY_COLS, kind="stable")
+    old["_old_prev_time"] = old.groupby("ticker", sort=False)["time"].shift(1)
+    k = k.merge(old, on=_KEY_COLS, how="left")
+    same_pred = (k["_prev_time"] == k["_old_prev_time"]) | (
+        k["_prev_time"].isna() & k["_old_prev_time"].isna()
+    )
+    g = k.groupby("ticker", sort=False)
+    k["_recompute"] = k["_changed"] | g["_changed"].shift(1, fill_value=False) | ~same_pred
+    # Predecessors of recomputed rows supply the pct_change boundary state.
+    g = k.groupby("ticker", sort=False)
+    k["_needed"] = k["_recompute"] | g["_recompute"].shift(-1, fill_value=False)
+
+    recompute_keys = _key_index(k[k["_recompute"]])
+    current = _key_index(fp)
+    prev_keys = _key_index(prev_fp)
+    removed_keys = prev_keys[
+        prev_keys.get_level_values("ticker").isin(fp["ticker"].unique()) & ~prev_keys.isin(current)
+    ]
+
+    if recompute_keys.empty and removed_keys.empty:
+        _logger.info("[incremental] no changes across %d row(s)", len(fp))
+        return IncrementalState(previous.results, fp_out, wfp_out, recomputed=0)
+
+    _logger.info(
+        "[incremental] recomputing %d of %d row(s); %d removed",
+        len(recompute_keys), len(fp), len(removed_keys),
+    )
+
+    fresh = _empty_result()
+    if not recompute_keys.empty:
+        subset = frame[_key_index(frame).isin(_key_index(k[k["_needed"]]))]
+        fresh = UniverseMetricsEvaluator(subset, weights=ev.weights, sector_col=sector_col).evaluate()
+
+    replaced = recompute_keys.append(removed_keys)
+    results = {}
+    for key in _EMPTY_RESULT_KEYS:
+        kept = _select(previous.results.get(key, pd.DataFrame()), replaced, keep=False)
+        new = _select(fresh.get(key, pd.DataFrame()), recompute_keys, keep=True)
+        parts = [p for p in (kept, new) if isinstance(p, pd.DataFrame) and not p.empty]
+        if not parts:
+            results[key] = pd.DataFrame()
+            continue
+        spliced = pd.concat(parts, ignore_index=True)
+        results[key] = spliced.sort_values(_KEY_COLS, kind="stable").reset_index(drop=True)
+
+    return IncrementalState(results, fp_out, wfp_out, recomputed=len(recompute_keys))
+
+
+def _evaluate_all(ev: UniverseMetricsEvaluator, fp: pd.DataFrame, wfp: dict) -> IncrementalState:
+    results = ev.evaluate()
+    for key, df in results.items():
+        if isinstance(df, pd.DataFrame) and not df.empty and set(_KEY_COLS) <= set(df.columns):
+            results[key] = df.sort_values(_KEY_COLS, kind="stable").reset_index(drop=True)
+    return IncrementalState(results, fp, wfp, recomputed=len(fp))
@@ -0,0 +1,238 @@
+"""payloads.py — compact JSON encoding of evaluate() frames for LLM prompts.
+
+Provides:
+  PAYLOAD_LAYOUTS  — ``"table"`` (default), ``"columns"`` and ``"records"``.
+  encode_payload() — one DataFrame → compact JSON string: significant-digit
+                     rounding, constant columns hoisted out of the rows,
+                     optional column projection.
+  project_payload() — drop metric columns from an already encoded payload
+                     (any layout, or the legacy records JSON).
+  encode_payloads() — ``{key: DataFrame}`` → ``{key: JSON string}``; logs the
+                     token count against the legacy ``dataframe_to_json`` output.
+  count_tokens()   — tiktoken count for a model (≈ characters / 4 when tiktoken
+                     or its encoding files are unavailable).
+  payload_token_counts() — per-payload tokens, legacy records vs compact.
+
+Layouts, for a frame with ticker, time, ROE over two years:
+  table   : {"constant":{"ticker":"AAPL"},"columns":["time","ROE"],"rows":[[2023,0.1234],[2024,0.15]]}
+  columns : {"constant":{"ticker":"AAPL"},"columns":{"time":[2023,2024],"ROE":[0.1234,0.15]}}
+  records : {"constant":{"ticker":"AAPL"},"records":[{"time":2023,"ROE":0.1234},…]}
+            (a bare list, as dataframe_to_json, when nothing is constant)
+
+Column names are written once instead of once per row, separators carry no
+spaces, NaN / ±inf become ``null`` (valid JSON, unlike ``NaN``), and
+integral floats are written as integers. A column is hoisted into
+``"constant"`` when every row has the same value and it is not a metric
+series — identifiers such as ``ticker`` / ``sector`` and columns that are
+null throughout. A metric that happens to be flat keeps its series. An empty
+frame encodes as ``[]``.
+
+Depends on: utils (dataframe_to_json), pandas; tiktoken (optional).
+"""
+import json
+import logging as _logging
+import math
+from functools import lru_cache
+
+import pandas as pd
+
+from financialtools.utils import dataframe_to_json
+
+_logger = _logging.getLogger(__name__)
+
+PAYLOAD_LAYOUTS = ("table", "columns", "records")
+DEFAULT_SIG_DIGITS = 4
+DEFAULT_TOKEN_MODEL = "gpt-4.1-nano"
+
+# Kept by every projection: they identify a row rather than measure anything.
+_ID_COLS = ("ticker", "time", "sector", "company_name", "metrics", "red_flag")
+
+
+# ── token counting ───────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:          # not installed, or the BPE file cannot be fetched
+        _logger.info("tiktoken unavailable (%s) — estimating tokens as characters / 4", e)
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_TOKEN_MODEL) -> int:
+    """Tokens in ``text`` for ``model`` (≈ ``len(text) / 4`` without tiktoken)."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / 4)
+    return len(encoding.encode(text))
+
+
+# ── encoding ─────────────────────────────────────────────────────────────────
+
+def _round_sig(value: float, sig_digits: int | None):
+    if not math.isfinite(value):
+        return None
+    if sig_digits is not None and value != 0.0:
+        value = float(f"{value:.{sig_digits}g}")
+    return int(value) if value.is_integer() and abs(value) < 1e15 else value
+
+
+def _column_values(col: pd.Series, sig_digits: int | None) -> list:
+    if pd.api.types.is_float_dtype(col.dtype):
+        return [_round_sig(v, sig_digits) for v in col.to_numpy(dtype="float64", na_value=math.nan).tolist()]
+    values = col.astype(object).tolist()
+    out = []
+    for v in values:
+        if v is None or (not isinstance(v, str) and pd.isna(v)):
+            out.append(None)
+        elif isinstance(v, float):
+            out.append(_round_sig(v, sig_digits))
+        else:
+            out.append(v.item() if hasattr(v, "item") else v)
+    return out
+
+
+def _project(df: pd.DataFrame, columns) -> pd.DataFrame:
+    if columns is None:
+        return df
+    wanted = set(columns)
+    return df[[c for c in df.columns if c in wanted or c in _ID_COLS]]
+
+
+def encode_payload(
+    df: pd.DataFrame,
+    layout: str = "table",
+    sig_digits: int | None = DEFAULT_SIG_DIGITS,
+    drop_constant: bool = True,
+    columns=None,
+) -> str:
+    """Encode ``df`` as compact JSON for an LLM prompt.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        One ``evaluate()`` frame, typically after ``normalise_time`` /
+        ``filter_year``.
+    layout : str
+        One of ``PAYLOAD_LAYOUTS`` (see the module docstring).
+    sig_digits : int or None
+        Significant digits kept for floats; None keeps full precision.
+    drop_constant : bool
+        Hoist constant identifier / all-null columns into ``"constant"``
+        (only when there is more than one row).
+    columns : iterable of str, optional
+        Metric columns to keep; identifier columns (``ticker``, ``time`` …)
+        are always kept and unknown names are ignored. None keeps every column.
+
+    Raises
+    ------
+    TypeError
+        If ``df`` is not a DataFrame.
+    ValueError
+        If ``layout`` is unknown.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame.")
+    if layout not in PAYLOAD_LAYOUTS:
+        raise ValueError(f"Unknown payload layout {layout!r} — expected one of {PAYLOAD_LAYOUTS}")
+    df = _project(df, columns)
+    if df.empty:
+        return "[]"
+
+    data = {str(c): _column_values(df[c], sig_digits) for c in df.columns}
+    constant = {}
+    if drop_constant and len(df) > 1:
+        for name, values in list(data.items()):
+            first = values[0]
+            is_series = first is not None and pd.api.types.is_float_dtype(df[name].dtype)
+            if not is_series and all(v == first for v in values):
+                constant[name] = first
+                del data[name]
+
+    if layout == "table":
+        body = {"columns": list(data), "rows": [list(row) for row in zip(*data.values())]}
+    elif layout == "columns":
+        body = {"columns": data}
+    else:
+        records = [dict(zip(data, row)) for row in zip(*data.values())] if data else [{}] * len(df)
+        body = {"records": records} if constant else records
+    if constant:
+        body = {"constant": constant, **body}
+    return json.dumps(body, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def project_payload(text: str, columns) -> str:
+    """Keep only ``columns`` (plus identifier columns) of an encoded payload.
+
+    Works on every layout of ``encode_payload`` and on the legacy records
+    JSON of ``dataframe_to_json``; the layout is preserved. Projecting an
+    already projected payload is a no-op.
+    """
+    body = json.loads(text)
+    if not body:
+        return text
+    keep = set(columns) | set(_ID_COLS)
+
+    def _records(rows):
+        return [{k: v for k, v in row.items() if k in keep} for row in rows]
+
+    if isinstance(body, list):
+        body = _records(body)
+    else:
+        if "constant" in body:
+            body["constant"] = {k: v for k, v in body["constant"].items() if k in keep}
+        if "records" in body:
+            body["records"] = _records(body["records"])
+        elif "rows" in body:
+            idx = [i for i, c in enumerate(body["columns"]) if c in keep]
+            body["columns"] = [body["columns"][i] for i in idx]
+            body["rows"] = [[row[i] for i in idx] for row in body["rows"]]
+        else:
+            body["columns"] = {k: v for k, v in body["columns"].items() if k in keep}
+    return json.dumps(body, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode_payloads(frames: dict, model: str = DEFAULT_TOKEN_MODEL, **kwargs) -> dict:
+    """Encode every frame of ``frames`` with ``encode_payload(**kwargs)``.
+
+    Logs the total token count of the compact payloads against the legacy
+    ``dataframe_to_json`` records (counted for ``model``).
+
+    Returns
+    -------
+    dict
+        ``{key: JSON string}``, in the order of ``frames``.
+    """
+    encoded = {key: encode_payload(df, **kwargs) for key, df in frames.items()}
+    if _logger.isEnabledFor(_logging.INFO):
+        before = sum(count_tokens(dataframe_to_json(df), model) for df in frames.values())
+        after = sum(count_tokens(text, model) for text in encoded.values())
+        _logger.info(
+            "[payloads] %d payload(s): %d → %d tokens (%.0f%% saved)",
+            len(encoded), before, after, 100 * (1 - after / before) if before else 0.0,
+        )
+    return encoded
+
+
+def payload_token_counts(frames: dict, model: str = DEFAULT_TOKEN_MODEL, **kwargs) -> pd.DataFrame:
+    """Token counts per payload: legacy records JSON vs ``encode_payload(**kwargs)``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns ``payload``, ``records_tokens``, ``compact_tokens``,
+        ``saved_pct``, plus a final ``total`` row.
+    """
+    rows = [
+        (key, count_tokens(dataframe_to_json(df), model), count_tokens(encode_payload(df, **kwargs), model))
+        for key, df in frames.items()
+    ]
+    rows.append(("total", sum(r[1] for r in rows), sum(r[2] for r in rows)))
+    report = pd.DataFrame(rows, columns=["payload", "records_tokens", "compact_tokens"])
+    saved = 1 - report["compact_tokens"] / report["records_tokens"].where(report["records_tokens"] > 0)
+    report["saved_pct"] = (100 * saved).round(1)
+    return report
@@ -0,0 +1,137 @@
+"""projections.py — which payload blocks and metric columns each LLM topic receives.
+
+Provides:
+  PAYLOAD_BLOCKS        — the five payload keys and their labels in the human
+                          message, in prompt order.
+  TopicProjection       — one topic's blocks and, per block, the metric columns
+                          it needs (None = the whole block).
+  register_topic_projection() — add or replace a topic's projection.
+  topic_projection()    — the projection of a topic; unregistered topics get
+                          every block unprojected.
+  project_payloads()    — ``{block: JSON}`` → only the topic's blocks, each
+                          reduced to the topic's columns.
+  human_template()      — the human-message template for a topic's blocks.
+
+The column lists mirror the metric definitions of the topic system prompts in
+prompts.py (``_TOPIC_METRICS``): a topic is sent the metrics its prompt
+defines and nothing else. ``quantitative_overview`` and ``regime`` read every
+block in full. Identifier columns (``ticker``, ``time`` …) are always kept.
+
+Depends on: payloads (project_payload).
+"""
+from dataclasses import dataclass
+
+from financialtools.payloads import project_payload
+
+PAYLOAD_BLOCKS = {
+    "metrics":          "Metrics",
+    "extended_metrics": "Extended Metrics",
+    "composite_scores": "Scores",
+    "eval_metrics":     "Evaluation Metrics",
+    "red_flags":        "RedFlags",
+}
+
+
+@dataclass(frozen=True)
+class TopicProjection:
+    """Blocks a topic receives: ``{block: tuple of metric columns, or None for all}``."""
+
+    topic: str
+    columns: dict
+
+    @property
+    def blocks(self) -> tuple:
+        """The topic's blocks, in PAYLOAD_BLOCKS order."""
+        return tuple(b for b in PAYLOAD_BLOCKS if b in self.columns)
+
+
+_PROJECTIONS: dict[str, TopicProjection] = {}
+
+
+def register_topic_projection(projection: TopicProjection) -> None:
+    """Add ``projection`` to the registry (replacing one for the same topic).
+
+    Raises
+    ------
+    ValueError
+        If it names a block outside PAYLOAD_BLOCKS.
+    """
+    unknown = set(projection.columns) - set(PAYLOAD_BLOCKS)
+    if unknown:
+        raise ValueError(f"Unknown payload block(s) {sorted(unknown)} — expected {list(PAYLOAD_BLOCKS)}")
+    _PROJECTIONS[projection.topic] = projection
+
+
+def topic_projection(topic: str) -> TopicProjection:
+    """The registered projection of ``topic``, or every block in full."""
+    return _PROJECTIONS.get(topic) or TopicProjection(topic, dict.fromkeys(PAYLOAD_BLOCKS))
+
+
+def project_payloads(payloads: dict, topic: str) -> dict:
+    """Only the blocks ``topic`` reads, each reduced to the topic's columns.
+
+    ``payloads`` maps block names to JSON strings (compact or legacy records);
+    other keys are ignored.
+
+    Raises
+    ------
+    KeyError
+        If a block the topic needs is missing from ``payloads``.
+    """
+    projection = topic_projection(topic)
+    projected = {}
+    for block in projection.blocks:
+        columns = projection.columns[block]
+        text = payloads[block]
+        projected[block] = text if columns is None else project_payload(text, columns)
+    return projected
+
+
+def human_template(topic: str) -> str:
+    """Human-message template with one ``{block}`` section per block of ``topic``."""
+    return "\n".join(
+        f"{PAYLOAD_BLOCKS[block]}:\n{{{block}}}" for block in topic_projection(topic).blocks
+    )
+
+
+# ── built-in projections (metric lists as in prompts._TOPIC_METRICS) ─────────
+
+_WORKING_CAPITAL = ("ReceivablesTurnover", "DSO", "InventoryTurnover", "DIO",
+                    "PayablesTurnover", "DPO", "CCC")
+
+for _projection in (
+    TopicProjection("liquidity", {
+        "metrics": ("CurrentRatio", "QuickRatio", "CashRatio", "WorkingCapitalRatio"),
+        "extended_metrics": _WORKING_CAPITAL,
+    }),
+    TopicProjection("solvency", {
+        "metrics": ("DebtToEquity", "DebtRatio", "EquityRatio", "NetDebtToEBITDA", "InterestCoverage"),
+        "extended_metrics": ("DebtGrowth",),
+    }),
+    TopicProjection("profitability", {
+        "metrics": ("GrossMargin", "OperatingMargin", "NetProfitMargin", "EBITDAMargin",
+                    "ROA", "ROE", "ROIC"),
+        "extended_metrics": ("Accruals",),
+    }),
+    TopicProjection("efficiency", {
+        "metrics": ("AssetTurnover",),
+        "extended_metrics": _WORKING_CAPITAL,
+    }),
+    TopicProjection("cash_flow", {
+        "metrics": ("FCFToRevenue", "FCFYield", "FCFtoDebt", "OCFRatio", "FCFMargin",
+                    "CashConversion", "CapexRatio"),
+        "extended_metrics": ("FCFGrowth", "CapexToDepreciation"),
+    }),
+    TopicProjection("growth", {
+        "extended_metrics": ("RevenueGrowth", "NetIncomeGrowth", "FCFGrowth", "DebtGrowth", "Dilution"),
+    }),
+    TopicProjection("red_flags", {
+        # The metrics behind the threshold flags, for context next to the flags.
+        "metrics": ("GrossMargin", "OperatingMargin", "NetProfitMargin", "ROA", "ROE", "DebtToEquity"),
+        "extended_metrics": ("Accruals", "DebtGrowth", "Dilution", "CapexToDepreciation"),
+        "red_flags": None,
+    }),
+    TopicProjection("quantitative_overview", dict.fromkeys(PAYLOAD_BLOCKS)),
+    TopicProjection("regime", dict.fromkeys(PAYLOAD_BLOCKS)),
+):
+    register_topic_projection(_projection)
@@ -0,0 +1,242 @@
+"""results.py — compact columnar container for evaluate() results.
+
+Provides:
+  CompactResult — the ``evaluate()`` frames stored column-wise in a few blocks
+                  per key: identifier columns (``ticker``, ``time``, ``sector``,
+                  ``metrics``, ``red_flag`` …) dictionary-encoded as small integer
+                  codes, float columns in one float64 (or float32) block, integer
+                  columns (scores) downcast to the smallest integer dtype (int8
+                  for 1–5). Containers concatenate by reference — no data is
+                  copied until a key is decoded — and decode to the usual
+                  ``{key: DataFrame}`` shape on demand (``to_dict()``,
+                  ``frame(key)``, ``result[key]``).
+
+A container may hold one ticker (``CompactResult.from_result(evaluate())``) or a
+whole universe (``CompactResult.concat(results)``, or ``from_result`` on a
+``UniverseMetricsEvaluator`` result). ``merge_results`` accepts either directly.
+
+Decoding restores each column's original dtype; with ``float32=True`` float
+values are rounded to single precision. Row indexes are not kept (decoded
+frames have a fresh ``RangeIndex``, as ``merge_results`` returns).
+
+Depends on: evaluator (_EMPTY_RESULT_KEYS), numpy, pandas.
+"""
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import _EMPTY_RESULT_KEYS
+
+
+@dataclass(frozen=True)
+class _Schema:
+    """Column layout of one encoded frame; shared by every chunk with the same layout."""
+
+    columns: tuple
+    dtypes: tuple
+    floats: tuple      # positions in ``columns`` stored in the float block
+    ints: tuple        # ... in the integer block
+    labels: tuple      # ... as dictionary codes
+
+
+@lru_cache(maxsize=256)
+def _schema(columns: tuple, dtypes: tuple) -> _Schema:
+    floats, ints, labels = [], [], []
+    for i, dtype in enumerate(dtypes):
+        if pd.api.types.is_float_dtype(dtype) and isinstance(dtype, np.dtype):
+            floats.append(i)
+        elif pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+            ints.append(i)
+        else:
+            labels.append(i)
+    return _Schema(columns, dtypes, tuple(floats), tuple(ints), tuple(labels))
+
+
+class _Chunk(NamedTuple):
+    schema: _Schema
+    nrows: int
+    floats: np.ndarray     # (nrows × len(schema.floats)), column-major
+    ints: np.ndarray       # (nrows × len(schema.ints)), smallest fitting integer dtype
+    codes: np.ndarray      # (nrows × len(schema.labels)), -1 = missing
+    categories: tuple      # one object array per label column
+
+    @property
+    def nbytes(self) -> int:
+        return (self.floats.nbytes + self.ints.nbytes + self.codes.nbytes
+                + sum(c.nbytes for c in self.categories))
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _smallest_int(lo: int, hi: int) -> np.dtype:
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _int_block(columns: list, nrows: int) -> np.ndarray:
+    if not columns:
+        return np.empty((nrows, 0), dtype=np.int8)
+    block = np.column_stack(columns)
+    dtype = _smallest_int(int(block.min()), int(block.max())) if block.size else np.int8
+    return np.asfortranarray(block, dtype=dtype)
+
+
+def _encode(df: pd.DataFrame, float32: bool) -> _Chunk:
+    schema = _schema(tuple(df.columns), tuple(df.dtypes))
+    n = len(df)
+    floats = np.empty((n, len(schema.floats)), dtype=np.float32 if float32 else np.float64,
+                      order="F")
+    for j, i in enumerate(schema.floats):
+        floats[:, j] = df.iloc[:, i].to_numpy()
+    ints = _int_block([df.iloc[:, i].to_numpy() for i in schema.ints], n)
+    codes, categories = [], []
+    for i in schema.labels:
+        c, cats = pd.factorize(df.iloc[:, i], use_na_sentinel=True)
+        codes.append(c)
+        # Interned, so repeated identifiers share one string across chunks.
+        categories.append(np.array([_intern(v) for v in cats], dtype=object))
+    return _Chunk(schema, n, floats, ints, _int_block(codes, n), tuple(categories))
+
+
+def _decode(chunk: _Chunk, decode: bool = True) -> pd.DataFrame:
+    schema = chunk.schema
+    data = {}
+    for j, i in enumerate(schema.floats):
+        values = chunk.floats[:, j]
+        data[i] = values.astype(schema.dtypes[i], copy=False) if decode else values
+    for j, i in enumerate(schema.ints):
+        values = chunk.ints[:, j]
+        data[i] = values.astype(schema.dtypes[i]) if decode else values
+    for j, i in enumerate(schema.labels):
+        values = pd.Categorical.from_codes(chunk.codes[:, j], chunk.categories[j])
+        data[i] = pd.Series(values).astype(schema.dtypes[i]) if decode else values
+    return pd.DataFrame({schema.columns[i]: data[i] for i in range(len(schema.columns))})
+
+
+def _merge(chunks: tuple) -> _Chunk:
+    """One chunk holding the rows of ``chunks`` in order (the only copying step)."""
+    if len(chunks) == 1:
+        return chunks[0]
+    schema = chunks[0].schema
+    if any(c.schema != schema for c in chunks[1:]):
+        # Layouts differ (extra columns, different dtypes): let pandas align them.
+        frames = [_decode(c) for c in chunks]
+        float32 = any(c.floats.dtype == np.float32 for c in chunks)
+        return _encode(pd.concat(frames, ignore_index=True), float32)
+
+    n = sum(c.nrows for c in chunks)
+    floats = np.asfortranarray(np.concatenate([c.floats for c in chunks]))
+    ints = np.asfortranarray(np.concatenate([c.ints for c in chunks]))
+    local = np.concatenate([c.codes for c in chunks]).astype(np.int64)
+    codes, categories = [], []
+    for j in range(len(schema.labels)):
+        # Factorize every chunk's dictionary at once, then shift each row's local
+        # code by its chunk's offset into the stacked dictionaries.
+        stacked = np.concatenate([c.categories[j] for c in chunks])
+        to_merged, merged = pd.factorize(stacked)
+        sizes = np.array([len(c.categories[j]) for c in chunks])
+        offsets = np.repeat(np.cumsum(sizes) - sizes, [c.nrows for c in chunks])
+        column = local[:, j]
+        codes.append(np.where(column < 0, -1, to_merged[np.maximum(column, 0) + offsets]))
+        categories.append(np.asarray(merged, dtype=object))
+    return _Chunk(schema, n, floats, ints, _int_block(codes, n), tuple(categories))
+
+
+class CompactResult:
+    """Columnar, dictionary-encoded ``evaluate()`` result for one or many tickers.
+
+    Build with ``from_result`` (one ``evaluate()`` dict) or ``concat`` (many);
+    read with ``frame(key)``, ``result[key]`` or ``to_dict()``.
+    """
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, chunks: dict | None = None):
+        self._chunks = {key: tuple(parts) for key, parts in (chunks or {}).items() if parts}
+
+    @classmethod
+    def from_result(cls, result: dict, float32: bool = False) -> "CompactResult":
+        """Encode an ``evaluate()``-shaped dict; frames without columns are skipped.
+
+        ``float32=True`` stores float columns (ratios, scores) in single precision.
+        """
+        return cls({
+            key: (_encode(df, float32),)
+            for key, df in result.items()
+            if isinstance(df, pd.DataFrame) and len(df.columns)
+        })
+
+    @classmethod
+    def concat(cls, results, float32: bool = False) -> "CompactResult":
+        """Concatenate containers without copying their data.
+
+        ``results`` may be a ``{ticker: result}`` dict or an iterable of results
+        or ``(ticker, result)`` pairs, where each result is a ``CompactResult``
+        or an ``evaluate()`` dict (encoded on the way, with ``float32``).
+        """
+        items = results.values() if isinstance(results, dict) else results
+        chunks: dict = {}
+        for item in items:
+            result = item[1] if isinstance(item, tuple) else item
+            if isinstance(result, dict):
+                result = cls.from_result(result, float32=float32)
+            if not isinstance(result, CompactResult):
+                continue
+            for key, parts in result._chunks.items():
+                chunks.setdefault(key, []).extend(parts)
+        return cls(chunks)
+
+    def consolidate(self) -> "CompactResult":
+        """Copy each key's chunks into one, releasing the per-ticker pieces."""
+        return CompactResult({key: (_merge(parts),) for key, parts in self._chunks.items()})
+
+    def keys(self) -> list:
+        """Result keys: the six ``evaluate()`` keys plus any extra ones encoded."""
+        return list(_EMPTY_RESULT_KEYS) + [k for k in self._chunks if k not in _EMPTY_RESULT_KEYS]
+
+    def frame(self, key: str, decode: bool = True) -> pd.DataFrame:
+        """Rows of ``key`` as one DataFrame (empty DataFrame when there are none).
+
+        ``decode=False`` keeps the compact dtypes: identifiers as ``category``,
+        floats as stored, integers downcast.
+        """
+        parts = self._chunks.get(key)
+        if not parts:
+            return pd.DataFrame()
+        return _decode(_merge(parts), decode=decode)
+
+    def to_dict(self, decode: bool = True) -> dict:
+        """``{key: DataFrame}`` — the shape ``evaluate()`` returns."""
+        return {key: self.frame(key, decode=decode) for key in self.keys()}
+
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        if key not in self._chunks and key not in _EMPTY_RESULT_KEYS:
+            raise KeyError(key)
+        return self.frame(key)
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self._chunks or key in _EMPTY_RESULT_KEYS else default
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the encoded arrays (dictionary strings counted as pointers)."""
+        return sum(c.nbytes for parts in self._chunks.values() for c in parts)
+
+    def __repr__(self) -> str:
+        rows = {key: sum(c.nrows for c in parts) for key, parts in self._chunks.items()}
+        return f"CompactResult(rows={rows}, nbytes={self.nbytes})"
@@ -0,0 +1,286 @@
+"""store.py — partitioned columnar store for raw merged fundamentals.
+
+Provides FundamentalsStore: a Hive-partitioned Parquet dataset
+(``sector=<key>/fiscal_year=<yyyy>/part-0.parquet``) holding the merged
+balance sheet / income statement / cash flow rows produced by
+``Downloader.get_merged_data()``.
+
+Replaces the one-file-pair-per-ticker layout of ``Downloader.stream_download``:
+a full-universe reload opens one file per (sector, fiscal year) instead of
+thousands of small files, and reads prune partitions and row groups through
+predicate pushdown on ticker, sector and fiscal year.
+
+Write semantics
+---------------
+- ``upsert(df)`` replaces rows by (ticker, time) and appends new ones.
+  Only the partitions touched by ``df`` are rewritten (atomically, via a
+  temp file + ``os.replace``).
+- A ticker that moves sector (yfinance reclassification) has its old rows
+  for the same periods removed from the previous sector's partition. Only
+  other sectors' partitions of the upserted fiscal years are checked, by
+  their key columns alone.
+- Each upsert rewrites its partitions in full, so load many tickers with one
+  upsert (or a few large ones) rather than one per ticker.
+- Numeric columns are stored as float64 so partitions written from different
+  tickers always unify to one schema on read.
+
+Depends on: pandas, pyarrow (deferred — only required when the store is used).
+"""
+import logging as _logging
+import os
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+_logger = _logging.getLogger(__name__)
+
+_KEY_COLS = ("ticker", "time")
+# Text columns that must never be coerced to float.
+_TEXT_COLS = frozenset({"ticker", "sector", "company_name", "docs", "docs_x", "docs_y"})
+_PART_FILE = "part-0.parquet"
+
+
+def _fiscal_year(time: pd.Series) -> pd.Series:
+    """Derive the integer fiscal year from a 'time' column (timestamps, dates or years)."""
+    if pd.api.types.is_numeric_dtype(time):
+        return time.astype("int64")
+    return pd.to_datetime(time).dt.year.astype("int64")
+
+
+def _normalise_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce value columns to float64 so every partition shares one schema."""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in _TEXT_COLS or col == "time":
+            out[col] = s
+        elif pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+            out[col] = s.astype("float64")
+        else:
+            try:
+                out[col] = pd.to_numeric(s, errors="raise").astype("float64")
+            except (TypeError, ValueError):
+                out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+class FundamentalsStore:
+    """Hive-partitioned Parquet store for merged fundamentals.
+
+    Parameters
+    ----------
+    root : str
+        Dataset directory (created on first write). Relative paths resolve
+        against the caller's working directory.
+
+    Usage
+    -----
+    store = FundamentalsStore("financial_data/fundamentals")
+    store.upsert(merged_df, sector="technology")
+    df = store.read(sectors=["technology"], start=2021)
+    UniverseMetricsEvaluator(df).evaluate()
+    """
+
+    def __init__(self, root: str = "financial_data/fundamentals"):
+        self.root = root
+
+    # ── paths ────────────────────────────────────────────────────────────────
+
+    def _partition_path(self, sector: str, year: int) -> str:
+        return os.path.join(
+            self.root, f"sector={quote(str(sector), safe='')}", f"fiscal_year={int(year)}", _PART_FILE
+        )
+
+    def _files(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        found = []
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            if _PART_FILE in filenames:
+                found.append(os.path.join(dirpath, _PART_FILE))
+        return sorted(found)
+
+    # ── write ────────────────────────────────────────────────────────────────
+
+    def upsert(self, df: pd.DataFrame, sector: str | None = None) -> int:
+        """Insert or replace rows keyed by (ticker, time).
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Merged fundamentals with at least ``ticker`` and ``time`` columns.
+        sector : str, optional
+            Sector for every row. Required when ``df`` has no ``sector`` column;
+            overrides the column when both are present.
+
+        Returns
+        -------
+        int
+            Number of rows written from ``df`` (after de-duplication).
+
+        Raises
+        ------
+        ValueError
+            If key columns are missing or no sector information is available.
+        """
+        if df is None or df.empty:
+            return 0
+        missing = [c for c in _KEY_COLS if c not in df.columns]
+        if missing:
+            raise ValueError(f"upsert() requires columns {list(_KEY_COLS)}; missing {missing}")
+        if sector is None and "sector" not in df.columns:
+            raise ValueError("upsert() needs a 'sector' column or the sector= argument")
+
+        new = df.copy()
+        if sector is not None:
+            new["sector"] = sector
+        new["sector"] = new["sector"].fillna("default")
+        new = new.drop_duplicates(subset=list(_KEY_COLS), keep="last")
+        new = _normalise_types(new)
+        years = _fiscal_year(new["time"])
+
+        self._drop_moved_keys(new, years)
+
+        for (sec, year), part in new.groupby([new["sector"], years], sort=False):
+            path = self._partition_path(sec, year)
+            part = part.drop(columns="sector")
+            if os.path.isfile(path):
+                existing = pd.read_parquet(path)
+                part = pd.concat([existing, part], ignore_index=True)
+                part = part.drop_duplicates(subset=list(_KEY_COLS), keep="last")
+            self._write_partition(path, part)
+
+        _logger.info("[store] upserted %d row(s) into %s", len(new), self.root)
+        return len(new)
+
+    def _write_partition(self, path: str, part: pd.DataFrame) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        part.sort_values(list(_KEY_COLS)).reset_index(drop=True).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    def _year_partitions(self, year: int) -> list[tuple[str, str]]:
+        """``(sector, path)`` of every existing partition of fiscal ``year``."""
+        if not os.path.isdir(self.root):
+            return []
+        found = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if not (entry.is_dir() and entry.name.startswith("sector=")):
+                    continue
+                path = os.path.join(entry.path, f"fiscal_year={int(year)}", _PART_FILE)
+                if os.path.isfile(path):
+                    found.append((unquote(entry.name[len("sector="):]), path))
+        return found
+
+    def _drop_moved_keys(self, new: pd.DataFrame, years: pd.Series) -> None:
+        """Remove (ticker, time) rows that now belong to a different sector partition.
+
+        Only the partitions of ``new``'s fiscal years in other sectors can hold
+        such rows; each is checked by its key columns and rewritten only when
+        it does.
+        """
+        for year, rows in new.groupby(years, sort=False):
+            for sec, path in self._year_partitions(year):
+                elsewhere = rows[rows["sector"] != sec]
+                if elsewhere.empty:
+                    continue
+                keys = pd.read_parquet(path, columns=list(_KEY_COLS))
+                drop = pd.MultiIndex.from_frame(elsewhere[list(_KEY_COLS)])
+                keep = ~pd.MultiIndex.from_frame(keys).isin(drop)
+                if keep.all():
+                    continue
+                _logger.info(
+                    "[store] %d row(s) moved out of sector=%s fiscal_year=%s",
+                    int((~keep).sum()), sec, year,
+                )
+                if keep.any():
+                    self._write_partition(path, pd.read_parquet(path)[keep])
+                else:
+                    os.remove(path)
+
+    # ── read ─────────────────────────────────────────────────────────────────
+
+    def _dataset(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        files = self._files()
+        partitioning = ds.partitioning(
+            pa.schema([("sector", pa.string()), ("fiscal_year", pa.int32())]), flavor="hive"
+        )
+        probe = ds.dataset(files, format="parquet", partitioning=partitioning,
+                           partition_base_dir=self.root)
+        # Partitions written from different tickers can carry different column
+        # sets; unify every fragment's footer schema so no column is dropped.
+        schema = pa.unify_schemas(
+            [f.physical_schema for f in probe.get_fragments()] + [partitioning.schema],
+            promote_options="permissive",
+        )
+        return ds.dataset(files, schema=schema, format="parquet",
+                          partitioning=partitioning, partition_base_dir=self.root)
+
+    def read(
+        self,
+        tickers: list[str] | None = None,
+        sectors: list[str] | None = None,
+        years: list[int] | None = None,
+        start: int | None = None,
+        end: int | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Load rows matching the filters, in the frame shape the evaluators expect.
+
+        All filters are pushed down to the Parquet scan: sector and fiscal year
+        prune whole partitions, ticker prunes row groups via column statistics.
+
+        Parameters
+        ----------
+        tickers : only these tickers
+        sectors : only these sector keys
+        years   : only these fiscal years
+        start, end : inclusive fiscal-year bounds
+        columns : project to these columns (``ticker``, ``time`` and ``sector``
+                  are always included)
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per (ticker, time), sorted by ticker then time, with a
+            ``sector`` column. Empty DataFrame when the store is empty.
+        """
+        if not self._files():
+            return pd.DataFrame()
+        import pyarrow.dataset as ds
+
+        expr = None
+        clauses = []
+        if tickers is not None:
+            clauses.append(ds.field("ticker").isin(list(tickers)))
+        if sectors is not None:
+            clauses.append(ds.field("sector").isin(list(sectors)))
+        if years is not None:
+            clauses.append(ds.field("fiscal_year").isin([int(y) for y in years]))
+        if start is not None:
+            clauses.append(ds.field("fiscal_year") >= int(start))
+        if end is not None:
+            clauses.append(ds.field("fiscal_year") <= int(end))
+        for clause in clauses:
+            expr = clause if expr is None else expr & clause
+
+        dataset = self._dataset()
+        if columns is not None:
+            wanted = ["ticker", "time", "sector"] + [
+                c for c in columns if c not in ("ticker", "time", "sector")
+            ]
+            columns = [c for c in wanted if c in dataset.schema.names]
+        table = dataset.to_table(filter=expr, columns=columns)
+        df = table.to_pandas().drop(columns="fiscal_year", errors="ignore")
+        lead = [c for c in ("ticker", "time", "sector") if c in df.columns]
+        df = df[lead + [c for c in df.columns if c not in lead]]
+        return df.sort_values(list(_KEY_COLS), kind="stable").reset_index(drop=True)
+
+    def tickers(self) -> list[str]:
+        """Return every ticker in the store (reads only the ticker column)."""
+        df = self.read(columns=["ticker"])
+        return sorted(df["ticker"].unique().tolist()) if not df.empty else []
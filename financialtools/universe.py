@@ -0,0 +1,173 @@
+"""universe.py — universe-level (multi-ticker) evaluation engine.
+
+Provides UniverseMetricsEvaluator: evaluates every ticker in a combined
+merged-fundamentals frame (e.g. ``Downloader.combine_merged_data()`` or
+``download_data([...])``) in a single columnar pass, instead of one
+``FundamentalMetricsEvaluator`` per ticker.
+
+The ratio formulas, scoring thresholds, and red-flag rules are inherited
+from FundamentalMetricsEvaluator — only the multi-ticker concerns differ:
+  - each row's sector is looked up from its ticker (one sector per ticker)
+  - weights are joined on (sector, metrics), so several sectors coexist
+  - growth metrics (pct_change) are computed within each ticker's time series
+  - optional peer-relative scoring (``scoring="percentile"`` / ``"zscore"``)
+    ranks each metric against the tickers of the same sector and fiscal year
+
+With the default absolute scoring, results are identical to running the
+per-ticker path on each ticker and concatenating — only row order differs
+(see ``split_by_ticker``).
+
+Depends on: crosssection, evaluator, exceptions, weights (default_weights_registry), pandas, numpy.
+"""
+import logging as _logging
+
+import numpy as np
+import pandas as pd
+
+from financialtools.crosssection import _scoring_mode
+from financialtools.evaluator import FundamentalMetricsEvaluator, _EMPTY_RESULT_KEYS, _empty_result
+from financialtools.exceptions import EvaluationError
+from financialtools.weights import default_weights_registry
+
+_logger = _logging.getLogger(__name__)
+
+
+class UniverseMetricsEvaluator(FundamentalMetricsEvaluator):
+    """Vectorized evaluator for a frame containing many tickers and sectors.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Combined merged fundamentals — one row per (ticker, time).
+    weights : pd.DataFrame, optional
+        Weights with columns ``sector``, ``metrics``, ``weights`` covering every
+        sector present in the universe (e.g. several ``build_weights()`` frames
+        concatenated).  When None, every distinct sector's weights come from the
+        process-wide ``WeightsRegistry`` (built once, not per call).
+    sector : str, optional
+        Evaluate every ticker with this sector.  When None, sectors are read from
+        ``data[sector_col]`` (the column added by ``download_data()``).
+    sector_col : str
+        Name of the per-row sector column in ``data`` (default ``"sector"``).
+    scoring : str
+        Score source of the composite: ``"absolute"`` (fixed thresholds, default),
+        ``"percentile"`` or ``"zscore"`` — each metric ranked against the
+        universe's tickers of the same sector and fiscal year.
+
+    Raises
+    ------
+    EvaluationError
+        On empty data, no valid tickers, no sector information, a ticker mapped
+        to more than one sector, or weights missing for a sector in the universe.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        weights: pd.DataFrame | None = None,
+        sector: str | None = None,
+        sector_col: str = "sector",
+        scoring: str = "absolute",
+    ):
+        self.scoring = _scoring_mode(scoring)
+        if 'ticker' not in data.columns or data.empty:
+            raise EvaluationError(
+                "data DataFrame is empty or missing a 'ticker' column — "
+                "pass a non-empty combined DataFrame from Downloader.combine_merged_data()."
+            )
+        valid = data['ticker'].notna()
+        if not valid.any():
+            raise EvaluationError(
+                "data DataFrame has no valid ticker values (empty or all-NaN ticker column)"
+            )
+        if not valid.all():
+            _logger.warning(
+                "[universe] dropping %d row(s) with a NaN ticker", int((~valid).sum())
+            )
+            data = data[valid]
+        if not data.index.is_unique:
+            data = data.reset_index(drop=True)
+
+        # ── ticker → sector map (one sector per ticker) ───────────────────────
+        if sector is not None:
+            ticker_sectors = pd.Series(sector, index=pd.unique(data['ticker']))
+        elif sector_col in data.columns:
+            pairs = data[['ticker', sector_col]].drop_duplicates()
+            pairs = pairs[pairs[sector_col].notna()]
+            conflicts = pairs['ticker'][pairs['ticker'].duplicated()].unique().tolist()
+            if conflicts:
+                raise EvaluationError(
+                    f"tickers mapped to more than one sector: {sorted(conflicts)}"
+                )
+            ticker_sectors = pairs.set_index('ticker')[sector_col]
+            unmapped = sorted(set(pd.unique(data['ticker'])) - set(ticker_sectors.index))
+            if unmapped:
+                _logger.warning(
+                    "[universe] no sector for %d ticker(s) — using 'default': %s",
+                    len(unmapped), unmapped,
+                )
+                ticker_sectors = pd.concat(
+                    [ticker_sectors, pd.Series("default", index=unmapped)]
+                )
+        else:
+            raise EvaluationError(
+                f"data has no {sector_col!r} column and no sector was given — "
+                "pass sector=... or a frame from download_data() which carries 'sector'."
+            )
+
+        sectors = sorted(pd.unique(ticker_sectors).tolist())
+        if weights is None:
+            weights = default_weights_registry().frames(sectors)
+        else:
+            missing = sorted(set(sectors) - set(weights['sector'].dropna().unique()))
+            if missing:
+                raise EvaluationError(
+                    f"weights has no entries for sector(s) {missing} — "
+                    "pass weights covering every sector in the universe, or weights=None."
+                )
+
+        self.d = data
+        self.metrics = pd.DataFrame()
+        self.eval_metrics = pd.DataFrame()
+        self.metric_scores = pd.DataFrame()
+        self.scores = pd.DataFrame()
+        self.weights = weights
+        self.tickers = list(ticker_sectors.index)
+        self.sectors = sectors
+        self._ticker_sectors = ticker_sectors
+        # Scalar sector only when the universe is single-sector; log label for ticker.
+        self.sector = sectors[0] if len(sectors) == 1 else None
+        self.ticker = f"universe:{len(self.tickers)} tickers"
+
+    def _sector_column(self, d: pd.DataFrame) -> pd.Series:
+        """Map each row's ticker to its sector."""
+        return d["ticker"].map(self._ticker_sectors)
+
+    def _sort_for_growth(self, d: pd.DataFrame) -> pd.DataFrame:
+        """Group rows by ticker (first-appearance order), chronological within each."""
+        order = pd.Series(np.arange(len(self.tickers)), index=self.tickers)
+        d["_ticker_order"] = d["ticker"].map(order).to_numpy()
+        d = d.sort_values(["_ticker_order", "time"], kind="stable")
+        return d.drop(columns="_ticker_order").reset_index(drop=True)
+
+    def _pct_change(self, s: pd.Series, d: pd.DataFrame) -> pd.Series:
+        """Growth within each ticker — the first period of every ticker is NaN."""
+        return s.groupby(d["ticker"], sort=False).pct_change()
+
+
+def split_by_ticker(result: dict) -> dict:
+    """Split a universe ``evaluate()`` result into ``{ticker: result_dict}``.
+
+    The returned shape matches ``FundamentalEvaluator.evaluate_multiple()`` so
+    existing consumers (``merge_results``, exporters) keep working.  Each key is
+    partitioned with a single ``groupby`` pass.  Tickers with no rows for a key
+    (e.g. no red flags) receive an empty DataFrame for that key.
+    """
+    out: dict = {}
+    for key in _EMPTY_RESULT_KEYS:
+        df = result.get(key)
+        if not isinstance(df, pd.DataFrame) or df.empty or "ticker" not in df.columns:
+            continue
+        for ticker, part in df.groupby("ticker", sort=False):
+            out.setdefault(ticker, _empty_result())[key] = part.reset_index(drop=True)
+    return out
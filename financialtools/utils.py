@@ -1,16 +1,48 @@
 import json
 import logging
+import os
 import re
+import sqlite3
 import threading
 import time
+from collections import deque
 
 import pandas as pd
 
 from financialtools.config import sec_sector_metric_weights
+from financialtools.weights import default_weights_registry
 
 _logger = logging.getLogger(__name__)
 
 
+class _SlidingWindows:
+    """Sliding-window bookkeeping shared by the rate limiters.
+
+    Keeps one deque of call timestamps per window, oldest on the left. Expired
+    timestamps are pruned from the left, so every operation is O(1) amortized
+    regardless of the window limits. Not thread-safe — callers hold their own lock.
+    """
+
+    def __init__(self, limits: tuple):
+        # limits: ((window_seconds, max_calls), ...)
+        self.limits = tuple(limits)
+        self.calls = tuple(deque() for _ in self.limits)
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until every window has a free slot (0.0 when one is free now)."""
+        wait = 0.0
+        for calls, (window, limit) in zip(self.calls, self.limits):
+            while calls and now - calls[0] >= window:
+                calls.popleft()
+            if len(calls) >= limit:
+                wait = max(wait, window - (now - calls[0]))
+        return wait
+
+    def record(self, now: float) -> None:
+        for calls in self.calls:
+            calls.append(now)
+
+
 class RateLimiter:
     """
     Thread-safe sliding-window rate limiter.
@@ -25,9 +57,11 @@ class RateLimiter:
 
     Design invariant
     ----------------
-    The internal lock is held only during the window-check and the atomic
-    ``self.calls.append`` on success.  It is *never* held during ``sleep()``
-    so that other threads can check their own windows concurrently (C1 fix).
+    Each window is a deque pruned from the left, so a window check costs O(1)
+    amortized instead of a scan over up to ``per_day`` timestamps. The lock is
+    held only for that check and the append; waiting threads sleep on a
+    condition variable (which releases the lock) until the earliest slot frees,
+    so other threads can check their own windows concurrently (C1 fix).
 
     Usage
     -----
@@ -40,47 +74,174 @@ class RateLimiter:
         self.per_minute = per_minute
         self.per_hour   = per_hour
         self.per_day    = per_day
-        self.calls: list[float] = []
-        self._lock = threading.Lock()
+        self._windows = _SlidingWindows(((60, per_minute), (3600, per_hour), (86400, per_day)))
+        self._cond = threading.Condition(threading.Lock())
+
+    @property
+    def calls(self) -> list[float]:
+        """Timestamps of the calls recorded within the last 24 h, oldest first."""
+        with self._cond:
+            return list(self._windows.calls[2])
 
     def acquire(self) -> None:
         """
         Block until a call is permissible under all three rate limits.
 
-        Uses sliding-window checks. Refreshes timestamps after each sleep so
-        stale values do not cause limit overruns.
-
-        Invariant: self._lock is held only while reading/writing self.calls,
-        never during sleep(). Holding the lock across sleep() would serialise
-        all threads — they would queue on the lock rather than on the rate
-        window, defeating the purpose of the limiter entirely.
+        Invariant: the condition's lock is held only while reading/writing the
+        windows, never while waiting — ``Condition.wait`` releases it. Holding
+        the lock across the wait would serialise all threads on the lock rather
+        than on the rate window, defeating the purpose of the limiter entirely.
         """
-        while True:
-            with self._lock:
+        with self._cond:
+            while True:
                 now = time.time()
-                # Prune calls older than 24 h to bound list growth.
-                self.calls = [t for t in self.calls if now - t < 86400]
+                wait = self._windows.wait_time(now)
+                if wait <= 0.0:
+                    # All windows have a free slot — record the call and return.
+                    self._windows.record(now)
+                    return
+                # Sleep until the earliest slot frees; re-check with fresh
+                # timestamps after waking.
+                self._cond.wait(timeout=wait)
 
-                calls_last_minute = [t for t in self.calls if now - t < 60]
-                calls_last_hour   = [t for t in self.calls if now - t < 3600]
 
-                wait = 0.0
-                if len(calls_last_minute) >= self.per_minute and calls_last_minute:
-                    wait = max(wait, 60 - (now - calls_last_minute[0]))
-                if len(calls_last_hour) >= self.per_hour and calls_last_hour:
-                    wait = max(wait, 3600 - (now - calls_last_hour[0]))
-                if len(self.calls) >= self.per_day and self.calls:
-                    wait = max(wait, 86400 - (now - self.calls[0]))
+class TokenBucketLimiter:
+    """
+    Thread-safe token-bucket rate limiter with burst capacity.
 
-                if wait <= 0.0:
-                    # All windows have a free slot — record the call and return.
-                    self.calls.append(time.time())
+    Tokens refill continuously at ``per_minute / 60`` per second up to
+    ``burst``; each acquire() consumes one. Unlike the sliding windows of
+    RateLimiter, a full bucket lets ``burst`` calls through at once and then
+    paces the rest evenly. Same ``acquire()`` contract as RateLimiter.
+
+    Usage
+    -----
+    limiter = TokenBucketLimiter(per_minute=60, burst=10)
+    limiter.acquire()
+    """
+
+    def __init__(self, per_minute: float = 60, burst: int = 10):
+        if per_minute <= 0 or burst < 1:
+            raise ValueError(f"per_minute must be > 0 and burst >= 1, got {per_minute}, {burst}")
+        self.per_minute = per_minute
+        self.burst = burst
+        self._rate = per_minute / 60.0
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._cond = threading.Condition(threading.Lock())
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        with self._cond:
+            while True:
+                self._refill(time.monotonic())
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
                     return
+                self._cond.wait(timeout=(1.0 - self._tokens) / self._rate)
+
+
+class SQLiteRateLimiter:
+    """
+    Cross-process sliding-window rate limiter backed by a local SQLite file.
+
+    Same ``acquire()`` contract and windows as RateLimiter, but the call log
+    lives in ``path`` so every process (and thread) opening the same file shares
+    one budget — e.g. ProcessPoolExecutor workers or several run_pipeline.py
+    sector shards started side by side. No external service is involved.
+
+    Each acquire() runs one short ``BEGIN IMMEDIATE`` transaction (SQLite's
+    write lock serialises the check-and-record across processes); the lock is
+    released before sleeping. Several independent budgets can share a file
+    via ``name``.
+
+    Usage
+    -----
+    limiter = SQLiteRateLimiter("~/.cache/financialtools/ratelimit.sqlite", per_minute=30)
+    limiter.acquire()     # blocks if the shared limit is exceeded
+    """
 
-            # Lock released before sleeping so other threads can check their
-            # own windows concurrently. Re-enter loop to recompute with fresh
-            # timestamps after waking.
-            time.sleep(max(0.0, wait))
+    def __init__(
+        self,
+        path: str | None = None,
+        per_minute: int = 60,
+        per_hour: int = 360,
+        per_day: int = 8000,
+        name: str = "default",
+    ):
+        self.path = os.path.expanduser(path) if path else os.path.join(_cache_dir(), "ratelimit.sqlite")
+        self.per_minute = per_minute
+        self.per_hour   = per_hour
+        self.per_day    = per_day
+        self.name = name
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS calls (name TEXT NOT NULL, ts REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS calls_name_ts ON calls (name, ts)")
+
+    def __getstate__(self):
+        # sqlite3 connections cannot cross process boundaries — reopen lazily.
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _wait_time(self, conn: sqlite3.Connection, now: float) -> float:
+        conn.execute("DELETE FROM calls WHERE name = ? AND ts <= ?", (self.name, now - 86400))
+        wait = 0.0
+        for window, limit in ((60, self.per_minute), (3600, self.per_hour), (86400, self.per_day)):
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM calls WHERE name = ? AND ts > ?", (self.name, now - window)
+            ).fetchone()
+            if count >= limit:
+                # The slot frees when the (count - limit + 1)-th oldest call expires.
+                (oldest,) = conn.execute(
+                    "SELECT ts FROM calls WHERE name = ? AND ts > ? ORDER BY ts LIMIT 1 OFFSET ?",
+                    (self.name, now - window, count - limit),
+                ).fetchone()
+                wait = max(wait, window - (now - oldest))
+        return wait
+
+    def acquire(self) -> None:
+        """Block until a call is permissible under all three shared limits."""
+        conn = self._connect()
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                wait = self._wait_time(conn, now)
+                if wait <= 0.0:
+                    conn.execute("INSERT INTO calls (name, ts) VALUES (?, ?)", (self.name, now))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if wait <= 0.0:
+                return
+            # Write lock released before sleeping so other processes can proceed.
+            time.sleep(wait)
+
+
+def _cache_dir() -> str:
+    """Per-user directory for financialtools' local state (env FINANCIALTOOLS_CACHE_DIR)."""
+    return os.path.expanduser(
+        os.environ.get("FINANCIALTOOLS_CACHE_DIR", os.path.join("~", ".cache", "financialtools"))
+    )
 
 
 def export_to_csv(df, path):
@@ -123,29 +284,23 @@ def dataframe_to_json(df):
     return json.dumps(df_dict)
 
 
-def build_weights(sector: str) -> pd.DataFrame:
+def build_weights(sector: str, overrides: dict | None = None) -> pd.DataFrame:
     """Build a weights DataFrame for the given sector.
 
     Uses sec_sector_metric_weights (yfinance sectorKey convention, e.g. "technology").
     Falls back to 'default' if sector is not found.
 
+    Served from the process-wide ``WeightsRegistry`` — every sector is built once,
+    and each call returns a copy the caller may modify. ``overrides``
+    (``{metric: weight}``, ``None`` removes a metric) builds a one-off variant
+    of that sector only.
+
     Returns pd.DataFrame with columns: sector, metrics, weights.
     """
-    if sector in sec_sector_metric_weights:
-        sector_weights_dict = sec_sector_metric_weights[sector]
-    else:
-        _logger.warning(
-            "Sector '%s' not found in sec_sector_metric_weights — using 'default'. "
-            "Valid sectors: %s",
-            sector,
-            sorted(sec_sector_metric_weights.keys()),
-        )
-        sector_weights_dict = sec_sector_metric_weights["default"]
-    return pd.DataFrame({
-        "sector":  sector,
-        "metrics": list(sector_weights_dict.keys()),
-        "weights": list(sector_weights_dict.values()),
-    })
+    registry = default_weights_registry()
+    if overrides:
+        return registry.with_sector_overrides(sector, overrides).frame
+    return registry.frame(sector)
 
 
 def list_sectors() -> list[str]:
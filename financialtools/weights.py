@@ -0,0 +1,196 @@
+"""weights.py — precomputed per-sector metric weights.
+
+Provides:
+  SectorWeights     — one sector's weights: a read-only NumPy vector aligned to
+                      ``SCORED_METRICS`` (NaN where the sector has no weight),
+                      the metrics without a weight, and the long
+                      ``sector, metrics, weights`` DataFrame the evaluators take.
+  WeightsRegistry   — every sector of a weights table (``sec_sector_metric_weights``
+                      by default) built once, with optional per-sector overrides.
+                      Missing metrics are reported when the registry is built,
+                      not on every ``evaluate()`` call.
+  default_weights_registry() — the process-wide registry behind ``build_weights()``.
+
+Frames handed out by the registry are copies (a few dozen rows each), so
+callers may modify them in place without touching the cache. Each
+frame carries ``attrs["missing_metrics"]`` — ``{sector: (metric, ...)}`` already
+reported at build time — which the evaluators use to skip repeating the warning.
+
+Depends on: config (sec_sector_metric_weights), evaluator (SCORED_METRICS), numpy, pandas.
+"""
+import logging as _logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from financialtools.config import sec_sector_metric_weights
+from financialtools.evaluator import SCORED_METRICS
+
+_logger = _logging.getLogger(__name__)
+
+DEFAULT_SECTOR = "default"
+
+
+@dataclass(frozen=True)
+class SectorWeights:
+    """Weights of one sector, aligned to the registry's metric order."""
+
+    sector: str
+    metrics: tuple
+    vector: np.ndarray       # read-only, NaN where the sector has no weight
+    missing: tuple           # metrics without a weight, in metric order
+    _frame: pd.DataFrame
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """``sector, metrics, weights`` rows for the weighted metrics (a copy)."""
+        return self._frame.copy()
+
+
+def _build_sector(sector: str, raw: dict, metrics: tuple) -> SectorWeights:
+    # Metrics outside ``metrics`` (e.g. added with register_metric) keep their
+    # rows in the frame — evaluators pick them up by name — but have no vector slot.
+    extra = [m for m in raw if m not in set(metrics) and raw[m] is not None]
+    if extra:
+        _logger.debug("Sector '%s' weights metrics outside the registry order: %s", sector, extra)
+    vector = np.full(len(metrics), np.nan)
+    for j, metric in enumerate(metrics):
+        weight = raw.get(metric)
+        if weight is None:
+            continue
+        weight = float(weight)
+        if not math.isfinite(weight) or weight < 0:
+            raise ValueError(
+                f"Sector '{sector}' has an invalid weight for {metric!r}: {weight!r} "
+                "(weights must be finite and non-negative)"
+            )
+        vector[j] = weight
+    vector.setflags(write=False)
+
+    weighted = ~np.isnan(vector)
+    missing = tuple(m for m, ok in zip(metrics, weighted) if not ok)
+    if missing:
+        _logger.warning(
+            "Sector '%s' has no weight for metrics %s — they will be excluded from "
+            "its composite score.", sector, list(missing),
+        )
+    kept = [m for m, ok in zip(metrics, weighted) if ok] + extra
+    frame = pd.DataFrame({
+        "sector":  sector,
+        "metrics": kept,
+        "weights": [raw[m] for m in kept],     # config values as given (dtype preserved)
+    })
+    frame.attrs["missing_metrics"] = {sector: missing}
+    return SectorWeights(sector, metrics, vector, missing, frame)
+
+
+class WeightsRegistry:
+    """All sectors of a weights table, built once.
+
+    Parameters
+    ----------
+    weights : {sector: {metric: weight}}, optional
+        Base table. Defaults to ``sec_sector_metric_weights``; must contain
+        ``"default"`` (the fallback for unknown sectors).
+    overrides : {sector: {metric: weight}}, optional
+        Per-sector changes applied on top of ``weights``. A weight of ``None``
+        removes the metric; a sector absent from ``weights`` starts from the
+        ``"default"`` sector's weights.
+    metrics : sequence of str, optional
+        Metric order of the vectors. Defaults to ``SCORED_METRICS``.
+    """
+
+    def __init__(self, weights: dict | None = None, overrides: dict | None = None,
+                 metrics=None):
+        base = sec_sector_metric_weights if weights is None else weights
+        if DEFAULT_SECTOR not in base:
+            raise ValueError(f"weights must contain a {DEFAULT_SECTOR!r} sector")
+        self.metrics = tuple(SCORED_METRICS if metrics is None else metrics)
+        self._base = {sector: dict(raw) for sector, raw in base.items()}
+        self._overrides = {sector: dict(raw) for sector, raw in (overrides or {}).items()}
+
+        self._sectors = {
+            sector: _build_sector(sector, self._table(sector), self.metrics)
+            for sector in {**self._base, **self._overrides}
+        }
+
+    def _table(self, sector: str, changes: dict | None = None) -> dict:
+        # Base weights of ``sector`` (or "default"), then this registry's overrides, then ``changes``.
+        table = dict(self._base.get(sector, self._base[DEFAULT_SECTOR]))
+        for overrides in (self._overrides.get(sector, {}), changes or {}):
+            for metric, weight in overrides.items():
+                if weight is None:
+                    table.pop(metric, None)
+                else:
+                    table[metric] = weight
+        return table
+
+    def __contains__(self, sector: str) -> bool:
+        return sector in self._sectors
+
+    def sectors(self) -> list[str]:
+        """Sorted sector names, ``"default"`` included."""
+        return sorted(self._sectors)
+
+    def get(self, sector: str) -> SectorWeights:
+        """Weights for ``sector``; unknown sectors fall back to ``"default"`` with a warning.
+
+        The fallback keeps the requested sector name in ``frame`` so evaluators
+        see the sector they were asked for.
+        """
+        found = self._sectors.get(sector)
+        if found is not None:
+            return found
+        _logger.warning(
+            "Sector '%s' not found in sec_sector_metric_weights — using 'default'. "
+            "Valid sectors: %s",
+            sector,
+            self.sectors(),
+        )
+        default = self._sectors[DEFAULT_SECTOR]
+        frame = default._frame.assign(sector=sector)
+        frame.attrs["missing_metrics"] = {sector: default.missing}
+        return SectorWeights(sector, default.metrics, default.vector, default.missing, frame)
+
+    def frame(self, sector: str) -> pd.DataFrame:
+        """``build_weights()``-shaped frame for one sector."""
+        return self.get(sector).frame
+
+    def frames(self, sectors) -> pd.DataFrame:
+        """One frame covering several sectors (the ``UniverseMetricsEvaluator`` shape)."""
+        parts = [self.get(s) for s in sectors]
+        out = pd.concat([p._frame for p in parts], ignore_index=True)
+        out.attrs["missing_metrics"] = {p.sector: p.missing for p in parts}
+        return out
+
+    def vector(self, sector: str) -> np.ndarray:
+        """Read-only weight vector of ``sector`` in ``self.metrics`` order."""
+        return self.get(sector).vector
+
+    def with_sector_overrides(self, sector: str, changes: dict) -> SectorWeights:
+        """Weights of ``sector`` with ``changes`` applied, built for that sector alone.
+
+        Same rules as the ``overrides`` argument (``None`` removes a metric; a
+        sector absent from the base table starts from ``"default"``).
+        """
+        return _build_sector(sector, self._table(sector, changes), self.metrics)
+
+    def with_overrides(self, overrides: dict) -> "WeightsRegistry":
+        """A new registry with ``overrides`` applied on top of this one's."""
+        merged = {sector: dict(raw) for sector, raw in self._overrides.items()}
+        for sector, changes in overrides.items():
+            merged.setdefault(sector, {}).update(changes)
+        return WeightsRegistry(self._base, overrides=merged, metrics=self.metrics)
+
+
+@lru_cache(maxsize=None)
+def default_weights_registry() -> WeightsRegistry:
+    """Process-wide registry over ``sec_sector_metric_weights``, built on first use.
+
+    Call ``default_weights_registry.cache_clear()`` after editing the config table
+    at runtime.
+    """
+    return WeightsRegistry()
@@ -1,10 +1,13 @@
 import pandas as pd
 import datetime as dt
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from financialtools.utils import build_weights, export_to_xlsx, resolve_sector, RateLimiter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from financialtools.utils import build_weights, resolve_sector, RateLimiter
 from financialtools.processor import Downloader, FundamentalMetricsEvaluator
 from financialtools.evaluator import empty_result
+from financialtools.results import CompactResult
 from financialtools.exceptions import DownloadError
+from financialtools.exporters import read_frame, write_frames
 
 
 import logging
@@ -194,12 +197,15 @@ def _download_multiple_tickers(
     return pd.concat(fin_data, ignore_index=True)
 
 
-def download_data(tickers: str | list[str]) -> pd.DataFrame:
+def download_data(tickers: str | list[str], limiter: RateLimiter | None = None) -> pd.DataFrame:
     """Download merged financials for one or multiple tickers.
 
     Parameters
     ----------
     tickers : str or list[str]
+    limiter : optional rate limiter with an ``acquire()`` method — e.g. a
+              ``SQLiteRateLimiter`` shared with other processes. Defaults to
+              none for a single ticker and ``RateLimiter(per_minute=20)`` for a list.
 
     Returns
     -------
@@ -214,9 +220,9 @@ def download_data(tickers: str | list[str]) -> pd.DataFrame:
         If tickers is not a str or list[str].
     """
     if isinstance(tickers, str):
-        result = _download_single_ticker(tickers)
+        result = _download_single_ticker(tickers, limiter=limiter)
     elif isinstance(tickers, list):
-        result = _download_multiple_tickers(tickers)
+        result = _download_multiple_tickers(tickers, limiter=limiter)
     else:
         raise TypeError("tickers must be a str or list of str")
 
@@ -240,6 +246,30 @@ class DownloaderWrapper:
 
 
 
+def _evaluate_frame(
+    ticker: str, df: pd.DataFrame | None, weights: pd.DataFrame, compact: bool = False
+) -> dict | CompactResult:
+    """Evaluate one ticker's pre-partitioned frame; return empty_result() on failure.
+
+    Module-level (not a bound method) so ProcessPoolExecutor can pickle it —
+    workers receive only the ticker slice and the weights, never the full frame.
+    With ``compact=True`` the result is encoded in the worker, so process pools
+    also pickle the compact form back.
+    """
+    try:
+        if df is None or df.empty:
+            raise ValueError("Processed DataFrame is empty.")
+        assistant = FundamentalMetricsEvaluator(data=df, weights=weights)
+        result = assistant.evaluate()
+    except Exception as e:
+        logger.error(f"[{ticker}] evaluate_single failed: {e}", exc_info=True)
+        result = empty_result()  # single source of truth from processor.py
+    return CompactResult.from_result(result) if compact else result
+
+
+_EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
 class FundamentalEvaluator:
     """
     Wrapper around FundamentalMetricsEvaluator to evaluate fundamentals
@@ -276,6 +306,17 @@ class FundamentalEvaluator:
 
         self.df = df
         self.weights = weights if weights is not None else build_weights(sector)
+        self._partitions: dict[str, pd.DataFrame] | None = None
+
+    def partitions(self) -> dict[str, pd.DataFrame]:
+        """Return ``{ticker: slice}`` built with a single ``groupby`` pass.
+
+        Computed once and cached, replacing one boolean-mask scan of the full
+        frame per ticker.
+        """
+        if self._partitions is None:
+            self._partitions = dict(tuple(self.df.groupby("ticker", sort=False)))
+        return self._partitions
 
     def evaluate_single(self, ticker: str) -> dict:
         """
@@ -287,63 +328,104 @@ class FundamentalEvaluator:
         Returns:
             dict: Dictionary containing evaluation results.
         """
-        try:
-            processed_df = self.df[self.df["ticker"] == ticker]
-            if processed_df.empty:
-                raise ValueError("Processed DataFrame is empty.")
+        return _evaluate_frame(ticker, self.partitions().get(ticker), self.weights)
 
-            assistant = FundamentalMetricsEvaluator(
-                data=processed_df, weights=self.weights
-            )
-            return assistant.evaluate()
+    def iter_evaluate(
+        self,
+        tickers: list,
+        max_workers: int = 5,
+        executor: str = "thread",
+        compact: bool = False,
+    ):
+        """
+        Evaluate tickers in a pool and yield ``(ticker, result)`` as each finishes.
 
-        except Exception as e:
-            logger.error(f"[{ticker}] evaluate_single failed: {e}", exc_info=True)
-            return empty_result()  # single source of truth from processor.py
+        Results stream back in completion order, so consumers such as
+        ``merge_results`` can start concatenating before the slowest ticker is done.
 
-    def evaluate_multiple(self, tickers: list, parallel: bool = True, max_workers: int = 5) -> dict:
+        Parameters:
+            tickers (list): List of ticker symbols.
+            max_workers (int): Pool size (default=5).
+            executor (str): ``"thread"`` or ``"process"``. Evaluation is pure
+                pandas/NumPy CPU work, so ``"process"`` sidesteps the GIL on
+                large universes; ``"thread"`` avoids process start-up and
+                pickling cost for a handful of tickers.
+            compact (bool): Yield ``CompactResult`` containers instead of
+                dicts of DataFrames (default=False).
+
+        Raises:
+            ValueError: If ``executor`` is not one of the supported backends.
+        """
+        if executor not in _EXECUTORS:
+            raise ValueError(
+                f"Unknown executor {executor!r} — expected one of {sorted(_EXECUTORS)}"
+            )
+        parts = self.partitions()
+        with _EXECUTORS[executor](max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(_evaluate_frame, t, parts.get(t), self.weights, compact): t
+                for t in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Use empty_result() — not None — so that merge_results()
+                    # can safely call result.get(key) on every entry without
+                    # a NoneType AttributeError.
+                    logger.error(
+                        "[%s] Parallel evaluation failed: %s", ticker, e, exc_info=True
+                    )
+                    result = CompactResult() if compact else empty_result()
+                yield ticker, result
+
+    def evaluate_multiple(
+        self,
+        tickers: list,
+        parallel: bool = True,
+        max_workers: int = 5,
+        executor: str = "thread",
+        compact: bool = False,
+    ) -> dict:
         """
         Evaluate fundamentals for multiple tickers.
 
         Parameters:
             tickers (list): List of ticker symbols.
             parallel (bool): Run evaluations in parallel (default=True).
-            max_workers (int): Thread pool size for parallel runs (default=5).
-                Keep this low — each thread makes network calls to yfinance.
+            max_workers (int): Pool size for parallel runs (default=5).
+            executor (str): Parallel backend, ``"thread"`` (default) or
+                ``"process"`` — see ``iter_evaluate``. Ignored when
+                ``parallel=False``.
+            compact (bool): Store each result as a ``CompactResult``
+                (dictionary-encoded identifiers, one block per dtype) instead of
+                a dict of DataFrames — for keeping a whole universe in memory.
+                ``result[key]`` and ``merge_results`` work on either form.
 
         Returns:
             dict: Results for all tickers keyed by ticker.
         """
-        results = {}
-
         if parallel:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {executor.submit(self.evaluate_single, t): t for t in tickers}
-                for future in as_completed(futures):
-                    ticker = futures[future]
-                    try:
-                        results[ticker] = future.result()
-                    except Exception as e:
-                        # Use empty_result() — not None — so that merge_results()
-                        # can safely call result.get(key) on every entry without
-                        # a NoneType AttributeError.
-                        logger.error(
-                            "[%s] Parallel evaluation failed: %s", ticker, e, exc_info=True
-                        )
-                        results[ticker] = empty_result()
-        else:
-            for ticker in tickers:
-                results[ticker] = self.evaluate_single(ticker)
-
-        return results
+            return dict(self.iter_evaluate(
+                tickers, max_workers=max_workers, executor=executor, compact=compact
+            ))
+        parts = self.partitions()
+        return {
+            ticker: _evaluate_frame(ticker, parts.get(ticker), self.weights, compact)
+            for ticker in tickers
+        }
 
 
-def merge_results(results: dict, key: str) -> pd.DataFrame:
+def merge_results(results: dict | Iterable | CompactResult, key: str) -> pd.DataFrame:
     """
     Merges a specific key from multiple result dictionaries into a single DataFrame.
 
     Parameters:
-        results (dict): Dict of {ticker: result_dict}
+        results: Dict of {ticker: result_dict}, a single CompactResult, or any
+            iterable of result dicts / CompactResults or ``(ticker, result)`` pairs — e.g. the generator returned by
+            ``FundamentalEvaluator.iter_evaluate``, which is consumed as results
+            arrive.
         key (str): Key to extract and merge (e.g., 'composite_scores')
 
     Returns:
@@ -351,13 +433,23 @@ def merge_results(results: dict, key: str) -> pd.DataFrame:
 
     Design note:
         Each value in results must be a dict (as returned by evaluate_single /
-        empty_result()) — never None. The isinstance guard below is a defensive
-        last-resort check; evaluate_multiple guarantees this contract after S3 fix.
+        empty_result()) or a CompactResult — never None. The isinstance guard
+        below is a defensive last-resort check; evaluate_multiple guarantees
+        this contract after S3 fix. ``results`` may also be a single
+        CompactResult; compact entries are concatenated by reference and
+        decoded once.
     """
     try:
+        if isinstance(results, CompactResult):
+            df = results.frame(key)
+            return df if not df.empty else pd.DataFrame()
+        items = results.values() if isinstance(results, dict) else results
+        values = [item[1] if isinstance(item, tuple) else item for item in items]
+        if any(isinstance(result, CompactResult) for result in values):
+            return merge_results(CompactResult.concat(values), key)
         frames = [
             df
-            for result in results.values()
+            for result in values
             if isinstance(result, dict)
             for df in (result.get(key),)
             if isinstance(df, pd.DataFrame) and not df.empty
@@ -368,62 +460,71 @@ def merge_results(results: dict, key: str) -> pd.DataFrame:
         return pd.DataFrame()
     
 
-def export_financial_results(results, output_dir="financial_data", sheet_name="sheet1"):
-    """
-    Merges result dictionaries by predefined keys and exports each to an Excel file.
+_EXPORT_KEYS = ("metrics", "eval_metrics", "composite_scores", "red_flags", "raw_red_flags")
 
-    Parameters:
-        results (list): List of result dictionaries.
-        output_dir (str): Directory to save Excel files.
-        sheet_name (str): Name of the Excel sheet.
+
+def _merge_keys(results, keys) -> dict:
+    """Merge every key of ``results`` in one pass over the results.
+
+    ``results`` is consumed once (generators included); compact results are
+    concatenated once and decoded per key.
     """
-    import os
+    if not isinstance(results, CompactResult):
+        items = results.values() if isinstance(results, dict) else results
+        results = [item[1] if isinstance(item, tuple) else item for item in items]
+        if any(isinstance(result, CompactResult) for result in results):
+            results = CompactResult.concat(results)
+    return {key: merge_results(results, key) for key in keys}
 
-    keys = [
-        "metrics",
-        "eval_metrics",
-        "composite_scores",
-        "red_flags",
-        "raw_red_flags"
-    ]
 
-    os.makedirs(output_dir, exist_ok=True)
+def export_financial_results(results, output_dir="financial_data", sheet_name="sheet1",
+                             formats=("xlsx",), max_workers=None):
+    """
+    Merges result dictionaries by predefined keys and exports each key in every
+    requested format.
 
-    for key in keys:
-        try:
-            df = merge_results(results, key)
-            export_to_xlsx(
-                df=df,
-                path=f"{output_dir}/{key}.xlsx",
-                sheet_name=sheet_name
-            )
-        except Exception as e:
-            logger.error("Failed to export %r: %s", key, e, exc_info=True)
+    Parameters:
+        results: Anything merge_results accepts — dict of results, iterable of
+            results or ``(ticker, result)`` pairs, or a CompactResult.
+        output_dir (str): Directory to save the files (``<key>.<ext>``).
+        sheet_name (str): Name of the Excel sheet (xlsx only; frames beyond
+            Excel's row limit continue on ``<sheet_name>_2`` …).
+        formats: Export formats — any of ``available_formats()``
+            (``"xlsx"``, ``"parquet"``, ``"arrow"``, ``"csv"``).
+        max_workers: Threads writing (key, format) files in parallel.
+
+    Returns:
+        dict: ``{key: [paths written]}``; failed writes are logged and omitted.
+    """
+    frames = _merge_keys(results, _EXPORT_KEYS)
+    return write_frames(frames, output_dir, formats=formats, sheet_name=sheet_name,
+                        max_workers=max_workers)
 
 
-def read_financial_results(ticker=None, time=None, input_dir="financial_data", sheet_name="sheet1"):
+def read_financial_results(ticker=None, time=None, input_dir="financial_data", sheet_name="sheet1",
+                           fmt=None):
     """
-    Reads specific Excel files and returns selected DataFrames.
+    Reads the exported result files and returns selected DataFrames.
     Optionally filters each DataFrame by ticker and/or year.
 
+    Each key is read in the fastest format present in ``input_dir`` (Arrow,
+    then Parquet, CSV, Excel) unless ``fmt`` names one. Identifier columns come
+    back as strings; ``time`` matches an int or str year alike.
+
     Returns:
         Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
             metrics, eval_metrics, composite_scores, red_flags
     """
-    import os
-    import pandas as pd
-
     def read_and_filter(filename):
-        path = os.path.join(input_dir, f"{filename}.xlsx")
         try:
-            df = pd.read_excel(path, sheet_name=sheet_name)
+            df = read_frame(input_dir, filename, sheet_name=sheet_name, fmt=fmt)
             df = df.round(4)
 
             # Apply filters if columns exist
             if ticker is not None and "ticker" in df.columns:
                 df = df[df["ticker"] == ticker]
             if time is not None and "time" in df.columns:
-                df = df[df["time"] == time]
+                df = df[df["time"].astype(str) == str(time)]
 
             return df
         except Exception as e:
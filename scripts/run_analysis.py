@@ -11,6 +11,7 @@ Usage
     python scripts/run_analysis.py --ticker AAPL --sector technology
     python scripts/run_analysis.py --ticker ENI.MI --sector energy --year 2023
     python scripts/run_analysis.py --ticker AAPL --sector technology --model gpt-4o
+    python scripts/run_analysis.py --ticker AAPL --sector technology --max-concurrency 3
     python scripts/run_analysis.py --list-sectors
 
 Options
@@ -20,6 +21,9 @@ Options
                   (required unless --list-sectors)
     --year        Optional year filter; omit to include all available years
     --model       OpenAI model name (default: gpt-4.1-nano)
+    --max-concurrency  Topic chains in flight at once (default: all nine)
+    --no-llm-cache  Always call the LLM (skip the on-disk response cache)
+    --payload-layout  JSON layout of the LLM payloads: table (default), columns, records
     --list-sectors  Print all valid sector names and exit
 
 Output
@@ -45,6 +49,7 @@ import logging
 import sys
 
 from financialtools.config import sec_sector_metric_weights
+from financialtools.payloads import PAYLOAD_LAYOUTS
 
 # ---------------------------------------------------------------------------
 # Logging: console output for the script; wrappers.py configures file handlers
@@ -258,6 +263,24 @@ def _parse_args() -> argparse.Namespace:
         metavar="MODEL",
         help="OpenAI model name (default: gpt-4.1-nano)",
     )
+    p.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Run at most N topic chains at once (default: all nine; 1 = sequential).",
+    )
+    p.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always call the LLM instead of reusing cached assessments.",
+    )
+    p.add_argument(
+        "--payload-layout",
+        choices=PAYLOAD_LAYOUTS,
+        default="table",
+        help="JSON layout of the five payloads sent to the LLM (default: table).",
+    )
     p.add_argument(
         "--list-sectors",
         action="store_true",
@@ -291,6 +314,9 @@ def main() -> int:
             sector=args.sector,
             year=args.year,
             model=args.model,
+            max_concurrency=args.max_concurrency,
+            cache=None if args.no_llm_cache else True,
+            payload_layout=args.payload_layout,
         )
     except EvaluationError as exc:
         logger.error("Evaluation failed: %s", exc)
@@ -25,6 +25,9 @@ Usage
     # Recovery: job finished but script was interrupted
     python scripts/run_batch_collect.py --job-file batch_job.json
 
+    # Do not store the fresh results in the response cache
+    python scripts/run_batch_collect.py --no-llm-cache
+
 Poll interval
 -------------
 Default: 60 seconds.  Override with BATCH_POLL_INTERVAL env var (seconds).
@@ -45,6 +48,11 @@ Design invariants
 - Per-item errors in the batch response (item["error"]) are logged and the
   topic result is stored as {"error": "..."} in the cache — compile_report_node
   handles unavailable topics gracefully.
+- Topics answered from the response cache at submit time arrive in the job
+  file (cached_results) and are written alongside the batch results. Valid
+  fresh results are stored in the response cache under the submit-time
+  response_keys, so re-submitting the same request skips it. A job file with
+  job_id null (everything cached) needs no polling.
 - compile_report_node is called synchronously per ticker (one LLM call each)
   after all batch results are written.  It can optionally be batched too
   (future improvement) but is cheap relative to 8 × N topic calls.
@@ -200,6 +208,50 @@ def _write_results_to_cache(
     return dict(by_ticker)
 
 
+def _add_cached_results(by_ticker: dict[str, dict[str, dict]], job_meta: dict) -> int:
+    """
+    Merge the results served from the response cache at submit time into
+    by_ticker and write them to the disk cache.  Returns how many were added.
+    """
+    from agents._cache import write_topic_result
+
+    added = 0
+    for entry in job_meta.get("tickers", []):
+        cache_key = entry["cache_key"]
+        for topic, result_dict in (entry.get("cached_results") or {}).items():
+            by_ticker.setdefault(cache_key, {})[topic] = result_dict
+            write_topic_result(cache_key, topic, result_dict)
+            added += 1
+    return added
+
+
+def _store_responses(
+    by_ticker:       dict[str, dict[str, dict]],
+    job_meta:        dict,
+    topic_model_map: dict,
+    cache,
+) -> int:
+    """
+    Store every valid fresh batch result in the response cache under the key
+    recorded by run_batch_submit.py.  Returns how many were stored.
+    """
+    stored = 0
+    for entry in job_meta.get("tickers", []):
+        keys   = entry.get("response_keys") or {}
+        cached = entry.get("cached_results") or {}
+        for topic, result_dict in by_ticker.get(entry["cache_key"], {}).items():
+            model_cls = topic_model_map.get(topic)
+            if topic in cached or topic not in keys or model_cls is None or "error" in result_dict:
+                continue
+            try:
+                assessment = model_cls.model_validate(result_dict)
+            except Exception:
+                continue            # raw JSON kept after a validation failure
+            cache.put_assessment(keys[topic], topic, assessment)
+            stored += 1
+    return stored
+
+
 # ---------------------------------------------------------------------------
 # Compile report phase
 # ---------------------------------------------------------------------------
@@ -304,7 +356,12 @@ def main() -> int:
     client = OpenAI()
 
     # ── 2. Status-only mode ──────────────────────────────────────────────────
-    if args.status_only:
+    if job_id is None:
+        if args.status_only:
+            print("Status:     no batch job — every task was served from the response cache")
+            return 0
+        results = []
+    elif args.status_only:
         job = check_batch_job(client, job_id)
         counts = job.get("request_counts") or {}
         print(f"Status:     {job['status']}")
@@ -314,29 +371,30 @@ def main() -> int:
         return 0
 
     # ── 3. Poll until complete ───────────────────────────────────────────────
-    logger.info("Polling batch job (interval=%.0fs) ...", args.poll_interval)
-    completed_ids = poll_until_complete(
-        client, [job_id], poll_interval=args.poll_interval
-    )
-
-    if job_id not in completed_ids:
-        job = check_batch_job(client, job_id)
-        logger.error(
-            "Batch job did not complete — status=%s. "
-            "Re-run this script to retry, or check the OpenAI dashboard.",
-            job.get("status"),
+    if job_id is not None:
+        logger.info("Polling batch job (interval=%.0fs) ...", args.poll_interval)
+        completed_ids = poll_until_complete(
+            client, [job_id], poll_interval=args.poll_interval
         )
-        if job.get("error_file_id"):
-            errors = client.files.content(job["error_file_id"]).text
-            logger.error("Error file:\n%s", errors[:2000])
-        return 1
 
-    logger.info("Job completed.")
+        if job_id not in completed_ids:
+            job = check_batch_job(client, job_id)
+            logger.error(
+                "Batch job did not complete — status=%s. "
+                "Re-run this script to retry, or check the OpenAI dashboard.",
+                job.get("status"),
+            )
+            if job.get("error_file_id"):
+                errors = client.files.content(job["error_file_id"]).text
+                logger.error("Error file:\n%s", errors[:2000])
+            return 1
+
+        logger.info("Job completed.")
 
-    # ── 4. Download results ──────────────────────────────────────────────────
-    logger.info("Downloading results ...")
-    results = download_batch_results(client, job_id)
-    logger.info("  %d result items received", len(results))
+        # ── 4. Download results ──────────────────────────────────────────────
+        logger.info("Downloading results ...")
+        results = download_batch_results(client, job_id)
+        logger.info("  %d result items received", len(results))
 
     # ── 5. Build topic model map ─────────────────────────────────────────────
     from financialtools.analysis import _TOPIC_MAP
@@ -346,6 +404,17 @@ def main() -> int:
     logger.info("=== Writing topic results to cache ===")
     by_ticker = _write_results_to_cache(results, topic_model_map)
 
+    if not args.no_llm_cache:
+        from financialtools.cache import default_response_cache
+
+        cache = default_response_cache()
+        if cache is not None:
+            stored = _store_responses(by_ticker, job_meta, topic_model_map, cache)
+            logger.info("  %d result(s) stored in the response cache", stored)
+    n_cached = _add_cached_results(by_ticker, job_meta)
+    if n_cached:
+        logger.info("  %d result(s) served from the response cache at submit time", n_cached)
+
     n_ok  = sum(
         1 for t in by_ticker.values()
         for r in t.values() if "error" not in r
@@ -420,6 +489,11 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print current job status and exit without collecting results.",
     )
+    p.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Do not store the collected topic results in the response cache.",
+    )
     return p.parse_args()
 
 
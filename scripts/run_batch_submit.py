@@ -28,6 +28,9 @@ Usage
     # Write job metadata to a custom path (default: batch_job.json)
     python scripts/run_batch_submit.py --job-file runs/ftse_2024.json
 
+    # Submit every topic, even those answered before
+    python scripts/run_batch_submit.py --no-llm-cache
+
 Ticker file format
 ------------------
 Tab-separated, columns: ticker  sector
@@ -43,11 +46,15 @@ Writes --job-file (default: batch_job.json) — a JSON document with:
         "year":    null,
         "tickers": [
             {"ticker": "ENI.MI", "cache_key": "ENI.MI_all",
-             "company_name": "eni s.p.a.", "sector": "energy"},
+             "company_name": "eni s.p.a.", "sector": "energy",
+             "response_keys":  {"liquidity": "<ResponseCache key>", ...},
+             "cached_results": {"growth": {...}, ...}},
             ...
         ]
     }
 
+job_id is null when every task was answered from the response cache.
+
 Pass this file to run_batch_collect.py to retrieve results.
 
 Design invariants
@@ -61,6 +68,11 @@ Design invariants
   format is enforced by the API-level response_format parameter (strict mode).
 - Per-ticker download failures are logged and skipped; the remaining tickers
   are still submitted.
+- Tasks whose exact request (model, system prompt, response schema and user
+  message) was answered before are served from the response cache
+  (financialtools.cache.default_response_cache) and not submitted; their
+  results travel in the job file as cached_results. run_batch_collect.py
+  stores fresh results under response_keys.
 - Requires OPENAI_API_KEY in .env.
 
 Environment
@@ -182,22 +194,20 @@ def _response_format(model_cls: type) -> dict:
 # Prompt helpers
 # ---------------------------------------------------------------------------
 
-def _build_messages(system_prompt_str: str, payloads: dict) -> list[dict]:
+def _build_messages(system_prompt_str: str, payloads: dict, topic: str) -> list[dict]:
     """
     Build the messages list for one topic request.
 
     system_prompt_str has a {format_instructions} placeholder — we pass ""
     because the output format is enforced by response_format (strict mode).
-    The human message matches the _TOPIC_HUMAN_TEMPLATE used by _analyse_topic.
+    The human message matches the topic chain used by _analyse_topic: only the
+    payload blocks and metric columns registered for the topic in
+    financialtools.projections.
     """
+    from financialtools.projections import human_template, project_payloads
+
     system = system_prompt_str.format(format_instructions="")
-    human  = (
-        f"Metrics:\n{payloads['metrics']}\n"
-        f"Extended Metrics:\n{payloads['extended_metrics']}\n"
-        f"Scores:\n{payloads['composite_scores']}\n"
-        f"Evaluation Metrics:\n{payloads['eval_metrics']}\n"
-        f"RedFlags:\n{payloads['red_flags']}"
-    )
+    human  = human_template(topic).format(**project_payloads(payloads, topic))
     return [
         {"role": "system", "content": system},
         {"role": "user",   "content": human},
@@ -220,7 +230,7 @@ def _build_task(
     from financialtools.analysis import _TOPIC_MAP
 
     system_prompt_str, _ = _TOPIC_MAP[topic]
-    messages = _build_messages(system_prompt_str, payloads)
+    messages = _build_messages(system_prompt_str, payloads, topic)
 
     return {
         "custom_id": f"{cache_key}__{topic}",
@@ -339,14 +349,34 @@ def _download_all(
 # Batch task builder
 # ---------------------------------------------------------------------------
 
+def _response_cache_key(task: dict, topic: str) -> str:
+    """
+    ResponseCache key of one batch task.
+
+    Hashes the whole request body, so it never matches a synchronous chain
+    call (different system prompt, no fix retry) — "@batch" keeps the two
+    apart in the model field.
+    """
+    from financialtools.cache import ResponseCache
+
+    body = task["body"]
+    system = body["messages"][0]["content"] + "\n" + json.dumps(body["response_format"], sort_keys=True)
+    return ResponseCache.key(f"{body['model']}@batch", topic, system, {"user": body["messages"][1]["content"]})
+
+
 def _build_all_tasks(
     downloaded: list[dict],
     model:      str,
+    cache=None,
 ) -> list[dict]:
     """
-    Build one Batch API task per (ticker, topic) pair.
+    Build one Batch API task per (ticker, topic) pair not already cached.
 
-    Returns the full list of task dicts ready for submit_batch_job().
+    Sets entry["response_keys"] ({topic: ResponseCache key}) on every entry.
+    With ``cache`` (a ResponseCache), topics answered before go to
+    entry["cached_results"] ({topic: assessment dict}) instead of a task.
+
+    Returns the list of task dicts ready for submit_batch_job().
     """
     from financialtools.analysis import _TOPIC_MAP
 
@@ -355,11 +385,18 @@ def _build_all_tasks(
     for entry in downloaded:
         cache_key = entry["cache_key"]
         payloads  = entry["payloads"]
+        entry["response_keys"]  = {}
+        entry["cached_results"] = {}
 
         for topic in TOPIC_NAMES:
             _, model_cls = _TOPIC_MAP[topic]
             task = _build_task(cache_key, topic, payloads, model, model_cls)
-            tasks.append(task)
+            key  = entry["response_keys"][topic] = _response_cache_key(task, topic)
+            cached = cache.get_assessment(key, topic, model_cls) if cache is not None else None
+            if cached is not None:
+                entry["cached_results"][topic] = cached.model_dump()
+            else:
+                tasks.append(task)
 
     return tasks
 
@@ -393,34 +430,43 @@ def main() -> int:
 
     # ── 3. Build batch tasks ─────────────────────────────────────────────────
     logger.info("=== PHASE 2: building batch tasks ===")
-    tasks = _build_all_tasks(downloaded, args.model)
+    from financialtools.cache import default_response_cache
+
+    cache = None if args.no_llm_cache else default_response_cache()
+    tasks = _build_all_tasks(downloaded, args.model, cache=cache)
+    n_cached = len(downloaded) * len(TOPIC_NAMES) - len(tasks)
     logger.info(
-        "  %d tasks built (%d tickers × %d topics)",
-        len(tasks), len(downloaded), len(TOPIC_NAMES),
+        "  %d tasks built (%d tickers × %d topics, %d served from the response cache)",
+        len(tasks), len(downloaded), len(TOPIC_NAMES), n_cached,
     )
 
     # ── 4. Submit ────────────────────────────────────────────────────────────
-    logger.info("=== PHASE 3: submitting batch job ===")
+    if not tasks:
+        job_id = None
+        print("\nEvery task was answered from the response cache — no batch job submitted.")
+    else:
+        logger.info("=== PHASE 3: submitting batch job ===")
 
-    from openai import OpenAI
-    from kitai.batch import submit_batch_job
+        from openai import OpenAI
+        from kitai.batch import submit_batch_job
 
-    client = OpenAI()
+        client = OpenAI()
 
-    try:
-        job_id = submit_batch_job(
-            client,
-            tasks,
-            endpoint="/v1/chat/completions",
-            metadata={"description": f"financialtools topic analysis — {len(downloaded)} tickers"},
-        )
-    except Exception as exc:
-        logger.error("Batch submission failed: %s", exc)
-        return 1
+        try:
+            job_id = submit_batch_job(
+                client,
+                tasks,
+                endpoint="/v1/chat/completions",
+                metadata={"description": f"financialtools topic analysis — {len(downloaded)} tickers"},
+            )
+        except Exception as exc:
+            logger.error("Batch submission failed: %s", exc)
+            return 1
 
-    logger.info("  job_id = %s", job_id)
-    print(f"\nBatch job submitted: {job_id}")
-    print(f"Tasks: {len(tasks)} ({len(downloaded)} tickers × {len(TOPIC_NAMES)} topics)")
+        logger.info("  job_id = %s", job_id)
+        print(f"\nBatch job submitted: {job_id}")
+        print(f"Tasks: {len(tasks)} ({len(downloaded)} tickers × {len(TOPIC_NAMES)} topics, "
+              f"{n_cached} cached)")
 
     # ── 5. Save job metadata ─────────────────────────────────────────────────
     job_meta = {
@@ -429,10 +475,12 @@ def main() -> int:
         "year":   args.year,
         "tickers": [
             {
-                "ticker":       e["ticker"],
-                "cache_key":    e["cache_key"],
-                "company_name": e["company_name"],
-                "sector":       e["sector"],
+                "ticker":         e["ticker"],
+                "cache_key":      e["cache_key"],
+                "company_name":   e["company_name"],
+                "sector":         e["sector"],
+                "response_keys":  e["response_keys"],
+                "cached_results": e["cached_results"],
             }
             for e in downloaded
         ],
@@ -486,6 +534,11 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Reuse existing agents/.cache payloads instead of re-downloading.",
     )
+    p.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Submit every task, ignoring previously cached topic responses.",
+    )
     return p.parse_args()
 
 
@@ -9,6 +9,14 @@ Usage
     python scripts/run_pipeline.py --sleep 4 --resume      # 4-second sleep, skip done sectors
     python scripts/run_pipeline.py --sectors technology financial-services  # subset of sectors
     python scripts/run_pipeline.py --no-benchmarks          # skip benchmark file generation
+    python scripts/run_pipeline.py --no-benchmark-excel     # Parquet benchmarks only
+    python scripts/run_pipeline.py --formats xlsx parquet   # also export results as Parquet
+    python scripts/run_pipeline.py --store financial_data/fundamentals  # persist raw data
+    python scripts/run_pipeline.py --incremental            # re-evaluate changed periods only
+    python scripts/run_pipeline.py --concurrency 8          # asyncio download, 8 tickers in flight
+    python scripts/run_pipeline.py --sectors energy --shared-limiter /tmp/yf.sqlite &
+    python scripts/run_pipeline.py --sectors technology --shared-limiter /tmp/yf.sqlite
+                                                            # shards sharing one rate budget
 
 Ticker file format (tab-separated, same as ftse_mib.txt):
     ticker  sector
@@ -27,27 +35,40 @@ Output
         composite_scores.xlsx
         red_flags.xlsx
         raw_red_flags.xlsx
-        metrics_by_sectors.xlsx       — per-sector peer averages (read by get_market_metrics)
-        eval_metrics_by_sectors.xlsx  — per-sector valuation averages
+        metrics_by_sectors.xlsx       — per-sector peer mean / median / quartiles
+                                        (read by get_market_metrics)
+        eval_metrics_by_sectors.xlsx  — per-sector valuation benchmarks
+        benchmarks/                   — the same benchmarks as Parquet, one file per
+                                        sector (SectorBenchmarks)
         failed_tickers.log            — tickers skipped due to empty download
+        fundamentals/                 — (--store only) raw merged data, partitioned
+                                        sector=<key>/fiscal_year=<yyyy>/ (FundamentalsStore)
+        state/                        — (--incremental only) previous results + row
+                                        fingerprints read back on the next run
 
 Pipeline stages
 ---------------
   1. Download  — one ticker at a time, sequential, with configurable sleep
+                 (or --concurrency N: asyncio engine, shared rate limiter)
   2. Evaluate  — FundamentalMetricsEvaluator per ticker, sector-specific weights
-  3. Export    — five canonical Excel files via export_financial_results()
-  4. Benchmark — sector averages written to metrics_by_sectors.xlsx and
-                 eval_metrics_by_sectors.xlsx so chains.py can compare any
-                 ticker against its peer group via get_market_metrics()
+  3. Export    — five canonical result files via export_financial_results()
+                 (Excel by default; --formats adds Parquet / Arrow / CSV)
+  4. Benchmark — sector mean / median / quartiles computed from the in-memory
+                 results, stored under benchmarks/ and exported to
+                 metrics_by_sectors.xlsx and eval_metrics_by_sectors.xlsx so
+                 chains.py can compare any ticker against its peer group via
+                 get_market_metrics()
 
 Design invariants
 -----------------
-- One ticker downloaded at a time (sequential) to respect yfinance rate limits.
+- By default one ticker is downloaded at a time (sequential) to respect yfinance
+  rate limits; --concurrency keeps the same average rate via AsyncRateLimiter.
 - Each ticker is evaluated using the weights for its own sector from config.sec_sector_metric_weights.
 - Unknown sectors fall back to "default" with a warning (matches sec_sector_metric_weights key).
 - On --resume, sectors whose checkpoint file already exists are skipped entirely.
-- Benchmark files are always recomputed from the full metrics.xlsx after export,
-  so they reflect all tickers — including those from a previous run.
+- Benchmarks are recomputed only for the sectors evaluated in this run; the
+  stored benchmarks of other sectors (e.g. skipped by --resume) are kept, so
+  the exported files cover every sector run so far.
 """
 
 import argparse
@@ -61,9 +82,17 @@ import pandas as pd
 
 # --- package imports --------------------------------------------------------
 from financialtools.analysis import build_weights
+from financialtools.async_downloader import AsyncRateLimiter, download_concurrent
+from financialtools.benchmarks import SectorBenchmarks
 from financialtools.config import sec_sector_metric_weights
 from financialtools.processor import Downloader
 from financialtools.evaluator import empty_result
+from financialtools.exporters import available_formats
+from financialtools.incremental import IncrementalState, evaluate_incremental
+from financialtools.results import CompactResult
+from financialtools.store import FundamentalsStore
+from financialtools.universe import split_by_ticker
+from financialtools.utils import SQLiteRateLimiter
 from financialtools.wrappers import export_financial_results, merge_results
 
 # ---------------------------------------------------------------------------
@@ -87,6 +116,8 @@ DEFAULT_TICKERS_FILE = os.path.join(
 DEFAULT_OUTPUT_DIR = "financial_data"
 DEFAULT_SLEEP_SECONDS = 3
 FAILED_LOG_NAME = "failed_tickers.log"
+STATE_DIR_NAME = "state"
+BENCHMARK_DIR_NAME = "benchmarks"
 
 
 # ---------------------------------------------------------------------------
@@ -120,13 +151,22 @@ def _load_ticker_list(filepath: str) -> pd.DataFrame:
 # Core pipeline
 # ---------------------------------------------------------------------------
 
+def _per_minute(sleep_seconds: float) -> int:
+    """Calls per minute equivalent to one call every ``sleep_seconds``."""
+    return max(1, int(60 / sleep_seconds)) if sleep_seconds > 0 else 60
+
+
 def download_sector(
     tickers: list[str],
     sleep_seconds: float,
+    limiter: Optional[SQLiteRateLimiter] = None,
 ) -> dict[str, pd.DataFrame]:
     """
     Download merged financial data for each ticker in the list, sequentially.
 
+    When ``limiter`` (shared across processes) is given, its acquire() replaces
+    the fixed sleep so concurrently running shards split one budget.
+
     Returns
     -------
     dict[str, pd.DataFrame]
@@ -139,30 +179,56 @@ def download_sector(
     for i, ticker in enumerate(tickers, start=1):
         logger.info(f"  [{i}/{total}] Downloading {ticker} …")
         try:
-            time.sleep(sleep_seconds)
-            d = Downloader.from_ticker(ticker)
-            df = d.get_merged_data()
-
-            # ── Enrich: company name (mirrors wrappers.py / data_tools.py) ───
-            # Sector is already known from the ticker file; only company_name
-            # requires the extra get_info_data() call.
-            info_df = d.get_info_data()
-            if not info_df.empty and "longName" in info_df.columns:
-                company_name = info_df["longName"].str.lower().to_string(index=False).strip()
+            if limiter is not None:
+                limiter.acquire()
             else:
-                company_name = ticker.lower()
-                logger.warning(
-                    f"  [{i}/{total}] {ticker}: longName not found in info; using ticker as name"
-                )
+                time.sleep(sleep_seconds)
+            d = Downloader.from_ticker(ticker)
+            results[ticker] = _merged_with_company_name(d, f"[{i}/{total}] {ticker}")
+        except Exception as exc:
+            logger.error(f"  [{i}/{total}] {ticker}: unexpected error — {exc}", exc_info=True)
+            results[ticker] = pd.DataFrame()
 
-            if not df.empty:
-                df["company_name"] = company_name
+    return results
 
-            results[ticker] = df
-            if df.empty:
-                logger.warning(f"  [{i}/{total}] {ticker}: download succeeded but merged data is empty")
-            else:
-                logger.info(f"  [{i}/{total}] {ticker}: {len(df)} rows")
+
+def download_sector_concurrent(
+    tickers: list[str],
+    concurrency: int,
+    sleep_seconds: float,
+    limiter: Optional[SQLiteRateLimiter] = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Download merged financial data for many tickers at once with the asyncio engine.
+
+    The four yfinance fetches of each ticker run concurrently, at most
+    ``concurrency`` tickers are in flight, and a shared AsyncRateLimiter
+    admits one ticker every ``sleep_seconds`` on average (per_minute =
+    60 / sleep_seconds) — the same average rate as the sequential path.
+    A cross-process ``limiter`` replaces the in-process one when given.
+
+    Returns the same ``{ticker: merged_df}`` shape as download_sector().
+    """
+    if limiter is None:
+        per_minute = _per_minute(sleep_seconds)
+        limiter = AsyncRateLimiter(
+            per_minute=per_minute, per_hour=per_minute * 60, per_day=per_minute * 60 * 24
+        )
+    downloaders, failures = download_concurrent(
+        tickers,
+        limiter=limiter,
+        max_concurrency=concurrency,
+    )
+
+    results: dict[str, pd.DataFrame] = {}
+    total = len(tickers)
+    for i, ticker in enumerate(tickers, start=1):
+        if ticker in failures:
+            logger.error(f"  [{i}/{total}] {ticker}: {failures[ticker]}")
+            results[ticker] = pd.DataFrame()
+            continue
+        try:
+            results[ticker] = _merged_with_company_name(downloaders[ticker], f"[{i}/{total}] {ticker}")
         except Exception as exc:
             logger.error(f"  [{i}/{total}] {ticker}: unexpected error — {exc}", exc_info=True)
             results[ticker] = pd.DataFrame()
@@ -170,6 +236,28 @@ def download_sector(
     return results
 
 
+def _merged_with_company_name(d: Downloader, label: str) -> pd.DataFrame:
+    """Return d.get_merged_data() enriched with company_name, logging the outcome."""
+    df = d.get_merged_data()
+
+    # ── Enrich: company name (mirrors wrappers.py / data_tools.py) ───────────
+    # Sector is already known from the ticker file; only company_name
+    # requires the extra get_info_data() call.
+    info_df = d.get_info_data()
+    if not info_df.empty and "longName" in info_df.columns:
+        company_name = info_df["longName"].str.lower().to_string(index=False).strip()
+    else:
+        company_name = d.ticker.lower()
+        logger.warning(f"  {label}: longName not found in info; using ticker as name")
+
+    if df.empty:
+        logger.warning(f"  {label}: download succeeded but merged data is empty")
+    else:
+        df["company_name"] = company_name
+        logger.info(f"  {label}: {len(df)} rows")
+    return df
+
+
 def evaluate_sector(
     ticker_data: dict[str, pd.DataFrame],
     sector: str,
@@ -219,76 +307,44 @@ def collect_failed(ticker_data: dict[str, pd.DataFrame]) -> list[str]:
 # Sector benchmarks
 # ---------------------------------------------------------------------------
 
-def compute_sector_benchmarks(output_dir: str) -> None:
+def compute_sector_benchmarks(
+    results: dict[str, CompactResult],
+    output_dir: str,
+    excel: bool = True,
+) -> None:
     """
-    Compute per-sector peer-average metrics and write the two benchmark files
-    that chains.py reads via get_market_metrics().
+    Compute per-sector peer benchmarks from the in-memory results and persist
+    them under {output_dir}/benchmarks/ (one Parquet file per sector).
 
-    Reads
-    -----
-    - {output_dir}/metrics.xlsx      — wide: ticker, time, sector, <metric cols>
-    - {output_dir}/eval_metrics.xlsx — wide: ticker, time, sector, <valuation cols>
+    Only the sectors present in ``results`` are recomputed; benchmarks of
+    sectors evaluated in earlier runs (e.g. skipped by --resume) are kept.
 
     Writes
     ------
-    - {output_dir}/metrics_by_sectors.xlsx      — columns: sector, metrics, market_value, time
-    - {output_dir}/eval_metrics_by_sectors.xlsx — same schema
+    - {output_dir}/benchmarks/<key>/sector=<sector>.parquet
+    - with excel=True, for chains.py:
+      {output_dir}/metrics_by_sectors.xlsx      — columns: sector, metrics, time,
+                                                  market_value, median, q25, q75, count
+      {output_dir}/eval_metrics_by_sectors.xlsx — same schema
 
     Formula: market_value = mean(metric) across all tickers in the sector, per year.
-    NaN values are excluded from the mean (skipna=True, pandas default).
+    NaN values are excluded from every statistic.
 
-    Invariant: these files must exist before calling get_stock_evaluation_report()
+    Invariant: the Excel files must exist before calling get_stock_evaluation_report()
     or chains.py will raise SectorNotFoundError on every ticker.
     """
-    _ID_VARS = {"ticker", "time", "sector"}
-
-    for source_file, dest_file in (
-        ("metrics.xlsx",      "metrics_by_sectors.xlsx"),
-        ("eval_metrics.xlsx", "eval_metrics_by_sectors.xlsx"),
-    ):
-        source_path = os.path.join(output_dir, source_file)
-        dest_path   = os.path.join(output_dir, dest_file)
-
-        if not os.path.isfile(source_path):
-            logger.warning(f"Benchmark: {source_path} not found — skipping {dest_file}")
-            continue
-
-        try:
-            wide = pd.read_excel(source_path, sheet_name="sheet1")
-
-            # Derive metric columns dynamically — same logic as processor.evaluate()
-            metric_cols = [c for c in wide.columns if c not in _ID_VARS]
-
-            if not metric_cols:
-                logger.warning(f"Benchmark: no metric columns found in {source_file} — skipping")
-                continue
-
-            long = wide.melt(
-                id_vars=["sector", "time"],
-                value_vars=metric_cols,
-                var_name="metrics",
-                value_name="market_value",
-            )
-
-            benchmarks = (
-                long
-                .groupby(["sector", "metrics", "time"], dropna=False, sort=False)
-                .agg(market_value=("market_value", "mean"))
-                .reset_index()
-            )
-
-            with pd.ExcelWriter(dest_path, engine="openpyxl") as writer:
-                benchmarks.to_excel(writer, sheet_name="sheet1", index=False)
-
-            n_sectors = benchmarks["sector"].nunique()
-            n_metrics = benchmarks["metrics"].nunique()
-            logger.info(
-                f"Benchmark: wrote {dest_file} "
-                f"({n_sectors} sectors × {n_metrics} metrics)"
-            )
-
-        except Exception as exc:
-            logger.error(f"Benchmark: failed to build {dest_file} — {exc}", exc_info=True)
+    try:
+        bench = SectorBenchmarks(os.path.join(output_dir, BENCHMARK_DIR_NAME))
+        written = bench.update(CompactResult.concat(results))
+        logger.info(
+            f"Benchmark: updated {len(written['metrics'])} sector(s) "
+            f"({len(bench.sectors())} stored)"
+        )
+        if excel:
+            for path in bench.to_excel(output_dir, sheet_name="sheet1"):
+                logger.info(f"Benchmark: wrote {os.path.basename(path)}")
+    except Exception as exc:
+        logger.error(f"Benchmark: failed to update sector benchmarks — {exc}", exc_info=True)
 
 
 # ---------------------------------------------------------------------------
@@ -302,20 +358,38 @@ def run(
     resume: bool,
     sectors_filter: Optional[list[str]],
     benchmarks: bool = True,
+    benchmark_excel: bool = True,
+    formats: tuple = ("xlsx",),
+    store_dir: Optional[str] = None,
+    incremental: bool = False,
+    concurrency: int = 0,
+    shared_limiter: Optional[str] = None,
 ) -> None:
     """
     Main pipeline:
       1. Load ticker list grouped by sector.
       2. For each sector (optionally filtered, optionally skipped if --resume):
-         a. Download merged data for all tickers sequentially.
-         b. Evaluate metrics using sector-specific weights.
+         a. Download merged data for all tickers sequentially
+            (and upsert it into the FundamentalsStore when store_dir is set).
+         b. Evaluate metrics using sector-specific weights (deferred to one
+            incremental pass over all sectors when incremental=True).
          c. Accumulate results.
-      3. Export all results to financial_data/*.xlsx.
-      4. Compute sector benchmark files (metrics_by_sectors.xlsx,
-         eval_metrics_by_sectors.xlsx) — required by chains.py.
+      3. Export all results to financial_data/<key>.<ext> in every format of
+         ``formats`` (xlsx by default — what chains.py reads), written in parallel.
+      4. Update the sector benchmarks from the in-memory results and, unless
+         benchmark_excel=False, write metrics_by_sectors.xlsx and
+         eval_metrics_by_sectors.xlsx — required by chains.py.
       5. Write failed_tickers.log.
     """
     os.makedirs(output_dir, exist_ok=True)
+    store = FundamentalsStore(store_dir) if store_dir else None
+    limiter = None
+    if shared_limiter:
+        per_minute = _per_minute(sleep_seconds)
+        limiter = SQLiteRateLimiter(
+            shared_limiter, per_minute=per_minute, per_hour=per_minute * 60,
+            per_day=per_minute * 60 * 24, name="yfinance",
+        )
 
     # --- load tickers -------------------------------------------------------
     ticker_df = _load_ticker_list(tickers_file)
@@ -327,8 +401,9 @@ def run(
         logger.info(f"Filtered to {len(all_sectors)} sector(s): {all_sectors}")
 
     # --- pipeline loop per sector -------------------------------------------
-    all_results: dict[str, dict] = {}   # ticker → evaluate() result dict
+    all_results: dict[str, CompactResult] = {}   # ticker → compact evaluate() result
     all_failed: list[str] = []
+    universe_frames: list[pd.DataFrame] = []   # incremental mode only
 
     for sector in all_sectors:
         sector_tickers = ticker_df.loc[
@@ -346,7 +421,12 @@ def run(
         )
 
         # Stage 1: download
-        ticker_data = download_sector(sector_tickers, sleep_seconds)
+        if concurrency > 0:
+            ticker_data = download_sector_concurrent(
+                sector_tickers, concurrency, sleep_seconds, limiter=limiter
+            )
+        else:
+            ticker_data = download_sector(sector_tickers, sleep_seconds, limiter=limiter)
 
         # Track failures before evaluation
         failed = collect_failed(ticker_data)
@@ -354,14 +434,40 @@ def run(
             logger.warning(f"  Empty data for {len(failed)} ticker(s): {failed}")
         all_failed.extend(failed)
 
+        # Persist raw data — one upsert per sector rewrites each partition once.
+        if store is not None:
+            frames = [df for df in ticker_data.values() if not df.empty]
+            if frames:
+                store.upsert(pd.concat(frames, ignore_index=True), sector=sector)
+
         # Stage 2: evaluate
-        sector_results = evaluate_sector(ticker_data, sector)
-        all_results.update(sector_results)
+        if incremental:
+            universe_frames.extend(
+                df.assign(sector=sector) for df in ticker_data.values() if not df.empty
+            )
+        else:
+            # Keep results compact while the rest of the universe is processed.
+            sector_results = evaluate_sector(ticker_data, sector)
+            all_results.update(
+                (ticker, CompactResult.from_result(result))
+                for ticker, result in sector_results.items()
+            )
 
         # Mark sector complete for --resume
         _mark_sector_done(sector, output_dir)
         logger.info(f"  Sector {sector} complete.")
 
+    # --- incremental evaluation across all sectors ---------------------------
+    if incremental:
+        state_dir = os.path.join(output_dir, STATE_DIR_NAME)
+        state = IncrementalState.load(state_dir)
+        if universe_frames:
+            state = evaluate_incremental(pd.concat(universe_frames, ignore_index=True), state)
+            state.save(state_dir)
+            logger.info(f"Incremental evaluation: {state.recomputed} row(s) recomputed")
+        if state is not None:
+            all_results = split_by_ticker(state.results)
+
     # --- export all results -------------------------------------------------
     if not all_results:
         logger.warning("No results to export — all sectors were skipped or all downloads failed.")
@@ -369,17 +475,18 @@ def run(
 
     logger.info(f"\nExporting {len(all_results)} ticker results to {output_dir}/ …")
     export_financial_results(
-        results=list(all_results.values()),
+        results=all_results,
         output_dir=output_dir,
         sheet_name="sheet1",
+        formats=formats,
     )
 
     # --- compute sector benchmarks ------------------------------------------
-    # Must run after export so metrics.xlsx / eval_metrics.xlsx exist.
-    # These files are what chains.py reads via get_market_metrics().
+    # Straight from the results in memory; the *_by_sectors.xlsx files are
+    # what chains.py reads via get_market_metrics().
     if benchmarks:
         logger.info("\nComputing sector benchmarks …")
-        compute_sector_benchmarks(output_dir)
+        compute_sector_benchmarks(all_results, output_dir, excel=benchmark_excel)
     else:
         logger.info("Skipping benchmark computation (--no-benchmarks).")
 
@@ -442,6 +549,50 @@ def _parse_args() -> argparse.Namespace:
         dest="no_benchmarks",
         help="Skip writing metrics_by_sectors.xlsx and eval_metrics_by_sectors.xlsx.",
     )
+    p.add_argument(
+        "--no-benchmark-excel",
+        action="store_true",
+        dest="no_benchmark_excel",
+        help=f"Update the Parquet benchmarks in output-dir/{BENCHMARK_DIR_NAME}/ only; "
+             "skip the *_by_sectors.xlsx export.",
+    )
+    p.add_argument(
+        "--formats",
+        nargs="+",
+        default=["xlsx"],
+        choices=available_formats(),
+        metavar="FORMAT",
+        help=f"Result export formats, written in parallel (any of {available_formats()}; "
+             "default: xlsx). read_financial_results picks the fastest one present.",
+    )
+    p.add_argument(
+        "--store",
+        default=None,
+        metavar="DIR",
+        dest="store_dir",
+        help="Upsert raw merged data into a partitioned Parquet store at DIR.",
+    )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Re-evaluate only new or changed periods, reusing output-dir/{STATE_DIR_NAME}/.",
+    )
+    p.add_argument(
+        "--concurrency",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Download up to N tickers at once with the asyncio engine; --sleep then sets "
+             "the average admission rate. Default 0: sequential download.",
+    )
+    p.add_argument(
+        "--shared-limiter",
+        default=None,
+        metavar="PATH",
+        dest="shared_limiter",
+        help="SQLite file holding a rate budget shared by every process using the same PATH "
+             "(rate set by --sleep). Use when running several shards at once.",
+    )
     return p.parse_args()
 
 
@@ -454,4 +605,10 @@ if __name__ == "__main__":
         resume=args.resume,
         sectors_filter=args.sectors,
         benchmarks=not args.no_benchmarks,
+        benchmark_excel=not args.no_benchmark_excel,
+        formats=tuple(args.formats),
+        store_dir=args.store_dir,
+        incremental=args.incremental,
+        concurrency=args.concurrency,
+        shared_limiter=args.shared_limiter,
     )
@@ -0,0 +1,142 @@
+"""
+Synthetic inputs shared by the test modules — no network calls.
+
+Provides:
+  _make_data()       — merged fundamentals frame covering every column used by
+                       compute_metrics() / compute_extended_metrics()
+  _make_weights()    — weights frame for one sector of sec_sector_metric_weights
+  _make_bank_data()  — bank-layout frame (no gross_profit, current_assets …)
+  _statement()       — wide yfinance-style statement
+  _payloads()        — raw download payloads of one ticker for StaticFetcher
+
+Import as ``from tests._fixtures import _make_data`` (tests/ is a package), so
+the modules load the same under pytest's import modes and ``python -m unittest``.
+"""
+
+import pandas as pd
+
+
+def _make_data(
+    revenues=(100.0, 120.0, 150.0),
+    net_incomes=(10.0, 12.0, 15.0),
+    fcfs=(8.0, 10.0, 12.0),
+    ticker="TEST",
+    times=("2022", "2023", "2024"),
+) -> pd.DataFrame:
+    """
+    Build a synthetic merged DataFrame covering every column needed by
+    compute_metrics() and compute_extended_metrics().
+
+    Keyword args allow callers to pin specific values for growth-rate assertions.
+    """
+    n = len(times)
+    rev = list(revenues)
+    ni  = list(net_incomes)
+    fcf = list(fcfs)
+
+    return pd.DataFrame({
+        "ticker": ticker,
+        "time":   list(times),
+        # Income statement
+        "total_revenue":                    rev,
+        "gross_profit":                     [r * 0.6 for r in rev],
+        "operating_income":                 [r * 0.2 for r in rev],
+        "net_income_common_stockholders":   ni,
+        "ebitda":                           [r * 0.3 for r in rev],
+        "ebit":                             [r * 0.25 for r in rev],
+        "diluted_eps":                      [n_ / 100 for n_ in ni],
+        "interest_expense_non_operating":   [r * 0.01 for r in rev],
+        "tax_rate_for_calcs":               [0.21] * n,
+        # Balance sheet
+        "total_assets":                     [r * 2.0 for r in rev],
+        "total_debt":                       [r * 0.5 for r in rev],
+        "common_stock_equity":              [r * 1.2 for r in rev],
+        "current_assets":                   [r * 0.8 for r in rev],
+        "current_liabilities":              [r * 0.4 for r in rev],
+        "inventory":                        [r * 0.1 for r in rev],
+        "accounts_receivable":              [r * 0.15 for r in rev],
+        "accounts_payable":                 [r * 0.08 for r in rev],
+        "cash_and_cash_equivalents":        [r * 0.2 for r in rev],
+        "working_capital":                  [r * 0.4 for r in rev],
+        "net_debt":                         [r * 0.3 for r in rev],
+        "invested_capital":                 [r * 1.5 for r in rev],
+        "ordinary_shares_number":           [1000.0] * n,
+        # Cash flow
+        "free_cash_flow":                   fcf,
+        "operating_cash_flow":              [f * 1.2 for f in fcf],
+        "capital_expenditure":              [-r * 0.05 for r in rev],
+        "depreciation_amortization_depletion": [r * 0.04 for r in rev],
+        "cost_of_revenue":                  [r * 0.4 for r in rev],
+        # Market / other
+        "marketcap":                        [r * 5.0 for r in rev],
+        "currentprice":                     [20.0] * n,
+    })
+
+
+def _make_weights(sector: str = "technology") -> pd.DataFrame:
+    """Return a weights DataFrame covering all 24 scored metrics."""
+    from financialtools.config import sec_sector_metric_weights
+    items = sec_sector_metric_weights[sector].items()
+    df = pd.DataFrame(list(items), columns=["metrics", "weights"])
+    df["sector"] = sector
+    return df
+
+
+def _make_bank_data(ticker: str = "BGN.MI") -> pd.DataFrame:
+    """
+    Minimal synthetic DataFrame that mimics a bank ticker (e.g. Banca Generali).
+
+    Banks structurally omit: gross_profit, operating_income, ebitda,
+    current_assets, current_liabilities, inventory.
+
+    Columns present mirror what yfinance actually returns for MIL-listed banks.
+    """
+    return pd.DataFrame({
+        "ticker": [ticker] * 3,
+        "time":   ["2022", "2023", "2024"],
+        # Income statement — bank layout
+        "total_revenue":                    [500.0, 550.0, 600.0],
+        "net_interest_income":              [300.0, 330.0, 360.0],
+        "operating_revenue":                [480.0, 530.0, 580.0],
+        "net_income_common_stockholders":   [60.0,  70.0,  80.0],
+        "net_income":                       [60.0,  70.0,  80.0],
+        "pretax_income":                    [80.0,  90.0, 100.0],
+        "diluted_eps":                      [0.53,  0.61,  0.70],
+        "interest_expense_non_operating":   [10.0,  12.0,  14.0],
+        "tax_rate_for_calcs":               [0.25,  0.25,  0.25],
+        # Balance sheet — bank layout (no current_assets / current_liabilities)
+        "total_assets":                     [8000.0, 8500.0, 9000.0],
+        "total_debt":                       [1000.0, 1100.0, 1200.0],
+        "common_stock_equity":              [900.0,  970.0, 1050.0],
+        "net_debt":                         [800.0,  880.0,  960.0],
+        "receivables":                      [200.0,  220.0,  240.0],
+        "accounts_payable":                 [50.0,   55.0,   60.0],
+        "cash_and_cash_equivalents":        [400.0,  420.0,  440.0],
+        "invested_capital":                 [1900.0, 2070.0, 2250.0],
+        "ordinary_shares_number":           [114e6,  114e6,  114e6],
+        # Cash flow
+        "free_cash_flow":                   [50.0,  60.0,  70.0],
+        "operating_cash_flow":              [65.0,  75.0,  85.0],
+        "capital_expenditure":              [-5.0,  -6.0,  -7.0],
+        "depreciation_amortization_depletion": [8.0, 9.0, 10.0],
+        "cost_of_revenue":                  [0.0,   0.0,   0.0],
+        # Market data
+        "marketcap":                        [6e9,   6.5e9, 7e9],
+        "currentprice":                     [53.0,  57.0,  61.0],
+        # NOTE: gross_profit, ebitda, operating_income, current_assets,
+        #       current_liabilities, inventory are intentionally absent.
+    })
+
+
+def _statement(items: dict) -> pd.DataFrame:
+    """Wide yfinance-style statement: line items as index, one column per period."""
+    return pd.DataFrame(items, index=pd.to_datetime(["2024-12-31", "2023-12-31"])).T
+
+
+def _payloads(ticker: str) -> dict:
+    return {
+        "balance_sheet": _statement({"Total Assets": [500.0, 450.0], "Total Debt": [100.0, 90.0]}),
+        "income_stmt": _statement({"Total Revenue": [300.0, 250.0], "Net Income": [30.0, 20.0]}),
+        "cashflow": _statement({"Free Cash Flow": [25.0, 15.0]}),
+        "info": {"marketCap": 1e6, "currentPrice": 10.0, "sector": "Technology", "longName": ticker},
+    }
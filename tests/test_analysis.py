@@ -0,0 +1,281 @@
+"""
+Unit tests for concurrent topic-chain execution in analysis.py.
+
+The LLM is a fake Runnable — no network calls, no OPENAI_API_KEY required.
+
+Covered:
+  1. run_topic_chains runs every topic, in _TOPIC_MAP order, with at most
+     max_concurrency chains in flight (1 → sequential in the calling thread)
+  2. Per-topic fix retry still works inside the pool (broken JSON → fix call)
+  3. A topic whose chain raises or fails to parse comes back as None; the
+     others are unaffected
+  4. run_topic_analysis fills TopicAnalysisResult from the concurrent run
+  5. Invalid max_concurrency raises ValueError
+  6. With a ResponseCache a repeated run makes no LLM calls; a changed payload
+     or prompt misses; failed (None) topics are not cached; invoke_chain uses
+     default_response_cache() unless cache=False / None
+  7. ChainFactory reuses topic parts (rebuilt when the topic's prompt
+     changes) and one LLM client per (model, temperature) over a shared
+     HTTP pool; clear() leaves that pool open for clients in use, close()
+     shuts it; schema format instructions are rendered once per model
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+from financialtools import analysis
+from financialtools.analysis import _TOPIC_MAP, run_topic_analysis, run_topic_chains
+from financialtools.cache import ResponseCache
+
+from tests._fixtures import _make_data
+
+_INPUTS = dict(metrics="[]", extended_metrics="[]", composite_scores="[]",
+               eval_metrics="[]", red_flags="[]")
+
+
+class _Tiny(BaseModel):
+    rating: str
+
+
+class _InFlight:
+    """Fake invoke_chain that records how many calls overlap."""
+
+    def __init__(self, delay=0.05, fail=()):
+        self.delay, self.fail = delay, set(fail)
+        self.current = self.peak = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, parser, llm, inputs, topic, ticker, cache=None):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+            self.threads.add(threading.get_ident())
+        try:
+            time.sleep(self.delay)
+            if topic in self.fail:
+                raise ConnectionError("upstream timeout")
+            return f"{topic}-ok"
+        finally:
+            with self._lock:
+                self.current -= 1
+
+
+class TestRunTopicChains(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ, {"FINANCIALTOOLS_NO_CACHE": "1"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_all_topics_concurrently(self):
+        fake = _InFlight()
+        with mock.patch.object(analysis, "invoke_chain", fake):
+            results = run_topic_chains(None, _INPUTS, "TEST")
+        self.assertEqual(list(results), list(_TOPIC_MAP))
+        self.assertEqual(results["growth"], "growth-ok")
+        self.assertGreater(fake.peak, 1)
+
+    def test_concurrency_cap(self):
+        for cap in (1, 3):
+            with self.subTest(cap=cap):
+                fake = _InFlight(delay=0.02)
+                with mock.patch.object(analysis, "invoke_chain", fake):
+                    results = run_topic_chains(None, _INPUTS, "TEST", max_concurrency=cap)
+                self.assertEqual(len(results), len(_TOPIC_MAP))
+                self.assertLessEqual(fake.peak, cap)
+        self.assertEqual(fake.peak, 3)
+        sequential = _InFlight(delay=0)
+        with mock.patch.object(analysis, "invoke_chain", sequential):
+            run_topic_chains(None, _INPUTS, "TEST", max_concurrency=1)
+        self.assertEqual(sequential.threads, {threading.get_ident()})
+
+    def test_failed_topic_is_none(self):
+        fake = _InFlight(fail={"solvency", "regime"})
+        with mock.patch.object(analysis, "invoke_chain", fake):
+            results = run_topic_chains(None, _INPUTS, "TEST", topics=["solvency", "growth", "regime"])
+        self.assertEqual(results, {"solvency": None, "growth": "growth-ok", "regime": None})
+
+    def test_fix_retry_per_topic(self):
+        calls = []
+
+        def respond(prompt_value):
+            text = prompt_value.to_string()
+            calls.append(text)
+            if "Malformed JSON" in text:
+                # The fix prompt quotes the broken output; "hopeless" stays broken.
+                return AIMessage(content="nope" if "hopeless" in text else '{"rating": "fixed"}')
+            for name in ("broken", "hopeless"):
+                if f"topic={name}." in text:
+                    return AIMessage(content=f"{name} answer, not JSON")
+            return AIMessage(content='{"rating": "direct"}')
+
+        tiny_map = {
+            name: (f"topic={name}. Answer in JSON.", _Tiny)
+            for name in ("clean", "broken", "hopeless")
+        }
+        with mock.patch.dict(_TOPIC_MAP, tiny_map, clear=True):
+            results = run_topic_chains(RunnableLambda(respond), _INPUTS, "TEST")
+        self.assertEqual(results["clean"].rating, "direct")
+        self.assertEqual(results["broken"].rating, "fixed")
+        self.assertIsNone(results["hopeless"])
+        self.assertEqual(len(calls), 5)            # 1 + 2 + 2 LLM calls
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            run_topic_chains(None, _INPUTS, "TEST", max_concurrency=0)
+
+
+class TestResponseCaching(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self._tmp.name, "responses.sqlite"))
+        self.calls = []
+        self.tiny_map = {
+            name: (f"topic={name}. Answer in JSON.", _Tiny) for name in ("clean", "hopeless")
+        }
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _respond(self, prompt_value):
+        text = prompt_value.to_string()
+        self.calls.append(text)
+        if "hopeless" in text:
+            return AIMessage(content="hopeless answer, not JSON")
+        return AIMessage(content='{"rating": "direct"}')
+
+    def _run(self, inputs=_INPUTS):
+        with mock.patch.dict(_TOPIC_MAP, self.tiny_map, clear=True):
+            return run_topic_chains(RunnableLambda(self._respond), inputs, "TEST", cache=self.cache)
+
+    def test_repeat_served_from_cache(self):
+        first = self._run()
+        self.assertEqual(len(self.calls), 3)        # clean 1 + hopeless 2
+        second = self._run()
+        self.assertEqual(second["clean"], first["clean"])
+        self.assertIsNone(second["hopeless"])
+        self.assertEqual(len(self.calls), 5)        # only hopeless re-ran
+        self.assertEqual(self.cache.stats()["clean"], {"hits": 1, "misses": 1})
+
+    def test_changed_payload_or_prompt_misses(self):
+        self._run()
+        self._run(dict(_INPUTS, red_flags='[{"flag": 1}]'))
+        self.tiny_map["clean"] = ("topic=clean. Answer in strict JSON.", _Tiny)
+        self._run()
+        self.assertEqual(self.cache.stats()["clean"], {"hits": 0, "misses": 3})
+
+    def test_invoke_chain_uses_default_cache(self):
+        with mock.patch.dict(_TOPIC_MAP, self.tiny_map, clear=True):
+            prompt, parser = analysis.ChainFactory().parts("clean")
+        llm = RunnableLambda(self._respond)
+        with mock.patch.object(analysis, "default_response_cache", return_value=self.cache):
+            first = analysis.invoke_chain(prompt, parser, llm, _INPUTS, "clean", "TEST")
+            second = analysis.invoke_chain(prompt, parser, llm, _INPUTS, "clean", "TEST")
+            analysis.invoke_chain(prompt, parser, llm, _INPUTS, "clean", "TEST", cache=False)
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.calls), 2)        # first + cache=False
+        self.assertEqual(self.cache.stats()["clean"], {"hits": 1, "misses": 1})
+
+
+class TestChainFactory(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = analysis.ChainFactory()
+        self.addCleanup(self.factory.close)
+
+    def test_parts_reused_per_topic(self):
+        prompt, parser = self.factory.parts("liquidity")
+        self.assertIs(self.factory.parts("liquidity")[0], prompt)
+        self.assertIsNot(self.factory.parts("solvency")[0], prompt)
+        with mock.patch.dict(_TOPIC_MAP, {"liquidity": ("topic=liquidity. Answer in JSON.", _Tiny)}):
+            changed, tiny_parser = self.factory.parts("liquidity")
+        self.assertIsNot(changed, prompt)
+        self.assertIs(tiny_parser.pydantic_object, _Tiny)
+        with self.assertRaises(KeyError):
+            self.factory.parts("no_such_topic")
+
+    def test_llm_clients_shared(self):
+        with mock.patch.object(analysis, "ChatOpenAI") as chat:
+            a = self.factory.llm("gpt-4.1-nano")
+            self.assertIs(self.factory.llm("gpt-4.1-nano"), a)
+            self.factory.llm("gpt-4o")
+            self.factory.llm("gpt-4o", temperature=0.5)
+        self.assertEqual(chat.call_count, 3)
+        clients = {c.kwargs["http_client"] for c in chat.call_args_list}
+        self.assertEqual(len(clients), 1)
+        pool = clients.pop()
+        self.factory.clear()                        # clients in use keep their pool
+        self.assertFalse(pool.is_closed)
+        with mock.patch.object(analysis, "ChatOpenAI") as chat:
+            self.factory.llm("gpt-4.1-nano")
+        self.assertIsNot(chat.call_args.kwargs["http_client"], pool)
+        pool.close()
+        self.factory.close()
+        self.assertTrue(chat.call_args.kwargs["http_client"].is_closed)
+
+    def test_format_instructions_once(self):
+        analysis._schema_instructions.cache_clear()
+        with mock.patch.object(analysis.PydanticOutputParser, "get_format_instructions",
+                               autospec=True, return_value="{}") as fmt:
+            for _ in range(3):
+                analysis._build_chain_parts("topic. Answer in JSON.", _Tiny, None)
+        self.assertEqual(fmt.call_count, 1)
+        analysis._schema_instructions.cache_clear()
+
+
+class TestRunTopicAnalysis(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_result_fields_from_concurrent_run(self):
+        downloader = mock.MagicMock()
+        downloader.get_merged_data.return_value = _make_data(ticker="TEST")
+        fake = _InFlight(fail={"liquidity"})
+        with mock.patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}), \
+                mock.patch.object(analysis.Downloader, "from_ticker", return_value=downloader), \
+                mock.patch.object(analysis, "ChatOpenAI"), \
+                mock.patch.object(analysis, "default_chain_factory", return_value=analysis.ChainFactory()), \
+                mock.patch.object(analysis, "invoke_chain", fake):
+            result = run_topic_analysis("TEST", sector="technology", max_concurrency=4, cache=None)
+        self.assertEqual(result.failed_topics, ["liquidity"])
+        self.assertEqual(result.regime, "regime-ok")
+        self.assertLessEqual(fake.peak, 4)
+        self.assertIsInstance(result.evaluate_output["metrics"], pd.DataFrame)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for the asyncio download engine (async_downloader.py).
+
+All tests use StaticFetcher / an instrumented stub — no network calls.
+
+Covered:
+  1. Downloader.from_raw(): async results match the synchronous reshape
+  2. The four fetches of one ticker run concurrently
+  3. Per-host caps bound in-flight requests; max_concurrency bounds tickers
+  4. Failure isolation: a failing fetch yields DownloadError for that ticker only
+  5. AsyncRateLimiter: blocks once a window is full; reusable across event loops
+  6. download_concurrent() blocking entry point
+"""
+
+import asyncio
+import logging
+import time
+import unittest
+
+import pandas as pd
+
+from financialtools.async_downloader import (
+    AsyncDownloader,
+    AsyncRateLimiter,
+    StaticFetcher,
+    download_concurrent,
+)
+from financialtools.downloader import Downloader
+from financialtools.exceptions import DownloadError
+
+from tests._fixtures import _payloads
+
+
+class _TrackingFetcher(StaticFetcher):
+    """StaticFetcher that records the peak number of in-flight fetches."""
+
+    def __init__(self, payloads, latency=0.01, host_name="stub"):
+        super().__init__(payloads, latency=latency, host_name=host_name)
+        self.in_flight = 0
+        self.peak = 0
+        self.peak_tickers = 0
+        self._tickers: dict = {}
+
+    async def fetch(self, ticker, kind):
+        self.in_flight += 1
+        self._tickers[ticker] = self._tickers.get(ticker, 0) + 1
+        self.peak = max(self.peak, self.in_flight)
+        self.peak_tickers = max(self.peak_tickers, sum(1 for n in self._tickers.values() if n))
+        try:
+            return await super().fetch(ticker, kind)
+        finally:
+            self.in_flight -= 1
+            self._tickers[ticker] -= 1
+
+
+class TestAsyncDownloader(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_matches_synchronous_reshape(self):
+        raw = _payloads("AAA")
+        engine = AsyncDownloader(fetcher=StaticFetcher({"AAA": raw}))
+        d = asyncio.run(engine.download_one("AAA"))
+        expected = Downloader.from_raw("AAA", *(raw[k] for k in (
+            "balance_sheet", "income_stmt", "cashflow", "info"
+        )))
+        pd.testing.assert_frame_equal(d.get_merged_data(), expected.get_merged_data())
+        self.assertIn("total_revenue", d.get_merged_data().columns)
+        self.assertEqual(d.get_info_data()["marketCap"].iloc[0], 1e6)
+
+    def test_four_fetches_run_concurrently(self):
+        fetcher = _TrackingFetcher({"AAA": _payloads("AAA")})
+        asyncio.run(AsyncDownloader(fetcher=fetcher).download_one("AAA"))
+        self.assertEqual(fetcher.peak, 4)
+
+    def test_host_and_ticker_caps(self):
+        tickers = [f"T{i}" for i in range(6)]
+        payloads = {t: _payloads(t) for t in tickers}
+
+        fetcher = _TrackingFetcher(payloads)
+        engine = AsyncDownloader(fetcher=fetcher, host_limits={"stub": 3})
+        downloaders, failures = asyncio.run(engine.download_many(tickers))
+        self.assertEqual(len(downloaders), 6)
+        self.assertLessEqual(fetcher.peak, 3)
+
+        fetcher = _TrackingFetcher(payloads)
+        engine = AsyncDownloader(fetcher=fetcher, max_concurrency=2)
+        asyncio.run(engine.download_many(tickers))
+        self.assertLessEqual(fetcher.peak_tickers, 2)
+
+    def test_failure_isolation(self):
+        bad = _payloads("BAD")
+        bad["info"] = ConnectionError("boom")
+        fetcher = StaticFetcher({"AAA": _payloads("AAA"), "BAD": bad, "CCC": _payloads("CCC")})
+        downloaders, failures = asyncio.run(
+            AsyncDownloader(fetcher=fetcher).download_many(["AAA", "BAD", "CCC"])
+        )
+        self.assertEqual(list(downloaders), ["AAA", "CCC"])
+        self.assertIsInstance(failures["BAD"], DownloadError)
+        self.assertIn("info", str(failures["BAD"]))
+
+    def test_download_concurrent_blocking(self):
+        downloaders, failures = download_concurrent(
+            ["AAA"], fetcher=StaticFetcher({"AAA": _payloads("AAA")})
+        )
+        self.assertEqual(list(downloaders), ["AAA"])
+        self.assertEqual(failures, {})
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            AsyncDownloader(fetcher=StaticFetcher({}), max_concurrency=0)
+
+
+class TestAsyncRateLimiter(unittest.TestCase):
+
+    def test_full_window_reports_wait(self):
+        limiter = AsyncRateLimiter(per_minute=2)
+
+        async def _two():
+            await limiter.acquire()
+            await limiter.acquire()
+
+        asyncio.run(_two())
+        self.assertGreater(limiter._windows.wait_time(time.monotonic()), 50.0)
+
+    def test_reusable_across_event_loops(self):
+        limiter = AsyncRateLimiter(per_minute=10)
+        asyncio.run(limiter.acquire())
+        asyncio.run(limiter.acquire())
+        self.assertEqual(len(limiter._windows.calls[0]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Unit tests for sector benchmarks (benchmarks.py).
+
+All tests use synthetic results; persisted benchmarks go to a temporary directory.
+
+Covered:
+  1. compute_benchmarks: mean matches the former melt + groupby mean; median,
+     quantiles and counts match pandas per (sector, metric, time); NaN skipped
+  2. Empty or metric-less input yields the empty schema
+  3. SectorBenchmarks.update replaces only the sectors present in the result;
+     other sectors keep their stored benchmarks
+  4. read() filters by sector; CompactResult and dict results give the same tables
+  5. to_excel writes metrics_by_sectors.xlsx / eval_metrics_by_sectors.xlsx
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.benchmarks import SectorBenchmarks, compute_benchmarks
+from financialtools.results import CompactResult
+from financialtools.universe import UniverseMetricsEvaluator
+
+from tests._fixtures import _make_data
+
+_STATS = ["market_value", "median", "q25", "q75", "count"]
+
+
+def _result(sectors: dict) -> dict:
+    """UniverseMetricsEvaluator result for ``{ticker: sector}``, tickers slightly apart."""
+    frames = [
+        _make_data(ticker=t, revenues=(100.0 + 7 * i, 120.0 + 3 * i, 150.0 - i)).assign(sector=s)
+        for i, (t, s) in enumerate(sectors.items())
+    ]
+    return UniverseMetricsEvaluator(pd.concat(frames, ignore_index=True)).evaluate()
+
+
+class TestComputeBenchmarks(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.result = _result({"A": "energy", "B": "energy", "C": "energy", "D": "technology"})
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_matches_grouped_reference(self):
+        wide = self.result["metrics"].copy()
+        wide.loc[0, "ROE"] = np.nan
+        bench = compute_benchmarks(wide)
+        self.assertEqual(list(bench.columns), ["sector", "metrics", "time"] + _STATS)
+
+        metric_cols = [c for c in wide.columns if c not in ("ticker", "time", "sector")]
+        long = wide.melt(id_vars=["sector", "time"], value_vars=metric_cols,
+                         var_name="metrics", value_name="value")
+        grouped = long.groupby(["sector", "metrics", "time"])["value"]
+        expected = pd.DataFrame({
+            "market_value": grouped.mean(),
+            "median": grouped.median(),
+            "q25": grouped.quantile(0.25),
+            "q75": grouped.quantile(0.75),
+            "count": grouped.count(),
+        })
+        actual = bench.set_index(["sector", "metrics", "time"]).sort_index()
+        self.assertEqual(len(actual), len(expected))
+        pd.testing.assert_frame_equal(actual[_STATS], expected, check_names=False)
+        self.assertEqual(actual.loc[("energy", "ROE", wide.loc[0, "time"]), "count"], 2)
+
+    def test_custom_quantiles(self):
+        bench = compute_benchmarks(self.result["eval_metrics"], quantiles=(0.1, 0.9))
+        self.assertIn("q10", bench.columns)
+        self.assertIn("q90", bench.columns)
+        valued = bench[bench["count"] > 0]
+        self.assertTrue((valued["q10"] <= valued["q90"]).all())
+
+    def test_empty_input(self):
+        for wide in (pd.DataFrame(), self.result["metrics"][["ticker", "time", "sector"]]):
+            bench = compute_benchmarks(wide)
+            self.assertTrue(bench.empty)
+            self.assertEqual(list(bench.columns), ["sector", "metrics", "time"] + _STATS)
+
+
+class TestSectorBenchmarks(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self._tmp = tempfile.TemporaryDirectory()
+        self.bench = SectorBenchmarks(os.path.join(self._tmp.name, "benchmarks"))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def test_update_replaces_only_present_sectors(self):
+        first = _result({"A": "energy", "B": "energy", "C": "technology"})
+        written = self.bench.update(first)
+        self.assertEqual(sorted(written["metrics"]), ["energy", "technology"])
+        tech_before = self.bench.read("metrics", sectors=["technology"])
+
+        # Re-run energy alone with different tickers.
+        rerun = _result({"E": "energy", "F": "energy", "G": "energy"})
+        self.assertEqual(self.bench.update(rerun)["metrics"], ["energy"])
+        self.assertEqual(self.bench.sectors(), ["energy", "technology"])
+        pd.testing.assert_frame_equal(self.bench.read("metrics", sectors=["technology"]), tech_before)
+        energy = self.bench.read("metrics", sectors=["energy"])
+        pd.testing.assert_frame_equal(energy, compute_benchmarks(rerun["metrics"]))
+        self.assertTrue((energy["count"] <= 3).all())
+
+        everything = self.bench.read("eval_metrics")
+        self.assertEqual(sorted(everything["sector"].unique()), ["energy", "technology"])
+
+    def test_compact_results(self):
+        per_ticker = {t: _result({t: "energy"}) for t in ("A", "B")}
+        self.bench.update(CompactResult.concat(per_ticker))
+        merged = pd.concat([r["metrics"] for r in per_ticker.values()], ignore_index=True)
+        pd.testing.assert_frame_equal(self.bench.read("metrics"), compute_benchmarks(merged))
+
+    def test_to_excel(self):
+        self.bench.update(_result({"A": "energy", "B": "technology"}))
+        out = os.path.join(self._tmp.name, "out")
+        paths = self.bench.to_excel(out)
+        self.assertEqual([os.path.basename(p) for p in paths],
+                         ["metrics_by_sectors.xlsx", "eval_metrics_by_sectors.xlsx"])
+        back = pd.read_excel(paths[0], sheet_name="sheet1")
+        self.assertEqual(len(back), len(self.bench.read("metrics")))
+        self.assertEqual(list(back.columns), ["sector", "metrics", "time"] + _STATS)
+
+    def test_empty_store(self):
+        self.assertEqual(self.bench.sectors(), [])
+        self.assertTrue(self.bench.read().empty)
+        self.assertEqual(self.bench.to_excel(self._tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
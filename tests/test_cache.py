@@ -0,0 +1,221 @@
+"""
+Unit tests for the persistent payload caches (cache.py).
+
+All tests use a temporary SQLite file and a stubbed yfinance — no network calls.
+
+Covered:
+  1. DiskCache round-trips values and counts hits / misses per kind
+  2. Entries older than the TTL are misses and are deleted
+  3. LRU eviction keeps the total size under max_bytes, sparing recently read keys
+  4. DiskCache is picklable (connection recreated lazily)
+  5. StatementCache: per-kind TTLs, case-insensitive tickers, invalidate()
+  6. Downloader.from_ticker(cache=...): second call served from disk; empty payloads not cached
+  7. CachingFetcher: async downloads reuse cached payloads
+  8. default_statement_cache() / default_response_cache() honour FINANCIALTOOLS_NO_CACHE
+  9. ResponseCache: keys change with model / topic / prompt / payload (not key
+     order); assessments round-trip as Pydantic models; entries that no longer
+     validate are dropped and counted as misses; hit_rate()
+"""
+
+import asyncio
+import os
+import pickle
+import sys
+import tempfile
+import time
+import types
+import unittest
+from unittest import mock
+
+import pandas as pd
+from pydantic import BaseModel
+
+from financialtools.async_downloader import AsyncDownloader, CachingFetcher, StaticFetcher
+from financialtools.cache import (
+    DiskCache,
+    ResponseCache,
+    StatementCache,
+    default_response_cache,
+    default_statement_cache,
+)
+from financialtools.downloader import Downloader
+from tests._fixtures import _payloads
+
+
+class _FakeTicker:
+    """yf.Ticker stand-in counting attribute reads."""
+
+    reads = 0
+    payloads: dict = {}
+
+    def __init__(self, ticker):
+        self._raw = self.payloads[ticker]
+
+    def __getattr__(self, kind):
+        if kind.startswith("_"):
+            raise AttributeError(kind)
+        type(self).reads += 1
+        return self._raw[kind]
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "cache.sqlite")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_and_counters(self):
+        cache = DiskCache(self.path)
+        self.assertIsNone(cache.get("k", kind="demo"))
+        cache.put("k", {"a": [1, 2]}, kind="demo")
+        self.assertEqual(cache.get("k", kind="demo"), {"a": [1, 2]})
+        self.assertEqual(cache.stats(), {"demo": {"hits": 1, "misses": 1}})
+
+    def test_expired_entry_is_miss(self):
+        cache = DiskCache(self.path)
+        cache.put("k", 1)
+        with mock.patch("financialtools.cache.time.time", return_value=time.time() + 100):
+            self.assertIsNone(cache.get("k", ttl=50))
+        self.assertIsNone(cache.get("k"))       # deleted, not just hidden
+        self.assertEqual(cache.size_bytes(), 0)
+
+    def test_lru_eviction(self):
+        blob = b"x" * 1000
+        size = len(pickle.dumps(blob, protocol=pickle.HIGHEST_PROTOCOL))
+        cache = DiskCache(self.path, max_bytes=3 * size)
+        clock = [1000.0]
+        with mock.patch("financialtools.cache.time.time", side_effect=lambda: clock[0]):
+            for key in ("a", "b", "c"):
+                clock[0] += 1
+                cache.put(key, blob)
+            clock[0] += 1
+            cache.get("a")                     # "b" is now least recently used
+            clock[0] += 1
+            cache.put("d", blob)
+        self.assertLessEqual(cache.size_bytes(), 3 * size)
+        self.assertIsNone(cache.get("b"))
+        for key in ("a", "c", "d"):
+            self.assertEqual(cache.get(key), blob)
+
+    def test_picklable(self):
+        cache = DiskCache(self.path)
+        cache.put("k", "v")
+        clone = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(clone.get("k"), "v")
+
+
+class TestStatementCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "statements.sqlite")
+        _FakeTicker.reads = 0
+        _FakeTicker.payloads = {"AAA": _payloads("AAA")}
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_per_kind_ttl_and_invalidate(self):
+        cache = StatementCache(self.path, ttls={"info": 10})
+        cache.put_payload("aaa", "info", {"marketCap": 1})
+        cache.put_payload("AAA", "cashflow", _payloads("AAA")["cashflow"])
+        later = time.time() + 60
+        with mock.patch("financialtools.cache.time.time", return_value=later):
+            self.assertIsNone(cache.get_payload("AAA", "info"))
+            self.assertIsNotNone(cache.get_payload("AAA", "cashflow"))
+        cache.invalidate("AAA")
+        self.assertIsNone(cache.get_payload("AAA", "cashflow"))
+
+    def _from_ticker(self, cache):
+        fake_yf = types.SimpleNamespace(Ticker=_FakeTicker)
+        with mock.patch.dict(sys.modules, {"yfinance": fake_yf}):
+            return Downloader.from_ticker("AAA", cache=cache)
+
+    def test_from_ticker_served_from_cache(self):
+        cache = StatementCache(self.path)
+        first = self._from_ticker(cache)
+        self.assertEqual(_FakeTicker.reads, 4)
+        second = self._from_ticker(StatementCache(self.path))    # fresh instance, same file
+        self.assertEqual(_FakeTicker.reads, 4)
+        pd.testing.assert_frame_equal(first.get_merged_data(), second.get_merged_data())
+        self.assertEqual(cache.stats()["info"], {"hits": 0, "misses": 1})
+
+    def test_empty_payload_not_cached(self):
+        _FakeTicker.payloads["AAA"]["cashflow"] = pd.DataFrame()
+        cache = StatementCache(self.path)
+        self._from_ticker(cache)
+        self.assertIsNone(cache.get_payload("AAA", "cashflow"))
+        self.assertIsNotNone(cache.get_payload("AAA", "balance_sheet"))
+
+    def test_caching_fetcher(self):
+        cache = StatementCache(self.path)
+        inner = StaticFetcher({"AAA": _payloads("AAA")})
+        engine = AsyncDownloader(fetcher=CachingFetcher(inner, cache))
+        asyncio.run(engine.download_one("AAA"))
+        inner.payloads = {}                    # any further miss would raise KeyError
+        d = asyncio.run(engine.download_one("AAA"))
+        self.assertIn("total_revenue", d.get_merged_data().columns)
+
+    def test_default_cache_disabled_by_env(self):
+        with mock.patch.dict(os.environ, {"FINANCIALTOOLS_NO_CACHE": "1"}):
+            self.assertIsNone(default_statement_cache())
+            self.assertIsNone(default_response_cache())
+
+
+class _Rating(BaseModel):
+    rating: str
+    score: float
+
+
+class _Renamed(BaseModel):
+    grade: str
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self._tmp.name, "responses.sqlite"))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_key_is_content_address(self):
+        base = ResponseCache.key("gpt@0", "liquidity", "system", {"a": "[]", "b": "[1]"})
+        self.assertEqual(base, ResponseCache.key("gpt@0", "liquidity", "system", {"b": "[1]", "a": "[]"}))
+        for changed in (
+            ResponseCache.key("gpt@0.5", "liquidity", "system", {"a": "[]", "b": "[1]"}),
+            ResponseCache.key("gpt@0", "solvency", "system", {"a": "[]", "b": "[1]"}),
+            ResponseCache.key("gpt@0", "liquidity", "system v2", {"a": "[]", "b": "[1]"}),
+            ResponseCache.key("gpt@0", "liquidity", "system", {"a": "[]", "b": "[2]"}),
+        ):
+            self.assertNotEqual(base, changed)
+
+    def test_assessment_round_trip_and_hit_rate(self):
+        self.assertIsNone(self.cache.hit_rate())
+        self.assertIsNone(self.cache.get_assessment("k", "liquidity", _Rating))
+        self.cache.put_assessment("k", "liquidity", _Rating(rating="strong", score=0.9))
+        back = self.cache.get_assessment("k", "liquidity", _Rating)
+        self.assertEqual(back, _Rating(rating="strong", score=0.9))
+        self.assertEqual(self.cache.stats(), {"liquidity": {"hits": 1, "misses": 1}})
+        self.assertEqual(self.cache.hit_rate(), 0.5)
+        self.assertIsNone(self.cache.hit_rate("solvency"))
+
+    def test_stale_schema_is_miss(self):
+        self.cache.put_assessment("k", "liquidity", _Rating(rating="weak", score=0.1))
+        self.assertIsNone(self.cache.get_assessment("k", "liquidity", _Renamed))
+        self.assertEqual(self.cache.stats(), {"liquidity": {"hits": 0, "misses": 1}})
+        self.assertIsNone(self.cache.get("k"))            # dropped from disk
+
+    def test_ttl(self):
+        self.cache.put_assessment("k", "liquidity", _Rating(rating="weak", score=0.1))
+        later = time.time() + self.cache.ttl + 1
+        with mock.patch("financialtools.cache.time.time", return_value=later):
+            self.assertIsNone(self.cache.get_assessment("k", "liquidity", _Rating))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Unit tests for the wide-format composite and red-flag path in evaluate() (evaluator.py).
+
+``_reference_long`` is a copy of the former evaluate() middle section
+(melt → _score_metric → merge(weights) → _compute_composite_scores, and
+_metrics_red_flags on the melted frame); the wide path must match it exactly.
+
+Covered:
+  1. Single-ticker evaluate(): composite_scores and red_flags match the long path
+  2. Multi-sector universe with NaN metrics matches the long path
+  3. Metrics without a weight are excluded from the composite and logged
+  4. Duplicate (sector, metrics) weight rows are summed, as the merge did
+  5. No red flags → empty frame with the long path's columns and dtypes
+"""
+
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import FundamentalMetricsEvaluator
+from financialtools.universe import UniverseMetricsEvaluator
+
+from tests._fixtures import _make_data, _make_weights
+
+
+def _reference_long(ev, m):
+    id_vars = ["ticker", "time", "sector"]
+    scored_cols = [c for c in m.columns if c not in set(id_vars)]
+    m_long = m.melt(id_vars=id_vars, value_vars=scored_cols,
+                    var_name="metrics", value_name="value")
+    scored = ev._score_metric(m_long)
+    merged = scored.merge(ev.weights[["sector", "metrics", "weights"]],
+                          how="left", on=["sector", "metrics"])
+    scores = ev._compute_composite_scores(merged)
+    flags = ev._metrics_red_flags(m_long)[["ticker", "time", "metrics", "red_flag"]]
+    return scores, flags
+
+
+def _universe() -> pd.DataFrame:
+    frames = []
+    for i, (ticker, sector) in enumerate((("A", "technology"), ("B", "technology"),
+                                          ("C", "healthcare"), ("D", "energy"))):
+        d = _make_data(ticker=ticker, revenues=(100.0 + i, -5.0 * i, 150.0),
+                       fcfs=(10.0, -2.0, np.nan))
+        d["sector"] = sector
+        frames.append(d)
+    data = pd.concat(frames, ignore_index=True)
+    data.loc[3, "common_stock_equity"] = -40.0
+    data.loc[7, "total_debt"] = np.nan
+    return data
+
+
+class TestWideComposite(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def _assert_matches_long(self, ev):
+        result = ev.evaluate()
+        scores, flags = _reference_long(ev, ev.metrics)
+        pd.testing.assert_frame_equal(result["composite_scores"], scores)
+        pd.testing.assert_frame_equal(result["red_flags"], flags)
+        return result
+
+    def test_single_ticker_matches_long_path(self):
+        data = _make_data(revenues=(100.0, 0.0, 150.0), fcfs=(-5.0, 10.0, np.nan))
+        data["common_stock_equity"] = [-50.0, 10.0, np.nan]
+        result = self._assert_matches_long(FundamentalMetricsEvaluator(data, _make_weights()))
+        self.assertFalse(result["red_flags"].empty)
+
+    def test_universe_matches_long_path(self):
+        result = self._assert_matches_long(UniverseMetricsEvaluator(_universe()))
+        self.assertEqual(set(result["composite_scores"]["sector"]),
+                         {"technology", "healthcare", "energy"})
+
+    def test_missing_weights_excluded_and_logged(self):
+        weights = _make_weights()
+        weights = weights[weights["metrics"] != "ROE"].reset_index(drop=True)
+        ev = FundamentalMetricsEvaluator(_make_data(), weights)
+        logging.disable(logging.NOTSET)
+        try:
+            with self.assertLogs("financialtools.evaluator", level="WARNING") as logs:
+                self._assert_matches_long(ev)
+        finally:
+            logging.disable(logging.CRITICAL)
+        self.assertTrue(any("ROE" in line for line in logs.output))
+
+    def test_duplicate_weight_rows_summed(self):
+        weights = _make_weights()
+        weights = pd.concat([weights, weights[weights["metrics"] == "ROA"]], ignore_index=True)
+        self._assert_matches_long(FundamentalMetricsEvaluator(_make_data(), weights))
+
+    def test_no_red_flags(self):
+        ev = FundamentalMetricsEvaluator(_make_data(), _make_weights())
+        m = ev.compute_metrics()
+        m = m[["ticker", "time", "sector", "CurrentRatio"]]
+        _, flags = _reference_long(ev, m)
+        out = ev._metrics_red_flags_wide(m)
+        self.assertTrue(out.empty)
+        pd.testing.assert_frame_equal(out, flags)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+"""
+Unit tests for the copy-free compute path (evaluator.py).
+
+The reference functions below are copies of the former ``self.d.copy()`` +
+column-by-column ``safe_div`` implementations of compute_metrics,
+compute_valuation_metrics and compute_extended_metrics; the array path must
+match them exactly (values, dtypes, index).
+
+Covered:
+  1. All three compute steps match the reference — single ticker and universe,
+     shuffled rows and a non-default index
+  2. Absent required and optional columns (NaN fill, total_debt derivation)
+  3. Object-dtype numeric input columns
+  4. self.d is not mutated and the output does not alias it
+  5. safe_div on Series, arrays and scalars (zero / NaN denominators)
+  6. compute_extended_metrics NaN-fills absent operating_cash_flow / total_assets
+     instead of failing the whole step
+"""
+
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import (
+    SCORED_METRICS,
+    FundamentalMetricsEvaluator,
+    _REQUIRED_EXTENDED_COLS,
+    _REQUIRED_METRIC_COLS,
+    _REQUIRED_VALUATION_COLS,
+)
+from financialtools.universe import UniverseMetricsEvaluator
+
+from tests._fixtures import _make_data, _make_weights
+
+
+# ── Reference copies of the former implementation ──────────────────────────────
+
+def _ref_safe_div(num, den):
+    num = pd.Series(num) if not isinstance(num, pd.Series) else num
+    den = pd.Series(den) if not isinstance(den, pd.Series) else den
+    return np.where((den != 0) & (den.notna()) & (num.notna()), num / den, np.nan)
+
+
+def _ref_fill(ev, d, required):
+    missing = [c for c in required if c not in d.columns]
+    if "total_debt" in missing:
+        derived = ev._derive_total_debt(d)
+        if derived is not None:
+            d["total_debt"] = derived
+            missing.remove("total_debt")
+    for col in missing:
+        d[col] = np.nan
+    return d
+
+
+def _ref_compute_metrics(ev):
+    d = _ref_fill(ev, ev.d.copy(), _REQUIRED_METRIC_COLS)
+
+    def get(col):
+        return d.get(col, pd.Series(np.nan, index=d.index))
+
+    div = _ref_safe_div
+    d["GrossMargin"] = div(d["gross_profit"], d["total_revenue"])
+    d["OperatingMargin"] = div(d["operating_income"], d["total_revenue"])
+    d["NetProfitMargin"] = div(d["net_income_common_stockholders"], d["total_revenue"])
+    d["EBITDAMargin"] = div(d["ebitda"], d["total_revenue"])
+    d["ROA"] = div(d["net_income_common_stockholders"], d["total_assets"])
+    d["ROE"] = div(d["net_income_common_stockholders"], d["common_stock_equity"])
+    d["FCFToRevenue"] = div(d["free_cash_flow"], d["total_revenue"])
+    d["FCFYield"] = div(d["free_cash_flow"], get("marketcap"))
+    d["FCFtoDebt"] = div(d["free_cash_flow"], d["total_debt"])
+    d["DebtToEquity"] = div(d["total_debt"], d["common_stock_equity"])
+    d["CurrentRatio"] = div(d["current_assets"], d["current_liabilities"])
+    d["QuickRatio"] = div(d["current_assets"] - get("inventory"), d["current_liabilities"])
+    d["CashRatio"] = div(get("cash_and_cash_equivalents"), d["current_liabilities"])
+    d["WorkingCapitalRatio"] = div(get("working_capital"), d["current_assets"])
+    d["DebtRatio"] = div(d["total_debt"], d["total_assets"])
+    d["EquityRatio"] = div(d["common_stock_equity"], d["total_assets"])
+    d["NetDebtToEBITDA"] = div(get("net_debt"), d["ebitda"])
+    d["InterestCoverage"] = div(get("ebit"), get("interest_expense_non_operating"))
+    d["ROIC"] = div(get("ebit") * (1 - get("tax_rate_for_calcs")), get("invested_capital"))
+    d["AssetTurnover"] = div(d["total_revenue"], d["total_assets"])
+    d["OCFRatio"] = div(d["operating_cash_flow"], d["current_liabilities"])
+    d["FCFMargin"] = div(d["free_cash_flow"], d["total_revenue"])
+    d["CashConversion"] = div(d["operating_cash_flow"], d["net_income_common_stockholders"])
+    d["CapexRatio"] = div(get("capital_expenditure"), d["operating_cash_flow"])
+
+    d = d[["ticker", "time"] + list(SCORED_METRICS)]
+    d["sector"] = ev._sector_column(d)
+    return d
+
+
+def _ref_compute_valuation_metrics(ev):
+    d = _ref_fill(ev, ev.d.copy(), _REQUIRED_VALUATION_COLS)
+    nan = pd.Series(np.nan, index=d.index)
+    shares = d["sharesoutstanding"] if "sharesoutstanding" in d.columns else nan
+    price, mktcap = d.get("currentprice", nan), d.get("marketcap", nan)
+    div = _ref_safe_div
+    d["bvps"] = div(d["common_stock_equity"], shares)
+    d["fcf_per_share"] = div(d["free_cash_flow"], shares)
+    d["eps"] = d["diluted_eps"]
+    d["P/E"] = div(price, d["eps"])
+    d["P/B"] = div(price, d["bvps"])
+    d["P/FCF"] = div(price, d["fcf_per_share"])
+    d["EarningsYield"] = div(d["eps"], price)
+    d["FCFYield"] = div(d["free_cash_flow"], mktcap)
+    d = d[["ticker", "time", "bvps", "fcf_per_share", "eps", "P/E",
+           "P/B", "P/FCF", "EarningsYield", "FCFYield"]]
+    d["sector"] = ev._sector_column(d)
+    return d
+
+
+def _ref_compute_extended_metrics(ev):
+    d = ev._sort_for_growth(ev.d.copy())
+    d = _ref_fill(ev, d, _REQUIRED_EXTENDED_COLS)
+
+    def get(col):
+        return d.get(col, pd.Series(np.nan, index=d.index))
+
+    div = _ref_safe_div
+    recv, inv, pay, cogs = (get("accounts_receivable"), get("inventory"),
+                            get("accounts_payable"), get("cost_of_revenue"))
+    d["ReceivablesTurnover"] = div(d["total_revenue"], recv)
+    d["DSO"] = div(recv * 365, d["total_revenue"])
+    d["InventoryTurnover"] = div(cogs, inv)
+    d["DIO"] = div(inv * 365, cogs)
+    d["PayablesTurnover"] = div(cogs, pay)
+    d["DPO"] = div(pay * 365, cogs)
+    d["CCC"] = np.where(pd.isna(d["DSO"]) | pd.isna(d["DIO"]) | pd.isna(d["DPO"]),
+                        np.nan, d["DSO"] + d["DIO"] - d["DPO"])
+    d["RevenueGrowth"] = ev._pct_change(d["total_revenue"], d)
+    d["NetIncomeGrowth"] = ev._pct_change(d["net_income_common_stockholders"], d)
+    d["FCFGrowth"] = ev._pct_change(d["free_cash_flow"], d)
+    d["Accruals"] = div(d["net_income_common_stockholders"] - d["operating_cash_flow"],
+                        d["total_assets"])
+    d["DebtGrowth"] = ev._pct_change(d["total_debt"], d)
+    d["Dilution"] = ev._pct_change(get("ordinary_shares_number"), d)
+    d["CapexToDepreciation"] = div(get("capital_expenditure").abs(),
+                                   get("depreciation_amortization_depletion"))
+    cols = ["ReceivablesTurnover", "DSO", "InventoryTurnover", "DIO", "PayablesTurnover",
+            "DPO", "CCC", "RevenueGrowth", "NetIncomeGrowth", "FCFGrowth",
+            "Accruals", "DebtGrowth", "Dilution", "CapexToDepreciation"]
+    out = d[["ticker", "time"] + cols].copy()
+    out["sector"] = ev._sector_column(out)
+    return out
+
+
+_STEPS = (
+    ("compute_metrics", _ref_compute_metrics),
+    ("compute_valuation_metrics", _ref_compute_valuation_metrics),
+    ("compute_extended_metrics", _ref_compute_extended_metrics),
+)
+
+
+def _awkward_data(ticker="T") -> pd.DataFrame:
+    """Zero / negative / NaN denominators, reversed periods, a non-default index."""
+    d = _make_data(ticker=ticker, revenues=(100.0, 0.0, -20.0, 150.0),
+                   net_incomes=(10.0, np.nan, -3.0, 15.0), fcfs=(8.0, -1.0, 0.0, np.nan),
+                   times=("2024", "2021", "2023", "2022"))
+    d["sharesoutstanding"] = [10.0, 0.0, np.nan, 12.0]
+    d.loc[1, "current_liabilities"] = 0.0
+    d.loc[2, "common_stock_equity"] = -5.0
+    d.loc[3, "tax_rate_for_calcs"] = np.nan
+    d.index = [40, 10, 30, 20]
+    return d
+
+
+def _universe() -> pd.DataFrame:
+    frames = []
+    for ticker, sector in (("A", "technology"), ("B", "energy"), ("C", "technology")):
+        d = _awkward_data(ticker)
+        d["sector"] = sector
+        frames.append(d)
+    data = pd.concat(frames)
+    return data.sample(frac=1.0, random_state=0)
+
+
+class TestCopyFreeCompute(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def _assert_matches_reference(self, ev):
+        for step, reference in _STEPS:
+            with self.subTest(step=step):
+                pd.testing.assert_frame_equal(getattr(ev, step)(), reference(ev))
+
+    def test_single_ticker_matches_reference(self):
+        self._assert_matches_reference(FundamentalMetricsEvaluator(_awkward_data(), _make_weights()))
+
+    def test_universe_matches_reference(self):
+        self._assert_matches_reference(UniverseMetricsEvaluator(_universe()))
+
+    def test_absent_columns_match_reference(self):
+        data = _awkward_data().drop(columns=["total_debt", "ebitda", "inventory", "marketcap",
+                                             "currentprice", "ordinary_shares_number"])
+        data["current_debt"] = [1.0, 2.0, np.nan, 4.0]
+        data["long_term_debt"] = [10.0, np.nan, 30.0, 40.0]
+        ev = FundamentalMetricsEvaluator(data, _make_weights())
+        self._assert_matches_reference(ev)
+        np.testing.assert_allclose(ev.compute_metrics()["DebtRatio"].iloc[0], 11.0 / 200.0)
+
+    def test_object_dtype_inputs(self):
+        data = _awkward_data()
+        data["total_revenue"] = data["total_revenue"].astype(object)
+        data["ebit"] = [1.0, None, "n/a", 4.0]
+        ev = FundamentalMetricsEvaluator(data, _make_weights())
+        out = ev.compute_metrics()
+        self.assertEqual(out["GrossMargin"].dtype, np.float64)
+        self.assertTrue(np.isnan(out.loc[30, "InterestCoverage"]))
+        pd.testing.assert_series_equal(
+            out["GrossMargin"],
+            _ref_compute_metrics(FundamentalMetricsEvaluator(_awkward_data(), _make_weights()))
+            ["GrossMargin"],
+        )
+
+    def test_input_untouched(self):
+        data = _awkward_data()
+        snapshot = data.copy()
+        ev = FundamentalMetricsEvaluator(data, _make_weights())
+        out = ev.compute_metrics()
+        ev.compute_valuation_metrics()
+        ev.compute_extended_metrics()
+        pd.testing.assert_frame_equal(data, snapshot)
+        out.loc[40, "ticker"] = "X"
+        out.loc[40, "GrossMargin"] = 99.0
+        pd.testing.assert_frame_equal(data, snapshot)
+
+    def test_safe_div(self):
+        ev = FundamentalMetricsEvaluator(_make_data(), _make_weights())
+        num = pd.Series([1.0, 2.0, np.nan, 4.0, -3.0])
+        den = pd.Series([2.0, 0.0, 1.0, np.nan, -0.0])
+        np.testing.assert_array_equal(ev.safe_div(num, den), _ref_safe_div(num, den))
+        np.testing.assert_array_equal(ev.safe_div(num.to_numpy(), den.to_numpy()),
+                                      _ref_safe_div(num, den))
+        np.testing.assert_array_equal(ev.safe_div(num.to_numpy(), 2.0), num.to_numpy() / 2.0)
+        self.assertTrue(np.isnan(ev.safe_div(1.0, 0.0)))
+
+    def test_extended_fills_absent_operating_cash_flow(self):
+        data = _awkward_data().drop(columns=["operating_cash_flow"])
+        ext = FundamentalMetricsEvaluator(data, _make_weights()).compute_extended_metrics()
+        self.assertEqual(len(ext), 4)
+        self.assertTrue(ext["Accruals"].isna().all())
+        self.assertFalse(ext["RevenueGrowth"].isna().all())
+
+
+if __name__ == "__main__":
+    unittest.main()
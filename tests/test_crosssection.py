@@ -0,0 +1,172 @@
+"""
+Unit tests for peer-relative scoring (crosssection.py) and the evaluators' scoring modes.
+
+Covered:
+  1. peer_groups: one code per (sector, fiscal year); a missing sector or
+     time gets no group, and a null time row does not fail percentile scoring
+  2. cross_sectional_stats matches pandas groupby rank / mean / std (ties,
+     NaN values, rows without a group)
+  3. percentile_scores / zscore_scores: 1–5 mapping, inverse metrics, NaN → 3
+  4. UniverseMetricsEvaluator(scoring=...) — composites come from peer ranks;
+     a ticker alone in its sector-year scores a neutral 3; the long
+     compute_scores path agrees with the wide composite
+  5. compute_cross_sectional returns percentiles / z-scores shaped like metrics
+  6. Unknown scoring modes and stats raise ValueError; absolute is the default;
+     the single-ticker evaluator rejects peer-relative modes
+"""
+
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.crosssection import (
+    cross_sectional_stats,
+    peer_groups,
+    percentile_scores,
+    zscore_scores,
+)
+from financialtools.evaluator import FundamentalMetricsEvaluator
+from financialtools.universe import UniverseMetricsEvaluator
+
+from tests._fixtures import _make_data, _make_weights
+
+
+def _universe() -> pd.DataFrame:
+    """Three technology tickers of increasing profitability, one energy ticker."""
+    frames = [
+        _make_data(ticker=t, net_incomes=(n, n * 1.1, n * 1.2)).assign(sector="technology")
+        for t, n in (("LOW", 2.0), ("MID", 10.0), ("TOP", 30.0))
+    ]
+    frames.append(_make_data(ticker="NRG").assign(sector="energy"))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestPeerStatistics(unittest.TestCase):
+
+    def test_peer_groups(self):
+        groups = peer_groups(
+            ["tech", "tech", "tech", "energy", None],
+            ["2023-12-31", "2023-06-30", "2024-06-30", "2023-12-31", "2023-12-31"],
+        )
+        self.assertEqual(groups[0], groups[1])
+        self.assertEqual(len({groups[0], groups[2], groups[3]}), 3)
+        self.assertEqual(groups[4], -1)
+        mixed = peer_groups(["tech", "tech", "tech"], ["2023-12-31", None, "not a date"])
+        np.testing.assert_array_equal(mixed[1:], [-1, -1])
+        self.assertGreaterEqual(mixed[0], 0)
+        np.testing.assert_array_equal(peer_groups(["a", "a"], [2023.0, np.nan]), [0, -1])
+
+    def test_stats_match_pandas(self):
+        rng = np.random.default_rng(7)
+        values = rng.integers(0, 5, (400, 4)).astype(float)     # plenty of ties
+        values[rng.random(values.shape) < 0.15] = np.nan
+        groups = rng.integers(-1, 9, 400)
+        percentile, zscore = cross_sectional_stats(values, groups)
+
+        key = pd.Series(np.where(groups >= 0, groups, np.nan))
+        grouped = pd.DataFrame(values).groupby(key)
+        counts = grouped.transform("count").to_numpy()
+        np.testing.assert_allclose(percentile, (grouped.rank().to_numpy() - 0.5) / counts)
+        expected_z = (pd.DataFrame(values) - grouped.transform("mean")) / grouped.transform("std")
+        np.testing.assert_allclose(zscore, expected_z.to_numpy())
+        self.assertTrue(np.isnan(percentile[groups < 0]).all())
+
+    def test_single_peer_and_constant_group(self):
+        percentile, zscore = cross_sectional_stats(
+            np.array([[1.0], [2.0], [2.0], [np.nan]]), np.array([0, 1, 1, 1])
+        )
+        np.testing.assert_array_equal(percentile[:, 0], [0.5, 0.5, 0.5, np.nan])
+        self.assertTrue(np.isnan(zscore).all())
+
+    def test_score_mapping(self):
+        inverse = np.array([False, True])
+        np.testing.assert_allclose(
+            percentile_scores(np.array([[0.125, 0.125], [np.nan, 0.875]]), inverse),
+            [[1.5, 4.5], [3.0, 1.5]],
+        )
+        np.testing.assert_allclose(
+            zscore_scores(np.array([[2.5, 0.5], [-0.5, np.nan]]), inverse),
+            [[5.0, 2.5], [2.5, 3.0]],
+        )
+
+
+class TestScoringModes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def _composites(self, scoring):
+        ev = UniverseMetricsEvaluator(_universe(), scoring=scoring)
+        scores = ev.evaluate()["composite_scores"]
+        return ev, scores.set_index(["ticker", "time"])["composite_score"]
+
+    def test_percentile_composites(self):
+        ev, composite = self._composites("percentile")
+        for year in ("2022", "2023", "2024"):
+            self.assertLess(composite[("LOW", year)], composite[("MID", year)])
+            self.assertLess(composite[("MID", year)], composite[("TOP", year)])
+        # Alone in energy: every metric at the median, score 3.
+        np.testing.assert_allclose(composite.xs("NRG", level="ticker"), 3.0)
+
+        absolute = UniverseMetricsEvaluator(_universe()).evaluate()["composite_scores"]
+        self.assertFalse(np.allclose(composite.sort_index(),
+                                     absolute.set_index(["ticker", "time"])
+                                     ["composite_score"].sort_index()))
+
+    def test_null_time_row(self):
+        data = _universe()
+        data.loc[0, "time"] = None
+        for scoring in ("absolute", "percentile"):
+            with self.subTest(scoring=scoring):
+                result = UniverseMetricsEvaluator(data, scoring=scoring).evaluate()
+                self.assertFalse(result["composite_scores"].empty)
+
+    def test_zscore_composites_within_scale(self):
+        _, composite = self._composites("zscore")
+        self.assertTrue(composite.between(1.0, 5.0).all())
+        self.assertGreater(composite[("TOP", "2024")], composite[("LOW", "2024")])
+
+    def test_long_path_matches_wide(self):
+        ev = UniverseMetricsEvaluator(_universe(), scoring="percentile")
+        wide = ev._composite_scores_wide(ev.compute_metrics())
+        scored = ev.compute_scores()
+        self.assertTrue(scored["score"].between(1.0, 5.0).all())
+        merged = scored.merge(ev.weights, how="left", on=["sector", "metrics"])
+        long = ev._compute_composite_scores(merged)
+        pd.testing.assert_frame_equal(long, wide)
+
+    def test_compute_cross_sectional(self):
+        ev = UniverseMetricsEvaluator(_universe())
+        percentile = ev.compute_cross_sectional()
+        self.assertEqual(list(percentile.columns), list(ev.metrics.columns))
+        roe = percentile.set_index(["ticker", "time"])["ROE"]
+        self.assertAlmostEqual(roe[("TOP", "2023")], 5 / 6)
+        self.assertAlmostEqual(roe[("NRG", "2023")], 0.5)
+        zscore = ev.compute_cross_sectional("zscore").set_index(["ticker", "time"])["ROE"]
+        self.assertTrue(np.isnan(zscore[("NRG", "2023")]))
+        self.assertGreater(zscore[("TOP", "2023")], 0)
+        self.assertTrue(ev.metrics["ROE"].between(-10, 10).all())    # metrics untouched
+
+    def test_invalid_modes(self):
+        with self.assertRaises(ValueError):
+            UniverseMetricsEvaluator(_universe(), scoring="rank")
+        with self.assertRaises(ValueError):
+            FundamentalMetricsEvaluator(_make_data(), _make_weights(), scoring="rank")
+        for scoring in ("percentile", "zscore"):
+            with self.subTest(scoring=scoring), self.assertRaisesRegex(ValueError, "UniverseMetricsEvaluator"):
+                FundamentalMetricsEvaluator(_make_data(), _make_weights(), scoring=scoring)
+        ev = FundamentalMetricsEvaluator(_make_data(), _make_weights())
+        self.assertEqual(ev.scoring, "absolute")
+        with self.assertRaises(ValueError):
+            ev.compute_cross_sectional("rank")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Unit tests for the Downloader reshape / merge path (downloader.py).
+
+The reference functions below are copies of the former melt → pivot_table
+reshape and chained-merge implementation; the fast path must match them
+exactly. No network calls.
+
+Covered:
+  1. Reshape matches melt → pivot_table: sorted periods and line items, names normalised
+  2. All-NaN line items and periods are dropped; object-dtype statements keep their dtype
+  3. Duplicate line items are averaged, as pivot_table did
+  4. get_merged_data matches the chained merge, including docs_x / docs_y / docs
+     and _x / _y suffixes for line items present in several statements
+  5. Timestamp period labels (what yfinance returns) reshape on pandas 3
+  6. Empty statements are skipped by get_merged_data
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.downloader import Downloader
+
+
+def _reference_reshape(df: pd.DataFrame) -> pd.DataFrame:
+    """Former __reshape_fin_data (input: statement.reset_index().assign(ticker, docs))."""
+    if df.empty:
+        return df
+    pivot_vars = ["index", "ticker", "docs"]
+    value_vars = [c for c in df.columns if c not in pivot_vars]
+    df = df.melt(id_vars=pivot_vars, value_vars=value_vars, var_name="time", value_name="value")
+    df = df.pivot_table(index=["ticker", "docs", "time"], columns="index", values="value").reset_index()
+    df.columns = [col.replace(' ', '_').lower() for col in df.columns]
+    return df
+
+
+def _reference_merged(d: Downloader) -> pd.DataFrame:
+    """Former get_merged_data merge step (without the info broadcast)."""
+    dfs = [d._balance_sheet, d._cashflow, d._income_stmt]
+    dfs = [df for df in dfs if isinstance(df, pd.DataFrame) and not df.empty]
+    merged = dfs[0]
+    for df in dfs[1:]:
+        merged = merged.merge(df, how="left", on=["ticker", "time"])
+    return merged
+
+
+def _statement(items: dict, periods=("2024-12-31", "2023-12-31", "2022-12-31")) -> pd.DataFrame:
+    return pd.DataFrame(items, index=list(periods)).T
+
+
+def _raw():
+    bs = _statement({
+        "Total Assets": [500.0, 450.0, 400.0],
+        "Total Debt": [100.0, np.nan, 80.0],
+        "Ordinary Shares Number": [10.0, 10.0, 10.0],
+        "Goodwill": [np.nan, np.nan, np.nan],
+    })
+    inc = _statement({
+        "Total Revenue": [300.0, 250.0, np.nan],
+        "Net Income From Continuing Operations": [30.0, 20.0, 10.0],
+        "EBITDA": [60.0, np.nan, 40.0],
+    })
+    cf = _statement({
+        "Free Cash Flow": [25.0, 15.0, 5.0],
+        "Net Income From Continuing Operations": [30.0, 20.0, 10.0],
+        "Ordinary Shares Number": [10.0, 10.0, 10.0],
+    })
+    info = {"marketCap": 1e6, "currentPrice": 10.0, "sharesOutstanding": 1e5}
+    return bs, inc, cf, info
+
+
+def _reshape(statement, docs="balance_sheet"):
+    return Downloader._Downloader__reshape_fin_data(statement, "AAA", docs)
+
+
+class TestReshape(unittest.TestCase):
+
+    def _assert_matches_reference(self, statement, docs="balance_sheet"):
+        expected = _reference_reshape(statement.reset_index().assign(ticker="AAA", docs=docs))
+        pd.testing.assert_frame_equal(_reshape(statement, docs), expected)
+
+    def test_matches_melt_pivot(self):
+        bs, inc, cf, _ = _raw()
+        for statement, docs in ((bs, "balance_sheet"), (inc, "income_stmt"), (cf, "cashflow")):
+            with self.subTest(docs=docs):
+                self._assert_matches_reference(statement, docs)
+        out = _reshape(inc, "income_stmt")
+        self.assertEqual(list(out["time"]), ["2022-12-31", "2023-12-31", "2024-12-31"])
+        self.assertEqual(
+            list(out.columns),
+            ["ticker", "docs", "time", "ebitda", "net_income_from_continuing_operations", "total_revenue"],
+        )
+
+    def test_all_nan_dropped_and_object_dtype(self):
+        bs, *_ = _raw()
+        bs["2021-12-31"] = np.nan              # all-NaN period
+        self._assert_matches_reference(bs)
+        self.assertNotIn("goodwill", _reshape(bs).columns)
+        self.assertEqual(len(_reshape(bs)), 3)
+        self._assert_matches_reference(bs.astype(object))
+
+    def test_duplicate_line_items_averaged(self):
+        statement = pd.DataFrame(
+            [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]],
+            index=["Total Assets", "Total Assets", "Total Debt"],
+            columns=["2024-12-31", "2023-12-31"],
+        )
+        self._assert_matches_reference(statement)
+
+    def test_timestamp_periods(self):
+        bs, *_ = _raw()
+        bs.columns = pd.to_datetime(bs.columns)
+        out = _reshape(bs)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(out["time"]))
+        self.assertTrue(out["time"].is_monotonic_increasing)
+        self.assertEqual(out["total_assets"].tolist(), [400.0, 450.0, 500.0])
+
+
+class TestMergedData(unittest.TestCase):
+
+    def test_matches_chained_merge(self):
+        bs, inc, cf, info = _raw()
+        d = Downloader.from_raw("AAA", bs, inc, cf, info)
+        merged = d.get_merged_data()
+        expected = _reference_merged(d).merge(
+            pd.DataFrame({"ticker": ["AAA"], "marketcap": [1e6], "currentprice": [10.0],
+                          "sharesoutstanding": [1e5]}),
+            on="ticker", how="left",
+        )
+        pd.testing.assert_frame_equal(merged, expected)
+        for col in ("docs_x", "docs_y", "docs", "ordinary_shares_number_x",
+                    "ordinary_shares_number_y", "net_income_from_continuing_operations_x",
+                    "net_income_from_continuing_operations_y"):
+            self.assertIn(col, merged.columns)
+
+    def test_left_join_keeps_first_statement_periods(self):
+        bs, inc, cf, info = _raw()
+        cf = cf.drop(columns="2022-12-31")
+        d = Downloader.from_raw("AAA", bs, inc, cf, info)
+        pd.testing.assert_frame_equal(
+            d.get_merged_data().drop(columns=list(Downloader._MARKET_COLS)), _reference_merged(d)
+        )
+
+    def test_empty_statement_skipped(self):
+        bs, inc, _, info = _raw()
+        d = Downloader.from_raw("AAA", bs, inc, pd.DataFrame(), info)
+        merged = d.get_merged_data()
+        self.assertEqual(len(merged), 3)
+        self.assertIn("total_revenue", merged.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+"""
+Unit tests for the export layer (exporters.py) and export/read_financial_results.
+
+All tests write to a temporary directory — no network calls.
+
+Covered:
+  1. Every built-in format round-trips a result frame; identifier columns come
+     back as strings with the same dtypes from every format, even when written
+     as numbers
+  2. Frames beyond EXCEL_MAX_ROWS continue on extra sheets and read back whole
+  3. read_frame picks the fastest format present; fmt= forces one; missing → FileNotFoundError
+  4. register_format plugs in a new format; unknown formats raise ValueError
+  5. A failing write is logged and skipped without affecting the others
+  6. A later export in another format removes the older files of that key,
+     so a stale Parquet export never shadows a newer Excel one — also when
+     the Parquet write of that export fails
+  7. export_financial_results merges each key once (generators, CompactResult)
+     and read_financial_results reads the export back, filtered by ticker / year
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from financialtools import exporters
+from financialtools.evaluator import FundamentalMetricsEvaluator
+from financialtools.exporters import (
+    ResultFormat,
+    available_formats,
+    read_frame,
+    register_format,
+    write_frames,
+)
+from financialtools.results import CompactResult
+from financialtools.wrappers import export_financial_results, merge_results, read_financial_results
+
+from tests._fixtures import _make_data, _make_weights
+
+TICKERS = ["AAA", "BBB"]
+
+
+def _results() -> dict:
+    return {
+        t: FundamentalMetricsEvaluator(
+            _make_data(ticker=t, revenues=(100.0 + i, 120.0, 150.0)), _make_weights()
+        ).evaluate()
+        for i, t in enumerate(TICKERS)
+    }
+
+
+class TestFormats(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.metrics = merge_results(_results(), "metrics")
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_every_format(self):
+        formats = ["xlsx", "parquet", "arrow", "csv"]
+        written = write_frames({"metrics": self.metrics}, self.dir, formats=formats)
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         ["metrics.arrow", "metrics.csv", "metrics.parquet", "metrics.xlsx"])
+        self.assertEqual(len(written["metrics"]), 4)
+        for fmt in formats:
+            with self.subTest(fmt=fmt):
+                back = read_frame(self.dir, "metrics", fmt=fmt)
+                pd.testing.assert_frame_equal(back, self.metrics, check_dtype=False, rtol=1e-9)
+                self.assertEqual(back["time"].tolist(), self.metrics["time"].tolist())
+
+    def test_identifier_dtypes_match_across_formats(self):
+        frame = self.metrics.assign(time=self.metrics["time"].astype(int))    # numeric years
+        formats = ["xlsx", "parquet", "arrow", "csv"]
+        write_frames({"metrics": frame}, self.dir, formats=formats)
+        backs = {fmt: read_frame(self.dir, "metrics", fmt=fmt) for fmt in formats}
+        for fmt, back in backs.items():
+            with self.subTest(fmt=fmt):
+                ids = ["ticker", "time", "sector"]
+                pd.testing.assert_series_equal(back.dtypes[ids], self.metrics.dtypes[ids])
+                self.assertEqual(back["time"].tolist(), self.metrics["time"].tolist())
+
+    def test_excel_sheet_split(self):
+        with mock.patch.object(exporters, "EXCEL_MAX_ROWS", 3):
+            write_frames({"metrics": self.metrics}, self.dir, formats=["xlsx"])
+            with pd.ExcelFile(os.path.join(self.dir, "metrics.xlsx")) as book:
+                self.assertEqual(book.sheet_names, ["sheet1", "sheet1_2", "sheet1_3"])
+            back = read_frame(self.dir, "metrics")
+        pd.testing.assert_frame_equal(back, self.metrics, check_dtype=False)
+
+    def test_reader_prefers_fastest_format(self):
+        write_frames({"metrics": self.metrics}, self.dir, formats=["xlsx", "parquet"])
+        calls = []
+        parquet = exporters._FORMATS["parquet"]
+        spy = ResultFormat("parquet", ".parquet", parquet.write,
+                           lambda path, sheet_name: calls.append(path) or pd.read_parquet(path),
+                           parquet.requires, parquet.rank)
+        with mock.patch.dict(exporters._FORMATS, {"parquet": spy}):
+            read_frame(self.dir, "metrics")
+        self.assertEqual([os.path.basename(p) for p in calls], ["metrics.parquet"])
+        self.assertLess(available_formats().index("parquet"), available_formats().index("xlsx"))
+
+        with self.assertRaises(FileNotFoundError):
+            read_frame(self.dir, "metrics", fmt="csv")
+        with self.assertRaises(FileNotFoundError):
+            read_frame(self.dir, "composite_scores")
+
+    def test_later_export_replaces_other_formats(self):
+        write_frames({"metrics": self.metrics}, self.dir, formats=["parquet"])
+        newer = self.metrics.assign(ROE=self.metrics["ROE"] + 1)
+        write_frames({"metrics": newer}, self.dir, formats=["xlsx"])
+        self.assertEqual(os.listdir(self.dir), ["metrics.xlsx"])
+        pd.testing.assert_frame_equal(read_frame(self.dir, "metrics"), newer, check_dtype=False)
+
+    def test_failed_write_drops_previous_file(self):
+        write_frames({"metrics": self.metrics}, self.dir, formats=["parquet", "csv"])
+        newer = self.metrics.assign(ROE=self.metrics["ROE"] + 1)
+        parquet = exporters._FORMATS["parquet"]
+
+        def broken(df, path, sheet_name):
+            raise OSError("disk full")
+
+        failing = ResultFormat("parquet", ".parquet", broken, parquet.read, parquet.requires, parquet.rank)
+        logging.disable(logging.CRITICAL)
+        try:
+            with mock.patch.dict(exporters._FORMATS, {"parquet": failing}):
+                write_frames({"metrics": newer}, self.dir, formats=["parquet", "csv"])
+        finally:
+            logging.disable(logging.NOTSET)
+        self.assertEqual(os.listdir(self.dir), ["metrics.csv"])
+        pd.testing.assert_frame_equal(read_frame(self.dir, "metrics"), newer, check_dtype=False)
+
+    def test_register_format_and_unknown_format(self):
+        fmt = ResultFormat("json", ".json",
+                           lambda df, path, sheet_name: df.to_json(path, orient="records"),
+                           lambda path, sheet_name: pd.read_json(path, orient="records"),
+                           rank=10)
+        with mock.patch.dict(exporters._FORMATS):
+            register_format(fmt)
+            write_frames({"metrics": self.metrics}, self.dir, formats=["json"])
+            self.assertIn("json", available_formats())
+            self.assertEqual(len(read_frame(self.dir, "metrics")), len(self.metrics))
+        with self.assertRaises(ValueError):
+            write_frames({"metrics": self.metrics}, self.dir, formats=["json"])
+
+    def test_failed_write_is_isolated(self):
+        def broken(df, path, sheet_name):
+            with open(path, "w") as fh:
+                fh.write("partial")
+            raise OSError("disk full")
+
+        with mock.patch.dict(exporters._FORMATS, {"broken": ResultFormat("broken", ".bin", broken, None)}):
+            written = write_frames({"metrics": self.metrics}, self.dir, formats=["parquet", "broken"])
+        self.assertEqual([os.path.basename(p) for p in written["metrics"]], ["metrics.parquet"])
+        self.assertEqual(os.listdir(self.dir), ["metrics.parquet"])       # no temp file left
+
+
+class TestFinancialResultsExport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.results = _results()
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_generator_is_merged_once_per_export(self):
+        stream = ((t, r) for t, r in self.results.items())     # single-use iterable
+        written = export_financial_results(stream, self.dir, formats=["parquet", "csv"])
+        self.assertEqual(set(written), {"metrics", "eval_metrics", "composite_scores",
+                                        "red_flags", "raw_red_flags"})
+        composite = read_frame(self.dir, "composite_scores")
+        self.assertEqual(sorted(composite["ticker"].unique()), TICKERS)
+
+    def test_compact_results_and_read_back(self):
+        compact = {t: CompactResult.from_result(r) for t, r in self.results.items()}
+        export_financial_results(compact, self.dir, formats=["parquet"])
+        metrics, eval_metrics, composite, red_flags = read_financial_results(
+            ticker="BBB", input_dir=self.dir
+        )
+        expected = merge_results(self.results, "metrics")
+        expected = expected[expected["ticker"] == "BBB"].round(4)
+        pd.testing.assert_frame_equal(metrics, expected)
+        self.assertEqual(set(composite["ticker"]), {"BBB"})
+        self.assertFalse(eval_metrics.empty)
+
+    def test_default_excel_matches_parquet(self):
+        export_financial_results(self.results, self.dir, formats=["xlsx", "parquet"])
+        from_parquet = read_financial_results(input_dir=self.dir)
+        from_excel = read_financial_results(input_dir=self.dir, fmt="xlsx")
+        for a, b in zip(from_parquet, from_excel):
+            pd.testing.assert_frame_equal(a, b, check_dtype=False)
+        metrics = read_financial_results(time=2023, input_dir=self.dir)[0]
+        self.assertEqual(metrics["time"].unique().tolist(), ["2023"])
+        self.assertEqual(len(metrics), len(TICKERS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Unit tests for the declarative metric formulas (formulas.py) and their use in evaluator.py.
+
+Covered:
+  1. SCORED_METRICS, score thresholds, inverse flags and required columns are
+     derived from the formula tables
+  2. The compiled plan dedupes shared subexpressions and loads each column once
+  3. Expressions: + - * /, unary minus, abs(), constants, metric references,
+     division by zero → NaN; unsupported syntax and bad thresholds are rejected
+  4. Growth formulas go through the evaluator's _pct_change hook
+  5. register_metric: scored metric is computed, scored and weighted; extended
+     metric joins compute_extended_metrics; per-class isolation; validation
+"""
+
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import (
+    SCORED_METRICS,
+    FundamentalMetricsEvaluator,
+    _REQUIRED_EXTENDED_COLS,
+    _REQUIRED_METRIC_COLS,
+)
+from financialtools.formulas import MetricFormula, MetricPlan, compile_plan
+from financialtools.universe import UniverseMetricsEvaluator
+from financialtools.utils import build_weights
+
+from tests._fixtures import _make_data
+
+
+class _Scratch(FundamentalMetricsEvaluator):
+    """Subclass used to register metrics without touching the base class."""
+
+
+def _columns(**values) -> dict:
+    return {k: np.asarray(v, dtype=np.float64) for k, v in values.items()}
+
+
+class TestFormulaTables(unittest.TestCase):
+
+    def test_constants_derived_from_tables(self):
+        formulas = FundamentalMetricsEvaluator._METRIC_FORMULAS
+        self.assertEqual(SCORED_METRICS, [f.name for f in formulas])
+        self.assertEqual(len(SCORED_METRICS), 24)
+        self.assertEqual(FundamentalMetricsEvaluator._SCORE_THRESHOLDS["ROIC"], [0.05, 0.1, 0.15, 0.2])
+        self.assertEqual(FundamentalMetricsEvaluator._INVERSE_METRICS,
+                         {"DebtToEquity", "DebtRatio", "NetDebtToEBITDA", "CapexRatio"})
+        self.assertEqual(set(_REQUIRED_METRIC_COLS), {
+            "gross_profit", "operating_income", "ebitda", "current_assets", "current_liabilities",
+            "total_revenue", "net_income_common_stockholders", "total_assets",
+            "common_stock_equity", "free_cash_flow", "total_debt", "operating_cash_flow",
+        })
+        self.assertEqual(set(_REQUIRED_EXTENDED_COLS), {
+            "total_revenue", "net_income_common_stockholders", "free_cash_flow",
+            "total_debt", "operating_cash_flow", "total_assets",
+        })
+
+    def test_plan_loads_each_column_once(self):
+        plan = FundamentalMetricsEvaluator._metric_plan()
+        self.assertEqual(plan.names, tuple(SCORED_METRICS))
+        loaded = plan.required + plan.optional
+        self.assertEqual(len(loaded), len(set(loaded)))
+        self.assertIn("ebit", plan.optional)
+        self.assertIs(FundamentalMetricsEvaluator._metric_plan(), plan)
+
+
+class TestMetricPlan(unittest.TestCase):
+
+    def test_shared_subexpressions_evaluated_once(self):
+        plan = MetricPlan((
+            MetricFormula("A", "ebit * (1 - tax)", "capital"),
+            MetricFormula("B", "ebit * (1 - tax)", "revenue"),
+            MetricFormula("C", "revenue", "ebit * (1 - tax)"),
+        ))
+        self.assertEqual(plan.n_subexpressions, 2)     # (1 - tax), ebit * (...)
+        self.assertEqual(set(plan.optional), {"ebit", "tax", "capital", "revenue"})
+        block = plan.evaluate(_columns(ebit=[10.0, 4.0], tax=[0.5, 0.0],
+                                       capital=[5.0, 0.0], revenue=[20.0, np.nan]), 2)
+        np.testing.assert_array_equal(block[:, 0], [1.0, np.nan])
+        np.testing.assert_array_equal(block[:, 1], [0.25, np.nan])
+        np.testing.assert_array_equal(block[:, 2], [4.0, np.nan])
+        self.assertTrue(block.flags.f_contiguous)
+
+    def test_expression_syntax(self):
+        plan = compile_plan((
+            MetricFormula("Neg", "-a + abs(b) * 2"),
+            MetricFormula("Div", "a / b + 1"),
+            MetricFormula("Ref", "Neg - Div", "a"),
+            MetricFormula("Const", "3"),
+        ))
+        block = plan.evaluate(_columns(a=[1.0, 2.0], b=[-4.0, 0.0]), 2)
+        np.testing.assert_array_equal(block[:, 0], [7.0, -2.0])
+        np.testing.assert_array_equal(block[:, 1], [0.75, np.nan])
+        np.testing.assert_array_equal(block[:, 2], [6.25, np.nan])
+        np.testing.assert_array_equal(block[:, 3], [3.0, 3.0])
+
+    def test_metric_reference_only_after_definition(self):
+        plan = MetricPlan((MetricFormula("X", "Y"), MetricFormula("Y", "a")))
+        self.assertEqual(plan.optional, ("Y", "a"))
+
+    def test_invalid_formulas_rejected(self):
+        for kwargs in (
+            {"numerator": "log(a)"},
+            {"numerator": "a.b"},
+            {"numerator": "a > b"},
+            {"numerator": "a +"},
+            {"numerator": "a", "thresholds": (1, 2, 3)},
+            {"numerator": "a", "thresholds": (4, 3, 2, 1)},
+            {"numerator": "a", "inverse": True},
+            {"numerator": "a", "denominator": "b", "growth": True},
+        ):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                MetricFormula("M", **kwargs)
+        with self.assertRaises(ValueError):
+            MetricPlan((MetricFormula("M", "a"), MetricFormula("M", "b")))
+
+    def test_growth_uses_hook(self):
+        plan = MetricPlan((MetricFormula("G", "a * 2", growth=True),))
+        seen = []
+        block = plan.evaluate(_columns(a=[1.0, 2.0, 4.0]), 3,
+                              growth=lambda v: seen.append(v.copy()) or np.array([0.0, 1.0, 1.0]))
+        np.testing.assert_array_equal(seen[0], [2.0, 4.0, 8.0])
+        np.testing.assert_array_equal(block[:, 0], [0.0, 1.0, 1.0])
+
+
+class TestRegisterMetric(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        for attr in ("_METRIC_FORMULAS", "_EXTENDED_FORMULAS", "_SCORE_THRESHOLDS",
+                     "_INVERSE_METRICS"):
+            setattr(_Scratch, attr, getattr(FundamentalMetricsEvaluator, attr))
+
+    def test_scored_metric(self):
+        _Scratch.register_metric(MetricFormula(
+            "EBITToDebt", "ebit", "total_debt", required=("total_debt",),
+            thresholds=(0.1, 0.2, 0.3, 0.4), inverse=True,
+        ))
+        weights = build_weights("technology", overrides={"EBITToDebt": 10})
+        result = _Scratch(_make_data(), weights).evaluate()
+        m = result["metrics"]
+        self.assertEqual(list(m.columns[-2:]), ["EBITToDebt", "sector"])
+        np.testing.assert_allclose(m["EBITToDebt"], 0.25 / 0.5)
+        self.assertIn("EBITToDebt", _Scratch._INVERSE_METRICS)
+        scored = _Scratch(_make_data(), weights)._score_wide(m)
+        self.assertTrue((scored["EBITToDebt"] == 1).all())      # above every bound, lower is better
+        base = FundamentalMetricsEvaluator(_make_data(), weights).evaluate()
+        self.assertFalse(
+            np.allclose(result["composite_scores"]["composite_score"],
+                        base["composite_scores"]["composite_score"])
+        )
+        # Base class untouched.
+        self.assertNotIn("EBITToDebt", FundamentalMetricsEvaluator._SCORE_THRESHOLDS)
+        self.assertNotIn("EBITToDebt", base["metrics"].columns)
+
+    def test_extended_metric_and_universe(self):
+        _Scratch.register_metric(
+            MetricFormula("EBITGrowth", "ebit", growth=True), extended=True,
+        )
+
+        class _Universe(UniverseMetricsEvaluator):
+            _EXTENDED_FORMULAS = _Scratch._EXTENDED_FORMULAS
+
+        data = pd.concat([_make_data(ticker="A"), _make_data(ticker="B")], ignore_index=True)
+        ext = _Universe(data, sector="technology").compute_extended_metrics()
+        growth = ext.set_index(["ticker", "time"])["EBITGrowth"]
+        self.assertTrue(np.isnan(growth[("A", "2022")]))
+        self.assertAlmostEqual(growth[("B", "2023")], 0.2)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            _Scratch.register_metric(MetricFormula("ROE", "a", thresholds=(1, 2, 3, 4)))
+        with self.assertRaises(ValueError):
+            _Scratch.register_metric(MetricFormula("New", "a"))
+        with self.assertRaises(ValueError):
+            _Scratch.register_metric(MetricFormula("New", "a", thresholds=(1, 2, 3, 4)),
+                                     extended=True)
+        self.assertIs(_Scratch._METRIC_FORMULAS, FundamentalMetricsEvaluator._METRIC_FORMULAS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Unit tests for evaluate_incremental() — fingerprint-based incremental re-evaluation.
+
+All tests use synthetic DataFrames — no network calls, no .env required.
+
+Every scenario asserts that the spliced results equal a full
+UniverseMetricsEvaluator evaluation of the current data.
+
+Covered:
+  1. row_fingerprints(): stable under column order and all-NaN columns; sensitive to values
+  2. Unchanged data recomputes nothing
+  3. New period: growth uses the stored predecessor as boundary state
+  4. Restated middle period: the following period's growth is recomputed too
+  5. Removed period: the successor's growth is recomputed against its new predecessor
+  6. Changed sector weights recompute that sector only
+  7. Tickers absent from the input keep their previous results
+  8. IncrementalState save()/load() round trip
+"""
+
+import logging
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.incremental import IncrementalState, evaluate_incremental, row_fingerprints
+from financialtools.universe import UniverseMetricsEvaluator
+from financialtools.utils import build_weights
+
+from tests._fixtures import _make_data
+
+
+def _ticker(ticker: str, sector: str, times=("2021", "2022", "2023"), revenues=None) -> pd.DataFrame:
+    n = len(times)
+    revenues = revenues or tuple(100.0 + 10 * i for i in range(n))
+    df = _make_data(
+        revenues=revenues,
+        net_incomes=tuple(r / 10 for r in revenues),
+        fcfs=tuple(r / 12 for r in revenues),
+        times=times,
+        ticker=ticker,
+    )
+    df["sector"] = sector
+    return df
+
+
+def _universe() -> pd.DataFrame:
+    return pd.concat(
+        [_ticker("AAA", "technology"), _ticker("BBB", "technology"), _ticker("CCC", "energy")],
+        ignore_index=True,
+    )
+
+
+def _canon(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+    keys = [c for c in ("ticker", "time", "metrics") if c in df.columns]
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+class _IncrementalCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.WARNING)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def assertMatchesFull(self, state: IncrementalState, data: pd.DataFrame, weights=None):
+        full = UniverseMetricsEvaluator(data, weights=weights).evaluate()
+        for key, expected in full.items():
+            with self.subTest(key=key):
+                got = state.results[key]
+                if expected.empty:
+                    self.assertTrue(got.empty)
+                    continue
+                pd.testing.assert_frame_equal(
+                    _canon(got)[expected.columns], _canon(expected), check_dtype=False
+                )
+
+
+class TestRowFingerprints(unittest.TestCase):
+
+    def test_column_order_and_nan_columns_ignored(self):
+        df = _universe()
+        base = row_fingerprints(df)["fingerprint"]
+        reordered = row_fingerprints(df[df.columns[::-1]])["fingerprint"]
+        widened = row_fingerprints(df.assign(extra_col=np.nan))["fingerprint"]
+        self.assertTrue((base == reordered).all())
+        self.assertTrue((base == widened).all())
+
+    def test_value_change_changes_only_that_row(self):
+        df = _universe()
+        base = row_fingerprints(df)["fingerprint"]
+        df.loc[4, "total_revenue"] += 1
+        changed = row_fingerprints(df)["fingerprint"] != base
+        self.assertEqual(changed.tolist(), [i == 4 for i in range(len(df))])
+
+
+class TestEvaluateIncremental(_IncrementalCase):
+
+    def setUp(self):
+        self.data = _universe()
+        self.state = evaluate_incremental(self.data)
+
+    def test_first_run_is_full(self):
+        self.assertEqual(self.state.recomputed, len(self.data))
+        self.assertMatchesFull(self.state, self.data)
+
+    def test_unchanged_recomputes_nothing(self):
+        state = evaluate_incremental(self.data, self.state)
+        self.assertEqual(state.recomputed, 0)
+        self.assertMatchesFull(state, self.data)
+
+    def test_new_period_uses_boundary_state(self):
+        aaa = _ticker("AAA", "technology", times=("2021", "2022", "2023", "2024"))
+        data = pd.concat([aaa, self.data[self.data["ticker"] != "AAA"]], ignore_index=True)
+        state = evaluate_incremental(data, self.state)
+        self.assertEqual(state.recomputed, 1)
+        self.assertMatchesFull(state, data)
+        ext = state.results["extended_metrics"]
+        growth = ext.loc[(ext["ticker"] == "AAA") & (ext["time"] == "2024"), "RevenueGrowth"]
+        self.assertAlmostEqual(growth.iloc[0], 130.0 / 120.0 - 1)
+
+    def test_restated_period_recomputes_successor(self):
+        data = self.data.copy()
+        mask = (data["ticker"] == "BBB") & (data["time"] == "2022")
+        data.loc[mask, "total_revenue"] = 50.0
+        state = evaluate_incremental(data, self.state)
+        self.assertEqual(state.recomputed, 2)
+        self.assertMatchesFull(state, data)
+
+    def test_removed_period(self):
+        data = self.data[~((self.data["ticker"] == "CCC") & (self.data["time"] == "2022"))]
+        state = evaluate_incremental(data, self.state)
+        self.assertEqual(state.recomputed, 1)
+        self.assertMatchesFull(state, data)
+
+    def test_weights_change_recomputes_sector(self):
+        weights = pd.concat(
+            [build_weights("technology"), build_weights("energy")], ignore_index=True
+        )
+        weights.loc[(weights["sector"] == "energy") & (weights["metrics"] == "ROE"), "weights"] += 5
+        state = evaluate_incremental(self.data, self.state, weights=weights)
+        self.assertEqual(state.recomputed, 3)
+        self.assertMatchesFull(state, self.data, weights=weights)
+
+    def test_absent_tickers_keep_previous_results(self):
+        only_aaa = self.data[self.data["ticker"] == "AAA"]
+        state = evaluate_incremental(only_aaa, self.state)
+        self.assertEqual(state.recomputed, 0)
+        self.assertEqual(set(state.results["metrics"]["ticker"]), {"AAA", "BBB", "CCC"})
+        self.assertEqual(evaluate_incremental(self.data, state).recomputed, 0)
+
+    def test_save_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(IncrementalState.load(tmp))
+            self.state.save(tmp)
+            loaded = IncrementalState.load(tmp)
+        self.assertEqual(loaded.weights_fingerprints, self.state.weights_fingerprints)
+        data = self.data.copy()
+        data.loc[0, "total_assets"] *= 2
+        state = evaluate_incremental(data, loaded)
+        self.assertEqual(state.recomputed, 2)  # AAA 2021 and its successor 2022
+        self.assertMatchesFull(state, data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Unit tests for the compact LLM payload encoder (payloads.py).
+
+Token counts use the characters / 4 estimate (tiktoken encodings are not
+fetched) — no network calls.
+
+Covered:
+  1. Every layout decodes back to the same values as the legacy records JSON
+     (rounded to sig_digits; NaN/inf → null)
+  2. Constant identifier and all-null columns are hoisted into "constant";
+     flat metric series are kept; single-row frames hoist nothing
+  3. Column projection keeps identifier columns and ignores unknown names
+  4. Empty frames encode as []; bad input raises TypeError / ValueError
+  5. encode_payloads / payload_token_counts report fewer tokens than the
+     records JSON for a real evaluate() result
+"""
+
+import json
+import logging
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from financialtools import payloads
+from financialtools.analysis import normalise_time
+from financialtools.evaluator import FundamentalMetricsEvaluator
+from financialtools.payloads import (
+    PAYLOAD_LAYOUTS,
+    encode_payload,
+    encode_payloads,
+    payload_token_counts,
+)
+
+from tests._fixtures import _make_data, _make_weights
+
+_KEYS = ("metrics", "extended_metrics", "composite_scores", "eval_metrics", "red_flags")
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "ticker": ["AAA", "AAA", "AAA"],
+        "time": [2022, 2023, 2024],
+        "ROE": [0.0833333333, np.nan, 0.1],
+        "P/E": [200.0, 166.666666667, np.inf],
+        "Flat": [1.5, 1.5, 1.5],
+        "Empty": [np.nan, np.nan, np.nan],
+        "sector": ["technology"] * 3,
+    })
+
+
+def _rows(text: str) -> list[dict]:
+    """Decode any layout back to one dict per row (constants included)."""
+    body = json.loads(text)
+    if isinstance(body, list):
+        return body
+    constant = body.get("constant", {})
+    if "records" in body:
+        rows = body["records"]
+    elif "rows" in body:
+        rows = [dict(zip(body["columns"], row)) for row in body["rows"]]
+    else:
+        cols = body["columns"]
+        rows = [dict(zip(cols, values)) for values in zip(*cols.values())]
+    return [{**constant, **row} for row in rows]
+
+
+class TestEncodePayload(unittest.TestCase):
+
+    def test_layouts_round_trip(self):
+        expected = [
+            {"ticker": "AAA", "time": 2022, "ROE": 0.08333, "P/E": 200, "Flat": 1.5, "Empty": None, "sector": "technology"},
+            {"ticker": "AAA", "time": 2023, "ROE": None, "P/E": 166.7, "Flat": 1.5, "Empty": None, "sector": "technology"},
+            {"ticker": "AAA", "time": 2024, "ROE": 0.1, "P/E": None, "Flat": 1.5, "Empty": None, "sector": "technology"},
+        ]
+        for layout in PAYLOAD_LAYOUTS:
+            with self.subTest(layout=layout):
+                text = encode_payload(_frame(), layout=layout)
+                self.assertNotIn(" ", text)
+                self.assertNotIn("NaN", text)
+                self.assertEqual(_rows(text), expected)
+        full = _rows(encode_payload(_frame(), sig_digits=None))
+        self.assertEqual(full[0]["ROE"], 0.0833333333)
+
+    def test_constant_columns_hoisted(self):
+        body = json.loads(encode_payload(_frame()))
+        self.assertEqual(body["constant"], {"ticker": "AAA", "Empty": None, "sector": "technology"})
+        self.assertEqual(body["columns"], ["time", "ROE", "P/E", "Flat"])
+        kept = json.loads(encode_payload(_frame(), drop_constant=False))
+        self.assertNotIn("constant", kept)
+        single = json.loads(encode_payload(_frame().head(1)))
+        self.assertNotIn("constant", single)
+        plain = json.loads(encode_payload(_frame()[["time", "ROE"]], layout="records"))
+        self.assertIsInstance(plain, list)                 # legacy shape when nothing is constant
+
+    def test_projection(self):
+        body = json.loads(encode_payload(_frame(), columns=["ROE", "Missing"], drop_constant=False))
+        self.assertEqual(body["columns"], ["ticker", "time", "ROE", "sector"])
+
+    def test_empty_and_invalid(self):
+        self.assertEqual(encode_payload(pd.DataFrame()), "[]")
+        self.assertEqual(encode_payload(_frame().iloc[0:0]), "[]")
+        with self.assertRaises(TypeError):
+            encode_payload([{"a": 1}])
+        with self.assertRaises(ValueError):
+            encode_payload(_frame(), layout="yaml")
+
+
+class TestTokenReport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        result = FundamentalMetricsEvaluator(_make_data(ticker="TEST"), _make_weights()).evaluate()
+        cls.frames = {key: normalise_time(result[key]) for key in _KEYS}
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        patcher = mock.patch.object(payloads, "_encoding", lambda model: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_compact_is_smaller(self):
+        report = payload_token_counts(self.frames)
+        self.assertEqual(report["payload"].tolist(), list(_KEYS) + ["total"])
+        total = report.set_index("payload").loc["total"]
+        self.assertLess(total["compact_tokens"], total["records_tokens"])
+        self.assertEqual(total["compact_tokens"], report["compact_tokens"].iloc[:-1].sum())
+        self.assertEqual(report.set_index("payload").loc["red_flags", "saved_pct"], 0.0)   # "[]" either way
+
+    def test_encode_payloads_logs_counts(self):
+        logging.disable(logging.NOTSET)
+        try:
+            with self.assertLogs("financialtools.payloads", level="INFO") as logs:
+                encoded = encode_payloads(self.frames)
+        finally:
+            logging.disable(logging.CRITICAL)
+        self.assertEqual(list(encoded), list(_KEYS))
+        self.assertRegex(logs.output[-1], r"5 payload\(s\): \d+ → \d+ tokens")
+        self.assertEqual(_rows(encoded["composite_scores"])[0]["ticker"], "TEST")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,6 +19,8 @@ import pandas as pd
 
 from financialtools.processor import FundamentalMetricsEvaluator, SCORED_METRICS
 
+from tests._fixtures import _make_bank_data, _make_data, _make_weights
+
 
 # ---------------------------------------------------------------------------
 # Shared fixtures
@@ -45,72 +47,6 @@ ALL_EXTENDED_COLS = [
 ]
 
 
-def _make_data(
-    revenues=(100.0, 120.0, 150.0),
-    net_incomes=(10.0, 12.0, 15.0),
-    fcfs=(8.0, 10.0, 12.0),
-    ticker="TEST",
-    times=("2022", "2023", "2024"),
-) -> pd.DataFrame:
-    """
-    Build a synthetic merged DataFrame covering every column needed by
-    compute_metrics() and compute_extended_metrics().
-
-    Keyword args allow callers to pin specific values for growth-rate assertions.
-    """
-    n = len(times)
-    rev = list(revenues)
-    ni  = list(net_incomes)
-    fcf = list(fcfs)
-
-    return pd.DataFrame({
-        "ticker": ticker,
-        "time":   list(times),
-        # Income statement
-        "total_revenue":                    rev,
-        "gross_profit":                     [r * 0.6 for r in rev],
-        "operating_income":                 [r * 0.2 for r in rev],
-        "net_income_common_stockholders":   ni,
-        "ebitda":                           [r * 0.3 for r in rev],
-        "ebit":                             [r * 0.25 for r in rev],
-        "diluted_eps":                      [n_ / 100 for n_ in ni],
-        "interest_expense_non_operating":   [r * 0.01 for r in rev],
-        "tax_rate_for_calcs":               [0.21] * n,
-        # Balance sheet
-        "total_assets":                     [r * 2.0 for r in rev],
-        "total_debt":                       [r * 0.5 for r in rev],
-        "common_stock_equity":              [r * 1.2 for r in rev],
-        "current_assets":                   [r * 0.8 for r in rev],
-        "current_liabilities":              [r * 0.4 for r in rev],
-        "inventory":                        [r * 0.1 for r in rev],
-        "accounts_receivable":              [r * 0.15 for r in rev],
-        "accounts_payable":                 [r * 0.08 for r in rev],
-        "cash_and_cash_equivalents":        [r * 0.2 for r in rev],
-        "working_capital":                  [r * 0.4 for r in rev],
-        "net_debt":                         [r * 0.3 for r in rev],
-        "invested_capital":                 [r * 1.5 for r in rev],
-        "ordinary_shares_number":           [1000.0] * n,
-        # Cash flow
-        "free_cash_flow":                   fcf,
-        "operating_cash_flow":              [f * 1.2 for f in fcf],
-        "capital_expenditure":              [-r * 0.05 for r in rev],
-        "depreciation_amortization_depletion": [r * 0.04 for r in rev],
-        "cost_of_revenue":                  [r * 0.4 for r in rev],
-        # Market / other
-        "marketcap":                        [r * 5.0 for r in rev],
-        "currentprice":                     [20.0] * n,
-    })
-
-
-def _make_weights(sector: str = "technology") -> pd.DataFrame:
-    """Return a weights DataFrame covering all 24 scored metrics."""
-    from financialtools.config import sec_sector_metric_weights
-    items = sec_sector_metric_weights[sector].items()
-    df = pd.DataFrame(list(items), columns=["metrics", "weights"])
-    df["sector"] = sector
-    return df
-
-
 def _make_fta(
     revenues=(100.0, 120.0, 150.0),
     net_incomes=(10.0, 12.0, 15.0),
@@ -557,52 +493,6 @@ class TestMissingCoreColumns(unittest.TestCase):
         self.assertIn("total_debt", combined)
 
 
-def _make_bank_data(ticker: str = "BGN.MI") -> pd.DataFrame:
-    """
-    Minimal synthetic DataFrame that mimics a bank ticker (e.g. Banca Generali).
-
-    Banks structurally omit: gross_profit, operating_income, ebitda,
-    current_assets, current_liabilities, inventory.
-
-    Columns present mirror what yfinance actually returns for MIL-listed banks.
-    """
-    return pd.DataFrame({
-        "ticker": [ticker] * 3,
-        "time":   ["2022", "2023", "2024"],
-        # Income statement — bank layout
-        "total_revenue":                    [500.0, 550.0, 600.0],
-        "net_interest_income":              [300.0, 330.0, 360.0],
-        "operating_revenue":                [480.0, 530.0, 580.0],
-        "net_income_common_stockholders":   [60.0,  70.0,  80.0],
-        "net_income":                       [60.0,  70.0,  80.0],
-        "pretax_income":                    [80.0,  90.0, 100.0],
-        "diluted_eps":                      [0.53,  0.61,  0.70],
-        "interest_expense_non_operating":   [10.0,  12.0,  14.0],
-        "tax_rate_for_calcs":               [0.25,  0.25,  0.25],
-        # Balance sheet — bank layout (no current_assets / current_liabilities)
-        "total_assets":                     [8000.0, 8500.0, 9000.0],
-        "total_debt":                       [1000.0, 1100.0, 1200.0],
-        "common_stock_equity":              [900.0,  970.0, 1050.0],
-        "net_debt":                         [800.0,  880.0,  960.0],
-        "receivables":                      [200.0,  220.0,  240.0],
-        "accounts_payable":                 [50.0,   55.0,   60.0],
-        "cash_and_cash_equivalents":        [400.0,  420.0,  440.0],
-        "invested_capital":                 [1900.0, 2070.0, 2250.0],
-        "ordinary_shares_number":           [114e6,  114e6,  114e6],
-        # Cash flow
-        "free_cash_flow":                   [50.0,  60.0,  70.0],
-        "operating_cash_flow":              [65.0,  75.0,  85.0],
-        "capital_expenditure":              [-5.0,  -6.0,  -7.0],
-        "depreciation_amortization_depletion": [8.0, 9.0, 10.0],
-        "cost_of_revenue":                  [0.0,   0.0,   0.0],
-        # Market data
-        "marketcap":                        [6e9,   6.5e9, 7e9],
-        "currentprice":                     [53.0,  57.0,  61.0],
-        # NOTE: gross_profit, ebitda, operating_income, current_assets,
-        #       current_liabilities, inventory are intentionally absent.
-    })
-
-
 class TestBankLikeDataNoKeyError(unittest.TestCase):
     """
     Financial-sector tickers (banks) omit gross_profit, ebitda, operating_income,
@@ -0,0 +1,128 @@
+"""
+Unit tests for per-topic payload projection (projections.py).
+
+The LLM is never called — run_topic_chains goes through a recording fake.
+
+Covered:
+  1. Every _TOPIC_MAP topic has a projection; every projected column is a real
+     evaluate() column and is named in that topic's system prompt
+  2. project_payloads keeps the topic's blocks and columns (identifiers
+     always kept) for compact and legacy records payloads; full-block topics
+     and unregistered topics pass payloads through
+  3. build_topic_chain's human message asks for exactly the projected blocks,
+     and projected payloads are smaller than the full set
+  4. run_topic_chains hands each topic its projected payloads
+  5. register_topic_projection replaces a topic; unknown blocks raise ValueError
+"""
+
+import json
+import logging
+import re
+import unittest
+from unittest import mock
+
+from financialtools import analysis, projections
+from financialtools.analysis import _TOPIC_MAP, build_topic_chain, normalise_time, run_topic_chains
+from financialtools.evaluator import FundamentalMetricsEvaluator
+from financialtools.payloads import encode_payloads
+from financialtools.projections import (
+    PAYLOAD_BLOCKS,
+    TopicProjection,
+    human_template,
+    project_payloads,
+    register_topic_projection,
+    topic_projection,
+)
+from financialtools.prompts import _TOPIC_METRICS
+from financialtools.utils import dataframe_to_json
+
+from tests._fixtures import _make_data, _make_weights
+
+
+def _columns(text: str) -> set:
+    body = json.loads(text)
+    if isinstance(body, list):
+        return set().union(*(row.keys() for row in body)) if body else set()
+    return set(body.get("constant", {})) | set(body["columns"])
+
+
+class TestProjections(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        result = FundamentalMetricsEvaluator(_make_data(ticker="TEST"), _make_weights()).evaluate()
+        cls.frames = {key: normalise_time(result[key]) for key in PAYLOAD_BLOCKS}
+        cls.compact = encode_payloads(cls.frames)
+        cls.legacy = {key: dataframe_to_json(df) for key, df in cls.frames.items()}
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_registry_matches_prompts_and_frames(self):
+        for topic in _TOPIC_MAP:
+            with self.subTest(topic=topic):
+                projection = topic_projection(topic)
+                self.assertIn(topic, projections._PROJECTIONS)
+                for block, columns in projection.columns.items():
+                    if columns is None:
+                        continue
+                    self.assertLessEqual(set(columns), set(self.frames[block].columns))
+                    for column in columns:
+                        self.assertRegex(_TOPIC_METRICS[topic], rf"\b{re.escape(column)}\b")
+
+    def test_project_payloads(self):
+        for payloads in (self.compact, self.legacy):
+            liquidity = project_payloads(payloads, "liquidity")
+            self.assertEqual(list(liquidity), ["metrics", "extended_metrics"])
+            self.assertEqual(
+                _columns(liquidity["metrics"]),
+                {"ticker", "time", "sector", "CurrentRatio", "QuickRatio", "CashRatio", "WorkingCapitalRatio"},
+            )
+            self.assertNotIn("RevenueGrowth", _columns(liquidity["extended_metrics"]))
+            self.assertEqual(project_payloads(liquidity, "liquidity"), liquidity)    # idempotent
+        self.assertEqual(project_payloads(self.compact, "regime"), self.compact)
+        self.assertEqual(project_payloads(self.compact, "no_such_topic"), self.compact)
+        self.assertEqual(list(project_payloads(self.compact, "growth")), ["extended_metrics"])
+        with self.assertRaises(KeyError):
+            project_payloads({"metrics": "[]"}, "liquidity")
+
+    def test_chain_template_and_size(self):
+        full = sum(len(text) for text in self.compact.values())
+        for topic in _TOPIC_MAP:
+            with self.subTest(topic=topic):
+                prompt, _ = build_topic_chain(topic, None)
+                blocks = topic_projection(topic).blocks
+                self.assertEqual(set(prompt.input_variables), set(blocks))
+                self.assertEqual(human_template(topic).count("{"), len(blocks))
+                projected = sum(len(t) for t in project_payloads(self.compact, topic).values())
+                if topic in ("regime", "quantitative_overview"):
+                    self.assertEqual(projected, full)
+                else:
+                    self.assertLess(projected, full / 2)
+
+    def test_run_topic_chains_projects_per_topic(self):
+        seen = {}
+
+        def fake_invoke(prompt, parser, llm, inputs, topic, ticker, cache=None):
+            seen[topic] = inputs
+            return topic
+
+        with mock.patch.object(analysis, "invoke_chain", fake_invoke):
+            run_topic_chains(None, self.compact, "TEST", max_concurrency=1, cache=None)
+        self.assertEqual(set(seen), set(_TOPIC_MAP))
+        for topic, inputs in seen.items():
+            self.assertEqual(inputs, project_payloads(self.compact, topic))
+
+    def test_register_topic_projection(self):
+        with mock.patch.dict(projections._PROJECTIONS):
+            register_topic_projection(TopicProjection("growth", {"composite_scores": None}))
+            self.assertEqual(topic_projection("growth").blocks, ("composite_scores",))
+            with self.assertRaises(ValueError):
+                register_topic_projection(TopicProjection("growth", {"prices": None}))
+        self.assertEqual(topic_projection("growth").blocks, ("extended_metrics",))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for the rate limiters in utils.py (threaded and cross-process).
+
+Covered:
+  1. RateLimiter admits per_minute calls, then reports a wait until the oldest expires
+  2. Expired timestamps are pruned from the left of each window
+  3. RateLimiter under thread contention records every call exactly once
+  4. TokenBucketLimiter: burst passes immediately, the next call waits ~1/rate
+  5. TokenBucketLimiter rejects invalid parameters
+  6. SQLiteRateLimiter: instances on one file share a budget; names are independent
+  7. SQLiteRateLimiter is picklable and counts calls from several processes
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from financialtools.utils import RateLimiter, SQLiteRateLimiter, TokenBucketLimiter
+
+
+def _acquire_n(limiter: SQLiteRateLimiter, n: int) -> int:
+    for _ in range(n):
+        limiter.acquire()
+    return n
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_full_minute_window_waits(self):
+        limiter = RateLimiter(per_minute=3)
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(len(limiter.calls), 3)
+        self.assertGreater(limiter._windows.wait_time(time.time()), 59.0)
+
+    def test_expired_calls_are_pruned(self):
+        limiter = RateLimiter(per_minute=3, per_hour=100)
+        for _ in range(3):
+            limiter.acquire()
+        later = time.time() + 61
+        self.assertEqual(limiter._windows.wait_time(later), 0.0)
+        minute, hour, day = limiter._windows.calls
+        self.assertEqual((len(minute), len(hour), len(day)), (0, 3, 3))
+
+    def test_contention_records_every_call(self):
+        limiter = RateLimiter(per_minute=10_000, per_hour=10_000, per_day=10_000)
+        threads = [
+            threading.Thread(target=lambda: [limiter.acquire() for _ in range(25)])
+            for _ in range(16)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(limiter.calls), 400)
+
+
+class TestTokenBucketLimiter(unittest.TestCase):
+
+    def test_burst_then_paced(self):
+        limiter = TokenBucketLimiter(per_minute=600, burst=3)   # 10 tokens / s
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+        limiter.acquire()
+        elapsed = time.monotonic() - start
+        self.assertGreater(elapsed, 0.05)
+        self.assertLess(elapsed, 1.0)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TokenBucketLimiter(per_minute=0)
+        with self.assertRaises(ValueError):
+            TokenBucketLimiter(burst=0)
+
+
+class TestSQLiteRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "limits.sqlite")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _count(self, limiter, name="default") -> int:
+        conn = limiter._connect()
+        return conn.execute("SELECT COUNT(*) FROM calls WHERE name = ?", (name,)).fetchone()[0]
+
+    def test_instances_share_budget(self):
+        a = SQLiteRateLimiter(self.path, per_minute=3)
+        b = SQLiteRateLimiter(self.path, per_minute=3)
+        a.acquire()
+        a.acquire()
+        b.acquire()
+        self.assertGreater(b._wait_time(b._connect(), time.time()), 59.0)
+        other = SQLiteRateLimiter(self.path, per_minute=3, name="other")
+        self.assertEqual(other._wait_time(other._connect(), time.time()), 0.0)
+
+    def test_cross_process_calls_counted(self):
+        limiter = SQLiteRateLimiter(self.path, per_minute=1000, per_hour=1000, per_day=1000)
+        with ProcessPoolExecutor(max_workers=3) as pool:
+            done = sum(pool.map(_acquire_n, [limiter] * 3, [5] * 3))
+        self.assertEqual(done, 15)
+        self.assertEqual(self._count(limiter), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
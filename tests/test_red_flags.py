@@ -0,0 +1,181 @@
+"""
+Unit tests for the declarative red-flag rule tables (evaluator.py).
+
+The reference functions below are copies of the former row-wise
+``_metrics_red_flags`` (``df.apply(..., axis=1)``) and the np.where/melt
+``raw_red_flags``; the rule-table implementation must match them exactly.
+
+Covered:
+  1. _metrics_red_flags matches the row-wise reference (NaN, boundaries, unknown metrics,
+     no flags at all)
+  2. raw_red_flags matches the np.where + melt reference, index included
+  3. Absent raw columns never fire
+  4. register_red_flag_rule: metric and raw rules, per-class isolation
+  5. Invalid operators and column thresholds on metric rules are rejected
+  6. Rules registered on the base class reach UniverseMetricsEvaluator.evaluate()
+"""
+
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import FundamentalMetricsEvaluator, RedFlagRule
+from financialtools.universe import UniverseMetricsEvaluator
+
+from tests._fixtures import _make_data, _make_weights
+
+
+def _reference_metrics_red_flags(df):
+    df = df.copy()
+
+    def single_metric_flag(row):
+        metric, value = row["metrics"], row["value"]
+        if pd.isna(value):
+            return None
+        if metric == "GrossMargin" and value < 0:
+            return "Negative Gross Margin"
+        if metric == "OperatingMargin" and value < 0:
+            return "Negative Operating Margin"
+        if metric == "NetProfitMargin" and value < 0:
+            return "Negative Net Margin"
+        if metric == "ROA" and value < 0:
+            return "Negative ROA"
+        if metric == "ROE" and value < 0:
+            return "Negative ROE"
+        if metric == "DebtToEquity" and value > 2:
+            return "High Debt-to-Equity (>2)"
+        if metric == "FCFtoDebt" and value < 0.05:
+            return "Insufficient Free Cash Flow to cover debt"
+        return None
+
+    df["red_flag"] = df.apply(single_metric_flag, axis=1)
+    return df[df["red_flag"].notna()].reset_index(drop=True)
+
+
+def _reference_raw_red_flags(data):
+    _cols = ["ticker", "time", "free_cash_flow", "operating_cash_flow", "ebitda"]
+    d = data.reindex(columns=_cols).copy()
+    d["rrf_fcf"] = np.where(d["free_cash_flow"] < 0, "Negative Free Cash Flow", None)
+    d["rrf_ocf"] = np.where(d["operating_cash_flow"] < 0, "Negative Operating Cash Flow", None)
+    d["ebitdaVSocf"] = np.where(
+        (d["ebitda"].notna()) & (d["operating_cash_flow"].notna()) &
+        (d["ebitda"] > 2 * d["operating_cash_flow"]),
+        "Earnings quality concern (EBITDA >> OCF)",
+        None,
+    )
+    d = d.melt(id_vars=["ticker", "time"], value_vars=["rrf_fcf", "rrf_ocf", "ebitdaVSocf"],
+               var_name="metrics", value_name="red_flag")
+    return d[d["red_flag"].notna()]
+
+
+def _long_rows() -> pd.DataFrame:
+    values = {
+        "GrossMargin":     [-0.1, 0.0, np.nan, 0.3],
+        "ROE":             [-0.2, 0.1, -0.01, np.nan],
+        "DebtToEquity":    [2.0, 2.5, -1.0, np.nan],
+        "FCFtoDebt":       [0.05, 0.049, -0.3, 0.2],
+        "CurrentRatio":    [-5.0, 1.0, 2.0, 3.0],     # no rule
+    }
+    rows = [
+        {"ticker": "T", "time": f"202{i}", "sector": "technology", "metrics": m, "value": v}
+        for m, vs in values.items() for i, v in enumerate(vs)
+    ]
+    return pd.DataFrame(rows)
+
+
+def _raw_data() -> pd.DataFrame:
+    d = _make_data(fcfs=(-5.0, 10.0, np.nan), times=("2022", "2023", "2024"))
+    d["operating_cash_flow"] = [-1.0, 5.0, np.nan]
+    d["ebitda"] = [30.0, 10.0, 50.0]
+    return d
+
+
+class _Scratch(FundamentalMetricsEvaluator):
+    """Subclass used to register rules without touching the base class."""
+
+
+class TestRedFlagRules(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        self.ev = FundamentalMetricsEvaluator(_make_data(), _make_weights())
+        _Scratch._METRIC_RED_FLAG_RULES = FundamentalMetricsEvaluator._METRIC_RED_FLAG_RULES
+        _Scratch._RAW_RED_FLAG_RULES = FundamentalMetricsEvaluator._RAW_RED_FLAG_RULES
+
+    def test_metric_flags_match_reference(self):
+        df = _long_rows()
+        pd.testing.assert_frame_equal(
+            self.ev._metrics_red_flags(df), _reference_metrics_red_flags(df)
+        )
+
+    def test_no_flags_matches_reference(self):
+        df = _long_rows()
+        df = df[df["metrics"] == "CurrentRatio"]
+        pd.testing.assert_frame_equal(
+            self.ev._metrics_red_flags(df), _reference_metrics_red_flags(df)
+        )
+
+    def test_raw_flags_match_reference(self):
+        data = _raw_data()
+        ev = FundamentalMetricsEvaluator(data, _make_weights())
+        pd.testing.assert_frame_equal(ev.raw_red_flags(), _reference_raw_red_flags(data))
+
+    def test_absent_raw_column_never_fires(self):
+        data = _raw_data().drop(columns="ebitda")
+        ev = FundamentalMetricsEvaluator(data, _make_weights())
+        out = ev.raw_red_flags()
+        self.assertNotIn("ebitdaVSocf", set(out["metrics"]))
+        pd.testing.assert_frame_equal(out, _reference_raw_red_flags(data))
+
+    def test_register_metric_and_raw_rules(self):
+        _Scratch.register_red_flag_rule(RedFlagRule("CurrentRatio", "<", 0, "Negative Current Ratio"))
+        _Scratch.register_red_flag_rule(
+            RedFlagRule("total_debt", ">=", "total_assets", "Debt exceeds assets", scale=0.2,
+                        name="rrf_debt"),
+            raw=True,
+        )
+        ev = _Scratch(_make_data(), _make_weights())
+        flags = ev._metrics_red_flags(_long_rows())
+        self.assertEqual(
+            flags.loc[flags["metrics"] == "CurrentRatio", "red_flag"].tolist(),
+            ["Negative Current Ratio"],
+        )
+        raw = ev.raw_red_flags()
+        self.assertEqual(len(raw[raw["metrics"] == "rrf_debt"]), 3)   # debt 0.5×rev ≥ 0.2×2×rev
+        # Base class untouched.
+        self.assertEqual(len(FundamentalMetricsEvaluator._METRIC_RED_FLAG_RULES), 7)
+        self.assertEqual(len(FundamentalMetricsEvaluator._RAW_RED_FLAG_RULES), 3)
+
+    def test_invalid_rules_rejected(self):
+        with self.assertRaises(ValueError):
+            RedFlagRule("ROE", "=<", 0, "bad")
+        with self.assertRaises(ValueError):
+            _Scratch.register_red_flag_rule(RedFlagRule("ROE", "<", "ROA", "bad"))
+
+    def test_base_registration_reaches_universe(self):
+        saved = FundamentalMetricsEvaluator._METRIC_RED_FLAG_RULES
+        try:
+            FundamentalMetricsEvaluator.register_red_flag_rule(
+                RedFlagRule("AssetTurnover", "<", 10, "Low asset turnover")
+            )
+            data = pd.concat([_make_data(ticker="A"), _make_data(ticker="B")], ignore_index=True)
+            result = UniverseMetricsEvaluator(data, sector="technology").evaluate()
+            flagged = result["red_flags"]
+            self.assertEqual(
+                len(flagged[flagged["red_flag"] == "Low asset turnover"]), 6
+            )
+        finally:
+            FundamentalMetricsEvaluator._METRIC_RED_FLAG_RULES = saved
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Unit tests for the compact result container (results.py) and its use in wrappers.py.
+
+Covered:
+  1. from_result → frame/to_dict round trip restores every evaluate() frame
+     (dtypes and values; zero-row frames keep their columns)
+  2. Compact storage: identifiers as codes, int8 scores, float32 option,
+     decode=False keeps the compact dtypes
+  3. concat shares chunk arrays (no copy); merge_results over CompactResults
+     equals merge_results over dicts; consolidate merges dictionaries
+     (differing categories, missing labels, differing layouts)
+  4. FundamentalEvaluator.evaluate_multiple(compact=True) — thread, process and
+     sequential; failed tickers yield an empty container
+  5. Containers pickle and are smaller than the dict form
+"""
+
+import logging
+import pickle
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import FundamentalMetricsEvaluator, _EMPTY_RESULT_KEYS
+from financialtools.results import CompactResult
+from financialtools.universe import UniverseMetricsEvaluator
+from financialtools.wrappers import FundamentalEvaluator, merge_results
+
+from tests._fixtures import _make_data, _make_weights
+
+TICKERS = ["AAA", "BBB", "CCC"]
+
+
+def _evaluate(ticker="TEST", **kwargs) -> dict:
+    data = _make_data(ticker=ticker, **kwargs)
+    data.loc[0, "free_cash_flow"] = -5.0          # at least one raw red flag
+    return FundamentalMetricsEvaluator(data, _make_weights()).evaluate()
+
+
+class TestRoundTrip(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.result = _evaluate()
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_frames_round_trip(self):
+        compact = CompactResult.from_result(self.result)
+        decoded = compact.to_dict()
+        self.assertEqual(list(decoded), list(_EMPTY_RESULT_KEYS))
+        for key, df in self.result.items():
+            with self.subTest(key=key):
+                pd.testing.assert_frame_equal(decoded[key], df.reset_index(drop=True))
+                pd.testing.assert_frame_equal(compact[key], decoded[key])
+
+    def test_zero_row_frame_keeps_columns(self):
+        empty_flags = self.result["red_flags"].iloc[:0]
+        compact = CompactResult.from_result({"red_flags": empty_flags})
+        self.assertEqual(list(compact["red_flags"].columns), list(empty_flags.columns))
+        self.assertTrue(merge_results(compact, "red_flags").empty)
+
+    def test_empty_result_and_unknown_key(self):
+        compact = CompactResult.from_result({key: pd.DataFrame() for key in _EMPTY_RESULT_KEYS})
+        self.assertEqual(compact.nbytes, 0)
+        self.assertTrue(all(df.empty for df in compact.to_dict().values()))
+        with self.assertRaises(KeyError):
+            compact["scores"]
+        self.assertIsNone(compact.get("scores"))
+
+    def test_compact_dtypes(self):
+        scores = FundamentalMetricsEvaluator(_make_data(), _make_weights()).compute_scores()
+        compact = CompactResult.from_result({"scores": scores}, float32=True)
+        raw = compact.frame("scores", decode=False)
+        self.assertEqual(raw["ticker"].dtype, "category")
+        self.assertEqual(raw["metrics"].dtype, "category")
+        self.assertEqual(raw["score"].dtype, np.int8)
+        self.assertEqual(raw["value"].dtype, np.float32)
+
+        decoded = compact["scores"]
+        pd.testing.assert_frame_equal(decoded.drop(columns="value"),
+                                      scores.drop(columns="value").reset_index(drop=True))
+        self.assertEqual(decoded["value"].dtype, np.float64)
+        np.testing.assert_allclose(decoded["value"], scores["value"], rtol=1e-6)
+
+
+class TestConcat(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.results = {
+            t: _evaluate(t, revenues=(100.0 + i, 120.0, 150.0 + i))
+            for i, t in enumerate(TICKERS)
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_concat_does_not_copy(self):
+        parts = [CompactResult.from_result(r) for r in self.results.values()]
+        merged = CompactResult.concat(parts)
+        for part, chunk in zip(parts, merged._chunks["metrics"]):
+            self.assertIs(chunk, part._chunks["metrics"][0])
+
+    def test_merge_results_matches_dict_form(self):
+        compact = {t: CompactResult.from_result(r) for t, r in self.results.items()}
+        consolidated = CompactResult.concat(compact).consolidate()
+        mixed = [compact["AAA"], self.results["BBB"], ("CCC", compact["CCC"])]
+        for key in _EMPTY_RESULT_KEYS:
+            with self.subTest(key=key):
+                expected = merge_results(self.results, key)
+                pd.testing.assert_frame_equal(merge_results(compact, key), expected)
+                pd.testing.assert_frame_equal(merge_results(consolidated, key), expected)
+                pd.testing.assert_frame_equal(merge_results(mixed, key), expected)
+        self.assertEqual(len(consolidated._chunks["metrics"]), 1)
+
+    def test_dictionaries_merged_with_missing_labels(self):
+        a = pd.DataFrame({"ticker": ["A", "A"], "metrics": ["x", None], "value": [1.0, 2.0]})
+        b = pd.DataFrame({"ticker": ["B"], "metrics": ["y"], "value": [3.0]})
+        c = pd.DataFrame({"ticker": ["A"], "metrics": ["x"], "value": [4.0]})
+        merged = CompactResult.concat(
+            CompactResult.from_result({"k": df}) for df in (a, b, c)
+        ).consolidate()
+        pd.testing.assert_frame_equal(merged["k"], pd.concat([a, b, c], ignore_index=True))
+        raw = merged.frame("k", decode=False)
+        self.assertEqual(list(raw["ticker"].cat.categories), ["A", "B"])
+
+    def test_differing_layouts_are_aligned(self):
+        a = pd.DataFrame({"ticker": ["A"], "ROE": [0.1]})
+        b = pd.DataFrame({"ticker": ["B"], "ROE": [0.2], "Custom": [1.0]})
+        merged = CompactResult.concat([{"metrics": a}, {"metrics": b}])
+        pd.testing.assert_frame_equal(merged["metrics"], pd.concat([a, b], ignore_index=True))
+
+    def test_universe_result(self):
+        data = pd.concat([_make_data(ticker=t) for t in TICKERS], ignore_index=True)
+        result = UniverseMetricsEvaluator(data, sector="technology").evaluate()
+        compact = CompactResult.from_result(result)
+        pd.testing.assert_frame_equal(compact["composite_scores"],
+                                      result["composite_scores"].reset_index(drop=True))
+
+    def test_pickle_and_size(self):
+        compact = CompactResult.concat(self.results).consolidate()
+        restored = pickle.loads(pickle.dumps(compact))
+        pd.testing.assert_frame_equal(restored["metrics"], compact["metrics"])
+        self.assertLess(len(pickle.dumps(compact)), len(pickle.dumps(self.results)) / 2)
+
+
+class TestEvaluateMultipleCompact(unittest.TestCase):
+
+    def setUp(self):
+        df = pd.concat(
+            [_make_data(ticker=t, revenues=(100.0 + i, 120.0, 150.0 + i))
+             for i, t in enumerate(TICKERS)],
+            ignore_index=True,
+        )
+        self.evaluator = FundamentalEvaluator(df=df, sector="technology")
+
+    def test_backends(self):
+        expected = self.evaluator.evaluate_multiple(TICKERS, parallel=False)
+        for kwargs in ({"parallel": False}, {"executor": "thread"},
+                       {"executor": "process", "max_workers": 2}):
+            with self.subTest(**kwargs):
+                results = self.evaluator.evaluate_multiple(TICKERS, compact=True, **kwargs)
+                self.assertTrue(all(isinstance(r, CompactResult) for r in results.values()))
+                for ticker in TICKERS:
+                    pd.testing.assert_frame_equal(results[ticker]["metrics"],
+                                                  expected[ticker]["metrics"].reset_index(drop=True))
+
+    def test_failed_ticker_is_empty_container(self):
+        with self.assertLogs("TickerDownloader", level="ERROR"):
+            results = self.evaluator.evaluate_multiple(["ZZZ"], parallel=False, compact=True)
+        self.assertEqual(results["ZZZ"].nbytes, 0)
+        self.assertTrue(merge_results(results, "metrics").empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
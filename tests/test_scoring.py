@@ -0,0 +1,112 @@
+"""
+Unit tests for the precompiled threshold scoring path (evaluator.py).
+
+``_reference_score_metric`` is a copy of the former per-metric mask loop;
+the single-pass implementation must match it exactly.
+
+Covered:
+  1. _score_metric matches the per-metric loop on random data (boundaries, NaN,
+     unknown and missing metric names, negative D/E, ±inf)
+  2. _score_wide on the wide metrics frame equals _score_metric on its melt
+  3. The threshold table is compiled once per class and rebuilt for subclass overrides
+"""
+
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import FundamentalMetricsEvaluator
+
+from tests._fixtures import _make_data, _make_weights
+
+
+def _reference_score_metric(self, df):
+    df = df.copy()
+    scores = pd.Series(3, index=df.index, dtype=np.int64)
+    non_null = df['value'].notna()
+    for metric_name, thresholds in self._SCORE_THRESHOLDS.items():
+        mask = non_null & (df['metrics'] == metric_name)
+        if not mask.any():
+            continue
+        raw = (np.digitize(df.loc[mask, 'value'].to_numpy(), thresholds) + 1).astype(np.int64)
+        if metric_name in self._INVERSE_METRICS:
+            raw = 6 - raw
+        scores.loc[mask] = raw
+    neg_dte = non_null & (df['metrics'] == 'DebtToEquity') & (df['value'] < 0)
+    scores.loc[neg_dte] = 1
+    df['score'] = scores
+    return df
+
+
+def _random_long(n: int = 5000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    names = list(FundamentalMetricsEvaluator._SCORE_THRESHOLDS) + ["SomeFutureMetric"]
+    metrics = rng.choice(names, size=n).astype(object)
+    metrics[rng.random(n) < 0.01] = None
+    values = rng.normal(0.5, 1.0, size=n)
+    # Exact boundary hits and non-finite values.
+    on_bound = rng.random(n) < 0.2
+    for i in np.flatnonzero(on_bound):
+        if metrics[i] in FundamentalMetricsEvaluator._SCORE_THRESHOLDS:
+            values[i] = rng.choice(FundamentalMetricsEvaluator._SCORE_THRESHOLDS[metrics[i]])
+    values[rng.random(n) < 0.05] = np.nan
+    values[:2] = [np.inf, -np.inf]
+    return pd.DataFrame({"ticker": "T", "metrics": metrics, "value": values},
+                        index=pd.RangeIndex(10, 10 + n))
+
+
+class TestThresholdScoring(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        self.ev = FundamentalMetricsEvaluator(_make_data(), _make_weights())
+
+    def test_matches_per_metric_loop(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                df = _random_long(seed=seed)
+                pd.testing.assert_frame_equal(
+                    self.ev._score_metric(df), _reference_score_metric(self.ev, df)
+                )
+
+    def test_wide_equals_long(self):
+        data = _make_data(revenues=(100.0, 0.0, 150.0))
+        data["common_stock_equity"] = [-50.0, 10.0, np.nan]
+        ev = FundamentalMetricsEvaluator(data, _make_weights())
+        wide = ev._score_wide(ev.compute_metrics())
+        id_vars = ["ticker", "time", "sector"]
+        long = ev._score_metric(
+            ev.metrics.melt(id_vars=id_vars, var_name="metrics", value_name="value")
+        )
+        melted = wide.melt(id_vars=id_vars, var_name="metrics", value_name="score")
+        self.assertEqual(list(wide.columns[:3]), id_vars)
+        self.assertEqual(melted["score"].dtype, np.int64)
+        np.testing.assert_array_equal(melted["score"].to_numpy(), long["score"].to_numpy())
+
+    def test_table_compiled_per_class(self):
+        first = FundamentalMetricsEvaluator._threshold_table()
+        self.assertIs(FundamentalMetricsEvaluator._threshold_table()[1], first[1])
+        self.assertEqual(first[1].shape, (len(FundamentalMetricsEvaluator._SCORE_THRESHOLDS), 4))
+
+        class _Strict(FundamentalMetricsEvaluator):
+            _SCORE_THRESHOLDS = {"ROE": [0.1, 0.2, 0.3, 0.4]}
+
+        ev = _Strict(_make_data(), _make_weights())
+        df = pd.DataFrame({"metrics": ["ROE", "ROA"], "value": [0.25, 0.25]})
+        self.assertEqual(ev._score_metric(df)["score"].tolist(), [3, 3])
+        df["value"] = [0.35, 0.35]
+        self.assertEqual(ev._score_metric(df)["score"].tolist(), [4, 3])
+        self.assertIs(FundamentalMetricsEvaluator._threshold_table()[1], first[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+"""
+Unit tests for FundamentalsStore — the partitioned Parquet store for merged fundamentals.
+
+All tests use synthetic DataFrames written to a temporary directory — no network calls.
+
+Covered:
+  1. Layout: one file per (sector, fiscal_year) partition
+  2. Upsert replaces rows by (ticker, time) and appends new periods
+  3. Read filters (ticker, sector, fiscal year range, column projection)
+  4. Partitions with different column sets unify on read
+  5. A ticker that changes sector is removed from its old partition, checking
+     only other sectors' partitions of the upserted years (no dataset scan)
+  6. Read output feeds UniverseMetricsEvaluator unchanged
+  7. Input validation: missing keys or sector raise ValueError
+  8. Downloader.stream_download upserts into the store in batches, and falls
+     back to the per-ticker Parquet files when an upsert fails
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from financialtools.downloader import Downloader
+from financialtools.store import FundamentalsStore
+from financialtools.universe import UniverseMetricsEvaluator
+
+from tests._fixtures import _make_data
+
+
+def _frame(ticker: str, revenues=(100.0, 110.0, 120.0), times=("2022", "2023", "2024")) -> pd.DataFrame:
+    n = len(times)
+    df = _make_data(
+        revenues=revenues, net_incomes=(10.0,) * n, fcfs=(8.0,) * n, times=times, ticker=ticker
+    )
+    df["time"] = pd.to_datetime(df["time"])
+    return df
+
+
+class TestFundamentalsStore(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = FundamentalsStore(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_partition_layout(self):
+        self.store.upsert(_frame("AAA"), sector="technology")
+        self.store.upsert(_frame("BBB"), sector="energy")
+        dirs = sorted(
+            os.path.relpath(d, self._tmp.name)
+            for d, _, files in os.walk(self._tmp.name) if files
+        )
+        self.assertEqual(len(dirs), 6)
+        self.assertIn(os.path.join("sector=technology", "fiscal_year=2023"), dirs)
+
+    def test_upsert_replaces_and_appends(self):
+        self.store.upsert(_frame("AAA"), sector="technology")
+        update = _frame("AAA", revenues=(999.0, 130.0), times=("2024", "2025"))
+        self.store.upsert(update, sector="technology")
+        df = self.store.read(tickers=["AAA"])
+        self.assertEqual(len(df), 4)
+        self.assertFalse(df.duplicated(["ticker", "time"]).any())
+        rev = df.set_index(df["time"].dt.year)["total_revenue"]
+        self.assertEqual(rev[2024], 999.0)
+        self.assertEqual(rev[2022], 100.0)
+
+    def test_read_filters(self):
+        self.store.upsert(_frame("AAA"), sector="technology")
+        self.store.upsert(_frame("BBB"), sector="energy")
+        self.assertEqual(set(self.store.read(sectors=["energy"])["ticker"]), {"BBB"})
+        self.assertEqual(set(self.store.read(tickers=["AAA"])["sector"]), {"technology"})
+        ranged = self.store.read(start=2023, end=2023)
+        self.assertEqual(set(ranged["time"].dt.year), {2023})
+        self.assertEqual(len(self.store.read(years=[2022, 2024])), 4)
+        projected = self.store.read(columns=["total_revenue"])
+        self.assertEqual(list(projected.columns), ["ticker", "time", "sector", "total_revenue"])
+        self.assertEqual(self.store.tickers(), ["AAA", "BBB"])
+
+    def test_schema_unification(self):
+        a = _frame("AAA")
+        a["only_in_a"] = 1
+        self.store.upsert(a, sector="technology")
+        self.store.upsert(_frame("BBB"), sector="energy")
+        df = self.store.read()
+        self.assertIn("only_in_a", df.columns)
+        self.assertTrue(df.loc[df["ticker"] == "BBB", "only_in_a"].isna().all())
+        self.assertEqual(df["only_in_a"].dtype, "float64")
+
+    def test_sector_change_moves_rows(self):
+        self.store.upsert(_frame("AAA"), sector="technology")
+        self.store.upsert(_frame("AAA"), sector="communication-services")
+        df = self.store.read(tickers=["AAA"])
+        self.assertEqual(len(df), 3)
+        self.assertEqual(set(df["sector"]), {"communication-services"})
+
+    def test_sector_change_scans_only_affected_partitions(self):
+        self.store.upsert(_frame("AAA"), sector="technology")
+        self.store.upsert(_frame("BBB", revenues=(50.0, 60.0), times=("2019", "2020")), sector="energy")
+        reads = []
+        real_read = pd.read_parquet
+
+        def _tracking_read(path, *args, **kwargs):
+            reads.append(os.path.relpath(path, self._tmp.name))
+            return real_read(path, *args, **kwargs)
+
+        with mock.patch.object(self.store, "_dataset", side_effect=AssertionError("full scan")), \
+             mock.patch("financialtools.store.pd.read_parquet", side_effect=_tracking_read):
+            self.store.upsert(_frame("AAA", revenues=(130.0,), times=("2024",)), sector="communication-services")
+        self.assertFalse(any("sector=energy" in r for r in reads))
+        self.assertTrue(all("fiscal_year=2024" in r for r in reads))
+        df = self.store.read(tickers=["AAA"])
+        self.assertEqual(
+            df.groupby("sector")["time"].count().to_dict(),
+            {"communication-services": 1, "technology": 2},
+        )
+
+    def test_empty_store_reads_empty(self):
+        self.assertTrue(self.store.read().empty)
+        self.assertEqual(self.store.tickers(), [])
+
+    def test_read_feeds_universe_evaluator(self):
+        self.store.upsert(_frame("AAA"), sector="technology")
+        self.store.upsert(_frame("BBB"), sector="energy")
+        logging.disable(logging.WARNING)
+        try:
+            result = UniverseMetricsEvaluator(self.store.read()).evaluate()
+        finally:
+            logging.disable(logging.NOTSET)
+        self.assertEqual(set(result["metrics"]["ticker"]), {"AAA", "BBB"})
+        self.assertEqual(
+            set(result["metrics"].groupby("ticker")["sector"].first()), {"technology", "energy"}
+        )
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            self.store.upsert(_frame("AAA").drop(columns="time"), sector="technology")
+        with self.assertRaises(ValueError):
+            self.store.upsert(_frame("AAA"))
+        self.assertEqual(self.store.upsert(pd.DataFrame(), sector="technology"), 0)
+
+
+class TestStreamDownloadStore(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.out_dir = os.path.join(self._tmp.name, "out")
+        self.store = FundamentalsStore(os.path.join(self._tmp.name, "store"))
+        sectors = {"AAA": "Technology", "BBB": "Energy", "CCC": "Technology"}
+
+        def _downloader(ticker):
+            d = mock.MagicMock(ticker=ticker)
+            d.get_merged_data.return_value = _frame(ticker)
+            d.get_info_data.return_value = pd.DataFrame({"ticker": [ticker], "sector": [sectors[ticker]]})
+            return d
+
+        patcher = mock.patch.object(Downloader, "from_ticker", side_effect=_downloader)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, tickers=("AAA",), **kwargs):
+        list(Downloader.stream_download(
+            list(tickers), mock.MagicMock(), out_dir=self.out_dir, store=self.store, **kwargs
+        ))
+        return sorted(os.listdir(self.out_dir))
+
+    def test_merged_data_goes_to_store(self):
+        self.assertEqual(self._run(), ["AAA_info.parquet"])
+        self.assertEqual(self.store.tickers(), ["AAA"])
+
+    def test_upserts_are_batched(self):
+        with mock.patch.object(self.store, "upsert", wraps=self.store.upsert) as upsert:
+            self._run(("AAA", "BBB", "CCC"), store_batch_size=2)
+        self.assertEqual(
+            [sorted(c.args[0]["ticker"].unique()) for c in upsert.call_args_list],
+            [["AAA", "BBB"], ["CCC"]],
+        )
+        df = self.store.read()
+        self.assertEqual(df.groupby("ticker")["sector"].first().to_dict(),
+                         {"AAA": "technology", "BBB": "energy", "CCC": "technology"})
+
+    def test_closing_stream_early_flushes(self):
+        stream = Downloader.stream_download(
+            ["AAA", "BBB"], mock.MagicMock(), out_dir=self.out_dir, store=self.store
+        )
+        next(stream)
+        stream.close()
+        self.assertEqual(self.store.tickers(), ["AAA"])
+
+    def test_failed_upsert_falls_back_to_parquet(self):
+        logging.disable(logging.CRITICAL)
+        try:
+            with mock.patch.object(self.store, "upsert", side_effect=OSError("disk full")):
+                files = self._run(("AAA", "BBB"))
+        finally:
+            logging.disable(logging.NOTSET)
+        self.assertEqual(files, [
+            "AAA_info.parquet", "AAA_merged_data.parquet",
+            "BBB_info.parquet", "BBB_merged_data.parquet",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Unit tests for UniverseMetricsEvaluator — the multi-ticker evaluation engine.
+
+All tests use synthetic DataFrames — no network calls, no .env required.
+
+Covered:
+  1. Universe evaluate() matches the per-ticker path for every key (multi-sector)
+  2. Growth metrics never cross a ticker boundary (first period of each ticker is NaN)
+  3. Sector comes from the data's 'sector' column or the sector= argument
+  4. Input validation: empty data, no sector info, conflicting sectors, missing weights
+  5. split_by_ticker() returns the evaluate_multiple() shape
+"""
+
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financialtools.evaluator import FundamentalMetricsEvaluator
+from financialtools.exceptions import EvaluationError
+from financialtools.universe import UniverseMetricsEvaluator, split_by_ticker
+from financialtools.utils import build_weights
+
+from tests._fixtures import _make_bank_data, _make_data
+
+
+def _make_universe() -> pd.DataFrame:
+    a = _make_data(ticker="AAA")
+    a["sector"] = "technology"
+    b = _make_data(
+        revenues=(150.0, 120.0, 100.0), times=("2024", "2023", "2022"), ticker="BBB",
+    )
+    b["sector"] = "technology"
+    # Trigger both raw and threshold red flags for BBB.
+    b.loc[0, "free_cash_flow"] = -5.0
+    b.loc[1, "net_income_common_stockholders"] = -3.0
+    c = _make_bank_data("CCC")
+    c["sector"] = "financial-services"
+    return pd.concat([a, b, c], ignore_index=True)
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    keys = ["time", "metrics"] if "metrics" in df.columns else ["time"]
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+class TestUniverseMatchesPerTicker(unittest.TestCase):
+    """The universe pass must reproduce the per-ticker results exactly."""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.WARNING)
+        cls.data = _make_universe()
+        cls.universe = split_by_ticker(UniverseMetricsEvaluator(cls.data).evaluate())
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_every_key_identical(self):
+        for ticker, frame in self.data.groupby("ticker"):
+            sector = frame["sector"].iloc[0]
+            expected = FundamentalMetricsEvaluator(
+                frame.drop(columns="sector"), build_weights(sector)
+            ).evaluate()
+            for key, exp_df in expected.items():
+                with self.subTest(ticker=ticker, key=key):
+                    got = self.universe[ticker][key]
+                    if exp_df.empty:
+                        self.assertTrue(got.empty)
+                        continue
+                    pd.testing.assert_frame_equal(_sorted(got), _sorted(exp_df))
+
+    def test_growth_does_not_cross_tickers(self):
+        for ticker, result in self.universe.items():
+            ext = result["extended_metrics"].sort_values("time")
+            self.assertTrue(np.isnan(ext["RevenueGrowth"].iloc[0]), ticker)
+
+    def test_sector_column_per_ticker(self):
+        self.assertEqual(
+            set(self.universe["CCC"]["metrics"]["sector"]), {"financial-services"}
+        )
+        self.assertEqual(set(self.universe["AAA"]["metrics"]["sector"]), {"technology"})
+
+
+class TestUniverseSectorResolution(unittest.TestCase):
+
+    def test_sector_argument_overrides_missing_column(self):
+        data = _make_universe().drop(columns="sector")
+        ev = UniverseMetricsEvaluator(data, sector="technology")
+        self.assertEqual(ev.sectors, ["technology"])
+        self.assertEqual(ev.sector, "technology")
+
+    def test_multi_sector_has_no_scalar_sector(self):
+        ev = UniverseMetricsEvaluator(_make_universe())
+        self.assertIsNone(ev.sector)
+        self.assertEqual(ev.sectors, ["financial-services", "technology"])
+
+
+class TestUniverseValidation(unittest.TestCase):
+
+    def test_empty_data_raises(self):
+        with self.assertRaises(EvaluationError):
+            UniverseMetricsEvaluator(pd.DataFrame())
+
+    def test_no_sector_information_raises(self):
+        with self.assertRaises(EvaluationError):
+            UniverseMetricsEvaluator(_make_universe().drop(columns="sector"))
+
+    def test_conflicting_sectors_raise(self):
+        data = _make_universe()
+        data.loc[0, "sector"] = "energy"
+        with self.assertRaises(EvaluationError):
+            UniverseMetricsEvaluator(data)
+
+    def test_weights_missing_sector_raise(self):
+        with self.assertRaises(EvaluationError):
+            UniverseMetricsEvaluator(_make_universe(), weights=build_weights("technology"))
+
+
+class TestSplitByTicker(unittest.TestCase):
+
+    def test_all_keys_for_every_ticker(self):
+        logging.disable(logging.WARNING)
+        try:
+            split = split_by_ticker(UniverseMetricsEvaluator(_make_universe()).evaluate())
+        finally:
+            logging.disable(logging.NOTSET)
+        self.assertEqual(set(split), {"AAA", "BBB", "CCC"})
+        for result in split.values():
+            self.assertIn("extended_metrics", result)
+            self.assertIsInstance(result["red_flags"], pd.DataFrame)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for the precomputed sector weights registry (weights.py).
+
+Covered:
+  1. Vectors are aligned to SCORED_METRICS, read-only, and match the config table
+  2. build_weights() serves registry frames; caller edits never reach the cache
+     (the returned frame shares no memory with the cached one)
+  3. Unknown sectors fall back to 'default' under the requested sector name
+  4. Overrides: change, remove and add-sector; the base registry is untouched;
+     build_weights(overrides=...) builds only the requested sector
+  5. Missing metrics are reported at build time; extra metrics are kept; invalid weights raise
+  6. evaluate() does not repeat a gap the registry already reported, but still
+     warns for gaps in hand-built weights
+  7. frames() covers several sectors for UniverseMetricsEvaluator
+"""
+
+import logging
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from financialtools.config import sec_sector_metric_weights
+from financialtools.evaluator import SCORED_METRICS, FundamentalMetricsEvaluator
+from financialtools.utils import build_weights
+from financialtools import weights as weights_module
+from financialtools.weights import WeightsRegistry, default_weights_registry
+
+from tests._fixtures import _make_data, _make_weights
+
+
+class TestWeightsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = default_weights_registry()
+
+    def test_vectors_match_config(self):
+        self.assertIs(default_weights_registry(), self.registry)
+        for sector, raw in sec_sector_metric_weights.items():
+            with self.subTest(sector=sector):
+                vector = self.registry.vector(sector)
+                self.assertFalse(vector.flags.writeable)
+                np.testing.assert_array_equal(vector, [raw[m] for m in SCORED_METRICS])
+
+    def test_build_weights_returns_private_copy(self):
+        weights = build_weights("technology")
+        self.assertEqual(list(weights.columns), ["sector", "metrics", "weights"])
+        self.assertEqual(weights["metrics"].tolist(), SCORED_METRICS)
+        pd.testing.assert_series_equal(
+            weights.set_index("metrics")["weights"].sort_index(),
+            _make_weights().set_index("metrics")["weights"].sort_index(),
+        )
+        cached = self.registry.get("technology")._frame
+        self.assertFalse(np.shares_memory(weights["weights"].to_numpy(), cached["weights"].to_numpy()))
+        weights.loc[0, "weights"] = -1
+        weights["sector"] = "changed"
+        self.assertEqual(build_weights("technology").loc[0, "weights"],
+                         sec_sector_metric_weights["technology"][SCORED_METRICS[0]])
+        self.assertEqual(set(build_weights("technology")["sector"]), {"technology"})
+
+    def test_unknown_sector_falls_back_to_default(self):
+        with self.assertLogs("financialtools.weights", level="WARNING"):
+            weights = build_weights("no-such-sector")
+        self.assertEqual(set(weights["sector"]), {"no-such-sector"})
+        np.testing.assert_array_equal(weights["weights"].to_numpy(),
+                                      build_weights("default")["weights"].to_numpy())
+
+    def test_overrides(self):
+        with self.assertLogs("financialtools.weights", level="WARNING") as logs:
+            custom = self.registry.with_overrides({
+                "technology": {"ROE": 50, "ROA": None},
+                "space": {"CapexRatio": 0},
+            })
+        self.assertTrue(any("'technology'" in line and "ROA" in line for line in logs.output))
+        tech = custom.get("technology")
+        self.assertEqual(tech.vector[SCORED_METRICS.index("ROE")], 50)
+        self.assertEqual(tech.missing, ("ROA",))
+        self.assertNotIn("ROA", tech.frame["metrics"].tolist())
+        self.assertEqual(custom.vector("space")[SCORED_METRICS.index("CapexRatio")], 0)
+        self.assertIn("space", custom)
+        self.assertNotIn("space", self.registry)
+        self.assertEqual(self.registry.get("technology").missing, ())
+
+        with mock.patch.object(weights_module, "_build_sector", wraps=weights_module._build_sector) as build:
+            one_off = build_weights("energy", overrides={"ROE": 1})
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(set(one_off["sector"]), {"energy"})
+        self.assertEqual(one_off.set_index("metrics").loc["ROE", "weights"], 1)
+        self.assertNotEqual(build_weights("energy").set_index("metrics").loc["ROE", "weights"], 1)
+
+    def test_build_time_validation(self):
+        table = {"default": {"ROE": 1, "Custom": 2}}
+        with self.assertLogs("financialtools.weights", level="WARNING") as logs:
+            registry = WeightsRegistry(table)
+        self.assertTrue(any("'default' has no weight" in line for line in logs.output))
+        self.assertEqual(len(registry.get("default").missing), len(SCORED_METRICS) - 1)
+        # Metrics outside SCORED_METRICS stay in the frame (no vector slot).
+        self.assertEqual(registry.frame("default")["metrics"].tolist(), ["ROE", "Custom"])
+        self.assertEqual(len(registry.vector("default")), len(SCORED_METRICS))
+        with self.assertRaises(ValueError):
+            WeightsRegistry({"default": {"ROE": -1}})
+        with self.assertRaises(ValueError):
+            WeightsRegistry({"technology": {"ROE": 1}})
+
+    def test_evaluate_does_not_repeat_reported_gaps(self):
+        logging.getLogger("financialtools.weights").setLevel(logging.ERROR)
+        try:
+            weights = build_weights("technology", overrides={"ROE": None})
+        finally:
+            logging.getLogger("financialtools.weights").setLevel(logging.NOTSET)
+        with self.assertLogs("financialtools.evaluator", level="WARNING") as logs:
+            FundamentalMetricsEvaluator(_make_data(), weights).evaluate()
+        self.assertFalse(any("Metrics missing weights" in line for line in logs.output))
+
+        hand_built = weights.iloc[1:].copy()
+        hand_built.attrs = {}
+        with self.assertLogs("financialtools.evaluator", level="WARNING") as logs:
+            FundamentalMetricsEvaluator(_make_data(), hand_built).evaluate()
+        self.assertTrue(any("Metrics missing weights" in line for line in logs.output))
+
+    def test_frames_cover_sectors(self):
+        frame = self.registry.frames(["energy", "technology"])
+        self.assertEqual(frame["sector"].value_counts().to_dict(),
+                         {"energy": len(SCORED_METRICS), "technology": len(SCORED_METRICS)})
+        self.assertEqual(frame.attrs["missing_metrics"], {"energy": (), "technology": ()})
+
+
+if __name__ == "__main__":
+    unittest.main()
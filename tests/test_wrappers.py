@@ -12,6 +12,9 @@ Covered:
   6. _configure_logging falls back to StreamHandler on PermissionError (P2-4)
   7. _configure_logging falls back to StreamHandler on any OSError (P2-4)
   8. FINANCIALTOOLS_LOG_DIR env var overrides the default log path (P2-4)
+  9. FundamentalEvaluator process backend matches the thread backend
+ 10. iter_evaluate streams (ticker, result) pairs; merge_results consumes the stream
+ 11. Unknown executor raises ValueError; missing tickers return empty_result()
 """
 
 import logging
@@ -19,9 +22,16 @@ import unittest
 from unittest.mock import MagicMock, patch, call
 import pandas as pd
 
-from financialtools.wrappers import _download_single_ticker, _download_multiple_tickers
+from financialtools.wrappers import (
+    FundamentalEvaluator,
+    _download_multiple_tickers,
+    _download_single_ticker,
+    merge_results,
+)
 from financialtools.utils import RateLimiter
 
+from tests._fixtures import _make_data
+
 
 def _make_merged_df(ticker="AAPL") -> pd.DataFrame:
     return pd.DataFrame({
@@ -190,5 +200,58 @@ class TestConfigureLogging(unittest.TestCase):
         self.assertEqual(resolved, "/custom/logs")
 
 
+class TestFundamentalEvaluatorExecutors(unittest.TestCase):
+    """evaluate_multiple / iter_evaluate across thread and process backends."""
+
+    TICKERS = ["AAA", "BBB", "CCC"]
+
+    def setUp(self):
+        df = pd.concat(
+            [_make_data(ticker=t, revenues=(100.0 + i, 120.0, 150.0 + i))
+             for i, t in enumerate(self.TICKERS)],
+            ignore_index=True,
+        )
+        self.evaluator = FundamentalEvaluator(df=df, sector="technology")
+
+    def test_process_backend_matches_thread_backend(self):
+        threaded = self.evaluator.evaluate_multiple(self.TICKERS, executor="thread")
+        processed = self.evaluator.evaluate_multiple(
+            self.TICKERS, executor="process", max_workers=2
+        )
+        self.assertEqual(set(processed), set(self.TICKERS))
+        for ticker in self.TICKERS:
+            for key, df in threaded[ticker].items():
+                pd.testing.assert_frame_equal(processed[ticker][key], df)
+
+    def test_iter_evaluate_streams_pairs(self):
+        pairs = list(self.evaluator.iter_evaluate(self.TICKERS))
+        self.assertEqual(sorted(t for t, _ in pairs), self.TICKERS)
+        self.assertTrue(all(isinstance(r, dict) for _, r in pairs))
+
+    def test_merge_results_consumes_stream(self):
+        stream = self.evaluator.iter_evaluate(self.TICKERS)
+        merged = merge_results(stream, "composite_scores")
+        self.assertEqual(sorted(merged["ticker"].unique()), self.TICKERS)
+
+    def test_merge_results_accepts_list_of_results(self):
+        results = self.evaluator.evaluate_multiple(self.TICKERS, parallel=False)
+        merged = merge_results(list(results.values()), "metrics")
+        self.assertEqual(len(merged), 3 * len(self.TICKERS))
+
+    def test_unknown_executor_raises(self):
+        with self.assertRaises(ValueError):
+            list(self.evaluator.iter_evaluate(self.TICKERS, executor="gpu"))
+
+    def test_missing_ticker_returns_empty_result(self):
+        with self.assertLogs("TickerDownloader", level="ERROR"):
+            result = self.evaluator.evaluate_single("ZZZ")
+        self.assertTrue(all(df.empty for df in result.values()))
+
+    def test_partitions_computed_once(self):
+        first = self.evaluator.partitions()
+        self.assertIs(first, self.evaluator.partitions())
+        self.assertEqual(set(first), set(self.TICKERS))
+
+
 if __name__ == "__main__":
     unittest.main()